@@ -0,0 +1,38 @@
+"""Minelancher 后端核心
+
+子模块（下载、校验、启动等）依赖较重，全部按需导入：
+``import MLCore`` 本身几乎没有开销，``MLCore.xxx`` 第一次被访问时才导入对应子模块。
+"""
+import importlib
+
+# 可按需导入的子模块，新增子模块时在这里登记
+_LAZY_SUBMODULES = (
+    "accounts",
+    "download",
+    "instances",
+    "java",
+    "jvm",
+    "launch",
+    "logs",
+    "mods",
+    "natives",
+    "objects",
+    "paths",
+    "process",
+    "ranges",
+    "resolver",
+    "verify",
+    "versions",
+)
+
+__all__ = list(_LAZY_SUBMODULES)
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        module = importlib.import_module("." + name, __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
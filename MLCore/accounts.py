@@ -0,0 +1,419 @@
+"""账号存储
+
+账号保存在 SQLite 数据库中：
+- accounts 表只存列表显示需要的头信息，启动时只读这一张表
+- profiles 表存令牌与完整档案，令牌加密后保存，只在需要时按 UUID 读取
+- meta 表存零散的键值（如上次使用的离线用户名）
+
+所有写操作交给后台线程批量提交，调用方（通常是 GUI 线程）不会被磁盘 I/O 阻塞。
+"""
+import atexit
+import hashlib
+import hmac
+import json
+import os
+import queue
+import secrets
+import sqlite3
+import threading
+import time
+import uuid as uuid_lib
+from collections import namedtuple
+from . import paths
+
+# 账号头信息，字段与 ui.widgets.account_list.AccountEntry 一致
+# expires_at 为令牌过期时间（Unix 时间戳），离线账号或未知时为 None
+AccountHeader = namedtuple("AccountHeader", "uuid username account_type expires_at skin_path")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    uuid TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    account_type TEXT NOT NULL,
+    expires_at REAL,
+    skin_path TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_accounts_username ON accounts (username);
+CREATE TABLE IF NOT EXISTS profiles (
+    uuid TEXT PRIMARY KEY REFERENCES accounts (uuid) ON DELETE CASCADE,
+    access_token BLOB,
+    refresh_token BLOB,
+    profile TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def offline_uuid(username):
+    """计算离线账号的 UUID，与原版服务端的 OfflinePlayer 规则一致"""
+    digest = bytearray(hashlib.md5(("OfflinePlayer:" + username).encode("utf-8")).digest())
+    digest[6] = (digest[6] & 0x0f) | 0x30
+    digest[8] = (digest[8] & 0x3f) | 0x80
+    return uuid_lib.UUID(bytes=bytes(digest)).hex
+
+class TokenCipher:
+    """令牌的静态加密
+
+    只使用标准库：以 HMAC-SHA256 作为计数器模式的密钥流加密，
+    再对密文做 HMAC-SHA256 认证（先加密后认证）。
+    密钥单独保存在权限为 0600 的文件中，数据库被拷走时令牌无法直接读取。
+    """
+
+    VERSION = b"\x01"
+    NONCE_SIZE = 16
+    TAG_SIZE = 16
+
+    def __init__(self, key):
+        """初始化
+
+        Args:
+            key: 32 字节主密钥
+        """
+        self.enc_key = hmac.new(key, b"minelancher-enc", hashlib.sha256).digest()
+        self.mac_key = hmac.new(key, b"minelancher-mac", hashlib.sha256).digest()
+
+    @classmethod
+    def from_key_file(cls, path):
+        """从密钥文件加载，文件不存在时生成新密钥"""
+        try:
+            with open(path, "rb") as f:
+                key = f.read()
+        except FileNotFoundError:
+            key = secrets.token_bytes(32)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(key)
+        return cls(key)
+
+    def _keystream(self, nonce, length):
+        blocks = []
+        for counter in range((length + 31) // 32):
+            blocks.append(hmac.new(self.enc_key, nonce + counter.to_bytes(8, "big"), hashlib.sha256).digest())
+        return b"".join(blocks)[:length]
+
+    def encrypt(self, text):
+        """加密字符串，None 原样返回"""
+        if text is None:
+            return None
+        data = text.encode("utf-8")
+        nonce = secrets.token_bytes(self.NONCE_SIZE)
+        body = bytes(a ^ b for a, b in zip(data, self._keystream(nonce, len(data))))
+        tag = hmac.new(self.mac_key, self.VERSION + nonce + body, hashlib.sha256).digest()[:self.TAG_SIZE]
+        return self.VERSION + nonce + body + tag
+
+    def decrypt(self, blob):
+        """解密，数据被篡改或密钥不匹配时抛出 ValueError"""
+        if blob is None:
+            return None
+        blob = bytes(blob)
+        if blob[:1] != self.VERSION:
+            raise ValueError("不支持的令牌加密版本")
+        nonce = blob[1:1 + self.NONCE_SIZE]
+        body = blob[1 + self.NONCE_SIZE:-self.TAG_SIZE]
+        tag = blob[-self.TAG_SIZE:]
+        expected = hmac.new(self.mac_key, blob[:-self.TAG_SIZE], hashlib.sha256).digest()[:self.TAG_SIZE]
+        if not hmac.compare_digest(tag, expected):
+            raise ValueError("令牌校验失败")
+        return bytes(a ^ b for a, b in zip(body, self._keystream(nonce, len(body)))).decode("utf-8")
+
+class AccountStore:
+    """账号存储
+
+    读操作在调用线程上直接查询（每个线程一个连接，WAL 模式下读写互不阻塞）；
+    写操作进入队列，由后台线程合并成批次在一个事务中提交。
+    """
+
+    BATCH_SIZE = 256
+    BATCH_WAIT = 0.05
+
+    def __init__(self, db_path=None, key_path=None):
+        """初始化账号存储
+
+        Args:
+            db_path: 数据库路径，默认在数据目录下的 accounts.db
+            key_path: 令牌密钥路径，默认在数据目录下的 accounts.key
+        """
+        self.db_path = db_path or os.path.join(paths.data_dir(), "accounts.db")
+        self.key_path = key_path or os.path.join(os.path.dirname(self.db_path), "accounts.key")
+        self.cipher = None
+        self.local = threading.local()
+        self.write_queue = queue.Queue()
+        # 写入失败时在后台线程调用 on_error(异常)（如通知界面）；
+        # 没有设置时失败的写操作（异常）保存在 write_errors 中，由 flush()/close() 抛给调用方
+        self.on_error = None
+        self.write_errors = []
+        self.closed = False
+
+        # 建表在调用线程上同步完成，保证之后的读操作能立刻使用
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+        self.writer = threading.Thread(target=self._write_loop, name="AccountStoreWriter", daemon=True)
+        self.writer.start()
+
+    def connection(self):
+        """当前线程的数据库连接"""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self.local.conn = conn
+        return conn
+
+    def get_cipher(self):
+        """令牌加解密器，第一次用到令牌时才读取密钥"""
+        if self.cipher is None:
+            self.cipher = TokenCipher.from_key_file(self.key_path)
+        return self.cipher
+
+    # 读操作
+
+    def list_headers(self):
+        """列出所有账号的头信息，不读取令牌与档案"""
+        rows = self.connection().execute(
+            "SELECT uuid, username, account_type, expires_at, skin_path FROM accounts ORDER BY rowid"
+        ).fetchall()
+        return [AccountHeader(*row) for row in rows]
+
+    def get_header(self, uuid):
+        """按 UUID 获取账号头信息，不存在时返回 None"""
+        row = self.connection().execute(
+            "SELECT uuid, username, account_type, expires_at, skin_path FROM accounts WHERE uuid = ?",
+            (uuid,)
+        ).fetchone()
+        return AccountHeader(*row) if row else None
+
+    def find_by_username(self, username):
+        """按用户名查找账号（走 username 索引）"""
+        rows = self.connection().execute(
+            "SELECT uuid, username, account_type, expires_at, skin_path FROM accounts WHERE username = ?",
+            (username,)
+        ).fetchall()
+        return [AccountHeader(*row) for row in rows]
+
+    def get_profile(self, uuid):
+        """读取账号的完整档案与解密后的令牌
+
+        Returns:
+            {"access_token": ..., "refresh_token": ..., "profile": {...}}，账号不存在时返回 None
+        """
+        row = self.connection().execute(
+            "SELECT access_token, refresh_token, profile FROM profiles WHERE uuid = ?", (uuid,)
+        ).fetchone()
+        if row is None:
+            return None
+        cipher = self.get_cipher()
+        return {
+            "access_token": cipher.decrypt(row[0]),
+            "refresh_token": cipher.decrypt(row[1]),
+            "profile": json.loads(row[2]) if row[2] else {}
+        }
+
+    def get_meta(self, key, default=None):
+        """读取键值"""
+        row = self.connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    # 写操作（异步）
+
+    def save_account(self, header, access_token=None, refresh_token=None, profile=None):
+        """保存账号，已存在时覆盖
+
+        Args:
+            header: AccountHeader
+            access_token: 访问令牌
+            refresh_token: 刷新令牌
+            profile: 完整档案（可 JSON 序列化的字典）
+        """
+        self.save_accounts([(header, access_token, refresh_token, profile)])
+
+    def save_accounts(self, records):
+        """批量保存账号
+
+        Args:
+            records: (header, access_token, refresh_token, profile) 元组的列表
+        """
+        cipher = self.get_cipher() if any(r[1] or r[2] for r in records) else None
+        now = time.time()
+        account_rows = []
+        profile_rows = []
+        for header, access_token, refresh_token, profile in records:
+            account_rows.append(tuple(header) + (now,))
+            if not (access_token or refresh_token or profile):
+                # 只更新头信息（如改名）时不碰已保存的令牌与档案
+                continue
+            profile_rows.append((
+                header.uuid,
+                cipher.encrypt(access_token) if access_token else None,
+                cipher.encrypt(refresh_token) if refresh_token else None,
+                json.dumps(profile, ensure_ascii=False) if profile else None
+            ))
+        # 用 UPSERT 而不是 REPLACE，避免先删除旧行而级联删除档案
+        self._enqueue(
+            "INSERT INTO accounts (uuid, username, account_type, expires_at, skin_path, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (uuid) DO UPDATE SET "
+            "username = excluded.username, account_type = excluded.account_type, expires_at = excluded.expires_at, "
+            "skin_path = excluded.skin_path, updated_at = excluded.updated_at", account_rows
+        )
+        if profile_rows:
+            # 只覆盖本次给出的字段，没有给出的（None）保留原值
+            self._enqueue(
+                "INSERT INTO profiles (uuid, access_token, refresh_token, profile) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (uuid) DO UPDATE SET "
+                "access_token = COALESCE(excluded.access_token, access_token), "
+                "refresh_token = COALESCE(excluded.refresh_token, refresh_token), "
+                "profile = COALESCE(excluded.profile, profile)", profile_rows
+            )
+
+    def remove_account(self, uuid):
+        """删除账号及其档案"""
+        self._enqueue("DELETE FROM accounts WHERE uuid = ?", [(uuid,)])
+
+    def set_meta(self, key, value):
+        """写入键值"""
+        self._enqueue("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [(key, value)])
+
+    def flush(self):
+        """等待已提交的写操作全部落盘
+
+        Raises:
+            sqlite3.Error: 之前有写操作在后台线程中失败（没有设置 on_error 时），抛出其中第一个
+        """
+        self.write_queue.join()
+        self._raise_write_error()
+
+    def close(self):
+        """写完剩余操作后停止后台线程，写入失败时与 flush() 一样抛出异常"""
+        if self.closed:
+            return
+        self.closed = True
+        self.write_queue.put(None)
+        self.writer.join()
+        self._raise_write_error()
+
+    def _report_write_error(self, error):
+        on_error = self.on_error
+        if on_error is None:
+            self.write_errors.append(error)
+            return
+        try:
+            on_error(error)
+        except Exception:
+            # 回调本身出错（如接收通知的界面已销毁）时退回到由 flush()/close() 抛出
+            self.write_errors.append(error)
+
+    def _raise_write_error(self):
+        if self.write_errors:
+            errors, self.write_errors = self.write_errors, []
+            raise errors[0]
+
+    def _enqueue(self, sql, rows):
+        if self.closed:
+            raise RuntimeError("账号存储已关闭")
+        self.write_queue.put((sql, rows))
+
+    def _write_loop(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        running = True
+        while running:
+            batch = [self.write_queue.get()]
+            # 短暂等待，把相邻的写操作合并进同一个事务
+            deadline = time.monotonic() + self.BATCH_WAIT
+            while len(batch) < self.BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.write_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            ops = [op for op in batch if op is not None]
+            running = len(ops) == len(batch)
+            try:
+                with conn:
+                    for op in ops:
+                        conn.executemany(*op)
+            except sqlite3.Error:
+                # 整批回滚后逐个重新提交，只丢弃真正失败的写操作
+                for op in ops:
+                    try:
+                        with conn:
+                            conn.executemany(*op)
+                    except sqlite3.Error as e:
+                        self._report_write_error(e)
+            finally:
+                for _ in batch:
+                    self.write_queue.task_done()
+        conn.close()
+
+    # 导入旧启动器账号
+
+    def import_legacy_file(self, path):
+        """从其他启动器的账号文件批量导入
+
+        支持官方启动器的 launcher_accounts.json、旧版 launcher_profiles.json
+        以及 HMCL 的 accounts.json。
+
+        Args:
+            path: 账号文件路径
+
+        Returns:
+            导入的账号数量
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        records = parse_legacy_accounts(data)
+        if records:
+            self.save_accounts(records)
+        return len(records)
+
+def parse_legacy_accounts(data):
+    """把其他启动器的账号数据转换为 save_accounts() 的记录列表"""
+    records = []
+    if isinstance(data, dict) and isinstance(data.get("accounts"), dict):
+        # 官方启动器 launcher_accounts.json
+        for entry in data["accounts"].values():
+            profile = entry.get("minecraftProfile") or {}
+            if not profile.get("id"):
+                continue
+            header = AccountHeader(profile["id"].replace("-", ""), profile.get("name", ""), "msa", None, None)
+            records.append((header, entry.get("accessToken"), None, {"source": "launcher_accounts"}))
+    elif isinstance(data, dict) and isinstance(data.get("authenticationDatabase"), dict):
+        # 旧版官方启动器 launcher_profiles.json
+        for entry in data["authenticationDatabase"].values():
+            for profile_id, profile in (entry.get("profiles") or {}).items():
+                header = AccountHeader(profile_id.replace("-", ""), profile.get("displayName", ""), "msa", None, None)
+                records.append((header, entry.get("accessToken"), None, {"source": "launcher_profiles"}))
+    elif isinstance(data, list):
+        # HMCL accounts.json
+        for entry in data:
+            name = entry.get("displayName") or entry.get("username") or ""
+            if entry.get("type") == "offline":
+                header = AccountHeader(entry.get("uuid") or offline_uuid(name), name, "offline", None, None)
+                records.append((header, None, None, None))
+            elif entry.get("uuid"):
+                header = AccountHeader(entry["uuid"].replace("-", ""), name, "msa", None, None)
+                records.append((header, entry.get("accessToken"), entry.get("refreshToken"), {"source": "hmcl"}))
+    return records
+
+_default_store = None
+_default_lock = threading.Lock()
+
+def default_store():
+    """数据目录下的默认账号存储（进程内唯一）
+
+    后台写入线程是守护线程，进程退出时（atexit）关闭存储，排队中的写操作全部落盘后才退出。
+    """
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = AccountStore()
+            atexit.register(_default_store.close)
+    return _default_store
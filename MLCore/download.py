@@ -0,0 +1,508 @@
+"""下载引擎
+
+用固定大小的线程池并发下载大量文件：
+- 每个主机保持一组 keep-alive 连接，请求之间复用
+- 大文件按 HTTP Range 拆成分块并行下载，已完成的分块记录在旁路文件中，中断后可以续传
+- 全局与单个主机各有一个令牌桶限速
+- 边下载边计算哈希，下载完成时不需要重新读取文件
+"""
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# 官方资源文件服务器
+RESOURCES_URL = "https://resources.download.minecraft.net"
+
+# 一个下载任务；size 与 sha1 未知时为 None，已知时下载完成后校验
+DownloadTask = namedtuple("DownloadTask", "url path size sha1", defaults=(None, None))
+
+# 下载统计
+DownloadStats = namedtuple("DownloadStats", "files skipped bytes seconds")
+
+BLOCK_SIZE = 64 * 1024
+# 4xx 中值得重试的状态码（请求超时、请求过多），其余 4xx 重试也不会成功
+RETRY_STATUSES = (408, 429)
+
+class DownloadError(Exception):
+    """下载失败
+
+    Attributes:
+        failures: [(DownloadTask, 错误信息), ...]
+    """
+
+    def __init__(self, message, failures=()):
+        super().__init__(message)
+        self.failures = list(failures)
+
+class RateLimiter:
+    """令牌桶限速器（线程安全）"""
+
+    def __init__(self, rate, burst=None):
+        """初始化限速器
+
+        Args:
+            rate: 每秒允许的字节数
+            burst: 桶容量，默认为一秒的量
+        """
+        self.rate = float(rate)
+        self.capacity = float(burst or rate)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, amount):
+        """消耗 amount 字节的额度，额度不足时阻塞到足够为止"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            # 允许欠账：先扣除，再在锁外等待欠下的部分，保证多个线程公平排队
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+class ConnectionPool:
+    """按主机复用的 HTTP 连接池
+
+    每个主机最多同时使用 per_host 个连接，用完的连接放回池中供下一个请求使用。
+    """
+
+    def __init__(self, per_host=8, timeout=30):
+        """初始化连接池
+
+        Args:
+            per_host: 每个主机的最大并发连接数
+            timeout: 连接与读取超时（秒）
+        """
+        self.per_host = per_host
+        self.timeout = timeout
+        self.idle = {}
+        self.slots = {}
+        self.lock = threading.Lock()
+
+    def _slot(self, key):
+        with self.lock:
+            slot = self.slots.get(key)
+            if slot is None:
+                slot = self.slots[key] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    def acquire(self, scheme, netloc):
+        """取出一个到该主机的连接，达到并发上限时阻塞"""
+        key = (scheme, netloc)
+        self._slot(key).acquire()
+        with self.lock:
+            idle = self.idle.get(key)
+            if idle:
+                return idle.pop()
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def release(self, scheme, netloc, conn, reusable=True):
+        """归还连接；reusable 为 False 时（出错或服务器要求关闭）直接关闭"""
+        key = (scheme, netloc)
+        if reusable:
+            with self.lock:
+                self.idle.setdefault(key, []).append(conn)
+        else:
+            conn.close()
+        self.slots[key].release()
+
+    def close(self):
+        """关闭所有空闲连接"""
+        with self.lock:
+            for conns in self.idle.values():
+                for conn in conns:
+                    conn.close()
+            self.idle.clear()
+
+class _FileState:
+    """分块下载中一个文件的共享状态
+
+    分块可能乱序完成；哈希只能按顺序计算，所以提前完成的分块数据暂存在内存中，
+    等前面的分块完成后再一起送入哈希。续传时已经在磁盘上的分块是唯一需要回读的部分。
+    """
+
+    def __init__(self, task, chunk_size):
+        self.task = task
+        self.part_path = task.path + ".part"
+        self.meta_path = task.path + ".part.json"
+        self.chunk_size = chunk_size
+        self.count = (task.size + chunk_size - 1) // chunk_size
+        self.done = set()
+        self.pending = {}
+        self.next_hash = 0
+        self.hasher = hashlib.sha1() if task.sha1 else None
+        # 服务器忽略 Range 时改为整个文件下载，whole_index 为负责下载的分块序号
+        self.whole_index = None
+        self.failed = False
+        self.lock = threading.Lock()
+
+    def prepare(self):
+        """创建（或续用）.part 文件，返回还需要下载的分块序号"""
+        meta = None
+        if os.path.exists(self.part_path):
+            try:
+                with open(self.meta_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = None
+        if (meta and meta.get("size") == self.task.size and meta.get("sha1") == self.task.sha1
+                and meta.get("chunk_size") == self.chunk_size):
+            self.done = set(meta["done"])
+            # 已完成的分块在轮到它时从磁盘回读哈希
+            for index in self.done:
+                self.pending[index] = None
+        else:
+            os.makedirs(os.path.dirname(self.task.path) or ".", exist_ok=True)
+            with open(self.part_path, "wb") as f:
+                f.truncate(self.task.size)
+        return [index for index in range(self.count) if index not in self.done]
+
+    @property
+    def whole(self):
+        return self.whole_index is not None
+
+    def claim_whole(self, index):
+        """服务器对分块 index 返回了整个文件：第一个收到的分块负责下载整个文件
+
+        Returns:
+            是否由该分块下载（重试时同一个分块会再次收到整个文件）
+        """
+        with self.lock:
+            if self.whole_index is None:
+                self.whole_index = index
+            return self.whole_index == index
+
+    def chunk_range(self, index):
+        start = index * self.chunk_size
+        return start, min(start + self.chunk_size, self.task.size) - 1
+
+    def complete_chunk(self, index, blocks):
+        """记录一个分块完成
+
+        Returns:
+            整个文件是否已经全部完成
+        """
+        with self.lock:
+            self.done.add(index)
+            if self.hasher is not None:
+                self.pending[index] = blocks
+                self._advance_hash()
+            self._save_meta()
+            return len(self.done) == self.count
+
+    def _advance_hash(self):
+        while self.next_hash in self.pending:
+            blocks = self.pending.pop(self.next_hash)
+            if blocks is None:
+                start, end = self.chunk_range(self.next_hash)
+                with open(self.part_path, "rb") as f:
+                    f.seek(start)
+                    blocks = [f.read(end - start + 1)]
+            for block in blocks:
+                self.hasher.update(block)
+            self.next_hash += 1
+
+    def _save_meta(self):
+        data = {
+            "size": self.task.size,
+            "sha1": self.task.sha1,
+            "chunk_size": self.chunk_size,
+            "done": sorted(self.done)
+        }
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+class Downloader:
+    """并发下载器"""
+
+    def __init__(self, workers=16, per_host=8, chunk_size=4 * 1024 * 1024, split_size=8 * 1024 * 1024,
+                 speed_limit=None, host_speed_limit=None, retries=3, timeout=30):
+        """初始化下载器
+
+        Args:
+            workers: 工作线程数
+            per_host: 每个主机的最大并发连接数
+            chunk_size: 大文件的分块大小（字节）
+            split_size: 已知大小不小于该值的文件才分块下载
+            speed_limit: 全局限速（字节/秒），None 为不限速
+            host_speed_limit: 单个主机的限速（字节/秒），None 为不限速
+            retries: 每个文件或分块的重试次数
+            timeout: 连接与读取超时（秒）
+        """
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.split_size = split_size
+        self.retries = retries
+        self.pool = ConnectionPool(per_host=per_host, timeout=timeout)
+        self.global_limiter = RateLimiter(speed_limit) if speed_limit else None
+        self.host_speed_limit = host_speed_limit
+        self.host_limiters = {}
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        # 当前线程中本次请求已计入进度的字节数，请求失败重试时从进度中扣除
+        self.attempt = threading.local()
+
+    def cancel(self):
+        """取消正在进行的下载，已完成的分块保留以便续传"""
+        self.cancelled.set()
+
+    def close(self):
+        """关闭空闲连接"""
+        self.pool.close()
+
+    def download(self, tasks, progress=None):
+        """下载一批文件
+
+        已存在且大小一致的文件直接跳过，不重新校验内容（内容校验见 MLCore.verify）。
+
+        Args:
+            tasks: DownloadTask 列表
+            progress: 进度回调 progress(done_bytes, done_files, total_files)，在工作线程中调用
+
+        Returns:
+            DownloadStats
+
+        Raises:
+            DownloadError: 有文件下载失败或下载被取消
+        """
+        self.cancelled.clear()
+        started = time.perf_counter()
+        self.done_bytes = 0
+        self.done_files = 0
+        failures = []
+        skipped = 0
+        todo = []
+        for task in tasks:
+            if task.size is not None and _file_size(task.path) == task.size:
+                skipped += 1
+            else:
+                todo.append(task)
+        self.total_files = len(todo)
+        self.progress = progress
+
+        # 大文件最耗时，先提交它们的分块，避免最后只剩一个大文件在下载
+        todo.sort(key=lambda task: -(task.size or 0))
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="Download") as executor:
+            futures = []
+            for task in todo:
+                if task.size is not None and task.size >= self.split_size:
+                    state = _FileState(task, self.chunk_size)
+                    indexes = state.prepare()
+                    if not indexes:
+                        futures.append((task, executor.submit(self._finish_chunked, state)))
+                    for index in indexes:
+                        futures.append((task, executor.submit(self._run_chunk, state, index)))
+                else:
+                    futures.append((task, executor.submit(self._run_whole, task)))
+            reported = set()
+            for task, future in futures:
+                error = future.exception()
+                if error is not None and task.path not in reported:
+                    reported.add(task.path)
+                    failures.append((task, str(error)))
+
+        stats = DownloadStats(self.total_files - len(failures), skipped, self.done_bytes,
+                              time.perf_counter() - started)
+        if failures:
+            raise DownloadError(f"{len(failures)} 个文件下载失败", failures)
+        return stats
+
+    def _host_limiter(self, netloc):
+        if not self.host_speed_limit:
+            return None
+        with self.lock:
+            limiter = self.host_limiters.get(netloc)
+            if limiter is None:
+                limiter = self.host_limiters[netloc] = RateLimiter(self.host_speed_limit)
+            return limiter
+
+    def _add_progress(self, nbytes, files=0):
+        self.attempt.bytes = getattr(self.attempt, "bytes", 0) + nbytes
+        with self.lock:
+            self.done_bytes += nbytes
+            self.done_files += files
+            done_bytes, done_files = self.done_bytes, self.done_files
+        if self.progress is not None:
+            self.progress(done_bytes, done_files, self.total_files)
+
+    def _request(self, url, headers, handle):
+        """发送 GET 请求并交给 handle(response) 读取响应体
+
+        网络错误、5xx 与校验失败按次数重试，重试前扣除失败的那次已计入进度的字节；
+        其他 4xx（404、403 等）直接失败。
+        """
+        parts = urlsplit(url)
+        target = parts.path + ("?" + parts.query if parts.query else "")
+        limiter = self._host_limiter(parts.netloc)
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if self.cancelled.is_set():
+                raise DownloadError("下载已取消")
+            conn = self.pool.acquire(parts.scheme, parts.netloc)
+            reusable = False
+            fatal = False
+            self.attempt.bytes = 0
+            try:
+                conn.request("GET", target, headers=headers)
+                response = conn.getresponse()
+                if response.status not in (200, 206):
+                    response.read()
+                    reusable = not response.will_close
+                    fatal = response.status < 500 and response.status not in RETRY_STATUSES
+                    raise DownloadError(f"HTTP {response.status}: {url}")
+                result = handle(response, limiter)
+                # 响应体没有读完（length 仍大于 0）的连接不能再复用
+                reusable = not response.will_close and not response.length
+                return result
+            except (OSError, http.client.HTTPException, DownloadError) as e:
+                last_error = e
+                if self.attempt.bytes:
+                    self._add_progress(-self.attempt.bytes)
+                if fatal or self.cancelled.is_set():
+                    raise
+                time.sleep(min(0.2 * 2 ** attempt, 2))
+            finally:
+                self.pool.release(parts.scheme, parts.netloc, conn, reusable)
+        raise DownloadError(f"{url}: {last_error}")
+
+    def _read_blocks(self, response, limiter, sink):
+        """按块读取响应体，每块先经过限速再交给 sink"""
+        total = 0
+        while True:
+            if self.cancelled.is_set():
+                raise DownloadError("下载已取消")
+            block = response.read(BLOCK_SIZE)
+            if not block:
+                return total
+            if self.global_limiter is not None:
+                self.global_limiter.consume(len(block))
+            if limiter is not None:
+                limiter.consume(len(block))
+            sink(block)
+            total += len(block)
+            self._add_progress(len(block))
+
+    def _run_whole(self, task):
+        """不分块下载整个文件"""
+        part_path = task.path + ".part"
+        os.makedirs(os.path.dirname(task.path) or ".", exist_ok=True)
+
+        def handle(response, limiter):
+            hasher = hashlib.sha1() if task.sha1 else None
+            with open(part_path, "wb") as f:
+                def sink(block):
+                    f.write(block)
+                    if hasher is not None:
+                        hasher.update(block)
+                size = self._read_blocks(response, limiter, sink)
+            _check(task, size, hasher)
+
+        self._request(task.url, {}, handle)
+        os.replace(part_path, task.path)
+        self._add_progress(0, 1)
+
+    def _run_chunk(self, state, index):
+        """下载大文件的一个分块"""
+        if state.whole or state.failed:
+            return
+        start, end = state.chunk_range(index)
+
+        def handle(response, limiter):
+            if response.status == 200:
+                # 服务器忽略了 Range：由第一个收到整个文件的分块（不论序号）下载整个文件，其余分块放弃。
+                # 续传时第 0 块可能已经完成，不能只由它负责
+                if not state.claim_whole(index):
+                    response.close()
+                    return False
+                hasher = hashlib.sha1() if state.task.sha1 else None
+                with open(state.part_path, "r+b") as f:
+                    def sink(block):
+                        f.write(block)
+                        if hasher is not None:
+                            hasher.update(block)
+                    size = self._read_blocks(response, limiter, sink)
+                _check(state.task, size, hasher)
+                return True
+            blocks = []
+            with open(state.part_path, "r+b") as f:
+                f.seek(start)
+                def sink(block):
+                    f.write(block)
+                    blocks.append(block)
+                size = self._read_blocks(response, limiter, sink)
+            if size != end - start + 1:
+                raise DownloadError(f"分块大小不符: {state.task.url} [{start}-{end}]")
+            if state.whole:
+                # 已经改为整个文件下载，由负责的分块完成
+                return False
+            return state.complete_chunk(index, blocks)
+
+        try:
+            finished = self._request(state.task.url, {"Range": f"bytes={start}-{end}"}, handle)
+        except DownloadError:
+            state.failed = True
+            raise
+        if finished:
+            self._finish_chunked(state)
+
+    def _finish_chunked(self, state):
+        """所有分块完成后校验并把 .part 文件移动到目标位置"""
+        if not state.whole:
+            if state.hasher is not None:
+                with state.lock:
+                    state._advance_hash()
+            _check(state.task, os.path.getsize(state.part_path), state.hasher)
+        os.replace(state.part_path, state.task.path)
+        try:
+            os.remove(state.meta_path)
+        except FileNotFoundError:
+            pass
+        self._add_progress(0, 1)
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+def _check(task, size, hasher):
+    """校验下载结果的大小与 SHA-1"""
+    if task.size is not None and size != task.size:
+        raise DownloadError(f"大小不符: {task.url} ({size} != {task.size})")
+    if hasher is not None and hasher.hexdigest() != task.sha1:
+        raise DownloadError(f"SHA-1 不符: {task.url}")
+
+def asset_tasks(index, objects_dir, base_url=RESOURCES_URL):
+    """把资源索引（assets/indexes/<id>.json 的内容）转换为下载任务
+
+    同一个对象可能被多个路径引用，只下载一次。
+
+    Args:
+        index: 资源索引字典，{"objects": {name: {"hash": ..., "size": ...}}}
+        objects_dir: assets/objects 目录
+        base_url: 资源服务器地址
+
+    Returns:
+        DownloadTask 列表
+    """
+    tasks = {}
+    for obj in index["objects"].values():
+        sha1 = obj["hash"]
+        if sha1 not in tasks:
+            tasks[sha1] = DownloadTask(
+                f"{base_url}/{sha1[:2]}/{sha1}",
+                os.path.join(objects_dir, sha1[:2], sha1),
+                obj["size"],
+                sha1
+            )
+    return list(tasks.values())
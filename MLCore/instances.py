@@ -0,0 +1,366 @@
+"""游戏实例
+
+每个实例是实例根目录（默认为数据目录下的 instances）中的一个子目录，同时也是该实例的游戏目录：
+- instance.json：名称、游戏版本、加载器、游戏时长等配置
+- mods/、screenshots/、logs/ 等由游戏本身使用
+
+InstanceManager 在内存中保存全部实例，并为每个实例记录配置文件与 mods、screenshots 目录的状态。
+文件系统发生变化时（由界面层的文件监视器通知），apply() 只重新读取受影响实例中状态变化的部分，
+并把这批变化汇总为增量差异（新增、删除、修改），不需要重新扫描所有实例。
+"""
+import json
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from . import paths
+
+CONFIG_NAME = "instance.json"
+MODS_DIR = "mods"
+SCREENSHOTS_DIR = "screenshots"
+# 实例根目录中记录当前选中实例的文件
+SELECTED_NAME = ".selected"
+
+# mtime 距今不足该时长（纳秒）的状态不作为“未变化”的依据：同一时间精度内的再次修改无法从 mtime 上看出来
+RACY_WINDOW_NS = 2 * 10 ** 9
+
+LOADERS = ("vanilla", "fabric", "forge", "neoforge", "quilt")
+SCREENSHOT_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+# 加载器 -> 它在模组依赖声明中的 ID
+LOADER_MOD_IDS = {
+    "fabric": "fabricloader",
+    "forge": "forge",
+    "neoforge": "neoforge",
+    "quilt": "quilt_loader",
+}
+
+# 一个实例
+# playtime 为累计游戏时长（秒），last_played 为上次游戏结束的时间戳（从未游戏时为 0）
+# mods 为已启用的模组数，screenshots 为截图文件名（新的在前）
+# config 为 instance.json 的全部内容（其他模块的设置也保存在其中）；读取失败时 error 为错误信息
+Instance = namedtuple(
+    "Instance",
+    "id path name version loader loader_version playtime last_played mods screenshots config error"
+)
+
+# 一批变化：added、changed 为 Instance 列表，removed 为实例 ID 列表
+InstanceDiff = namedtuple("InstanceDiff", "added removed changed")
+
+def _stat_key(path):
+    """(mtime_ns, 大小)，不存在时为 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _trusted(stamps):
+    """刚修改过的状态记为 None，下次 apply() 时总是重新读取"""
+    now_ns = time.time_ns()
+    return tuple(None if stamp is None or now_ns - stamp[0] < RACY_WINDOW_NS else stamp for stamp in stamps)
+
+def _read_config(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        if not isinstance(config, dict):
+            raise ValueError("instance.json 不是对象")
+        return config, None
+    except FileNotFoundError:
+        return {}, None
+    except (OSError, ValueError) as e:
+        return {}, f"{type(e).__name__}: {e}"
+
+def _config_times(config):
+    """instance.json 中的游戏时长与上次游玩时间
+
+    手动编辑过的文件中可能不是数字（如 "playtime": "1h"），这时按 0 处理并返回错误信息，
+    不影响其他实例的读取。
+
+    Returns:
+        (playtime, last_played, 错误信息或 None)
+    """
+    values = []
+    problems = []
+    for key in ("playtime", "last_played"):
+        value = config.get(key) or 0
+        try:
+            number = float(value)
+            if number != number or number in (float("inf"), float("-inf")) or isinstance(value, bool):
+                raise ValueError
+        except (TypeError, ValueError):
+            problems.append(f"{key} 不是数字: {value!r}")
+            number = 0.0
+        values.append(number)
+    return values[0], values[1], "; ".join(problems) or None
+
+def _count_mods(path):
+    try:
+        with os.scandir(path) as entries:
+            return sum(1 for entry in entries if entry.name.endswith(".jar"))
+    except OSError:
+        return 0
+
+def _list_screenshots(path):
+    try:
+        with os.scandir(path) as entries:
+            names = [entry.name for entry in entries if entry.name.lower().endswith(SCREENSHOT_SUFFIXES)]
+    except OSError:
+        return ()
+    # 游戏按时间命名截图，按名称倒序即新的在前
+    names.sort(reverse=True)
+    return tuple(names)
+
+def _write_config(path, config):
+    """原子地写入 instance.json"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, path)
+
+def slugify(name):
+    """由实例名称生成目录名"""
+    slug = re.sub(r'[\\/:*?"<>|\s]+', "-", name.strip()).strip("-.")
+    return slug or "instance"
+
+def mod_environment(instance):
+    """实例的游戏与加载器版本，作为模组依赖检查的环境（见 MLCore.resolver.ModResolver）"""
+    environment = {}
+    if instance.version:
+        environment["minecraft"] = instance.version
+    loader_id = LOADER_MOD_IDS.get(instance.loader)
+    if loader_id and instance.loader_version:
+        environment[loader_id] = instance.loader_version
+    return environment
+
+class InstanceManager:
+    """实例管理器"""
+
+    def __init__(self, root=None):
+        """初始化实例管理器（不扫描，首次使用前调用 scan()）
+
+        Args:
+            root: 实例根目录，默认为数据目录下的 instances
+        """
+        self.root = os.path.abspath(root or paths.data_dir("instances"))
+        os.makedirs(self.root, exist_ok=True)
+        self.lock = threading.Lock()
+        # 实例 ID -> Instance
+        self.instances = {}
+        # 实例 ID -> (配置状态, mods 目录状态, screenshots 目录状态)
+        self.stamps = {}
+        # 统计实际重新读取实例的次数
+        self.reloads = 0
+
+    def instance_path(self, instance_id, *parts):
+        return os.path.join(self.root, instance_id, *parts)
+
+    def watch_paths(self, instance_id):
+        """需要监视的路径：实例目录、配置文件、mods 与 screenshots 目录"""
+        return [
+            self.instance_path(instance_id),
+            self.instance_path(instance_id, CONFIG_NAME),
+            self.instance_path(instance_id, MODS_DIR),
+            self.instance_path(instance_id, SCREENSHOTS_DIR),
+        ]
+
+    def _list_ids(self):
+        try:
+            with os.scandir(self.root) as entries:
+                return {
+                    entry.name for entry in entries
+                    if not entry.name.startswith(".") and entry.is_dir()
+                    and os.path.isfile(os.path.join(entry.path, CONFIG_NAME))
+                }
+        except OSError:
+            return set()
+
+    def _load(self, instance_id, previous=None):
+        """读取一个实例，只重新读取状态变化的部分
+
+        Returns:
+            (Instance, 状态)，实例已不存在时为 (None, None)
+        """
+        config_path = self.instance_path(instance_id, CONFIG_NAME)
+        stamps = (
+            _stat_key(config_path),
+            _stat_key(self.instance_path(instance_id, MODS_DIR)),
+            _stat_key(self.instance_path(instance_id, SCREENSHOTS_DIR)),
+        )
+        if stamps[0] is None:
+            return None, None
+        old_instance, old_stamps = previous or (None, (None, None, None))
+        if old_instance is not None and stamps == old_stamps:
+            return old_instance, old_stamps
+        self.reloads += 1
+        if old_instance is not None and stamps[0] == old_stamps[0]:
+            config, error = old_instance.config, old_instance.error
+            playtime, last_played = old_instance.playtime, old_instance.last_played
+        else:
+            config, error = _read_config(config_path)
+            playtime, last_played, field_error = _config_times(config)
+            error = error or field_error
+        if old_instance is not None and stamps[1] == old_stamps[1]:
+            mods = old_instance.mods
+        else:
+            mods = _count_mods(self.instance_path(instance_id, MODS_DIR))
+        if old_instance is not None and stamps[2] == old_stamps[2]:
+            screenshots = old_instance.screenshots
+        else:
+            screenshots = _list_screenshots(self.instance_path(instance_id, SCREENSHOTS_DIR))
+        instance = Instance(
+            instance_id, self.instance_path(instance_id),
+            str(config.get("name") or instance_id), str(config.get("version", "")),
+            str(config.get("loader") or "vanilla"), str(config.get("loader_version", "")),
+            playtime, last_played,
+            mods, screenshots, config, error
+        )
+        return instance, _trusted(stamps)
+
+    def scan(self):
+        """完整扫描实例根目录
+
+        Returns:
+            {实例 ID: Instance}
+        """
+        instances = {}
+        stamps = {}
+        for instance_id in self._list_ids():
+            instance, stamp = self._load(instance_id)
+            if instance is not None:
+                instances[instance_id] = instance
+                stamps[instance_id] = stamp
+        with self.lock:
+            self.instances = instances
+            self.stamps = stamps
+        return dict(instances)
+
+    def apply(self, instance_ids, root_changed=False):
+        """按文件监视器报告的变化更新内存中的实例
+
+        Args:
+            instance_ids: 目录或文件发生变化的实例 ID
+            root_changed: 实例根目录本身发生变化（可能有实例被新增、删除或改名）
+
+        Returns:
+            InstanceDiff
+        """
+        with self.lock:
+            candidates = set(instance_ids)
+            if root_changed:
+                present = self._list_ids()
+                candidates |= present ^ set(self.instances)
+            added, removed, changed = [], [], []
+            for instance_id in sorted(candidates):
+                previous = self.instances.get(instance_id)
+                instance, stamp = self._load(
+                    instance_id, (previous, self.stamps.get(instance_id)) if previous else None
+                )
+                if instance is None:
+                    if previous is not None:
+                        del self.instances[instance_id]
+                        del self.stamps[instance_id]
+                        removed.append(instance_id)
+                    continue
+                self.instances[instance_id] = instance
+                self.stamps[instance_id] = stamp
+                if previous is None:
+                    added.append(instance)
+                elif instance != previous:
+                    changed.append(instance)
+            return InstanceDiff(added, removed, changed)
+
+    def get(self, instance_id):
+        return self.instances.get(instance_id)
+
+    def read(self, instance_id):
+        """直接从磁盘读取一个实例（不使用也不修改内存中的状态），不存在时为 None"""
+        instance, _ = self._load(instance_id)
+        return instance
+
+    def create(self, name, version, loader="vanilla", loader_version=""):
+        """新建实例
+
+        Args:
+            name: 实例名称
+            version: 游戏版本
+            loader: 加载器，见 LOADERS
+            loader_version: 加载器版本
+
+        Returns:
+            新实例的 ID
+        """
+        base = slugify(name)
+        instance_id = base
+        number = 1
+        while os.path.exists(self.instance_path(instance_id)):
+            number += 1
+            instance_id = f"{base}-{number}"
+        os.makedirs(self.instance_path(instance_id, MODS_DIR))
+        _write_config(self.instance_path(instance_id, CONFIG_NAME), {
+            "name": name,
+            "version": version,
+            "loader": loader,
+            "loader_version": loader_version,
+            "playtime": 0,
+            "last_played": 0,
+            "created": time.time(),
+        })
+        return instance_id
+
+    def update_config(self, instance_id, **changes):
+        """修改实例配置（读取当前文件内容后合并写回）
+
+        Returns:
+            合并后的配置
+        """
+        path = self.instance_path(instance_id, CONFIG_NAME)
+        config, error = _read_config(path)
+        if error:
+            raise ValueError(error)
+        config.update(changes)
+        _write_config(path, config)
+        return config
+
+    def add_playtime(self, instance_id, seconds, finished_at=None):
+        """累加一次游戏的时长；已有的时长不是数字时从 0 开始累加
+
+        Args:
+            instance_id: 实例 ID
+            seconds: 本次游戏时长（秒）
+            finished_at: 结束时间戳，默认为现在
+        """
+        config, _ = _read_config(self.instance_path(instance_id, CONFIG_NAME))
+        playtime, _, _ = _config_times(config)
+        self.update_config(
+            instance_id,
+            playtime=playtime + max(0.0, seconds),
+            last_played=finished_at or time.time(),
+        )
+
+    def selected(self):
+        """当前选中的实例 ID，没有选中或实例已不存在时为 None"""
+        try:
+            with open(os.path.join(self.root, SELECTED_NAME), "r", encoding="utf-8") as f:
+                instance_id = f.read().strip()
+        except OSError:
+            return None
+        return instance_id if os.path.isfile(self.instance_path(instance_id, CONFIG_NAME)) else None
+
+    def select(self, instance_id):
+        """记录当前选中的实例"""
+        tmp_path = os.path.join(self.root, SELECTED_NAME + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(instance_id)
+        os.replace(tmp_path, os.path.join(self.root, SELECTED_NAME))
+
+_default = None
+
+def default_manager():
+    """应用共用的实例管理器（实例根目录为数据目录下的 instances）"""
+    global _default
+    if _default is None:
+        _default = InstanceManager()
+    return _default
@@ -0,0 +1,292 @@
+"""Java 运行时发现
+
+在 Linux 上常见的位置查找 Java：JAVA_HOME、PATH、/usr/lib/jvm 等系统目录与 SDKMAN 安装的 JDK。
+版本、厂商与架构优先从 JAVA_HOME/release 文件读取，不需要启动进程；没有 release 文件时才运行
+``java -XshowSettings:properties -version`` 探测，多个候选并行探测。
+结果按 java 可执行文件的真实路径缓存在磁盘上，文件状态（mtime、大小）不变时直接沿用，
+热启动时列出全部 Java 只需要几次 stat。
+"""
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from . import paths
+from .ranges import compare_versions, version_key
+
+# 系统包与手动安装 JDK 的常见目录，其中每个子目录是一个 JAVA_HOME
+JVM_DIRS = ("/usr/lib/jvm", "/usr/lib64/jvm", "/usr/java", "/opt/java", "/opt/jdk")
+# SDKMAN 中 JDK 所在的子目录
+SDKMAN_JAVA_DIR = os.path.join("candidates", "java")
+
+# 缓存格式版本，修改缓存内容后递增，旧缓存自动失效
+CACHE_VERSION = 1
+# 启动 java 探测的超时（秒）与并行数
+PROBE_TIMEOUT = 15
+PROBE_WORKERS = 4
+# mtime 距今不足该时长（纳秒）的文件状态不写入缓存：同一时间精度内的再次修改无法从 mtime 上看出来
+RACY_WINDOW_NS = 2 * 10 ** 9
+
+# 一个 Java 运行时
+# path 为 java 可执行文件的真实路径，home 为 JAVA_HOME，major 为主版本号（1.8 记为 8）
+# sources 为找到它的位置（JAVA_HOME、PATH、system、SDKMAN）；无法识别时 error 为错误信息
+JavaRuntime = namedtuple("JavaRuntime", "path home version major vendor arch sources error")
+
+_PROPERTY = re.compile(r"^\s*([\w.]+) = (.*)$", re.M)
+_VERSION_LINE = re.compile(r'version "([^"]+)"')
+
+def _stat_key(path):
+    """(mtime_ns, 大小)，不存在时为 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def major_version(version):
+    """主版本号：1.8.0_392 -> 8，17.0.9 -> 17，无法识别时为 0"""
+    match = re.match(r"(\d+)(?:\.(\d+))?", version or "")
+    if not match:
+        return 0
+    major = int(match.group(1))
+    if major == 1 and match.group(2):
+        return int(match.group(2))
+    return major
+
+def read_release(home):
+    """读取 JAVA_HOME/release
+
+    Returns:
+        {键: 值}，文件不存在时为 None
+    """
+    try:
+        with open(os.path.join(home, "release"), "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    except OSError:
+        return None
+    values = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            values[key.strip()] = value.strip().strip('"')
+    return values
+
+def probe(java_path, timeout=PROBE_TIMEOUT):
+    """运行 java 读取系统属性
+
+    Returns:
+        (版本, 厂商, 架构, 错误信息)
+    """
+    try:
+        result = subprocess.run(
+            [java_path, "-XshowSettings:properties", "-version"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        return "", "", "", f"{type(e).__name__}: {e}"
+    text = result.stderr.decode("utf-8", "replace") + result.stdout.decode("utf-8", "replace")
+    properties = dict(_PROPERTY.findall(text))
+    version = properties.get("java.version")
+    if not version:
+        # 不支持 -XshowSettings 的旧版本只能从版本行中读取
+        match = _VERSION_LINE.search(text)
+        version = match.group(1) if match else ""
+    if not version:
+        return "", "", "", text.strip().splitlines()[0] if text.strip() else f"exit {result.returncode}"
+    return version, properties.get("java.vendor", ""), properties.get("os.arch", ""), None
+
+def _home_of(java_path):
+    """由 java 的真实路径推出 JAVA_HOME（Java 8 的 JDK 中 java 位于 jre/bin 下）"""
+    home = os.path.dirname(os.path.dirname(java_path))
+    if os.path.basename(home) == "jre" and os.path.isfile(os.path.join(os.path.dirname(home), "release")):
+        home = os.path.dirname(home)
+    return home
+
+def sort_key(runtime):
+    """排序键（配合 reverse=True）：新版本在前"""
+    return (runtime.major, version_key(runtime.version))
+
+def required_major(minecraft_version):
+    """游戏版本需要的 Java 主版本（版本 JSON 中没有 javaVersion 或还没有下载时的估计）"""
+    if not re.match(r"1\.\d+", minecraft_version or ""):
+        # 快照等非正式版本号按最新的要求
+        return 21
+    for version, major in (("1.20.5", 21), ("1.18", 17), ("1.17", 16)):
+        if compare_versions(minecraft_version, version) >= 0:
+            return major
+    return 8
+
+def select_runtime(runtimes, major):
+    """为游戏版本选择 Java：优先主版本一致，其次是高于要求的最低主版本
+
+    Args:
+        runtimes: discover() 的结果（新版本在前）
+        major: 游戏版本要求的主版本（版本 JSON 的 javaVersion.majorVersion，没有时按 8）
+
+    Returns:
+        JavaRuntime，没有可用的时为 None
+    """
+    usable = [runtime for runtime in runtimes if runtime.error is None and runtime.major >= major]
+    if not usable:
+        return None
+    best = min(runtime.major for runtime in usable)
+    return next(runtime for runtime in usable if runtime.major == best)
+
+class JavaFinder:
+    """Java 运行时发现与缓存"""
+
+    def __init__(self, cache_path=None, env=None, jvm_dirs=JVM_DIRS, workers=PROBE_WORKERS):
+        """初始化
+
+        Args:
+            cache_path: 缓存文件，默认为缓存目录下的 java.json
+            env: 读取 JAVA_HOME、PATH、SDKMAN_DIR 的环境变量，默认为 os.environ
+            jvm_dirs: 系统 JDK 目录
+            workers: 并行探测数
+        """
+        self.cache_path = cache_path or os.path.join(paths.cache_dir(), "java.json")
+        self.env = os.environ if env is None else env
+        self.jvm_dirs = tuple(jvm_dirs)
+        self.workers = workers
+        self.lock = threading.Lock()
+        # 统计：读取 release 文件与启动 java 探测的次数
+        self.release_reads = 0
+        self.probes = 0
+
+    def candidates(self):
+        """列出候选的 java 可执行文件，按真实路径去重
+
+        Returns:
+            {真实路径: [来源, ...]}，按发现顺序
+        """
+        found = {}
+
+        def add(java_path, source):
+            real = os.path.realpath(java_path)
+            if not os.path.isfile(real) or not os.access(real, os.X_OK):
+                return
+            sources = found.setdefault(real, [])
+            if source not in sources:
+                sources.append(source)
+
+        def add_homes(directory, source):
+            try:
+                with os.scandir(directory) as entries:
+                    names = sorted(entry.name for entry in entries if entry.is_dir() and entry.name != "current")
+            except OSError:
+                return
+            for name in names:
+                add(os.path.join(directory, name, "bin", "java"), source)
+
+        java_home = self.env.get("JAVA_HOME")
+        if java_home:
+            add(os.path.join(java_home, "bin", "java"), "JAVA_HOME")
+        for directory in self.env.get("PATH", "").split(os.pathsep):
+            if directory:
+                add(os.path.join(directory, "java"), "PATH")
+        for directory in self.jvm_dirs:
+            add_homes(directory, "system")
+        sdkman = self.env.get("SDKMAN_DIR") or os.path.join(self.env.get("HOME") or os.path.expanduser("~"), ".sdkman")
+        add_homes(os.path.join(sdkman, SDKMAN_JAVA_DIR), "SDKMAN")
+        return found
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("runtimes") or {}
+
+    def _save_cache(self, entries):
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "runtimes": entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    def cached(self):
+        """上次 discover() 的结果，只读取缓存文件，不检查文件状态（用于立即显示列表）"""
+        runtimes = [self._runtime(path, entry) for path, entry in self._load_cache().items()]
+        return sorted(runtimes, key=sort_key, reverse=True)
+
+    @staticmethod
+    def _runtime(path, entry):
+        return JavaRuntime(
+            path, entry["home"], entry["version"], major_version(entry["version"]),
+            entry["vendor"], entry["arch"], tuple(entry.get("sources") or ()), entry["error"]
+        )
+
+    def discover(self):
+        """查找全部 Java：文件状态不变的直接使用缓存，有 release 文件的读取它，其余并行探测
+
+        Returns:
+            JavaRuntime 列表，新版本在前
+        """
+        with self.lock:
+            found = self.candidates()
+            old_entries = self._load_cache()
+            entries = {}
+            to_probe = []
+            now_ns = time.time_ns()
+            for path, sources in found.items():
+                home = _home_of(path)
+                stamp = _stat_key(path)
+                if stamp is None:
+                    continue
+                release_stamp = _stat_key(os.path.join(home, "release"))
+                trusted = all(s is None or now_ns - s[0] >= RACY_WINDOW_NS for s in (stamp, release_stamp))
+                entry = old_entries.get(path)
+                if (entry is not None and entry.get("stamp") == list(stamp)
+                        and entry.get("release_stamp") == (list(release_stamp) if release_stamp else None)):
+                    entries[path] = dict(entry, sources=sources)
+                    continue
+                entry = {
+                    "stamp": list(stamp) if trusted else None,
+                    "release_stamp": list(release_stamp) if trusted and release_stamp else None,
+                    "home": home, "version": "", "vendor": "", "arch": "", "error": None, "sources": sources,
+                }
+                release = None
+                if release_stamp is not None:
+                    self.release_reads += 1
+                    release = read_release(home)
+                if release and release.get("JAVA_VERSION"):
+                    entry.update(
+                        version=release["JAVA_VERSION"],
+                        vendor=release.get("IMPLEMENTOR", ""),
+                        arch=release.get("OS_ARCH", ""),
+                    )
+                else:
+                    to_probe.append(path)
+                entries[path] = entry
+
+            if to_probe:
+                self.probes += len(to_probe)
+                if len(to_probe) == 1:
+                    results = [probe(to_probe[0])]
+                else:
+                    with ThreadPoolExecutor(min(self.workers, len(to_probe))) as executor:
+                        results = list(executor.map(probe, to_probe))
+                for path, (version, vendor, arch, error) in zip(to_probe, results):
+                    entries[path].update(version=version, vendor=vendor, arch=arch, error=error)
+
+            if entries != old_entries:
+                try:
+                    self._save_cache(entries)
+                except OSError:
+                    pass
+            runtimes = [self._runtime(path, entry) for path, entry in entries.items()]
+            return sorted(runtimes, key=sort_key, reverse=True)
+
+_default = None
+
+def default_finder():
+    """应用共用的 Java 查找器"""
+    global _default
+    if _default is None:
+        _default = JavaFinder()
+    return _default
@@ -0,0 +1,266 @@
+"""JVM 参数方案
+
+按命名方案（G1 调优、ZGC 低延迟、低内存）生成游戏的 JVM 参数：
+- 堆大小由 /proc/meminfo 中的系统内存、实例的模组数与正在运行的游戏数共同决定，
+  -Xms 不超过当前可用内存，避免启动时就把系统压进交换区
+- 每个实例有自己的 CDS（类数据共享）归档，第一次启动时由 JVM 生成，之后的启动直接映射，
+  归档按 java 与类路径区分，任何一个变化都会换用新的归档
+
+方案的选择与内存上限保存在实例的 instance.json 中（"jvm" 键）。
+"""
+import hashlib
+import os
+from collections import namedtuple
+from . import paths
+
+# 一个方案：flags 为附加的 JVM 参数；min_java 为需要的最低 Java 主版本，低于它时改用 fallback；
+# heap_factor 按方案调整需要的堆（ZGC 需要更多余量）；heap_cap_mb 为堆的上限；xms_ratio 为 -Xms 占 -Xmx 的比例
+Profile = namedtuple("Profile", "name flags min_java fallback heap_factor heap_cap_mb xms_ratio")
+
+G1_FLAGS = (
+    "-XX:+UseG1GC", "-XX:+ParallelRefProcEnabled", "-XX:MaxGCPauseMillis=200",
+    "-XX:+UnlockExperimentalVMOptions", "-XX:+DisableExplicitGC", "-XX:+AlwaysPreTouch",
+    "-XX:G1NewSizePercent=30", "-XX:G1MaxNewSizePercent=40", "-XX:G1HeapRegionSize=8M",
+    "-XX:G1ReservePercent=20", "-XX:G1HeapWastePercent=5", "-XX:G1MixedGCCountTarget=4",
+    "-XX:InitiatingHeapOccupancyPercent=15", "-XX:G1MixedGCLiveThresholdPercent=90",
+    "-XX:SurvivorRatio=32", "-XX:+PerfDisableSharedMem", "-XX:MaxTenuringThreshold=1",
+)
+ZGC_FLAGS = ("-XX:+UseZGC", "-XX:+DisableExplicitGC", "-XX:+PerfDisableSharedMem")
+LOW_RAM_FLAGS = (
+    "-XX:+UseG1GC", "-XX:MaxGCPauseMillis=100", "-XX:G1HeapRegionSize=4M",
+    "-XX:MinHeapFreeRatio=10", "-XX:MaxHeapFreeRatio=30", "-XX:+UseStringDeduplication",
+)
+
+PROFILES = {
+    "g1": Profile("g1", G1_FLAGS, 8, None, 1.0, 12288, 1.0),
+    "zgc": Profile("zgc", ZGC_FLAGS, 15, "g1", 1.25, 16384, 0.5),
+    "low_ram": Profile("low_ram", LOW_RAM_FLAGS, 8, None, 0.75, 4096, 0.25),
+}
+DEFAULT_PROFILE = "g1"
+
+# 原版需要的堆，以及每个模组额外需要的堆（MB）
+BASE_HEAP_MB = 2048
+MOD_HEAP_MB = 32
+# 堆的下限与取整单位（MB）
+MIN_HEAP_MB = 1024
+HEAP_STEP_MB = 256
+# 留给系统与其他程序的内存：总内存的 20%，至少 1.5 GB
+RESERVE_RATIO = 0.2
+MIN_RESERVE_MB = 1536
+# 堆以外的开销（元空间、代码缓存、线程栈、直接内存）约为堆的 35%
+NATIVE_OVERHEAD = 1.35
+
+# 游戏进程的主类（原版、Fabric、Quilt、Forge/NeoForge、旧版 LaunchWrapper）
+GAME_MAIN_CLASSES = (
+    b"net.minecraft.client.main.Main", b"net.fabricmc.loader.impl.launch.knot.KnotClient",
+    b"org.quiltmc.loader.impl.launch.knot.KnotClient", b"cpw.mods.bootstraplauncher.BootstrapLauncher",
+    b"cpw.mods.modlauncher.Launcher", b"net.minecraft.launchwrapper.Launch",
+)
+
+# 系统内存（MB）
+MemInfo = namedtuple("MemInfo", "total_mb available_mb")
+# 实例的 JVM 设置；max_memory_mb 为 0 时自动计算
+JvmSettings = namedtuple("JvmSettings", "profile cds max_memory_mb")
+# 生成结果：profile 为实际使用的方案，cds_archive 没有使用 CDS 时为 None，
+# notes 为需要告知用户的情况（见 NOTES）
+JvmPlan = namedtuple("JvmPlan", "profile arguments xmx_mb xms_mb need_mb budget_mb cds_archive notes")
+
+# notes 中可能出现的代码
+NOTES = (
+    "profile_fallback",   # Java 版本不支持所选方案，已改用 fallback
+    "memory_limited",     # 系统内存不足以分配需要的堆
+    "xms_limited",        # 可用内存不足，-Xms 已调低
+    "cds_unsupported",    # Java 12 及以下不支持动态 CDS 归档
+    "cds_creating",       # 本次启动结束时生成 CDS 归档
+)
+
+DEFAULT_SETTINGS = JvmSettings(DEFAULT_PROFILE, True, 0)
+
+def read_meminfo(path="/proc/meminfo"):
+    """读取系统内存
+
+    Returns:
+        MemInfo；没有 /proc/meminfo 时用 sysconf 取总内存，可用内存按一半估计
+    """
+    values = {}
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                key, _, rest = line.partition(b":")
+                fields = rest.split()
+                if fields:
+                    values[key.decode()] = int(fields[0])
+    except (OSError, ValueError):
+        pass
+    if "MemTotal" in values:
+        total_kb = values["MemTotal"]
+        available_kb = values.get("MemAvailable", values.get("MemFree", 0) + values.get("Cached", 0))
+        return MemInfo(total_kb // 1024, available_kb // 1024)
+    try:
+        total_mb = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        total_mb = 4096
+    return MemInfo(total_mb, total_mb // 2)
+
+def running_games(proc="/proc"):
+    """正在运行的游戏进程数（按命令行中的主类识别，包括其他启动器启动的游戏）"""
+    count = 0
+    try:
+        pids = [name for name in os.listdir(proc) if name.isdigit()]
+    except OSError:
+        return 0
+    for pid in pids:
+        try:
+            with open(os.path.join(proc, pid, "cmdline"), "rb") as f:
+                cmdline = f.read()
+        except OSError:
+            continue
+        if b"java" in cmdline and any(main_class in cmdline for main_class in GAME_MAIN_CLASSES):
+            count += 1
+    return count
+
+def _round_down(mb):
+    return int(mb) // HEAP_STEP_MB * HEAP_STEP_MB
+
+def heap_size(profile, mods, running, memory, max_memory_mb=0):
+    """计算 -Xmx/-Xms
+
+    Args:
+        profile: Profile
+        mods: 实例启用的模组数
+        running: 已经在运行的游戏数，系统内存由它们与本次启动的游戏平分
+        memory: MemInfo
+        max_memory_mb: 用户指定的 -Xmx，0 为自动
+
+    Returns:
+        (xmx_mb, xms_mb, 需要的堆, 可分配的堆, notes)
+    """
+    notes = []
+    need = (BASE_HEAP_MB + MOD_HEAP_MB * mods) * profile.heap_factor
+    reserve = max(MIN_RESERVE_MB, memory.total_mb * RESERVE_RATIO)
+    budget = max(0, memory.total_mb - reserve) / (running + 1) / NATIVE_OVERHEAD
+    if max_memory_mb:
+        xmx = max(HEAP_STEP_MB, _round_down(max_memory_mb))
+    else:
+        if budget < min(need, profile.heap_cap_mb):
+            notes.append("memory_limited")
+        xmx = max(MIN_HEAP_MB, _round_down(min(need, budget, profile.heap_cap_mb)))
+    xms = _round_down(xmx * profile.xms_ratio)
+    # -Xms 在启动时就会占用（G1 方案还会预先触碰），不能超过现在可用的内存
+    available = _round_down(memory.available_mb / NATIVE_OVERHEAD)
+    if xms > available:
+        xms = max(HEAP_STEP_MB, available)
+        notes.append("xms_limited")
+    return xmx, max(HEAP_STEP_MB, min(xms, xmx)), int(need), int(budget), notes
+
+def archive_key(java_path, java_version, classpath=()):
+    """CDS 归档的键：同一个 java 与同一份类路径才能复用归档"""
+    digest = hashlib.sha1()
+    for part in (java_path, java_version, *classpath):
+        digest.update(part.encode("utf-8", "surrogateescape"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+def archive_path(instance_id, key):
+    """实例的 CDS 归档路径（在缓存目录中，删除后下次启动重新生成）"""
+    return os.path.join(paths.cache_dir("cds", instance_id), key + ".jsa")
+
+def prune_archives(instance_id, keep):
+    """删除实例中不再使用的旧归档（启动游戏前调用，keep 为本次使用的归档）"""
+    directory = paths.cache_dir("cds", instance_id)
+    for name in os.listdir(directory):
+        if name.endswith(".jsa") and name != os.path.basename(keep):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+def cds_arguments(java_major, archive):
+    """动态 CDS 归档参数
+
+    Java 19 起由 -XX:+AutoCreateSharedArchive 自动生成与校验；
+    Java 13-18 第一次用 -XX:ArchiveClassesAtExit 在退出时生成，之后用 -XX:SharedArchiveFile 映射。
+
+    Returns:
+        (参数列表, note)
+    """
+    if java_major >= 19:
+        return ["-XX:+AutoCreateSharedArchive", "-XX:SharedArchiveFile=" + archive], None
+    if java_major >= 13:
+        if os.path.isfile(archive):
+            return ["-XX:SharedArchiveFile=" + archive], None
+        return ["-XX:ArchiveClassesAtExit=" + archive], "cds_creating"
+    return [], "cds_unsupported"
+
+def resolve_profile(name, java_major):
+    """按 Java 版本确定实际使用的方案"""
+    profile = PROFILES.get(name) or PROFILES[DEFAULT_PROFILE]
+    while java_major < profile.min_java and profile.fallback:
+        profile = PROFILES[profile.fallback]
+    return profile
+
+def plan_jvm(settings, java_major, mods=0, running=0, instance_id=None, key="", memory=None):
+    """生成 JVM 参数
+
+    Args:
+        settings: JvmSettings
+        java_major: 使用的 Java 主版本
+        mods: 实例启用的模组数
+        running: 已经在运行的游戏数（见 running_games()）
+        instance_id: 实例 ID，用于 CDS 归档；为 None 时不使用 CDS
+        key: CDS 归档的键（见 archive_key()）
+        memory: MemInfo，默认读取 /proc/meminfo
+
+    Returns:
+        JvmPlan
+    """
+    memory = memory or read_meminfo()
+    profile = resolve_profile(settings.profile, java_major)
+    notes = [] if profile.name == settings.profile else ["profile_fallback"]
+    xmx, xms, need, budget, heap_notes = heap_size(profile, mods, running, memory, settings.max_memory_mb)
+    notes += heap_notes
+    arguments = ["-Xmx%dm" % xmx, "-Xms%dm" % xms]
+    arguments += profile.flags
+    if profile.name == "zgc" and 21 <= java_major < 23:
+        # Java 21、22 的分代 ZGC 需要手动开启，23 起是默认行为
+        arguments.append("-XX:+ZGenerational")
+    archive = None
+    if settings.cds and instance_id:
+        archive = archive_path(instance_id, key or "default")
+        cds, note = cds_arguments(java_major, archive)
+        arguments += cds
+        if note:
+            notes.append(note)
+        if not cds:
+            archive = None
+    return JvmPlan(profile.name, arguments, xmx, xms, need, budget, archive, tuple(notes))
+
+def load_settings(config):
+    """从实例配置（instance.json 的内容）中读取 JVM 设置"""
+    data = config.get("jvm")
+    if not isinstance(data, dict):
+        return DEFAULT_SETTINGS
+    profile = data.get("profile")
+    try:
+        max_memory_mb = max(0, int(data.get("max_memory", 0) or 0))
+    except (TypeError, ValueError):
+        max_memory_mb = 0
+    return JvmSettings(
+        profile if profile in PROFILES else DEFAULT_PROFILE,
+        bool(data.get("cds", DEFAULT_SETTINGS.cds)),
+        max_memory_mb,
+    )
+
+def save_settings(manager, instance_id, settings):
+    """把 JVM 设置写回实例的 instance.json
+
+    Args:
+        manager: MLCore.instances.InstanceManager
+        instance_id: 实例 ID
+        settings: JvmSettings
+    """
+    manager.update_config(instance_id, jvm={
+        "profile": settings.profile,
+        "cds": settings.cds,
+        "max_memory": settings.max_memory_mb,
+    })
@@ -0,0 +1,328 @@
+"""启动计划
+
+把（合并了继承链的）版本 JSON 与实例设置编译成一份启动计划：
+按规则（OS、架构、特性）筛选库与参数，按 group:artifact 去重，替换 ``${...}`` 占位符，拼出类路径。
+计划按输入的哈希缓存在磁盘上（版本 JSON 链的文件状态、设置、平台），任何输入变化都会重新编译；
+每次启动只需要把会话相关的字段（用户名、令牌等）填进去。
+"""
+import hashlib
+import json
+import os
+import platform
+import re
+import sys
+from collections import namedtuple
+from . import paths
+
+# 计划格式版本，修改编译逻辑后递增，旧计划自动失效
+PLAN_VERSION = 1
+
+LAUNCHER_NAME = "Minelancher"
+LAUNCHER_VERSION = "0.1"
+
+# 启动时才知道的会话字段，编译时保留占位符
+SESSION_KEYS = frozenset((
+    "auth_player_name", "auth_uuid", "auth_access_token", "auth_xuid",
+    "auth_session", "clientid", "user_type"
+))
+
+PLACEHOLDER = re.compile(r"\$\{(\w+)\}")
+
+# 1.13 之前的版本没有 arguments.jvm，使用启动器默认的 JVM 参数
+LEGACY_JVM_ARGUMENTS = ("-Djava.library.path=${natives_directory}", "-cp", "${classpath}")
+
+# 规则匹配用的平台信息
+Platform = namedtuple("Platform", "os_name arch os_version")
+
+def current_platform():
+    """当前系统对应的规则平台名（linux/windows/osx，x86/x86_64/arm64）"""
+    if sys.platform.startswith("win"):
+        os_name = "windows"
+    elif sys.platform == "darwin":
+        os_name = "osx"
+    else:
+        os_name = "linux"
+    machine = platform.machine().lower()
+    if machine in ("amd64", "x86_64"):
+        arch = "x86_64"
+    elif machine in ("aarch64", "arm64"):
+        arch = "arm64"
+    elif machine in ("i386", "i686", "x86"):
+        arch = "x86"
+    else:
+        arch = machine
+    return Platform(os_name, arch, platform.release())
+
+def rules_allow(rules, plat, features):
+    """按官方启动器的语义判断规则是否允许
+
+    没有规则时允许；否则从“不允许”开始，依次应用每条匹配的规则。
+
+    Args:
+        rules: Rule 元组
+        plat: Platform
+        features: {特性名: bool}
+    """
+    if not rules:
+        return True
+    allowed = False
+    for rule in rules:
+        if rule.os_name and rule.os_name != plat.os_name:
+            continue
+        if rule.os_arch and rule.os_arch != plat.arch:
+            continue
+        if rule.os_version and not re.search(rule.os_version, plat.os_version):
+            continue
+        if any(features.get(name, False) != value for name, value in rule.features):
+            continue
+        allowed = rule.action == "allow"
+    return allowed
+
+class LaunchPlan:
+    """编译好的启动计划
+
+    Attributes:
+        key: 输入的哈希
+        main_class: 主类
+        arguments: 完整的 java 参数（不含 java 可执行文件），会话字段仍为占位符
+        classpath: 类路径中的文件
+        natives: 需要解压到 natives 目录的 jar：[{"path": ..., "exclude": [...]}, ...]
+        natives_dir: natives 目录
+        session_slots: arguments 中包含会话占位符的位置
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.key = data["key"]
+        self.main_class = data["main_class"]
+        self.arguments = data["arguments"]
+        self.classpath = data["classpath"]
+        self.natives = data["natives"]
+        self.natives_dir = data["natives_dir"]
+        self.session_slots = data["session_slots"]
+
+    def command(self, java, session, jvm_arguments=()):
+        """生成启动命令
+
+        Args:
+            java: java 可执行文件路径
+            session: 会话字段，如 {"auth_player_name": "Steve", "auth_uuid": ..., "auth_access_token": ...}
+            jvm_arguments: 附加的 JVM 参数（如 MLCore.jvm.plan_jvm() 的结果），放在版本自带的参数之前
+
+        Returns:
+            参数列表
+        """
+        arguments = list(self.arguments)
+        for index in self.session_slots:
+            arguments[index] = PLACEHOLDER.sub(
+                lambda m: str(session.get(m.group(1), m.group(0))), arguments[index]
+            )
+        return [java] + list(jvm_arguments) + arguments
+
+def _substitute(template, values):
+    return PLACEHOLDER.sub(lambda m: values.get(m.group(1), m.group(0)), template)
+
+def _native_classifier(library, plat):
+    """旧式 natives 字段对应的分类器，如 natives-windows-64"""
+    for os_name, classifier in library.natives:
+        if os_name == plat.os_name:
+            return classifier.replace("${arch}", "32" if plat.arch == "x86" else "64")
+    return None
+
+def compile_resolved(version, jar_id, settings, key="", plat=None):
+    """把合并后的版本编译成启动计划
+
+    Args:
+        version: 合并了继承链的 Version
+        jar_id: 客户端 jar 所属的版本 ID（继承链最末端的原版版本）
+        settings: 实例设置（可 JSON 序列化的字典）：
+            game_dir: 游戏目录（实例目录）
+            root_dir: 共享的 libraries/assets/versions 所在目录，默认与 game_dir 相同
+            natives_dir: natives 目录，默认为 versions/<id>/natives
+            jvm_args: 额外的 JVM 参数列表（内存、GC 等），放在主类之前
+            game_args: 额外的游戏参数列表
+            resolution: [宽, 高]，为空时不传分辨率
+            features: 额外的规则特性，如 {"is_demo_user": false}
+        key: 写入计划的输入哈希
+        plat: Platform，默认为当前系统
+
+    Returns:
+        LaunchPlan
+    """
+    plat = plat or current_platform()
+    game_dir = settings["game_dir"]
+    root_dir = settings.get("root_dir") or game_dir
+    libraries_dir = os.path.join(root_dir, "libraries")
+    assets_dir = os.path.join(root_dir, "assets")
+    natives_dir = settings.get("natives_dir") or os.path.join(root_dir, "versions", version.id, "natives")
+    resolution = settings.get("resolution")
+    features = {"has_custom_resolution": bool(resolution)}
+    features.update(settings.get("features") or {})
+
+    # 库：子版本的库排在前面，同一个 group:artifact(:classifier) 只保留第一次出现的
+    seen = set()
+    classpath = []
+    natives = []
+    for library in version.libraries:
+        if not rules_allow(library.rules, plat, features):
+            continue
+        if library.natives:
+            classifier = _native_classifier(library, plat)
+            download = dict(library.classifiers).get(classifier) if classifier else None
+            if download is not None and (library.group, library.artifact, classifier) not in seen:
+                seen.add((library.group, library.artifact, classifier))
+                natives.append({
+                    "path": os.path.join(libraries_dir, download.path),
+                    "exclude": list(library.extract_exclude)
+                })
+            if library.download is None:
+                continue
+        identity = (library.group, library.artifact, library.classifier)
+        if identity in seen or library.download is None:
+            continue
+        seen.add(identity)
+        classpath.append(os.path.join(libraries_dir, library.download.path))
+    classpath.append(os.path.join(root_dir, "versions", jar_id, jar_id + ".jar"))
+
+    separator = ";" if plat.os_name == "windows" else ":"
+    values = {
+        "version_name": version.id,
+        "version_type": settings.get("version_type") or version.type or "release",
+        "game_directory": game_dir,
+        "assets_root": assets_dir,
+        "game_assets": assets_dir,
+        "assets_index_name": version.assets or (version.asset_index.id if version.asset_index else ""),
+        "natives_directory": natives_dir,
+        "library_directory": libraries_dir,
+        "classpath_separator": separator,
+        "classpath": separator.join(classpath),
+        "launcher_name": LAUNCHER_NAME,
+        "launcher_version": LAUNCHER_VERSION,
+        "user_properties": "{}",
+        "resolution_width": str(resolution[0]) if resolution else "",
+        "resolution_height": str(resolution[1]) if resolution else "",
+    }
+
+    def expand(arguments):
+        result = []
+        for argument in arguments:
+            if rules_allow(argument.rules, plat, features):
+                result.extend(_substitute(value, values) for value in argument.values)
+        return result
+
+    if version.jvm_arguments:
+        jvm = expand(version.jvm_arguments)
+    else:
+        jvm = [_substitute(value, values) for value in LEGACY_JVM_ARGUMENTS]
+    if version.game_arguments:
+        game = expand(version.game_arguments)
+    else:
+        game = [_substitute(value, values) for value in (version.minecraft_arguments or "").split()]
+    if version.logging and version.logging.file:
+        log_config = os.path.join(assets_dir, "log_configs", version.logging.file.path or "client.xml")
+        jvm.append(version.logging.argument.replace("${path}", log_config))
+
+    arguments = list(settings.get("jvm_args") or ()) + jvm + [version.main_class] + game
+    arguments += list(settings.get("game_args") or ())
+    session_slots = [
+        i for i, argument in enumerate(arguments)
+        if any(name in SESSION_KEYS for name in PLACEHOLDER.findall(argument))
+    ]
+    return LaunchPlan({
+        "version": PLAN_VERSION,
+        "key": key,
+        "main_class": version.main_class,
+        "arguments": arguments,
+        "classpath": classpath,
+        "natives": natives,
+        "natives_dir": natives_dir,
+        "session_slots": session_slots
+    })
+
+class PlanCache:
+    """按输入哈希缓存的启动计划
+
+    每个 (实例, 版本) 一个计划文件。输入包括继承链上每个版本 JSON 的文件状态（加载器也在链上）、
+    实例设置与平台，任何一项变化时重新编译。
+    """
+
+    def __init__(self, repository, cache_dir=None):
+        """初始化
+
+        Args:
+            repository: MLCore.versions.VersionRepository
+            cache_dir: 计划文件目录，默认在缓存目录下的 plans
+        """
+        self.repository = repository
+        self.cache_dir = cache_dir or paths.cache_dir("plans")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 计划文件路径 -> LaunchPlan
+        self.plans = {}
+
+    def version_chain(self, version_id):
+        """继承链上的版本 ID，子版本在前"""
+        chain = []
+        current = version_id
+        while current is not None:
+            chain.append(current)
+            current = self.repository.version(current).inherits_from
+        return chain
+
+    def input_key(self, chain, settings, plat):
+        """计算输入哈希：继承链上每个版本 JSON 的文件状态、设置与平台"""
+        stats = []
+        for version_id in chain:
+            stat = os.stat(self.repository.version_path(version_id))
+            stats.append((version_id, stat.st_mtime_ns, stat.st_size))
+        text = json.dumps([PLAN_VERSION, list(plat), settings, stats], sort_keys=True)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, instance_id, version_id, settings, plat=None):
+        """获取启动计划，输入没有变化时直接使用缓存
+
+        已有计划记录了编译时的继承链，校验时只需要 stat 链上的文件，不需要读取版本 JSON。
+
+        Args:
+            instance_id: 实例 ID
+            version_id: 版本 ID
+            settings: 实例设置，见 compile_resolved
+            plat: Platform，默认为当前系统
+
+        Returns:
+            LaunchPlan
+        """
+        plat = plat or current_platform()
+        name = hashlib.sha1(f"{instance_id}\0{version_id}".encode("utf-8")).hexdigest()
+        path = os.path.join(self.cache_dir, name + ".json")
+
+        plan = self.plans.get(path)
+        if plan is None:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == PLAN_VERSION:
+                    plan = LaunchPlan(data)
+            except (OSError, ValueError):
+                pass
+        if plan is not None:
+            try:
+                if self.input_key(plan.data["chain"], settings, plat) == plan.key:
+                    self.plans[path] = plan
+                    return plan
+            except OSError:
+                pass
+
+        chain = self.version_chain(version_id)
+        key = self.input_key(chain, settings, plat)
+        plan = compile_resolved(self.repository.resolve(version_id), chain[-1], settings, key, plat)
+        plan.data["chain"] = chain
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(plan.data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.plans[path] = plan
+        return plan
+
+    def invalidate(self):
+        """丢弃内存中的计划（磁盘上的计划仍按输入哈希判断是否有效）"""
+        self.plans.clear()
@@ -0,0 +1,258 @@
+"""日志文件索引
+
+供日志页面查看数百 MB 的 latest.log：
+- 文件以 mmap 只读映射，不整体读入内存
+- 后台线程分块建立行首偏移索引（array），打开时只同步索引开头一小块，首屏不等待整个文件
+- 文件继续增长（游戏仍在写日志）时从上次的位置接着索引
+- LineScan 在后台按正则扫描已索引的行，得到匹配的行号，用于搜索与级别过滤；
+  扫描跟随索引进度，新索引的行会继续被扫描
+"""
+import mmap
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, count
+from operator import add
+
+# 后台每次索引/扫描的字节数
+CHUNK_SIZE = 4 * 1024 * 1024
+# 打开文件时同步索引的字节数，足够显示首屏
+FIRST_CHUNK = 256 * 1024
+
+LEVELS = ("TRACE", "DEBUG", "INFO", "WARN", "ERROR", "FATAL")
+
+def level_pattern(levels):
+    """匹配指定级别日志头的正则（bytes），如 "/ERROR]"
+
+    只匹配级别标记本身，不从行首开始匹配每一行，扫描时可以快速跳过其它行；
+    配合 LineScan(continuation=True) 使用，由扫描确认标记位于日志头并带上后续的续行。
+
+    Args:
+        levels: 级别名列表，如 ("WARN", "ERROR", "FATAL")
+    """
+    names = b"|".join(re.escape(level.encode("ascii")) for level in levels)
+    return re.compile(rb"/(?:" + names + rb")\]")
+
+class LogIndex:
+    """日志文件的行索引
+
+    offsets[i] 为第 i 行的起始字节偏移；最后一个元素是下一行（尚未索引的部分）的起点。
+    索引只在后台线程追加，读取方无需加锁。
+    """
+
+    def __init__(self, path):
+        """打开文件，同步索引开头一小块并在后台继续
+
+        Args:
+            path: 日志文件路径
+        """
+        self.path = path
+        self.file = open(path, "rb")
+        self.size = 0
+        self.map = b""
+        self.offsets = array("Q", [0])
+        # 已索引的字节数，总是落在行首
+        self.indexed = 0
+        self.complete = False
+        self.closed = False
+        self.changed = threading.Condition()
+        self.thread = None
+        self._remap()
+        self._index_chunk(FIRST_CHUNK)
+        self._start()
+
+    def _remap(self):
+        self.size = os.fstat(self.file.fileno()).st_size
+        # 空文件不能映射
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+
+    def _start(self):
+        self.complete = False
+        self.thread = threading.Thread(target=self._run, daemon=True, name="LogIndex")
+        self.thread.start()
+
+    def _run(self):
+        while not self.closed and self._index_chunk(CHUNK_SIZE):
+            pass
+        with self.changed:
+            self.complete = True
+            self.changed.notify_all()
+
+    def _index_chunk(self, limit):
+        """索引从 self.indexed 开始的一块，返回是否有进展"""
+        start = self.indexed
+        end = min(self.size, start + limit)
+        if end <= start:
+            return False
+        data = self.map[start:end]
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            # 这一行比块还长：直接找到它的结尾
+            newline = self.map.find(b"\n", end)
+            if newline < 0:
+                return False
+            data = self.map[start:newline + 1]
+            cut = len(data) - 1
+        # 第 j 行结束后的下一行起点 = start + 前 j+1 行长度之和 + (j+1) 个换行符
+        lengths = accumulate(map(len, data[:cut].split(b"\n")))
+        new_offsets = array("Q", map(add, lengths, count(start + 1)))
+        with self.changed:
+            self.offsets.extend(new_offsets)
+            self.indexed = start + cut + 1
+            self.changed.notify_all()
+        return True
+
+    def line_count(self):
+        """已索引的行数（索引完成后包括末尾没有换行符的最后一行）"""
+        lines = len(self.offsets) - 1
+        if self.complete and self.offsets[-1] < self.size:
+            lines += 1
+        return lines
+
+    def progress(self):
+        """索引进度（0~1）"""
+        return 1.0 if self.complete or not self.size else self.indexed / self.size
+
+    def line_span(self, number):
+        """第 number 行的 (起始, 结束) 字节偏移，不含换行符"""
+        start = self.offsets[number]
+        end = self.offsets[number + 1] - 1 if number + 1 < len(self.offsets) else self.size
+        return start, end
+
+    def line_bytes(self, number):
+        start, end = self.line_span(number)
+        data = self.map[start:end]
+        return data[:-1] if data.endswith(b"\r") else data
+
+    def line(self, number):
+        """第 number 行的文本"""
+        return self.line_bytes(number).decode("utf-8", "replace")
+
+    def refresh(self):
+        """检查文件是否增长，增长时接着索引新内容
+
+        Returns:
+            "grown"（有新内容）、"truncated"（文件变小，如日志轮转，需要重新打开）或 None
+        """
+        if not self.complete or self.closed:
+            return None
+        size = os.fstat(self.file.fileno()).st_size
+        if size < self.size:
+            return "truncated"
+        if size == self.size:
+            return None
+        # 旧的映射可能仍被扫描线程引用，交给垃圾回收释放
+        self._remap()
+        self._start()
+        return "grown"
+
+    def close(self):
+        """停止后台索引并关闭文件"""
+        self.closed = True
+        if self.thread is not None:
+            self.thread.join()
+        self.file.close()
+
+class LineScan:
+    """在后台按正则扫描日志索引，得到匹配的行号
+
+    每行至多记录一次，lines 只在扫描线程追加且保持递增，读取方无需加锁。
+    扫描线程在追上索引后等待索引的通知，不定时轮询；pause() 后也不再扫描，直到 resume()。
+    continuation 为 True 时按日志记录匹配：匹配必须出现在以 "[" 开头的日志头行，
+    其后不以 "[" 开头的续行（堆栈等）一并记录。
+    """
+
+    def __init__(self, index, pattern, continuation=False):
+        """开始扫描
+
+        Args:
+            index: LogIndex
+            pattern: 编译好的 bytes 正则
+            continuation: 是否按日志记录（日志头 + 续行）匹配
+        """
+        self.index = index
+        self.pattern = pattern
+        self.continuation = continuation
+        self.lines = array("Q")
+        # 已扫描的行数
+        self.scanned = 0
+        self.cancelled = False
+        self.paused = False
+        self.thread = threading.Thread(target=self._run, daemon=True, name="LineScan")
+        self.thread.start()
+
+    def caught_up(self):
+        """是否已扫描完当前索引的全部行"""
+        return self.index.complete and self.scanned >= self.index.line_count()
+
+    def cancel(self):
+        self.cancelled = True
+        self._wake()
+
+    def pause(self):
+        """暂停扫描（如页面隐藏时），已有结果保留"""
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        self._wake()
+
+    def _wake(self):
+        with self.index.changed:
+            self.index.changed.notify_all()
+
+    def _run(self):
+        index = self.index
+        while not self.cancelled:
+            with index.changed:
+                while not self.cancelled and (self.paused or self.scanned >= index.line_count()):
+                    index.changed.wait()
+            if self.cancelled:
+                break
+            self._scan_batch(self.scanned, index.line_count())
+
+    @staticmethod
+    def _starts_record(data, position):
+        """position 处的行是否是日志头行（以 "[" 开头）"""
+        return data[position:position + 1] == b"["
+
+    def _scan_batch(self, first, available):
+        """扫描 [first, available) 中开头约 CHUNK_SIZE 字节的行"""
+        offsets = self.index.offsets
+        data_map = self.index.map
+        base = offsets[first]
+        # 本批的行：[first, last)，至少一行
+        last = max(first + 1, min(available, bisect_right(offsets, base + CHUNK_SIZE, first) - 1))
+        if self.continuation:
+            # 不把一条记录的续行拆到下一批
+            while last < available and not self._starts_record(data_map, offsets[last]):
+                last += 1
+        data = data_map[base:self.index.line_span(last - 1)[1]]
+        lines = self.lines
+        search = self.pattern.search
+        position = 0
+        while True:
+            match = search(data, position)
+            if match is None:
+                break
+            start_line = bisect_right(offsets, base + match.start(), first, last) - 1
+            end_line = bisect_right(offsets, base + max(match.start(), match.end() - 1), first, last) - 1
+            if self.continuation:
+                # 级别标记不在日志头行（如出现在堆栈里）时跳过这一行
+                if not self._starts_record(data, offsets[start_line] - base):
+                    if start_line + 1 >= last:
+                        break
+                    position = offsets[start_line + 1] - base
+                    continue
+                while end_line + 1 < last and not self._starts_record(data, offsets[end_line + 1] - base):
+                    end_line += 1
+            if lines and lines[-1] >= start_line:
+                start_line = lines[-1] + 1
+            lines.extend(range(start_line, end_line + 1))
+            # 从下一行开始继续，每行只记录一次
+            if end_line + 1 >= last:
+                break
+            position = offsets[end_line + 1] - base
+        self.scanned = last
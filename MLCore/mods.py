@@ -0,0 +1,510 @@
+"""模组元数据索引
+
+读取 mods 目录下每个 jar 的模组信息（Fabric 的 fabric.mod.json、Forge/NeoForge 的 mods.toml、
+旧版 Forge 的 mcmod.info）：
+- 只读取 zip 末尾的中央目录与这几个条目，不解析其余成百上千个 class 条目；
+  格式不寻常（zip64、加密、前置数据等）时退回 zipfile
+- 解析结果按 (路径, 大小, mtime_ns) 缓存在 SQLite 中，文件没有变化时只需要一次 stat
+- 需要解析的 jar 较多时交给进程池
+
+同时带有多个加载器元数据的 jar 会索引每个加载器的模组，由 select_mods() 按实例的加载器选取。
+禁用的模组以 .jar.disabled 结尾，同样会被索引。
+"""
+import json
+import os
+import pickle
+import sqlite3
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from . import paths
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jars (
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    parse_version INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (dir, name)
+) WITHOUT ROWID;
+"""
+
+# 解析结果的格式版本，修改记录结构或解析规则后递增，旧的缓存自动失效
+PARSE_VERSION = 2
+
+# 一个依赖声明
+# kind: required / optional / recommended / incompatible / discouraged
+# ranges: 版本范围的原文，多个时满足任意一个即可（Fabric 的数组写法）；空元组表示任意版本
+Dependency = namedtuple("Dependency", "mod_id kind ranges")
+
+# jar 中声明的一个模组，loader 为 fabric / forge / neoforge（mcmod.info 记为 forge）
+ModInfo = namedtuple("ModInfo", "mod_id name version loader description authors dependencies provides")
+
+# mods 目录中的一个 jar
+# mods 为 ModInfo 元组（没有模组元数据的库 jar 为空元组），尚未解析时为 None；
+# 读取或解析失败时 error 为错误信息
+ModFile = namedtuple("ModFile", "path name enabled size mtime_ns mods error")
+
+JAR_SUFFIX = ".jar"
+DISABLED_SUFFIX = ".jar.disabled"
+
+FABRIC_ENTRY = "fabric.mod.json"
+FORGE_ENTRY = "META-INF/mods.toml"
+NEOFORGE_ENTRY = "META-INF/neoforge.mods.toml"
+LEGACY_ENTRY = "mcmod.info"
+MANIFEST_ENTRY = "META-INF/MANIFEST.MF"
+METADATA_ENTRIES = (FABRIC_ENTRY, NEOFORGE_ENTRY, FORGE_ENTRY, LEGACY_ENTRY)
+
+# 实例的加载器 -> 它加载的模组元数据（ModInfo.loader），Quilt 也加载 Fabric 模组
+LOADER_METADATA = {
+    "fabric": ("fabric",),
+    "quilt": ("fabric",),
+    "forge": ("forge",),
+    "neoforge": ("neoforge",),
+}
+# 没有指定加载器或 jar 中没有该加载器的元数据时，多加载器 jar 按此顺序取第一个
+METADATA_PREFERENCE = ("fabric", "neoforge", "forge")
+
+# fabric.mod.json 的依赖字段 -> 依赖类型
+FABRIC_DEPENDENCY_KINDS = (
+    ("depends", "required"),
+    ("recommends", "recommended"),
+    ("suggests", "optional"),
+    ("breaks", "incompatible"),
+    ("conflicts", "discouraged"),
+)
+# mods.toml 的 type 字段（NeoForge 与新版 Forge）-> 依赖类型
+FORGE_DEPENDENCY_TYPES = {
+    "required": "required",
+    "optional": "optional",
+    "incompatible": "incompatible",
+    "discouraged": "discouraged",
+}
+
+# 需要解析的 jar 不少于该数量时才启用进程池，少量 jar 时进程启动的开销反而更大
+POOL_THRESHOLD = 32
+# mtime 距今不足该时长（纳秒）的文件不写入缓存：同一时间精度内的再次修改无法从 mtime 上看出来
+RACY_WINDOW_NS = 2 * 10 ** 9
+
+# zip 结构
+EOCD_SIGNATURE = b"PK\x05\x06"
+EOCD_STRUCT = struct.Struct("<4s4H2LH")
+CENTRAL_SIGNATURE = b"PK\x01\x02"
+CENTRAL_STRUCT = struct.Struct("<4s4B4HL2L5H2L")
+LOCAL_SIGNATURE = b"PK\x03\x04"
+LOCAL_STRUCT = struct.Struct("<4s2B4HL2L2H")
+# 中央目录末尾记录之后最多还有 65535 字节的注释
+EOCD_SEARCH = EOCD_STRUCT.size + 0xFFFF
+
+class ModFormatError(Exception):
+    """jar 无法按常规方式读取，需要退回 zipfile"""
+
+def _read_central_directory(f, size):
+    """读取 zip 的中央目录
+
+    Returns:
+        中央目录的原始字节
+    """
+    tail_size = min(size, EOCD_SEARCH)
+    f.seek(size - tail_size)
+    tail = f.read(tail_size)
+    position = tail.rfind(EOCD_SIGNATURE)
+    if position < 0 or position + EOCD_STRUCT.size > len(tail):
+        raise ModFormatError("没有找到中央目录")
+    _, disk, _, _, entries, cd_size, cd_offset, _ = EOCD_STRUCT.unpack_from(tail, position)
+    if disk != 0 or entries == 0xFFFF or cd_offset == 0xFFFFFFFF or cd_size == 0xFFFFFFFF:
+        raise ModFormatError("分卷或 zip64")
+    # 中央目录紧挨在末尾记录之前，位置不符说明文件前面有附加数据
+    if cd_offset + cd_size != size - tail_size + position:
+        raise ModFormatError("中央目录位置不符")
+    start = position - cd_size
+    if start >= 0:
+        return tail[start:position]
+    f.seek(cd_offset)
+    return f.read(cd_size)
+
+def _find_entry(central, name):
+    """在中央目录中查找条目，返回 (压缩方式, 标志位, 压缩后大小, 本地文件头偏移)，不存在时返回 None
+
+    直接在字节中查找名称，再核对它确实位于某个目录项的名称字段，不需要逐项解析整个目录。
+    """
+    encoded = name.encode("ascii")
+    position = central.find(encoded)
+    while position >= 0:
+        header = position - CENTRAL_STRUCT.size
+        if header >= 0 and central[header:header + 4] == CENTRAL_SIGNATURE:
+            fields = CENTRAL_STRUCT.unpack_from(central, header)
+            if fields[12] == len(encoded):
+                # (压缩方式, 标志位, 压缩后大小, 偏移)
+                return fields[6], fields[5], fields[10], fields[18]
+        position = central.find(encoded, position + 1)
+    return None
+
+def _read_entry(f, entry):
+    method, flags, compressed_size, offset = entry
+    if flags & 0x1 or compressed_size == 0xFFFFFFFF or method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+        raise ModFormatError("加密、zip64 或不支持的压缩方式")
+    f.seek(offset)
+    header = f.read(LOCAL_STRUCT.size)
+    if len(header) < LOCAL_STRUCT.size or header[:4] != LOCAL_SIGNATURE:
+        raise ModFormatError("本地文件头损坏")
+    fields = LOCAL_STRUCT.unpack(header)
+    f.seek(fields[10] + fields[11], os.SEEK_CUR)
+    data = f.read(compressed_size)
+    if method == zipfile.ZIP_DEFLATED:
+        return zlib.decompress(data, -15)
+    return data
+
+def read_entries(path, names):
+    """读取 jar 中的若干条目
+
+    Args:
+        path: jar 路径
+        names: 条目名称
+
+    Returns:
+        {名称: 内容}，不存在的条目不出现在结果中
+    """
+    with open(path, "rb") as f:
+        try:
+            central = _read_central_directory(f, os.fstat(f.fileno()).st_size)
+            found = {}
+            for name in names:
+                entry = _find_entry(central, name)
+                if entry is not None:
+                    found[name] = _read_entry(f, entry)
+            return found
+        except (ModFormatError, zlib.error, struct.error):
+            pass
+        f.seek(0)
+        with zipfile.ZipFile(f) as jar:
+            present = set(jar.namelist())
+            return {name: jar.read(name) for name in names if name in present}
+
+def _text(data):
+    return data.decode("utf-8-sig", errors="replace")
+
+def _authors(value):
+    """作者字段可能是字符串、字符串列表或 {"name": ...} 列表"""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return tuple(name.strip() for name in value.split(",") if name.strip())
+    return tuple(item.get("name", "") if isinstance(item, dict) else str(item) for item in value)
+
+def _ranges(value):
+    if value is None or value == "*":
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(str(item) for item in value)
+
+def parse_fabric(data):
+    """解析 fabric.mod.json"""
+    meta = json.loads(_text(data), strict=False)
+    dependencies = []
+    for field, kind in FABRIC_DEPENDENCY_KINDS:
+        for mod_id, ranges in (meta.get(field) or {}).items():
+            dependencies.append(Dependency(mod_id, kind, _ranges(ranges)))
+    provides = tuple(
+        item.get("id", "") if isinstance(item, dict) else str(item) for item in meta.get("provides") or ()
+    )
+    return (ModInfo(
+        meta["id"], meta.get("name") or meta["id"], str(meta.get("version", "")), "fabric",
+        meta.get("description", ""), _authors(meta.get("authors")), tuple(dependencies), provides
+    ),)
+
+def parse_mods_toml(data, loader="forge", jar_version=""):
+    """解析 mods.toml / neoforge.mods.toml
+
+    Args:
+        data: 文件内容
+        loader: forge 或 neoforge
+        jar_version: 清单中的 Implementation-Version，用于替换 ${file.jarVersion}
+    """
+    try:
+        import tomllib
+    except ImportError:  # Python 3.10 及以下
+        import tomli as tomllib
+    meta = tomllib.loads(_text(data))
+    all_dependencies = meta.get("dependencies") or {}
+    mods = []
+    for mod in meta.get("mods") or ():
+        mod_id = mod["modId"]
+        dependencies = []
+        for dep in all_dependencies.get(mod_id) or ():
+            if "type" in dep:
+                kind = FORGE_DEPENDENCY_TYPES.get(str(dep["type"]).lower(), "optional")
+            else:
+                kind = "required" if dep.get("mandatory", False) else "optional"
+            dependencies.append(Dependency(dep["modId"], kind, _ranges(dep.get("versionRange"))))
+        version = str(mod.get("version", ""))
+        if "${file.jarVersion}" in version:
+            version = version.replace("${file.jarVersion}", jar_version)
+        mods.append(ModInfo(
+            mod_id, mod.get("displayName") or mod_id, version, loader,
+            str(mod.get("description", "")).strip(), _authors(mod.get("authors")),
+            tuple(dependencies), ()
+        ))
+    return tuple(mods)
+
+def _legacy_dependency(spec, kind):
+    """mcmod.info 的依赖写作 "modid@版本范围" 或 "modid" """
+    mod_id, _, version_range = spec.partition("@")
+    return Dependency(mod_id.strip(), kind, (version_range.strip(),) if version_range.strip() else ())
+
+def parse_mcmod_info(data):
+    """解析 mcmod.info（列表，或带 modList 的对象）"""
+    meta = json.loads(_text(data), strict=False)
+    if isinstance(meta, dict):
+        meta = meta.get("modList") or ()
+    mods = []
+    for mod in meta:
+        required = [str(spec) for spec in mod.get("requiredMods") or ()]
+        required_ids = {spec.partition("@")[0].strip() for spec in required}
+        dependencies = [_legacy_dependency(spec, "required") for spec in required]
+        # dependencies 只声明加载顺序，没有同时列在 requiredMods 中的视为可选
+        dependencies.extend(
+            _legacy_dependency(str(spec), "optional") for spec in mod.get("dependencies") or ()
+            if str(spec).partition("@")[0].strip() not in required_ids
+        )
+        mods.append(ModInfo(
+            mod["modid"], mod.get("name") or mod["modid"], str(mod.get("version", "")), "forge",
+            mod.get("description", ""), _authors(mod.get("authorList") or mod.get("authors")),
+            tuple(dependencies), ()
+        ))
+    return tuple(mods)
+
+def _manifest_version(data):
+    for line in _text(data).splitlines():
+        if line.startswith("Implementation-Version:"):
+            return line.split(":", 1)[1].strip()
+    return ""
+
+def read_mod_file(path):
+    """读取一个 jar 中的模组信息
+
+    jar 中有几个加载器的元数据就解析几个，结果按 fabric、neoforge、forge 的顺序排列；
+    mcmod.info 只在没有 mods.toml 时读取（旧版 Forge）。部分元数据解析失败时保留其余的结果。
+
+    Returns:
+        (ModInfo 元组, 错误信息)，成功时错误信息为 None
+    """
+    try:
+        entries = read_entries(path, METADATA_ENTRIES)
+    except Exception as e:
+        return (), f"{type(e).__name__}: {e}"
+    mods = []
+    error = None
+    parsed = False
+    for name in METADATA_ENTRIES:
+        if name not in entries or (name == LEGACY_ENTRY and FORGE_ENTRY in entries):
+            continue
+        try:
+            if name == FABRIC_ENTRY:
+                mods.extend(parse_fabric(entries[name]))
+            elif name == LEGACY_ENTRY:
+                mods.extend(parse_mcmod_info(entries[name]))
+            else:
+                jar_version = ""
+                if b"${file.jarVersion}" in entries[name]:
+                    manifest = read_entries(path, (MANIFEST_ENTRY,)).get(MANIFEST_ENTRY)
+                    jar_version = _manifest_version(manifest) if manifest else ""
+                loader = "neoforge" if name == NEOFORGE_ENTRY else "forge"
+                mods.extend(parse_mods_toml(entries[name], loader, jar_version))
+            parsed = True
+        except Exception as e:
+            error = error or f"{type(e).__name__}: {e}"
+    if parsed:
+        return tuple(mods), None
+    return (), error
+
+def select_mods(mods, loader=None):
+    """一个 jar 在指定加载器下生效的模组
+
+    只有一个加载器元数据的 jar 原样返回；多加载器 jar 只取实例加载器的那一组，
+    没有指定加载器（或 jar 中没有它的元数据）时按 METADATA_PREFERENCE 取第一组。
+
+    Args:
+        mods: ModFile.mods
+        loader: 实例的加载器（见 MLCore.instances.LOADERS），可以为 None
+    """
+    if not mods:
+        return mods
+    loaders = {mod.loader for mod in mods}
+    if len(loaders) == 1:
+        return mods
+    for candidate in LOADER_METADATA.get(loader, ()) + METADATA_PREFERENCE:
+        if candidate in loaders:
+            return tuple(mod for mod in mods if mod.loader == candidate)
+    return mods
+
+def _read_batch(paths_):
+    return [read_mod_file(path) for path in paths_]
+
+def mod_name_key(name):
+    """mods 目录中文件的排序键：忽略大小写与 .disabled 后缀"""
+    return name[:-len(".disabled")].lower() if name.endswith(".disabled") else name.lower()
+
+class ModIndex:
+    """模组元数据索引"""
+
+    def __init__(self, db_path=None, workers=None):
+        """初始化模组索引
+
+        Args:
+            db_path: 缓存数据库路径，默认在缓存目录下的 mods.db（删除后只会导致重新解析）
+            workers: 进程池大小，默认为 CPU 数
+        """
+        self.db_path = db_path or os.path.join(paths.cache_dir(), "mods.db")
+        self.workers = workers or os.cpu_count() or 1
+        self.local = threading.local()
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def connection(self):
+        """当前线程的数据库连接"""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def scan(self, mods_dir, parse=True):
+        """列出 mods 目录中的 jar，文件没有变化的直接使用缓存的解析结果
+
+        Args:
+            mods_dir: mods 目录
+            parse: 是否立即解析缓存中没有的 jar；为 False 时这些 jar 的 mods 为 None，
+                可以先显示列表，再把它们交给 parse() 在后台解析
+
+        Returns:
+            按文件名排序的 ModFile 列表
+        """
+        mods_dir = os.path.abspath(mods_dir)
+        conn = self.connection()
+        cached = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                "SELECT name, size, mtime_ns, parse_version, data FROM jars WHERE dir = ?", (mods_dir,)
+            )
+        }
+        files = []
+        try:
+            entries = list(os.scandir(mods_dir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            name = entry.name
+            enabled = name.endswith(JAR_SUFFIX)
+            if not enabled and not name.endswith(DISABLED_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            mods = error = None
+            record = cached.pop(name, None)
+            if record is not None and record[:3] == (stat.st_size, stat.st_mtime_ns, PARSE_VERSION):
+                mods, error = pickle.loads(record[3])
+            files.append(ModFile(entry.path, name, enabled, stat.st_size, stat.st_mtime_ns, mods, error))
+        files.sort(key=lambda item: mod_name_key(item.name))
+
+        # 已经不存在的文件（包括被重命名的）不再保留缓存
+        if cached:
+            with conn:
+                conn.executemany("DELETE FROM jars WHERE dir = ? AND name = ?",
+                                 [(mods_dir, name) for name in cached])
+        if parse:
+            parsed = iter(self.parse([item for item in files if item.mods is None]))
+            files = [next(parsed) if item.mods is None else item for item in files]
+        return files
+
+    def parse(self, files):
+        """解析一批 jar 并写入缓存
+
+        Args:
+            files: ModFile 列表（通常是 scan(parse=False) 结果中 mods 为 None 的项）
+
+        Returns:
+            解析后的 ModFile 列表，顺序与参数一致
+        """
+        if not files:
+            return []
+        results = self._read([item.path for item in files], [item.size for item in files])
+        now_ns = time.time_ns()
+        parsed = []
+        rows = []
+        for item, (mods, error) in zip(files, results):
+            parsed.append(item._replace(mods=mods, error=error))
+            if now_ns - item.mtime_ns > RACY_WINDOW_NS:
+                rows.append((
+                    os.path.dirname(item.path), item.name, item.size, item.mtime_ns, PARSE_VERSION,
+                    pickle.dumps((mods, error), pickle.HIGHEST_PROTOCOL)
+                ))
+        if rows:
+            conn = self.connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO jars (dir, name, size, mtime_ns, parse_version, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+        return parsed
+
+    def _read(self, file_paths, sizes):
+        """读取一批 jar，数量多时分批交给进程池"""
+        if len(file_paths) < POOL_THRESHOLD or self.workers == 1:
+            return _read_batch(file_paths)
+        # 按大小排序后轮流分配，让各个进程的工作量大致相同
+        order = sorted(range(len(file_paths)), key=lambda i: -sizes[i])
+        batches = [order[i::self.workers] for i in range(self.workers)]
+        results = [None] * len(file_paths)
+        with ProcessPoolExecutor(self.workers) as executor:
+            outputs = executor.map(_read_batch, [[file_paths[i] for i in batch] for batch in batches])
+            for batch, batch_results in zip(batches, outputs):
+                for i, result in zip(batch, batch_results):
+                    results[i] = result
+        return results
+
+    def set_enabled(self, item, enabled):
+        """启用或禁用一个模组：重命名为 .jar 或 .jar.disabled，缓存随之改名，不需要重新解析
+
+        Args:
+            item: ModFile
+            enabled: 新状态
+
+        Returns:
+            更新后的 ModFile
+
+        Raises:
+            FileExistsError: 目标文件名已存在
+        """
+        if item.enabled == enabled:
+            return item
+        new_path = item.path[:-len(".disabled")] if enabled else item.path + ".disabled"
+        if os.path.exists(new_path):
+            raise FileExistsError(new_path)
+        os.rename(item.path, new_path)
+        mods_dir = os.path.dirname(item.path)
+        new_name = os.path.basename(new_path)
+        conn = self.connection()
+        with conn:
+            conn.execute("UPDATE OR REPLACE jars SET name = ? WHERE dir = ? AND name = ?",
+                         (new_name, mods_dir, item.name))
+        return item._replace(path=new_path, name=new_name, enabled=enabled)
+
+    def forget(self, mods_dir):
+        """删除某个 mods 目录的全部缓存"""
+        conn = self.connection()
+        with conn:
+            conn.execute("DELETE FROM jars WHERE dir = ?", (os.path.abspath(mods_dir),))
@@ -0,0 +1,151 @@
+"""natives 解压
+
+旧版本的 LWJGL 等本地库打包在带分类器的 jar 中，启动前要解压到 natives 目录。
+- 多个 jar 并行解压（zlib 解压时释放 GIL），每个条目流式写入磁盘，不把整个压缩包读进内存
+- 遵守版本 JSON 中的 extract.exclude
+- 解压完成后写入清单，记录每个 jar 的文件状态与解压出的文件（CRC、大小、mtime）；
+  再次启动时 jar 与解压结果都没有变化则不做任何写入
+"""
+import json
+import os
+import shutil
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+MANIFEST_NAME = ".natives.json"
+MANIFEST_VERSION = 1
+
+# 解压统计：extracted 为写入的文件数，skipped 为未变化而跳过的文件数，removed 为删除的过期文件数
+ExtractStats = namedtuple("ExtractStats", "extracted skipped removed")
+
+def _safe_name(name):
+    """压缩包内的路径是否可以安全地解压到目标目录下（排除绝对路径与 ..）"""
+    return not (name.startswith("/") or name.startswith("\\") or ".." in name.replace("\\", "/").split("/"))
+
+def _read_manifest(natives_dir):
+    try:
+        with open(os.path.join(natives_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+def _jar_states(jars):
+    states = {}
+    for jar in jars:
+        stat = os.stat(jar["path"])
+        states[jar["path"]] = [stat.st_size, stat.st_mtime_ns, sorted(jar.get("exclude") or ())]
+    return states
+
+def _files_intact(natives_dir, files):
+    for name, (_, size, mtime_ns) in files.items():
+        try:
+            stat = os.stat(os.path.join(natives_dir, name))
+        except FileNotFoundError:
+            return False
+        if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+            return False
+    return True
+
+def _plan_entries(jars):
+    """读取各 jar 的中央目录，决定每个文件由哪个 jar 提供
+
+    同名文件以列表中靠前的 jar 为准，解压时各 jar 写入的文件互不重叠，可以并行。
+
+    Returns:
+        {jar 路径: [ZipInfo, ...]}
+    """
+    owners = {}
+    entries = {jar["path"]: [] for jar in jars}
+    for jar in jars:
+        exclude = tuple(jar.get("exclude") or ())
+        with zipfile.ZipFile(jar["path"]) as zf:
+            for info in zf.infolist():
+                name = info.filename
+                if info.is_dir() or name.startswith(exclude) or not _safe_name(name) or name in owners:
+                    continue
+                owners[name] = jar["path"]
+                entries[jar["path"]].append(info)
+    return entries
+
+def _extract_jar(jar_path, infos, natives_dir, previous):
+    """解压一个 jar 中分配给它的条目
+
+    目标文件的 CRC 与大小和上次清单一致、且文件状态没有变化时跳过。
+
+    Returns:
+        ({文件名: [crc, 大小, mtime_ns]}, 写入数, 跳过数)
+    """
+    files = {}
+    extracted = skipped = 0
+    with zipfile.ZipFile(jar_path) as zf:
+        for info in infos:
+            target = os.path.join(natives_dir, info.filename)
+            old = previous.get(info.filename)
+            if old is not None and old[0] == info.CRC and old[1] == info.file_size:
+                try:
+                    stat = os.stat(target)
+                    if stat.st_size == old[1] and stat.st_mtime_ns == old[2]:
+                        files[info.filename] = old
+                        skipped += 1
+                        continue
+                except FileNotFoundError:
+                    pass
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = target + ".tmp"
+            # ZipExtFile 读到末尾时会校验 CRC，损坏的条目在这里抛出 BadZipFile
+            with zf.open(info) as src, open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(tmp, target)
+            files[info.filename] = [info.CRC, info.file_size, os.stat(target).st_mtime_ns]
+            extracted += 1
+    return files, extracted, skipped
+
+def extract_natives(jars, natives_dir, workers=4):
+    """把 natives jar 解压到 natives 目录
+
+    Args:
+        jars: [{"path": jar 路径, "exclude": [排除的前缀, ...]}, ...]（即 LaunchPlan.natives）
+        natives_dir: natives 目录
+        workers: 并行解压的 jar 数
+
+    Returns:
+        ExtractStats
+    """
+    jar_states = _jar_states(jars)
+    manifest = _read_manifest(natives_dir)
+    previous = manifest["files"] if manifest else {}
+    if manifest and manifest["jars"] == jar_states and _files_intact(natives_dir, previous):
+        return ExtractStats(0, len(previous), 0)
+
+    os.makedirs(natives_dir, exist_ok=True)
+    entries = _plan_entries(jars)
+    files = {}
+    extracted = skipped = 0
+    with ThreadPoolExecutor(max(1, min(workers, len(jars)))) as executor:
+        futures = [
+            executor.submit(_extract_jar, jar_path, infos, natives_dir, previous)
+            for jar_path, infos in entries.items()
+        ]
+        for future in futures:
+            jar_files, jar_extracted, jar_skipped = future.result()
+            files.update(jar_files)
+            extracted += jar_extracted
+            skipped += jar_skipped
+
+    # 删除上次解压出、这次已不再需要的文件
+    removed = 0
+    for name in previous:
+        if name not in files:
+            try:
+                os.remove(os.path.join(natives_dir, name))
+                removed += 1
+            except FileNotFoundError:
+                pass
+
+    tmp = os.path.join(natives_dir, MANIFEST_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "jars": jar_states, "files": files}, f)
+    os.replace(tmp, os.path.join(natives_dir, MANIFEST_NAME))
+    return ExtractStats(extracted, skipped, removed)
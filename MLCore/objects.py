@@ -0,0 +1,339 @@
+"""内容寻址的对象库
+
+所有实例共用一份文件：资源、库与客户端 jar 都按 SHA-1 保存在
+``<root>/objects/<前两位>/<sha1>``（与原版 assets/objects 的布局相同，可直接作为资源目录使用）。
+索引数据库记录每个对象的大小、SHA-256 与文件的 mtime，已知对象不需要重新计算哈希；
+引用表记录每个实例用到了哪些对象，没有引用的对象可以被回收。
+
+下载器可以直接把资源下载到 objects 目录（见 MLCore.download.asset_tasks），完成后用 adopt() 登记。
+
+实例需要文件时优先用 reflink（写时复制），其次硬链接，都不支持时才复制，
+因此创建同一版本的第二个实例几乎不占额外空间。
+"""
+import errno
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+from . import paths
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    sha1 TEXT PRIMARY KEY,
+    sha256 TEXT,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_objects_sha256 ON objects (sha256);
+CREATE TABLE IF NOT EXISTS refs (
+    owner TEXT NOT NULL,
+    sha1 TEXT NOT NULL,
+    PRIMARY KEY (owner, sha1)
+);
+CREATE INDEX IF NOT EXISTS idx_refs_sha1 ON refs (sha1);
+"""
+
+# Linux 的 FICLONE ioctl，在 btrfs、XFS 等文件系统上创建共享数据块的副本
+FICLONE = 0x40049409
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def hash_file(path):
+    """一次读取同时计算 SHA-1 与 SHA-256
+
+    Returns:
+        (sha1, sha256, size)
+    """
+    sha1 = hashlib.sha1()
+    sha256 = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(HASH_BLOCK_SIZE)
+            if not block:
+                break
+            sha1.update(block)
+            sha256.update(block)
+            size += len(block)
+    return sha1.hexdigest(), sha256.hexdigest(), size
+
+def _reflink(src, dst):
+    import fcntl
+    with open(src, "rb") as fsrc:
+        fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            fcntl.ioctl(fd, FICLONE, fsrc.fileno())
+        except OSError:
+            os.close(fd)
+            os.remove(dst)
+            raise
+        os.close(fd)
+
+class ObjectStore:
+    """对象库"""
+
+    # 依次尝试的文件生成方式
+    METHODS = ("reflink", "hardlink", "copy")
+
+    def __init__(self, root=None):
+        """初始化对象库
+
+        Args:
+            root: 对象库根目录，默认在数据目录下的 store
+        """
+        self.root = root or paths.data_dir("store")
+        self.objects_dir = os.path.join(self.root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.db_path = os.path.join(self.root, "index.db")
+        self.local = threading.local()
+        # (对象库所在设备, 目标设备) -> 可用的生成方式，避免每个文件都先失败一次
+        self.methods = {}
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def connection(self):
+        """当前线程的数据库连接"""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # 索引丢失最多导致重新计算哈希，不需要每次提交都同步到磁盘
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def path(self, sha1):
+        """对象在库中的路径"""
+        return os.path.join(self.objects_dir, sha1[:2], sha1)
+
+    # 查询
+
+    def lookup(self, sha1):
+        """查询索引中的对象
+
+        Returns:
+            (sha1, sha256, size, mtime_ns)，不存在时返回 None
+        """
+        return self.connection().execute(
+            "SELECT sha1, sha256, size, mtime_ns FROM objects WHERE sha1 = ?", (sha1,)
+        ).fetchone()
+
+    def find_sha256(self, sha256):
+        """按 SHA-256 查找对象，返回其 SHA-1，不存在时返回 None"""
+        row = self.connection().execute("SELECT sha1 FROM objects WHERE sha256 = ?", (sha256,)).fetchone()
+        return row[0] if row else None
+
+    def has(self, sha1, size=None):
+        """对象是否存在且未被改动
+
+        只比较索引中记录的大小与 mtime，不重新计算哈希。
+        """
+        row = self.lookup(sha1)
+        if row is None or (size is not None and row[2] != size):
+            return False
+        try:
+            stat = os.stat(self.path(sha1))
+        except FileNotFoundError:
+            return False
+        return stat.st_size == row[2] and stat.st_mtime_ns == row[3]
+
+    def missing(self, entries):
+        """筛选出库中没有的对象
+
+        Args:
+            entries: [(sha1, size), ...]
+
+        Returns:
+            缺失的 (sha1, size) 列表（去重）
+        """
+        known = {}
+        for sha1, size, mtime_ns in self.connection().execute("SELECT sha1, size, mtime_ns FROM objects"):
+            known[sha1] = (size, mtime_ns)
+        result = {}
+        for sha1, size in entries:
+            if sha1 in result:
+                continue
+            record = known.get(sha1)
+            if record is None or (size is not None and record[0] != size):
+                result[sha1] = (sha1, size)
+        return list(result.values())
+
+    # 写入
+
+    def add_file(self, src, sha1=None, move=False):
+        """把文件加入对象库
+
+        Args:
+            src: 源文件
+            sha1: 期望的 SHA-1，与实际内容不符时抛出 ValueError
+            move: 为 True 时移动源文件，否则复制
+
+        Returns:
+            对象的 SHA-1
+        """
+        digest, sha256, size = hash_file(src)
+        if sha1 is not None and sha1 != digest:
+            raise ValueError(f"SHA-1 不符: {src}")
+        target = self.path(digest)
+        if not self.has(digest):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = target + ".tmp"
+            if move:
+                os.replace(src, tmp)
+            else:
+                shutil.copyfile(src, tmp)
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, target)
+            self._record([(digest, sha256, size, os.stat(target).st_mtime_ns)])
+        elif move:
+            os.remove(src)
+        return digest
+
+    def add_bytes(self, data):
+        """把一段内容加入对象库，返回 SHA-1"""
+        digest = hashlib.sha1(data).hexdigest()
+        if not self.has(digest, len(data)):
+            target = self.path(digest)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = target + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, target)
+            self._record([(digest, hashlib.sha256(data).hexdigest(), len(data), os.stat(target).st_mtime_ns)])
+        return digest
+
+    def adopt(self, sha1s):
+        """登记已经由下载器写到 path(sha1) 且校验过 SHA-1 的对象
+
+        只读取文件状态，不重新读取内容；这些对象的 SHA-256 留空。
+
+        Args:
+            sha1s: SHA-1 列表
+        """
+        rows = []
+        for sha1 in sha1s:
+            target = self.path(sha1)
+            os.chmod(target, 0o444)
+            stat = os.stat(target)
+            rows.append((sha1, None, stat.st_size, stat.st_mtime_ns))
+        self._record(rows)
+
+    def _record(self, rows):
+        conn = self.connection()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO objects (sha1, sha256, size, mtime_ns) VALUES (?, ?, ?, ?)", rows)
+
+    # 生成实例文件
+
+    def materialize(self, files, dest_root, owner=None):
+        """在实例目录中生成文件，并登记引用
+
+        已经是同一个对象（同一 inode）的文件直接跳过。
+
+        Args:
+            files: {相对路径: sha1}
+            dest_root: 实例目录
+            owner: 引用者（如实例名），为 None 时不登记引用
+
+        Returns:
+            {"reflink": n, "hardlink": n, "copy": n, "skipped": n}
+        """
+        counts = dict.fromkeys(self.METHODS + ("skipped",), 0)
+        src_dev = os.stat(self.objects_dir).st_dev
+        # 目录 -> (对象库设备, 目标设备)
+        dir_keys = {}
+        for rel_path, sha1 in files.items():
+            src = self.path(sha1)
+            dst = os.path.join(dest_root, rel_path)
+            parent = os.path.dirname(dst)
+            key = dir_keys.get(parent)
+            if key is None:
+                os.makedirs(parent, exist_ok=True)
+                key = dir_keys[parent] = (src_dev, os.stat(parent).st_dev)
+            # 新实例里目标通常不存在，先直接生成，冲突时再比较
+            try:
+                method = self._link(src, dst, key)
+            except FileExistsError:
+                if os.path.samefile(src, dst):
+                    counts["skipped"] += 1
+                    continue
+                os.remove(dst)
+                method = self._link(src, dst, key)
+            counts[method] += 1
+        if owner is not None:
+            self.add_refs(owner, set(files.values()))
+        return counts
+
+    def _link(self, src, dst, key):
+        """用可用的最快方式生成 dst，返回使用的方式"""
+        start = self.methods.get(key, 0)
+        for i in range(start, len(self.METHODS)):
+            method = self.METHODS[i]
+            try:
+                if method == "reflink":
+                    _reflink(src, dst)
+                elif method == "hardlink":
+                    os.link(src, dst)
+                else:
+                    shutil.copyfile(src, dst)
+            except (OSError, ImportError) as e:
+                # 只有“不支持”类错误才退回下一种方式，其他错误直接抛出
+                if method == "copy" or (isinstance(e, OSError) and e.errno not in (
+                        errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.EPERM,
+                        errno.EMLINK, errno.ENOSYS, errno.EBADF)):
+                    raise
+                continue
+            self.methods[key] = i
+            return method
+        raise OSError(f"无法生成文件: {dst}")
+
+    # 引用与回收
+
+    def add_refs(self, owner, sha1s):
+        """登记 owner 引用了这些对象"""
+        conn = self.connection()
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO refs (owner, sha1) VALUES (?, ?)",
+                             [(owner, sha1) for sha1 in sha1s])
+
+    def remove_refs(self, owner):
+        """移除 owner 的所有引用（如删除实例后）"""
+        conn = self.connection()
+        with conn:
+            conn.execute("DELETE FROM refs WHERE owner = ?", (owner,))
+
+    def gc(self, dry_run=False):
+        """回收没有被任何实例引用的对象
+
+        仍有其他硬链接（st_nlink > 1）的对象说明实例目录里还在使用，即使引用丢失也保留。
+
+        Args:
+            dry_run: 为 True 时只统计不删除
+
+        Returns:
+            (回收的对象数, 回收的字节数)
+        """
+        conn = self.connection()
+        rows = conn.execute(
+            "SELECT sha1, size FROM objects WHERE sha1 NOT IN (SELECT sha1 FROM refs)"
+        ).fetchall()
+        removed = []
+        freed = 0
+        for sha1, size in rows:
+            path = self.path(sha1)
+            try:
+                if os.stat(path).st_nlink > 1:
+                    continue
+                if not dry_run:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+            removed.append((sha1,))
+            freed += size
+        if not dry_run and removed:
+            with conn:
+                conn.executemany("DELETE FROM objects WHERE sha1 = ?", removed)
+        return len(removed), freed
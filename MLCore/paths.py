@@ -0,0 +1,51 @@
+"""启动器数据与缓存目录
+
+默认遵循 XDG 规范；设置环境变量 MINELANCHER_HOME 后，数据与缓存都放在该目录下，
+便于便携模式和测试。
+"""
+import os
+
+ENV_HOME = "MINELANCHER_HOME"
+APP_NAME = "minelancher"
+
+def data_dir(*parts):
+    """数据目录（账号、实例、对象库等需要长期保存的内容）
+
+    Args:
+        parts: 追加在数据目录后的子路径
+
+    Returns:
+        目录的绝对路径，不存在时自动创建
+    """
+    home = os.environ.get(ENV_HOME)
+    if home:
+        base = home
+    else:
+        base = os.path.join(
+            os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"),
+            APP_NAME
+        )
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def cache_dir(*parts):
+    """缓存目录（删除后可以重新生成的内容）
+
+    Args:
+        parts: 追加在缓存目录后的子路径
+
+    Returns:
+        目录的绝对路径，不存在时自动创建
+    """
+    home = os.environ.get(ENV_HOME)
+    if home:
+        base = os.path.join(home, "cache")
+    else:
+        base = os.path.join(
+            os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+            APP_NAME
+        )
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,255 @@
+"""游戏进程管理
+
+启动游戏进程后由后台线程读取 stdout/stderr：
+- 按块读取并增量解码，逐行交给日志解析器（同时支持 log4j XML 布局与普通文本布局）
+- 解析出的日志记录写入有界的环形缓冲区，读取方按序号增量取用，跟不上时只丢最旧的记录
+- 另一个线程等待进程退出，记录退出码并根据输出判断是否崩溃
+
+本模块不依赖 Qt；界面通过 ui.process_bridge.ProcessBridge 定时批量取用日志。
+"""
+import codecs
+import os
+import re
+import subprocess
+import threading
+import time
+from collections import deque, namedtuple
+from itertools import islice
+
+# 一条日志；stream 为 "stdout" 或 "stderr"，无法解析的行（如堆栈）沿用上一条的级别
+LogRecord = namedtuple("LogRecord", "time level thread logger message stream")
+
+LEVELS = ("TRACE", "DEBUG", "INFO", "WARN", "ERROR", "FATAL")
+
+# [12:34:56] [Render thread/INFO]: message
+# [12:34:56] [main/INFO] [minecraft/Main]: message（Forge）
+PLAIN_PATTERN = re.compile(
+    r"^\[([^\]]+)\] \[(.+?)/(TRACE|DEBUG|INFO|WARN|ERROR|FATAL)\](?: \[([^\]]+)\])?: ?(.*)$"
+)
+XML_ATTR_PATTERN = re.compile(r'(\w+)="([^"]*)"')
+CDATA_PATTERN = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.S)
+CRASH_REPORT_PATTERN = re.compile(r"#@!@# Game crashed! Crash report saved to: #@!@# (.+)")
+
+READ_SIZE = 64 * 1024
+
+class LogParser:
+    """增量日志解析器
+
+    feed() 接受任意切分的文本块，返回其中完整的日志记录；
+    不完整的行与尚未结束的 XML 事件保留到下一次 feed()。
+    """
+
+    def __init__(self, stream="stdout"):
+        self.stream = stream
+        self.partial = ""
+        # 正在累积的 XML 事件行，不在事件中时为 None
+        self.event_lines = None
+        self.last_level = "INFO"
+
+    def feed(self, text):
+        """解析一段文本
+
+        Returns:
+            LogRecord 列表
+        """
+        lines = (self.partial + text).split("\n")
+        self.partial = lines.pop()
+        records = []
+        for line in lines:
+            record = self.parse_line(line.rstrip("\r"))
+            if record is not None:
+                records.append(record)
+        return records
+
+    def flush(self):
+        """输出剩余的不完整行（流结束时调用）"""
+        records = self.feed("\n") if self.partial else []
+        if self.event_lines:
+            records.append(self._plain_record("\n".join(self.event_lines)))
+            self.event_lines = None
+        return records
+
+    def parse_line(self, line):
+        if self.event_lines is not None:
+            self.event_lines.append(line)
+            if "</log4j:Event>" in line:
+                text = "\n".join(self.event_lines)
+                self.event_lines = None
+                return self._xml_record(text)
+            return None
+        if line.startswith("<log4j:Event"):
+            self.event_lines = [line]
+            if "</log4j:Event>" in line:
+                self.event_lines = None
+                return self._xml_record(line)
+            return None
+        match = PLAIN_PATTERN.match(line)
+        if match:
+            when, thread, level, logger, message = match.groups()
+            self.last_level = level
+            return LogRecord(when, level, thread, logger, message, self.stream)
+        return self._plain_record(line)
+
+    def _plain_record(self, line):
+        return LogRecord(None, self.last_level, None, None, line, self.stream)
+
+    def _xml_record(self, text):
+        head = text[:text.find(">") + 1]
+        attrs = dict(XML_ATTR_PATTERN.findall(head))
+        message = "\n".join(CDATA_PATTERN.findall(text))
+        level = attrs.get("level", "INFO")
+        self.last_level = level
+        timestamp = attrs.get("timestamp")
+        when = time.strftime("%H:%M:%S", time.localtime(int(timestamp) / 1000)) if timestamp else None
+        return LogRecord(when, level, attrs.get("thread"), attrs.get("logger"), message, self.stream)
+
+class RingBuffer:
+    """有界的环形缓冲区（线程安全）
+
+    每个元素有一个单调递增的序号；读取方保存自己的游标，用 read_since() 增量读取。
+    """
+
+    def __init__(self, capacity=100000):
+        self.items = deque(maxlen=capacity)
+        # 已写入的元素总数，即下一个元素的序号
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def extend(self, items):
+        with self.lock:
+            self.items.extend(items)
+            self.total += len(items)
+
+    def read_since(self, cursor, limit=None):
+        """读取序号不小于 cursor 的元素
+
+        Args:
+            cursor: 上次读取返回的游标
+            limit: 最多返回的元素数；积压超过 limit 时跳过较旧的元素，只返回最新的 limit 个
+
+        Returns:
+            (元素列表, 新游标, 被跳过或已被覆盖的元素数)
+        """
+        with self.lock:
+            first = self.total - len(self.items)
+            start = max(cursor, first)
+            if limit is not None:
+                start = max(start, self.total - limit)
+            items = list(islice(self.items, start - first, None))
+            return items, self.total, start - cursor
+
+    def snapshot(self):
+        """缓冲区中当前的全部元素"""
+        with self.lock:
+            return list(self.items)
+
+class GameProcess:
+    """游戏进程
+
+    Attributes:
+        buffer: 日志记录的环形缓冲区
+        returncode: 退出码，运行中为 None
+        crashed: 是否崩溃（退出码非零或输出了崩溃报告）
+        crash_report: 崩溃报告路径，没有时为 None
+    """
+
+    def __init__(self, buffer_capacity=100000):
+        self.buffer = RingBuffer(buffer_capacity)
+        self.process = None
+        self.returncode = None
+        self.crashed = False
+        self.crash_report = None
+        self.started_at = None
+        self.readers = []
+        self.finished = threading.Event()
+
+    def start(self, command, cwd=None, env=None):
+        """启动进程，立即返回；输出由后台线程读取
+
+        Args:
+            command: 参数列表（如 LaunchPlan.command() 的结果）
+            cwd: 工作目录（游戏目录）
+            env: 环境变量，默认继承当前进程
+        """
+        self.started_at = time.monotonic()
+        self.process = subprocess.Popen(
+            command, cwd=cwd, env=env,
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            # 独立的进程组，结束游戏时连同它的子进程一起结束
+            start_new_session=(os.name == "posix")
+        )
+        self.readers = [
+            threading.Thread(target=self._read, args=(self.process.stdout, "stdout"), daemon=True,
+                             name="GameStdout"),
+            threading.Thread(target=self._read, args=(self.process.stderr, "stderr"), daemon=True,
+                             name="GameStderr"),
+        ]
+        for reader in self.readers:
+            reader.start()
+        threading.Thread(target=self._wait, daemon=True, name="GameWaiter").start()
+
+    @property
+    def pid(self):
+        return self.process.pid if self.process else None
+
+    def running(self):
+        return self.process is not None and not self.finished.is_set()
+
+    def _read(self, pipe, stream):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        parser = LogParser(stream)
+        fd = pipe.fileno()
+        while True:
+            chunk = os.read(fd, READ_SIZE)
+            if not chunk:
+                break
+            records = parser.feed(decoder.decode(chunk))
+            if records:
+                self._check_crash(records)
+                self.buffer.extend(records)
+        records = parser.feed(decoder.decode(b"", final=True)) + parser.flush()
+        if records:
+            self._check_crash(records)
+            self.buffer.extend(records)
+        pipe.close()
+
+    def _check_crash(self, records):
+        for record in records:
+            if "#@!@#" in record.message:
+                match = CRASH_REPORT_PATTERN.search(record.message)
+                self.crashed = True
+                if match:
+                    self.crash_report = match.group(1).strip()
+
+    def _wait(self):
+        returncode = self.process.wait()
+        # 等输出读完，保证 finished 之后缓冲区里已经有全部日志
+        for reader in self.readers:
+            reader.join()
+        self.returncode = returncode
+        if returncode != 0:
+            self.crashed = True
+        self.finished.set()
+
+    def wait(self, timeout=None):
+        """等待进程结束并读完输出，返回退出码（超时返回 None）"""
+        self.finished.wait(timeout)
+        return self.returncode
+
+    def terminate(self):
+        """请求进程结束"""
+        if self.running():
+            self.process.terminate()
+
+    def kill(self):
+        """强制结束进程（连同进程组）"""
+        if not self.running():
+            return
+        if os.name == "posix":
+            import signal
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        else:
+            self.process.kill()
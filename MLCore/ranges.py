@@ -0,0 +1,303 @@
+"""版本号比较与版本范围
+
+模组声明依赖时使用两类写法：
+- Maven 范围（Forge/NeoForge 的 versionRange、mcmod.info）："[1.0,2.0)"、"(,1.5]"、"[1.2]"，
+  逗号连接的多个区间取并集；不带括号的版本号只是“推荐版本”，不限制版本
+- SemVer 风格（Fabric）：">=1.2 <2"、"^1.2.3"、"~1.2"、"1.2.x"、"*"，空格连接的比较取交集，
+  "||" 连接的取并集；不带运算符的版本号表示精确匹配
+
+版本号统一转换为可比较的键：数字段按数值比较，末尾的 0 不影响结果（1.0 == 1.0.0），
+alpha < beta < milestone < rc < snapshot < 正式版 < sp < 其他后缀 < 数字，"+" 之后的构建信息忽略。
+范围表示为有序、互不相交的区间列表，支持包含判断、交集与并集。
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# 预发布后缀的先后顺序
+QUALIFIERS = {
+    "alpha": 0, "a": 0,
+    "beta": 1, "b": 1,
+    "milestone": 2, "m": 2,
+    "rc": 3, "cr": 3, "pre": 3,
+    "snapshot": 4,
+}
+# 与正式版等价的后缀
+RELEASE_ALIASES = frozenset(("final", "ga", "release"))
+
+# 版本键中各项的类别，类别不同时按类别比较
+_QUALIFIER = 1
+_RELEASE = 2
+_SERVICE_PACK = 3
+_STRING = 4
+_NUMBER = 5
+# 版本键末尾的哨兵：较短的版本与较长版本比较时，相当于用“正式版”补齐
+_END = (_RELEASE, 0)
+
+TOKEN_PATTERN = re.compile(r"\d+|[a-z]+")
+NUMBERS_PATTERN = re.compile(r"(\d+)(?:\.(\d+))?(?:\.(\d+))?")
+COMPARATOR_PATTERN = re.compile(r"(>=|<=|>|<|=|\^|~>?)?\s*([^\s<>=^~]+)")
+MAVEN_PATTERN = re.compile(r"\s*([\[(])([^\[\]()]*)([\])])\s*(?:,|$)")
+WILDCARDS = frozenset(("x", "X", "*"))
+
+class RangeError(ValueError):
+    """版本范围无法解析"""
+
+@lru_cache(maxsize=16384)
+def version_key(version):
+    """版本号的比较键
+
+    Args:
+        version: 版本号字符串
+
+    Returns:
+        元组，可直接比较大小或判断相等
+    """
+    text = version.strip().lower().split("+", 1)[0]
+    if text[:1] == "v" and text[1:2].isdigit():
+        text = text[1:]
+    items = []
+    run = []
+    for token in TOKEN_PATTERN.findall(text):
+        if token.isdigit():
+            run.append(int(token))
+            continue
+        _flush_numbers(run, items)
+        if token in RELEASE_ALIASES:
+            continue
+        if token in QUALIFIERS:
+            items.append((_QUALIFIER, QUALIFIERS[token]))
+        elif token == "sp":
+            items.append((_SERVICE_PACK, 0))
+        else:
+            items.append((_STRING, token))
+    _flush_numbers(run, items)
+    items.append(_END)
+    return tuple(items)
+
+def _flush_numbers(run, items):
+    """把一段连续的数字加入版本键，去掉末尾的 0"""
+    while run and run[-1] == 0:
+        run.pop()
+    items.extend((_NUMBER, number) for number in run)
+    run.clear()
+
+def compare_versions(a, b):
+    """比较两个版本号，返回 -1、0 或 1"""
+    a, b = version_key(a), version_key(b)
+    return (a > b) - (a < b)
+
+# 一个区间；low/high 为版本键，None 表示无界
+Interval = namedtuple("Interval", "low low_inclusive high high_inclusive")
+
+def _interval_empty(interval):
+    if interval.low is None or interval.high is None:
+        return False
+    if interval.low == interval.high:
+        return not (interval.low_inclusive and interval.high_inclusive)
+    return interval.low > interval.high
+
+def _low_order(interval):
+    # 无下界排在最前；同一下界时包含端点的在前
+    if interval.low is None:
+        return (0, ())
+    return (1, interval.low, not interval.low_inclusive)
+
+def _touches(first, second):
+    """按下界排序后相邻的两个区间是否重叠或首尾相接（可以合并）"""
+    if first.high is None or second.low is None:
+        return True
+    if first.high > second.low:
+        return True
+    return first.high == second.low and (first.high_inclusive or second.low_inclusive)
+
+def _normalize(intervals):
+    """排序、去掉空区间并合并重叠的区间"""
+    intervals = sorted((item for item in intervals if not _interval_empty(item)), key=_low_order)
+    merged = []
+    for item in intervals:
+        if merged and _touches(merged[-1], item):
+            last = merged[-1]
+            if last.high is None:
+                continue
+            if item.high is None or item.high > last.high or (
+                    item.high == last.high and item.high_inclusive):
+                merged[-1] = Interval(last.low, last.low_inclusive, item.high, item.high_inclusive)
+        else:
+            merged.append(item)
+    return tuple(merged)
+
+class VersionRange:
+    """版本范围：若干互不相交的区间的并集"""
+
+    __slots__ = ("intervals", "text")
+
+    def __init__(self, intervals, text=""):
+        """初始化版本范围
+
+        Args:
+            intervals: Interval 列表，会被排序与合并
+            text: 范围的原文，用于显示
+        """
+        self.intervals = _normalize(intervals)
+        self.text = text
+
+    def __repr__(self):
+        return f"VersionRange({self.text or self.intervals!r})"
+
+    def __str__(self):
+        return self.text or "*"
+
+    def __eq__(self, other):
+        return isinstance(other, VersionRange) and self.intervals == other.intervals
+
+    def __hash__(self):
+        return hash(self.intervals)
+
+    def is_empty(self):
+        return not self.intervals
+
+    def is_any(self):
+        return self.intervals == (Interval(None, False, None, False),)
+
+    def contains(self, version):
+        """版本号（字符串或版本键）是否在范围内"""
+        key = version_key(version) if isinstance(version, str) else version
+        for interval in self.intervals:
+            if interval.low is not None and (
+                    key < interval.low or (key == interval.low and not interval.low_inclusive)):
+                # 区间按下界排序，后面的区间下界更大
+                return False
+            if interval.high is None or key < interval.high or (
+                    key == interval.high and interval.high_inclusive):
+                return True
+        return False
+
+    __contains__ = contains
+
+    def intersect(self, other):
+        """两个范围的交集"""
+        result = []
+        for a in self.intervals:
+            for b in other.intervals:
+                if a.low is None or (b.low is not None and (
+                        b.low > a.low or (b.low == a.low and not b.low_inclusive))):
+                    low, low_inclusive = b.low, b.low_inclusive
+                else:
+                    low, low_inclusive = a.low, a.low_inclusive
+                if a.high is None or (b.high is not None and (
+                        b.high < a.high or (b.high == a.high and not b.high_inclusive))):
+                    high, high_inclusive = b.high, b.high_inclusive
+                else:
+                    high, high_inclusive = a.high, a.high_inclusive
+                result.append(Interval(low, low_inclusive, high, high_inclusive))
+        text = " ".join(str(item) for item in (self, other) if not item.is_any())
+        return VersionRange(result, text)
+
+    def union(self, other):
+        """两个范围的并集"""
+        return VersionRange(self.intervals + other.intervals, f"{self} || {other}")
+
+ANY = VersionRange([Interval(None, False, None, False)], "*")
+EMPTY = VersionRange([], "∅")
+
+def _exact(version):
+    key = version_key(version)
+    return Interval(key, True, key, True)
+
+def _bump(numbers, position):
+    """numbers 的第 position 段加一、之后的段截去，作为开区间上界"""
+    bumped = list(numbers[:position + 1])
+    bumped[position] += 1
+    return version_key(".".join(str(number) for number in bumped))
+
+def _parse_comparator(op, version):
+    parts = version.split(".")
+    if version in WILDCARDS:
+        return ANY.intervals[0]
+    if parts[-1] in WILDCARDS:
+        # 1.2.x：相当于 ~1.2
+        prefix = [part for part in parts if part not in WILDCARDS]
+        numbers = [int(part) for part in prefix if part.isdigit()]
+        if len(numbers) != len(prefix):
+            raise RangeError(version)
+        return Interval(version_key(".".join(prefix)), True, _bump(numbers, len(numbers) - 1), False)
+    key = version_key(version)
+    if op in (None, "="):
+        return Interval(key, True, key, True)
+    if op == ">=":
+        return Interval(key, True, None, False)
+    if op == ">":
+        return Interval(key, False, None, False)
+    if op == "<=":
+        return Interval(None, False, key, True)
+    if op == "<":
+        return Interval(None, False, key, False)
+    match = NUMBERS_PATTERN.match(version)
+    if match is None:
+        raise RangeError(version)
+    numbers = [int(group) for group in match.groups() if group is not None]
+    if op == "^":
+        # 第一个非零段不变
+        position = next((i for i, number in enumerate(numbers) if number), len(numbers) - 1)
+        return Interval(key, True, _bump(numbers, position), False)
+    # ~ 与 ~>：有次版本号时次版本号不变，否则主版本号不变
+    return Interval(key, True, _bump(numbers, 1 if len(numbers) > 1 else 0), False)
+
+def parse_semver_range(text):
+    """解析 SemVer 风格的范围（Fabric）"""
+    alternatives = []
+    for alternative in text.split("||"):
+        alternative = alternative.strip()
+        current = ANY
+        if alternative:
+            if COMPARATOR_PATTERN.sub("", alternative).strip():
+                raise RangeError(text)
+            for match in COMPARATOR_PATTERN.finditer(alternative):
+                current = current.intersect(VersionRange([_parse_comparator(*match.groups())]))
+        alternatives.extend(current.intervals)
+    return VersionRange(alternatives, text)
+
+def parse_maven_range(text):
+    """解析 Maven 范围（Forge/NeoForge、mcmod.info）；不带括号的版本号不限制版本"""
+    stripped = text.strip()
+    if not stripped or stripped[0] not in "[(":
+        return VersionRange(ANY.intervals, text or "*")
+    intervals = []
+    position = 0
+    while position < len(stripped):
+        match = MAVEN_PATTERN.match(stripped, position)
+        if match is None:
+            raise RangeError(text)
+        position = match.end()
+        opening, body, closing = match.groups()
+        if "," not in body:
+            if opening != "[" or closing != "]" or not body.strip():
+                raise RangeError(text)
+            intervals.append(_exact(body.strip()))
+            continue
+        low, high = (part.strip() for part in body.split(",", 1))
+        intervals.append(Interval(
+            version_key(low) if low else None, opening == "[" and bool(low),
+            version_key(high) if high else None, closing == "]" and bool(high),
+        ))
+    return VersionRange(intervals, text)
+
+@lru_cache(maxsize=4096)
+def parse_range(text, syntax="semver"):
+    """解析版本范围
+
+    Args:
+        text: 范围原文；以 [ 或 ( 开头时总是按 Maven 范围解析
+        syntax: 其余写法的语法，semver（Fabric）或 maven（Forge）
+
+    Returns:
+        VersionRange
+
+    Raises:
+        RangeError: 无法解析
+    """
+    stripped = text.strip()
+    if stripped[:1] in ("[", "(") or syntax == "maven":
+        return parse_maven_range(stripped)
+    return parse_semver_range(stripped)
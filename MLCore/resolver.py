@@ -0,0 +1,254 @@
+"""模组依赖与冲突检查
+
+在 MLCore.mods 索引出的模组图上检查：
+- 必需依赖是否存在、版本是否在声明的范围内（版本范围见 MLCore.ranges）
+- 声明为不兼容的模组是否同时启用
+- 同一个模组 ID 是否由多个 jar 提供
+
+mods 目录中的每个模组 ID 只有一个提供者（重复本身就是错误），不需要在多个版本之间搜索，
+检查归结为逐条核对依赖声明：按目标 ID 建立反向索引，每条声明的结果单独保存。
+启用或禁用一个 jar 时只重新核对：
+- 该 jar 自己的依赖声明（加入或移除）
+- 以该 jar 提供的模组 ID 为目标的声明（提供者变了）
+其余声明的结果保持不变，单次切换的开销与这个 jar 的度数成正比，而不是与整个图的规模成正比。
+"""
+from collections import namedtuple
+from .mods import select_mods
+from .ranges import ANY, RangeError, parse_range, version_key
+
+# 一个检查结果
+# severity: error（阻止启动）或 warning
+# kind: missing / version / incompatible / discouraged / duplicate / bad_range
+# mod_id、file: 声明依赖的模组与所在 jar 的文件名；duplicate 时为重复的模组 ID 与第一个 jar
+# target: 依赖的目标模组 ID；ranges: 声明的版本范围原文
+# found: 目标的实际版本；duplicate 时为提供该 ID 的全部 jar 文件名
+Problem = namedtuple("Problem", "severity kind mod_id file target ranges found")
+
+# 由游戏与加载器本身提供的 ID：没有在 environment 中给出版本时不检查对它们的依赖
+BUILTIN_IDS = frozenset((
+    "minecraft", "java", "fabricloader", "fabric-loader", "quilt_loader",
+    "forge", "neoforge", "javafml", "lowcodefml", "mcp", "fml",
+))
+
+# 各加载器的依赖声明使用的范围语法
+RANGE_SYNTAX = {
+    "fabric": "semver",
+    "forge": "maven",
+    "neoforge": "maven",
+}
+
+# 版本不符时的严重程度，按依赖类型
+MISMATCH_SEVERITY = {
+    "required": "error",
+    "recommended": "warning",
+}
+
+def dependency_range(mod, dependency):
+    """依赖声明的版本范围；多个范围取并集，无法解析时返回 None"""
+    syntax = RANGE_SYNTAX.get(mod.loader, "semver")
+    result = None
+    try:
+        for text in dependency.ranges:
+            parsed = parse_range(text, syntax)
+            result = parsed if result is None else result.union(parsed)
+    except RangeError:
+        return None
+    return result or ANY
+
+class ModResolver:
+    """模组依赖检查器，支持按单个 jar 增量更新"""
+
+    def __init__(self, files, environment=None, loader=None):
+        """建立依赖图并完整检查一次
+
+        Args:
+            files: MLCore.mods.ModFile 列表，只有已启用且已解析的参与检查
+            environment: {模组 ID: 版本}，游戏与加载器本身提供的模组（如 minecraft、fabricloader、java）
+            loader: 实例的加载器，多加载器 jar 只检查它的元数据（见 MLCore.mods.select_mods）
+        """
+        self.loader = loader
+        self.environment = {mod_id: version_key(version) for mod_id, version in (environment or {}).items()}
+        self.environment_text = dict(environment or {})
+        self.files = {}
+        # 模组 ID（含 provides 别名）-> {jar 路径: ModInfo}
+        self.providers = {}
+        # 目标 ID -> {声明键: (ModInfo, jar 文件名, Dependency, VersionRange 或 None)}
+        # 声明键为 (jar 路径, 模组 ID, 依赖序号)
+        self.dependents = {}
+        # 目标 ID -> {声明键或 "duplicate": Problem}
+        self.results = {}
+        for item in files:
+            self.files[item.path] = item
+            self._add(item)
+        for target in set(self.dependents) | set(self.providers):
+            self._check_target(target)
+
+    def _active(self, item):
+        return item is not None and item.enabled and item.mods
+
+    def _mods(self, item):
+        return select_mods(item.mods, self.loader)
+
+    def _add(self, item):
+        """登记一个 jar 提供的模组与依赖声明，返回它提供的模组 ID 与新增的 [(目标 ID, 声明键), ...]"""
+        if not self._active(item):
+            return set(), []
+        provided = set()
+        added = []
+        for mod in self._mods(item):
+            for mod_id in (mod.mod_id,) + mod.provides:
+                self.providers.setdefault(mod_id, {})[item.path] = mod
+                provided.add(mod_id)
+            for number, dependency in enumerate(mod.dependencies):
+                if dependency.mod_id == mod.mod_id:
+                    continue
+                key = (item.path, mod.mod_id, number)
+                self.dependents.setdefault(dependency.mod_id, {})[key] = (
+                    mod, item.name, dependency, dependency_range(mod, dependency)
+                )
+                added.append((dependency.mod_id, key))
+        return provided, added
+
+    def _remove(self, item):
+        """移除一个 jar 的模组与依赖声明，返回它提供的模组 ID 与依赖的目标 ID"""
+        if not self._active(item):
+            return set(), set()
+        provided = set()
+        targets = set()
+        for mod in self._mods(item):
+            for mod_id in (mod.mod_id,) + mod.provides:
+                providers = self.providers.get(mod_id)
+                if providers is not None:
+                    providers.pop(item.path, None)
+                    if not providers:
+                        del self.providers[mod_id]
+                provided.add(mod_id)
+            for number, dependency in enumerate(mod.dependencies):
+                key = (item.path, mod.mod_id, number)
+                constraints = self.dependents.get(dependency.mod_id)
+                if constraints is not None and constraints.pop(key, None) is not None:
+                    results = self.results.get(dependency.mod_id)
+                    if results is not None:
+                        results.pop(key, None)
+                        if not results:
+                            del self.results[dependency.mod_id]
+                    if not constraints:
+                        del self.dependents[dependency.mod_id]
+                targets.add(dependency.mod_id)
+        return provided, targets
+
+    def update(self, old_path, item):
+        """增量更新一个 jar：启用/禁用（重命名）、替换或删除
+
+        Args:
+            old_path: 更新前的路径，新增时为 None
+            item: 更新后的 ModFile（如 ModIndex.set_enabled() 的返回值），删除时为 None
+
+        Returns:
+            受影响的模组 ID 集合
+        """
+        old = self.files.pop(old_path, None) if old_path is not None else None
+        removed_provided, removed_targets = self._remove(old)
+        if item is not None:
+            self.files[item.path] = item
+        added_provided, added = self._add(item)
+        # 提供者变化的 ID：全部声明重新核对；其余 ID 只需要核对新增的声明
+        provided = removed_provided | added_provided
+        for target in provided:
+            self._check_target(target)
+        for target, key in added:
+            if target not in provided:
+                self._store(target, key, self._check_constraint(target, self.dependents[target][key]))
+        return provided | removed_targets | {target for target, _ in added}
+
+    def _store(self, target, key, problem):
+        results = self.results.setdefault(target, {})
+        if problem is None:
+            results.pop(key, None)
+            if not results:
+                del self.results[target]
+        else:
+            results[key] = problem
+
+    def _found(self, target):
+        """目标 ID 的实际版本：(是否存在, 版本键, 版本原文)"""
+        if target in self.environment:
+            return True, self.environment[target], self.environment_text[target]
+        providers = self.providers.get(target)
+        if not providers:
+            return False, None, None
+        mod = next(iter(providers.values()))
+        return True, version_key(mod.version), mod.version
+
+    def _check_target(self, target):
+        """重新核对以 target 为目标的全部声明，以及 target 是否重复"""
+        self.results.pop(target, None)
+        providers = self.providers.get(target, {})
+        # 只有作为主 ID 出现在多个 jar 中才算重复，provides 别名与主 ID 同名时以主 ID 为准
+        primary = [path for path, mod in providers.items() if mod.mod_id == target]
+        if len(primary) > 1:
+            names = tuple(sorted(self.files[path].name for path in primary))
+            self._store(target, "duplicate", Problem("error", "duplicate", target, names[0], target, (), names))
+        for key, constraint in self.dependents.get(target, {}).items():
+            self._store(target, key, self._check_constraint(target, constraint))
+
+    def _check_constraint(self, target, constraint):
+        mod, file_name, dependency, version_range = constraint
+        kind = dependency.kind
+        if version_range is None:
+            return Problem("warning", "bad_range", mod.mod_id, file_name, target, dependency.ranges, None)
+        present, key, text = self._found(target)
+        if not present:
+            if kind == "required" and target not in BUILTIN_IDS:
+                return Problem("error", "missing", mod.mod_id, file_name, target, dependency.ranges, None)
+            if kind == "recommended" and target not in BUILTIN_IDS:
+                return Problem("warning", "missing", mod.mod_id, file_name, target, dependency.ranges, None)
+            return None
+        in_range = version_range.contains(key)
+        if kind in ("incompatible", "discouraged"):
+            if not in_range:
+                return None
+            severity = "error" if kind == "incompatible" else "warning"
+            return Problem(severity, kind, mod.mod_id, file_name, target, dependency.ranges, text)
+        if in_range:
+            return None
+        # Forge 的可选依赖存在时同样要求版本符合；Fabric 的 suggests 只是建议
+        severity = MISMATCH_SEVERITY.get(kind, "warning" if mod.loader == "fabric" else "error")
+        return Problem(severity, "version", mod.mod_id, file_name, target, dependency.ranges, text)
+
+    def problems(self):
+        """全部检查结果，错误在前，按 jar 文件名排序"""
+        problems = [problem for results in self.results.values() for problem in results.values()]
+        problems.sort(key=lambda p: (p.severity != "error", p.file.lower(), p.mod_id, p.target))
+        return problems
+
+    def errors(self):
+        """阻止启动的检查结果"""
+        return [problem for problem in self.problems() if problem.severity == "error"]
+
+    def problem_files(self):
+        """有检查结果的 jar 文件名 -> 最严重的程度"""
+        files = {}
+        for results in self.results.values():
+            for problem in results.values():
+                names = problem.found if problem.kind == "duplicate" else (problem.file,)
+                for name in names:
+                    if files.get(name) != "error":
+                        files[name] = problem.severity
+        return files
+
+def check_mods_dir(mods_dir, environment=None, index=None, loader=None):
+    """索引一个 mods 目录并检查依赖（启动前调用）
+
+    Args:
+        mods_dir: mods 目录，不存在时视为没有模组
+        environment: 见 ModResolver
+        index: MLCore.mods.ModIndex，默认新建一个
+        loader: 实例的加载器，见 ModResolver
+
+    Returns:
+        ModResolver
+    """
+    from .mods import ModIndex
+    files = (index or ModIndex()).scan(mods_dir)
+    return ModResolver(files, environment, loader)
@@ -0,0 +1,169 @@
+"""增量文件校验
+
+启动前需要确认所有库、客户端 jar 与资源都存在且 SHA-1 正确。
+校验索引记录每个文件上次校验时的 (大小, mtime_ns, inode, sha1)，
+再次校验时只对文件状态发生变化的文件重新计算哈希，其余只需要一次 stat。
+
+需要重新计算的数据量较大时交给进程池，大文件用 mmap 读取。
+"""
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from . import paths
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    PRIMARY KEY (root, path)
+) WITHOUT ROWID;
+"""
+
+# 校验结果：missing 与 mismatched 为相对路径列表，hashed 为本次重新计算哈希的文件数
+# missing 包括不存在与无法访问（stat 或读取失败）的文件
+VerifyResult = namedtuple("VerifyResult", "missing mismatched hashed checked")
+
+# 不小于该大小的文件用 mmap 读取
+MMAP_THRESHOLD = 1024 * 1024
+# 需要重新计算的总字节数超过该值时才启用进程池，小批量时进程启动的开销反而更大
+POOL_THRESHOLD = 64 * 1024 * 1024
+# mtime 距今不足该时长（纳秒）的文件不写入索引：同一时间精度内的再次修改无法从 mtime 上看出来
+RACY_WINDOW_NS = 2 * 10 ** 9
+
+def sha1_file(path):
+    """计算文件的 SHA-1，大文件用 mmap 避免分块读取的复制"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha1(mm).hexdigest()
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _sha1_or_none(path):
+    """计算 SHA-1；stat 之后文件被删除或替换成目录等读取失败时为 None"""
+    try:
+        return sha1_file(path)
+    except OSError:
+        return None
+
+def _sha1_batch(paths_):
+    return [_sha1_or_none(path) for path in paths_]
+
+class VerifyIndex:
+    """校验索引"""
+
+    def __init__(self, db_path=None, workers=None):
+        """初始化校验索引
+
+        Args:
+            db_path: 索引数据库路径，默认在缓存目录下的 verify.db（删除后只会导致重新计算哈希）
+            workers: 进程池大小，默认为 CPU 数
+        """
+        self.db_path = db_path or os.path.join(paths.cache_dir(), "verify.db")
+        self.workers = workers or os.cpu_count() or 1
+        self.local = threading.local()
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def connection(self):
+        """当前线程的数据库连接"""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def verify(self, root, entries):
+        """校验一组文件
+
+        Args:
+            root: 文件所在的根目录（如游戏目录）
+            entries: [(相对路径, 大小, sha1), ...]，大小或 sha1 未知时为 None
+
+        Returns:
+            VerifyResult
+        """
+        root = os.path.abspath(root)
+        conn = self.connection()
+        cached = {
+            row[0]: row[1:]
+            for row in conn.execute("SELECT path, size, mtime_ns, inode, sha1 FROM files WHERE root = ?", (root,))
+        }
+
+        missing = []
+        mismatched = []
+        # 需要重新计算哈希的 (相对路径, 期望的 sha1, stat)
+        to_hash = []
+        for rel_path, size, sha1 in entries:
+            try:
+                stat = os.stat(os.path.join(root, rel_path))
+            except OSError:
+                # 不存在、上级路径变成了文件（NotADirectoryError）或没有权限：都需要重新下载
+                missing.append(rel_path)
+                continue
+            if size is not None and stat.st_size != size:
+                mismatched.append(rel_path)
+                continue
+            if sha1 is None:
+                continue
+            record = cached.get(rel_path)
+            if record is not None and record[:3] == (stat.st_size, stat.st_mtime_ns, stat.st_ino):
+                if record[3] != sha1:
+                    mismatched.append(rel_path)
+                continue
+            to_hash.append((rel_path, sha1, stat))
+
+        digests = self._hash([os.path.join(root, item[0]) for item in to_hash],
+                             [item[2].st_size for item in to_hash])
+        now_ns = time.time_ns()
+        rows = []
+        for (rel_path, sha1, stat), digest in zip(to_hash, digests):
+            if digest is None:
+                missing.append(rel_path)
+                continue
+            if digest != sha1:
+                mismatched.append(rel_path)
+            if now_ns - stat.st_mtime_ns > RACY_WINDOW_NS:
+                rows.append((root, rel_path, stat.st_size, stat.st_mtime_ns, stat.st_ino, digest))
+        if rows:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO files (root, path, size, mtime_ns, inode, sha1) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+        return VerifyResult(missing, mismatched, len(to_hash), len(entries))
+
+    def _hash(self, file_paths, sizes):
+        """计算一批文件的 SHA-1，数据量大时分批交给进程池"""
+        if not file_paths:
+            return []
+        if sum(sizes) < POOL_THRESHOLD or self.workers == 1:
+            return _sha1_batch(file_paths)
+        # 按大小排序后轮流分配，让各个进程的数据量大致相同
+        order = sorted(range(len(file_paths)), key=lambda i: -sizes[i])
+        batches = [order[i::self.workers] for i in range(self.workers)]
+        digests = [None] * len(file_paths)
+        with ProcessPoolExecutor(self.workers) as executor:
+            results = executor.map(_sha1_batch, [[file_paths[i] for i in batch] for batch in batches])
+            for batch, batch_digests in zip(batches, results):
+                for i, digest in zip(batch, batch_digests):
+                    digests[i] = digest
+        return digests
+
+    def forget(self, root):
+        """删除某个根目录的全部记录"""
+        conn = self.connection()
+        with conn:
+            conn.execute("DELETE FROM files WHERE root = ?", (os.path.abspath(root),))
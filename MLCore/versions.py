@@ -0,0 +1,540 @@
+"""版本清单与版本 JSON
+
+- HttpCache：按 URL 缓存响应体，记录 ETag/Last-Modified，刷新时发送条件请求，304 时直接沿用缓存
+- 解析结果是带 __slots__ 的不可变数据类，重复出现的字符串（库名、规则、OS 名等）全部驻留
+- 解析结果再以 pickle 缓存在磁盘上，源文件没有变化时不需要重新解析 JSON
+- inheritsFrom 链（Forge/Fabric 等）只合并一次，按整条链的文件状态缓存合并结果
+
+打开版本选择界面时只读取本地缓存，不访问网络；需要时再在后台调用 refresh_manifest()。
+"""
+import dataclasses
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from . import paths
+
+MANIFEST_URL = "https://piston-meta.mojang.com/mc/game/version_manifest_v2.json"
+LIBRARIES_URL = "https://libraries.minecraft.net/"
+
+# 解析结果的格式版本，修改数据类后递增，旧的 pickle 缓存自动失效
+PARSE_VERSION = 1
+
+intern = sys.intern
+
+def _intern_opt(value):
+    return intern(value) if isinstance(value, str) else value
+
+class VersionError(Exception):
+    """版本不存在或版本文件无法获取"""
+
+# 数据结构
+
+class _Record:
+    """不可变数据类的基类：frozen 数据类带 __slots__ 时默认的 pickle 无法恢复，改为按字段重新构造"""
+    __slots__ = ()
+
+    def __reduce__(self):
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+@dataclass(frozen=True)
+class ManifestVersion(_Record):
+    """版本清单中的一项"""
+    __slots__ = ("id", "type", "url", "release_time", "sha1")
+    id: str
+    type: str
+    url: str
+    release_time: str
+    sha1: str
+
+@dataclass(frozen=True)
+class VersionManifest(_Record):
+    """版本清单"""
+    __slots__ = ("latest_release", "latest_snapshot", "versions", "by_id")
+    latest_release: str
+    latest_snapshot: str
+    # 按发布时间从新到旧
+    versions: tuple
+    # id -> ManifestVersion
+    by_id: dict
+
+    def get(self, version_id):
+        return self.by_id.get(version_id)
+
+@dataclass(frozen=True)
+class Download(_Record):
+    """一个可下载的文件；path 为相对于所在目录（如 libraries）的路径，未知时为 None"""
+    __slots__ = ("path", "url", "sha1", "size")
+    path: str
+    url: str
+    sha1: str
+    size: int
+
+@dataclass(frozen=True)
+class Rule(_Record):
+    """库或参数的启用规则
+
+    features 为 ((特性名, 值), ...)，os_* 为 None 表示不限制。
+    """
+    __slots__ = ("action", "os_name", "os_arch", "os_version", "features")
+    action: str
+    os_name: str
+    os_arch: str
+    os_version: str
+    features: tuple
+
+@dataclass(frozen=True)
+class Argument(_Record):
+    """一组受同一组规则控制的参数"""
+    __slots__ = ("values", "rules")
+    values: tuple
+    rules: tuple
+
+@dataclass(frozen=True)
+class Library(_Record):
+    """一个库
+
+    natives 为 ((OS 名, 分类器模板), ...)，classifiers 为 ((分类器, Download), ...)。
+    """
+    __slots__ = ("name", "group", "artifact", "version", "classifier", "download",
+                 "natives", "classifiers", "extract_exclude", "rules")
+    name: str
+    group: str
+    artifact: str
+    version: str
+    classifier: str
+    download: Download
+    natives: tuple
+    classifiers: tuple
+    extract_exclude: tuple
+    rules: tuple
+
+@dataclass(frozen=True)
+class AssetIndexRef(_Record):
+    """版本引用的资源索引"""
+    __slots__ = ("id", "url", "sha1", "size", "total_size")
+    id: str
+    url: str
+    sha1: str
+    size: int
+    total_size: int
+
+@dataclass(frozen=True)
+class LoggingConfig(_Record):
+    """客户端日志配置（log4j 配置文件与对应的 JVM 参数模板）"""
+    __slots__ = ("argument", "file")
+    argument: str
+    file: Download
+
+@dataclass(frozen=True)
+class Version(_Record):
+    """一个版本 JSON 的解析结果
+
+    minecraft_arguments 为 1.13 之前的旧式参数字符串；新版本使用 game_arguments/jvm_arguments。
+    """
+    __slots__ = ("id", "type", "main_class", "inherits_from", "assets", "asset_index", "client",
+                 "libraries", "game_arguments", "jvm_arguments", "minecraft_arguments",
+                 "java_major", "logging")
+    id: str
+    type: str
+    main_class: str
+    inherits_from: str
+    assets: str
+    asset_index: AssetIndexRef
+    client: Download
+    libraries: tuple
+    game_arguments: tuple
+    jvm_arguments: tuple
+    minecraft_arguments: str
+    java_major: int
+    logging: LoggingConfig
+
+# 解析
+
+def maven_path(name):
+    """Maven 坐标 group:artifact:version[:classifier][@ext] 对应的相对路径"""
+    ext = "jar"
+    if "@" in name:
+        name, ext = name.split("@", 1)
+    parts = name.split(":")
+    group, artifact, version = parts[:3]
+    classifier = parts[3] if len(parts) > 3 else None
+    file_name = f"{artifact}-{version}" + (f"-{classifier}" if classifier else "") + "." + ext
+    return "/".join(group.split(".") + [artifact, version, file_name])
+
+def _parse_download(data, path=None):
+    if not data:
+        return None
+    return Download(data.get("path", path), data.get("url"), data.get("sha1"), data.get("size"))
+
+def _parse_rules(data):
+    rules = []
+    for rule in data or ():
+        os_info = rule.get("os") or {}
+        features = tuple(sorted((intern(k), v) for k, v in (rule.get("features") or {}).items()))
+        rules.append(Rule(
+            intern(rule.get("action", "allow")),
+            _intern_opt(os_info.get("name")),
+            _intern_opt(os_info.get("arch")),
+            _intern_opt(os_info.get("version")),
+            features
+        ))
+    return tuple(rules)
+
+def _parse_arguments(data):
+    arguments = []
+    for item in data or ():
+        if isinstance(item, str):
+            arguments.append(Argument((intern(item),), ()))
+        else:
+            value = item["value"]
+            values = (value,) if isinstance(value, str) else tuple(value)
+            arguments.append(Argument(tuple(intern(v) for v in values), _parse_rules(item.get("rules"))))
+    return tuple(arguments)
+
+def _parse_library(data):
+    name = intern(data["name"])
+    parts = name.split("@", 1)[0].split(":")
+    downloads = data.get("downloads") or {}
+    download = _parse_download(downloads.get("artifact"))
+    if download is None and not data.get("natives"):
+        # Fabric/Forge 等只给出 Maven 仓库地址的库
+        path = maven_path(name)
+        base = data.get("url") or LIBRARIES_URL
+        download = Download(path, base.rstrip("/") + "/" + path, data.get("sha1"), data.get("size"))
+    classifiers = tuple(
+        (intern(key), _parse_download(value))
+        for key, value in (downloads.get("classifiers") or {}).items()
+    )
+    return Library(
+        name,
+        intern(parts[0]),
+        intern(parts[1]),
+        intern(parts[2]) if len(parts) > 2 else "",
+        _intern_opt(parts[3]) if len(parts) > 3 else None,
+        download,
+        tuple((intern(k), intern(v)) for k, v in (data.get("natives") or {}).items()),
+        classifiers,
+        tuple(intern(p) for p in ((data.get("extract") or {}).get("exclude") or ())),
+        _parse_rules(data.get("rules"))
+    )
+
+def parse_version(data):
+    """把版本 JSON（字典）解析为 Version"""
+    arguments = data.get("arguments") or {}
+    asset_index = data.get("assetIndex")
+    logging_client = (data.get("logging") or {}).get("client")
+    java_version = data.get("javaVersion") or {}
+    return Version(
+        intern(data["id"]),
+        _intern_opt(data.get("type")),
+        _intern_opt(data.get("mainClass")),
+        _intern_opt(data.get("inheritsFrom")),
+        _intern_opt(data.get("assets")),
+        AssetIndexRef(
+            intern(asset_index["id"]), asset_index.get("url"), asset_index.get("sha1"),
+            asset_index.get("size"), asset_index.get("totalSize")
+        ) if asset_index else None,
+        _parse_download((data.get("downloads") or {}).get("client")),
+        tuple(_parse_library(lib) for lib in data.get("libraries") or ()),
+        _parse_arguments(arguments.get("game")),
+        _parse_arguments(arguments.get("jvm")),
+        data.get("minecraftArguments"),
+        java_version.get("majorVersion"),
+        LoggingConfig(
+            intern(logging_client.get("argument", "")),
+            _parse_download(logging_client.get("file"), logging_client.get("file", {}).get("id"))
+        ) if logging_client else None
+    )
+
+def parse_manifest(data):
+    """把版本清单 JSON（字典）解析为 VersionManifest"""
+    versions = tuple(
+        ManifestVersion(intern(v["id"]), intern(v["type"]), v["url"], v.get("releaseTime"), v.get("sha1"))
+        for v in data["versions"]
+    )
+    latest = data.get("latest") or {}
+    return VersionManifest(latest.get("release"), latest.get("snapshot"), versions, {v.id: v for v in versions})
+
+def merge_versions(child, parent):
+    """把子版本合并到（已经解析完继承链的）父版本上
+
+    子版本的库排在前面，参数接在父版本之后，其余字段子版本有值时覆盖父版本。
+    """
+    return dataclasses.replace(
+        parent,
+        id=child.id,
+        type=child.type or parent.type,
+        main_class=child.main_class or parent.main_class,
+        inherits_from=None,
+        assets=child.assets or parent.assets,
+        asset_index=child.asset_index or parent.asset_index,
+        client=child.client or parent.client,
+        libraries=child.libraries + parent.libraries,
+        game_arguments=parent.game_arguments + child.game_arguments,
+        jvm_arguments=parent.jvm_arguments + child.jvm_arguments,
+        minecraft_arguments=child.minecraft_arguments or parent.minecraft_arguments,
+        java_major=child.java_major or parent.java_major,
+        logging=child.logging or parent.logging
+    )
+
+# 缓存
+
+class HttpCache:
+    """按 URL 缓存的 HTTP 响应体
+
+    每个 URL 对应两份文件：响应体和记录 ETag/Last-Modified/获取时间的元数据。
+    """
+
+    def __init__(self, cache_dir=None, timeout=15):
+        """初始化
+
+        Args:
+            cache_dir: 缓存目录，默认在缓存目录下的 http
+            timeout: 请求超时（秒）
+        """
+        self.cache_dir = cache_dir or paths.cache_dir("http")
+        self.timeout = timeout
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".body", base + ".meta"
+
+    def cached(self, url):
+        """只读缓存：返回 (响应体路径, 元数据)，没有缓存时返回 (None, None)"""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None, None
+        if not os.path.exists(body_path):
+            return None, None
+        return body_path, meta
+
+    def fetch(self, url):
+        """带条件请求地刷新缓存
+
+        服务器返回 304 时只更新获取时间；网络错误时如果有缓存则沿用缓存。
+
+        Returns:
+            (响应体路径, 内容是否发生了变化)
+        """
+        body_path, meta_path = self._paths(url)
+        cached_path, meta = self.cached(url)
+        request = urllib.request.Request(url)
+        if meta:
+            if meta.get("etag"):
+                request.add_header("If-None-Match", meta["etag"])
+            if meta.get("last_modified"):
+                request.add_header("If-Modified-Since", meta["last_modified"])
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached_path:
+                meta["fetched_at"] = time.time()
+                self._write_meta(meta_path, meta)
+                return cached_path, False
+            if cached_path:
+                return cached_path, False
+            raise VersionError(f"HTTP {e.code}: {url}") from e
+        except (OSError, urllib.error.URLError) as e:
+            if cached_path:
+                return cached_path, False
+            raise VersionError(f"{url}: {e}") from e
+
+        tmp_path = body_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, body_path)
+        self._write_meta(meta_path, {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time()
+        })
+        return body_path, True
+
+    def _write_meta(self, meta_path, meta):
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+class VersionRepository:
+    """版本仓库：版本清单、本地与远程的版本 JSON 以及继承链合并
+
+    解析结果在内存中按文件状态缓存，同时以 pickle 写到磁盘，新进程也不需要重新解析。
+    """
+
+    def __init__(self, game_dir=None, http_cache=None, parsed_dir=None, manifest_url=MANIFEST_URL):
+        """初始化
+
+        Args:
+            game_dir: 游戏目录（版本 JSON 位于 versions/<id>/<id>.json），默认在数据目录下的 minecraft
+            http_cache: HttpCache，默认新建一个
+            parsed_dir: 解析结果的缓存目录，默认在缓存目录下的 parsed
+            manifest_url: 版本清单地址
+        """
+        self.game_dir = game_dir or paths.data_dir("minecraft")
+        self.http = http_cache or HttpCache()
+        self.parsed_dir = parsed_dir or paths.cache_dir("parsed")
+        os.makedirs(self.parsed_dir, exist_ok=True)
+        self.manifest_url = manifest_url
+        # 文件路径 -> (mtime_ns, size, 解析结果)
+        self.parsed = {}
+        # 继承链的文件状态 -> 合并后的 Version
+        self.resolved = {}
+        # 版本 JSON 路径 -> (mtime_ns, size, sha1)，文件没有变化时不重新计算哈希
+        self.digests = {}
+        self.lock = threading.RLock()
+
+    def version_path(self, version_id):
+        """版本 JSON 在游戏目录中的路径"""
+        return os.path.join(self.game_dir, "versions", version_id, version_id + ".json")
+
+    def _load_parsed(self, path, parse):
+        """读取并解析 JSON 文件，按 (mtime_ns, size) 缓存在内存与磁盘"""
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            cached = self.parsed.get(path)
+            if cached is not None and cached[:2] == key:
+                return cached[2]
+
+        pickle_path = os.path.join(self.parsed_dir, hashlib.sha1(path.encode("utf-8")).hexdigest() + ".pickle")
+        value = None
+        try:
+            with open(pickle_path, "rb") as f:
+                stored = pickle.load(f)
+            if stored[0] == PARSE_VERSION and stored[1] == key:
+                value = stored[2]
+        except (OSError, pickle.PickleError, EOFError, AttributeError, IndexError, TypeError,
+                ImportError, ValueError):
+            # 损坏或由其他版本写入的缓存（类或模块已不存在）：重新解析
+            pass
+        if value is None:
+            with open(path, "rb") as f:
+                value = parse(json.loads(f.read()))
+            tmp_path = pickle_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump((PARSE_VERSION, key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, pickle_path)
+        with self.lock:
+            self.parsed[path] = key + (value,)
+        return value
+
+    def manifest(self):
+        """本地缓存的版本清单，不访问网络；从未获取过时返回 None"""
+        body_path, _ = self.http.cached(self.manifest_url)
+        if body_path is None:
+            return None
+        return self._load_parsed(body_path, parse_manifest)
+
+    def refresh_manifest(self):
+        """以条件请求刷新版本清单（可能阻塞，应在后台调用）
+
+        Returns:
+            (VersionManifest, 是否有更新)
+        """
+        body_path, changed = self.http.fetch(self.manifest_url)
+        return self._load_parsed(body_path, parse_manifest), changed
+
+    def version(self, version_id):
+        """获取单个版本（不合并继承链）
+
+        本地没有版本 JSON 时根据版本清单下载。本地已有时与本地缓存的版本清单（不访问网络）比较 sha1：
+        一致或清单中没有该版本（如加载器生成的版本）时直接使用，不一致（被截断或已过期）时重新下载。
+        文件的哈希按文件状态缓存，文件没有变化时不重新计算。
+        """
+        path = self.version_path(version_id)
+        if not os.path.exists(path) or not self._matches_manifest(version_id, path):
+            self._download_version(version_id, path)
+        return self._load_parsed(path, parse_version)
+
+    def _matches_manifest(self, version_id, path):
+        manifest = self.manifest()
+        entry = manifest.get(version_id) if manifest is not None else None
+        if entry is None or not entry.sha1:
+            return True
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            cached = self.digests.get(path)
+        if cached is not None and cached[:2] == key:
+            digest = cached[2]
+        else:
+            with open(path, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            with self.lock:
+                self.digests[path] = key + (digest,)
+        return digest == entry.sha1
+
+    def _download_version(self, version_id, path):
+        manifest = self.manifest()
+        if manifest is None or manifest.get(version_id) is None:
+            manifest, _ = self.refresh_manifest()
+        entry = manifest.get(version_id)
+        if entry is None:
+            raise VersionError(f"版本不存在: {version_id}")
+        body_path, _ = self.http.fetch(entry.url)
+        with open(body_path, "rb") as f:
+            body = f.read()
+        if entry.sha1 and hashlib.sha1(body).hexdigest() != entry.sha1:
+            raise VersionError(f"版本 JSON 校验失败: {version_id}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+    def resolve(self, version_id):
+        """获取合并了整条 inheritsFrom 链的版本
+
+        合并结果按链上每个文件的状态缓存，任何一个文件变化后重新合并。
+        """
+        chain = []
+        seen = set()
+        current = version_id
+        while current is not None:
+            if current in seen:
+                raise VersionError(f"inheritsFrom 存在循环: {version_id}")
+            seen.add(current)
+            version = self.version(current)
+            chain.append(version)
+            current = version.inherits_from
+
+        with self.lock:
+            # version() 刚刚刷新过内存缓存，链上文件的状态直接从中取
+            key = tuple((v.id,) + self.parsed[self.version_path(v.id)][:2] for v in chain)
+            merged = self.resolved.get(key)
+        if merged is not None:
+            return merged
+        merged = chain[-1]
+        for child in reversed(chain[:-1]):
+            merged = merge_versions(child, merged)
+        with self.lock:
+            self.resolved[key] = merged
+        return merged
+
+    def installed_versions(self):
+        """游戏目录中已安装（有版本 JSON）的版本 ID"""
+        versions_dir = os.path.join(self.game_dir, "versions")
+        try:
+            names = os.listdir(versions_dir)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if os.path.exists(self.version_path(name)))
@@ -0,0 +1,84 @@
+"""账号列表基准：填充 10k 个账号并以编程方式滚动
+
+输出填充耗时、每次滚动（含重绘）的平均与 p99 耗时，
+以及每帧实际绘制的行数，用来确认只绘制了可见行。
+
+用法：
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_account_list.py
+"""
+import os
+import sys
+import time
+import uuid
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from PyQt5.QtWidgets import QApplication, QListView
+from ui import theme
+from ui.widgets.account_list import AccountEntry, AccountListModel, AccountDelegate
+
+ACCOUNT_COUNT=10000
+SCROLL_STEPS=500
+
+class CountingDelegate(AccountDelegate):
+    """统计绘制次数的委托"""
+    paint_count=0
+    def paint(self,painter,option,index):
+        CountingDelegate.paint_count+=1
+        super().paint(painter,option,index)
+
+def make_accounts(count):
+    now=time.time()
+    accounts=[]
+    for i in range(count):
+        accounts.append(AccountEntry(
+            uuid=uuid.uuid4().hex,
+            username="Player%05d"%i,
+            account_type="msa" if i%3 else "offline",
+            expires_at=None if i%3==0 else now+(i%30-5)*86400,
+            skin_path=None
+        ))
+    return accounts
+
+def main():
+    app=QApplication(sys.argv)
+    theme.apply_theme(app)
+
+    model=AccountListModel()
+    view=QListView()
+    view.setObjectName("accountList")
+    view.setUniformItemSizes(True)
+    view.setModel(model)
+    view.setItemDelegate(CountingDelegate(parent=view))
+    view.resize(600,480)
+    view.show()
+    app.processEvents()
+
+    accounts=make_accounts(ACCOUNT_COUNT)
+    start=time.perf_counter()
+    model.set_accounts(accounts)
+    view.viewport().repaint()
+    app.processEvents()
+    populate_ms=(time.perf_counter()-start)*1000
+
+    bar=view.verticalScrollBar()
+    step=max(bar.maximum()//SCROLL_STEPS,1)
+    costs=[]
+    CountingDelegate.paint_count=0
+    for i in range(SCROLL_STEPS):
+        start=time.perf_counter()
+        bar.setValue(i*step)
+        view.viewport().repaint()
+        app.processEvents()
+        costs.append((time.perf_counter()-start)*1000)
+    costs.sort()
+
+    print("账号数量: %d"%ACCOUNT_COUNT)
+    print("填充并首次绘制: %.2f ms"%populate_ms)
+    print("滚动 %d 次: 平均 %.3f ms, p99 %.3f ms"%(SCROLL_STEPS,sum(costs)/len(costs),costs[int(len(costs)*0.99)-1]))
+    print("每帧平均绘制行数: %.1f"%(CountingDelegate.paint_count/SCROLL_STEPS))
+
+if __name__=="__main__":
+    main()
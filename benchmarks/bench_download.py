@@ -0,0 +1,153 @@
+"""下载引擎基准
+
+用本地替身服务器提供一个合成的资源索引（默认 5000 个对象）和几个大文件，
+输出每秒文件数、MB/s、建立的连接数，并检查：
+- 所有文件的 SHA-1 在下载时已校验
+- 再次运行时全部跳过
+- 大文件中断后续传只下载剩余分块
+- 服务器不支持 Range 时退回整文件下载
+
+替身服务器与下载器在同一个进程里争用 GIL，结果只能作为下限参考；
+临时目录所在文件系统创建文件的开销也会计入，可用 TMPDIR 指向 tmpfs 排除。
+
+用法：
+    python benchmarks/bench_download.py
+    TMPDIR=/dev/shm python benchmarks/bench_download.py
+    python benchmarks/bench_download.py --objects 5000 --workers 32 --speed-limit 0
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from MLCore.download import Downloader, DownloadTask, DownloadError, asset_tasks
+from benchmarks.standin_server import StandinServer
+
+def make_objects(count,rng):
+    """生成合成资源：大小分布大致模仿原版资源（多数为几 KB 的小文件）"""
+    objects={}
+    index={"objects":{}}
+    for i in range(count):
+        size=int(rng.lognormvariate(8.5,1.2))+1
+        body=rng.randbytes(size)
+        sha1=hashlib.sha1(body).hexdigest()
+        objects["/%s/%s"%(sha1[:2],sha1)]=body
+        index["objects"]["minecraft/synthetic/%05d.ogg"%i]={"hash":sha1,"size":size}
+    return objects,index
+
+def make_jar(rng,size):
+    body=rng.randbytes(size)
+    sha1=hashlib.sha1(body).hexdigest()
+    return "/jars/%s.jar"%sha1,body,sha1
+
+def report(title,stats,server_stats):
+    mb=stats.bytes/1024/1024
+    print("%-16s %6d 文件 %8.2f MB %7.2f s %9.1f 文件/s %8.1f MB/s  连接 %d"%(
+        title,stats.files,mb,stats.seconds,stats.files/stats.seconds if stats.seconds else 0,
+        mb/stats.seconds if stats.seconds else 0,server_stats["connections"]))
+
+def main():
+    parser=argparse.ArgumentParser(description="下载引擎基准")
+    parser.add_argument("--objects",type=int,default=5000)
+    parser.add_argument("--workers",type=int,default=32)
+    parser.add_argument("--per-host",type=int,default=16)
+    parser.add_argument("--speed-limit",type=float,default=0,help="全局限速（MB/s），0 为不限速")
+    args=parser.parse_args()
+
+    rng=random.Random(1)
+    objects,index=make_objects(args.objects,rng)
+    jars=[make_jar(rng,24*1024*1024) for _ in range(3)]
+    for path,body,_ in jars:
+        objects[path]=body
+
+    server=StandinServer(objects).start()
+    failures=[]
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            speed_limit=args.speed_limit*1024*1024 or None
+            downloader=Downloader(workers=args.workers,per_host=args.per_host,speed_limit=speed_limit)
+            tasks=asset_tasks(index,os.path.join(tmp,"objects"),server.url())
+            tasks+=[DownloadTask(server.url(path),os.path.join(tmp,"jars",sha1+".jar"),len(body),sha1)
+                    for path,body,sha1 in jars]
+
+            stats=downloader.download(tasks)
+            report("冷下载",stats,server.stats)
+
+            stats=downloader.download(tasks)
+            print("%-16s %6d 跳过"%("再次运行",stats.skipped))
+            if stats.files or stats.skipped!=len(tasks):
+                failures.append("再次运行时没有全部跳过")
+
+            # 续传：删掉一个大文件，只下载前两块后取消，再重新下载
+            jar_task=tasks[-1]
+            os.remove(jar_task.path)
+            partial=Downloader(workers=1,per_host=1)
+            def cancel_after(done_bytes,done_files,total_files):
+                if done_bytes>=2*partial.chunk_size:
+                    partial.cancel()
+            try:
+                partial.download([jar_task],progress=cancel_after)
+            except DownloadError:
+                pass
+            before=server.stats["bytes"]
+            downloader.download([jar_task])
+            resumed=server.stats["bytes"]-before
+            print("%-16s %6.2f MB / %.2f MB"%("续传下载量",resumed/1024/1024,jar_task.size/1024/1024))
+            if resumed>=jar_task.size:
+                failures.append("续传没有跳过已完成的分块")
+
+            # 服务器忽略 Range 时退回整文件下载
+            server.support_range=False
+            os.remove(jar_task.path)
+            downloader.download([jar_task])
+            with open(jar_task.path,"rb") as f:
+                if hashlib.sha1(f.read()).hexdigest()!=jar_task.sha1:
+                    failures.append("不支持 Range 时下载结果错误")
+            print("%-16s 通过"%"无 Range 退回")
+
+            # 续传时第 0 块已经完成、服务器又不再支持 Range：仍应得到完整的文件
+            server.support_range=True
+            os.remove(jar_task.path)
+            partial=Downloader(workers=1,per_host=1)
+            try:
+                partial.download([jar_task],progress=cancel_after)
+            except DownloadError:
+                pass
+            server.support_range=False
+            seen=[]
+            stats=downloader.download([jar_task],progress=lambda done_bytes,*_:seen.append(done_bytes))
+            if not os.path.exists(jar_task.path) or stats.files!=1:
+                failures.append("续传时服务器忽略 Range，文件没有下载完成")
+            if seen and max(seen)>jar_task.size:
+                failures.append("进度超过文件大小: %d > %d"%(max(seen),jar_task.size))
+            print("%-16s 通过"%"续传无 Range")
+
+            # 404 不重试
+            before=server.stats["requests"]
+            try:
+                downloader.download([DownloadTask(server.url("/missing"),os.path.join(tmp,"missing"))])
+                failures.append("404 没有报错")
+            except DownloadError:
+                pass
+            requests=server.stats["requests"]-before
+            print("%-16s %6d 次请求"%("404",requests))
+            if requests!=1:
+                failures.append("404 重试了 %d 次"%(requests-1))
+            downloader.close()
+    finally:
+        server.stop()
+
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
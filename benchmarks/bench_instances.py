@@ -0,0 +1,177 @@
+"""实例管理基准
+
+在临时目录中生成 200 个实例（配置、mods、截图），然后测量：
+- 冷启动完整扫描的耗时（预算 500 ms）
+- 开始监视后，修改配置、新增截图、新增模组、新建实例、删除实例各自反映到列表模型的延迟（预算 1000 ms）
+- 每次变化只重新读取受影响的实例；短时间内的一串写入被合并为一批处理
+- 空闲时没有任何定时扫描，且最终的列表模型与从头扫描的结果一致
+
+用法：
+    python benchmarks/bench_instances.py
+    python benchmarks/bench_instances.py --instances 200 --dir /dev/shm
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from MLCore.instances import InstanceManager, CONFIG_NAME, MODS_DIR, SCREENSHOTS_DIR, LOADERS
+
+# 生成的文件的修改时间往前调整的秒数，避免全部落在“刚修改过”的窗口内
+BACKDATE=3600
+
+def make_instances(root,count,rng):
+    """生成 count 个实例"""
+    old=time.time()-BACKDATE
+    for i in range(count):
+        instance_dir=os.path.join(root,"inst%03d"%i)
+        os.makedirs(os.path.join(instance_dir,MODS_DIR))
+        loader=rng.choice(LOADERS)
+        with open(os.path.join(instance_dir,CONFIG_NAME),"w",encoding="utf-8") as f:
+            json.dump({
+                "name":"Instance %03d"%rng.randrange(1000),"version":"1.%d.%d"%(rng.randint(16,20),rng.randint(0,4)),
+                "loader":loader,"loader_version":"" if loader=="vanilla" else "0.%d"%rng.randint(1,50),
+                "playtime":rng.randint(0,200000),"last_played":old,
+            },f)
+        for j in range(rng.randint(0,30)):
+            open(os.path.join(instance_dir,MODS_DIR,"mod%02d.jar"%j),"wb").close()
+        if rng.random()<0.5:
+            os.makedirs(os.path.join(instance_dir,SCREENSHOTS_DIR))
+            for j in range(rng.randint(1,10)):
+                open(os.path.join(instance_dir,SCREENSHOTS_DIR,"2024-01-%02d_12.00.00.png"%(j+1)),"wb").close()
+        for dirpath,dirnames,filenames in os.walk(instance_dir):
+            for name in filenames+dirnames:
+                os.utime(os.path.join(dirpath,name),(old,old))
+            os.utime(dirpath,(old,old))
+
+def wait_for(app,condition,timeout):
+    """处理事件直到 condition() 为真，返回是否在超时前满足"""
+    deadline=time.perf_counter()+timeout
+    while time.perf_counter()<deadline:
+        app.processEvents()
+        if condition():
+            return True
+        time.sleep(0.002)
+    return False
+
+def main():
+    parser=argparse.ArgumentParser(description="实例管理基准")
+    parser.add_argument("--instances",type=int,default=200,help="合成实例数量")
+    parser.add_argument("--budget",type=float,default=500,help="冷扫描预算（毫秒）")
+    parser.add_argument("--latency",type=float,default=1000,help="变化反映到列表的预算（毫秒）")
+    parser.add_argument("--dir",default=None,help="临时目录所在位置")
+    args=parser.parse_args()
+
+    from PyQt5.QtWidgets import QApplication
+    from ui.instance_watcher import InstanceWatcher
+    from ui.widgets.instance_list import InstanceListModel, sort_key
+    app=QApplication(sys.argv)
+
+    failures=[]
+    rng=random.Random(1)
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        root=os.path.join(tmp,"instances")
+        os.makedirs(root)
+        make_instances(root,args.instances,rng)
+
+        manager=InstanceManager(root)
+        started=time.perf_counter()
+        instances=manager.scan()
+        scan_ms=(time.perf_counter()-started)*1000
+        print("%-16s %9.1f ms  (%d 个实例)"%("冷扫描",scan_ms,len(instances)))
+        if scan_ms>args.budget:
+            failures.append("冷扫描超出预算 %.0f ms"%args.budget)
+
+        model=InstanceListModel()
+        model.set_instances(instances.values())
+        watcher=InstanceWatcher(manager)
+        received=[]
+        watcher.diff_ready.connect(model.apply_diff)
+        watcher.diff_ready.connect(lambda diff:received.append((time.perf_counter(),diff)))
+        started=time.perf_counter()
+        watcher.start()
+        print("%-16s %9.1f ms  (%d 个路径)"%("开始监视",(time.perf_counter()-started)*1000,
+                                          len(watcher.watcher.files())+len(watcher.watcher.directories())))
+
+        def measure(label,action,condition,touched):
+            """执行一次修改，等待列表模型反映出来，检查重新读取的实例数"""
+            received.clear()
+            reloads=manager.reloads
+            started=time.perf_counter()
+            action()
+            if not wait_for(app,lambda:received and condition(),args.latency/1000*3):
+                failures.append("%s 没有反映到列表"%label)
+                return
+            latency=(received[-1][0]-started)*1000
+            print("%-16s %9.1f ms  (重新读取 %d 个实例)"%(label,latency,manager.reloads-reloads))
+            if latency>args.latency:
+                failures.append("%s 延迟超出预算 %.0f ms"%(label,args.latency))
+            if manager.reloads-reloads>touched:
+                failures.append("%s 重新读取了 %d 个实例"%(label,manager.reloads-reloads))
+
+        def row_instance(instance_id):
+            row=model.row_of(instance_id)
+            return None if row is None else model.instance_at(row)
+
+        measure("修改配置",lambda:manager.update_config("inst010",name="AAA Renamed"),
+                lambda:row_instance("inst010").name=="AAA Renamed" and model.row_of("inst010")==0,1)
+
+        def add_screenshot():
+            os.makedirs(os.path.join(root,"inst020",SCREENSHOTS_DIR),exist_ok=True)
+            open(os.path.join(root,"inst020",SCREENSHOTS_DIR,"2030-01-01_00.00.00.png"),"wb").close()
+        measure("新增截图",add_screenshot,lambda:row_instance("inst020").screenshots[:1]==("2030-01-01_00.00.00.png",),1)
+
+        mods_before=row_instance("inst030").mods
+        measure("新增模组",lambda:open(os.path.join(root,"inst030",MODS_DIR,"new.jar"),"wb").close(),
+                lambda:row_instance("inst030").mods==mods_before+1,1)
+
+        created=[]
+        measure("新建实例",lambda:created.append(manager.create("New One","1.20.1","fabric","0.15.3")),
+                lambda:created and row_instance(created[0]) is not None,1)
+
+        measure("删除实例",lambda:shutil.rmtree(os.path.join(root,"inst040")),
+                lambda:model.row_of("inst040") is None,0)
+
+        # 一串写入：5 个实例各写 20 张截图，应合并为一批处理
+        batches=watcher.batches
+        def burst():
+            for i in range(50,55):
+                directory=os.path.join(root,"inst%03d"%i,SCREENSHOTS_DIR)
+                os.makedirs(directory,exist_ok=True)
+                for j in range(20):
+                    open(os.path.join(directory,"burst%02d.png"%j),"wb").close()
+        measure("连续写入",burst,lambda:all(len(row_instance("inst%03d"%i).screenshots)>=20 for i in range(50,55)),5)
+        print("%-16s %9d 批  (%d 个通知)"%("合并",watcher.batches-batches,watcher.events))
+        if watcher.batches-batches!=1:
+            failures.append("连续写入被分成了 %d 批"%(watcher.batches-batches))
+
+        # 空闲时没有定时扫描
+        batches,reloads=watcher.batches,manager.reloads
+        wait_for(app,lambda:False,1.5)
+        print("%-16s %9d 批，重新读取 %d 个实例"%("空闲 1.5 s",watcher.batches-batches,manager.reloads-reloads))
+        if watcher.batches!=batches or manager.reloads!=reloads:
+            failures.append("空闲时仍在扫描")
+
+        fresh=sorted(InstanceManager(root).scan().values(),key=sort_key)
+        if model.instances!=fresh:
+            failures.append("列表模型与从头扫描的结果不一致")
+        if model.keys!=sorted(model.keys):
+            failures.append("列表模型没有保持排序")
+        watcher.stop()
+
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Java 发现基准
+
+在临时目录中模拟 /usr/lib/jvm、SDKMAN、JAVA_HOME 与 PATH 中的 JDK：
+大部分带 release 文件，另有几个只能启动探测（用每次耗时 PROBE_DELAY 秒的脚本代替 java）。测量：
+- 冷查找耗时与探测次数，没有 release 的候选并行探测（总耗时应明显小于逐个探测）
+- 热查找（缓存命中）不读取 release、不启动进程，耗时在预算内（预算 50 ms）
+- 修改 java 后只重新识别被修改的；cached() 的结果与上次查找一致
+- select_runtime 为不同游戏版本选出正确的主版本
+
+用法：
+    python benchmarks/bench_java.py
+    python benchmarks/bench_java.py --probed 4 --budget 50
+"""
+import argparse
+import os
+import stat
+import sys
+import tempfile
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from MLCore.java import JavaFinder, select_runtime
+
+# 模拟 java 启动的耗时（秒）
+PROBE_DELAY=0.3
+# 生成的文件的修改时间往前调整的秒数，避免落在“刚修改过”的窗口内
+BACKDATE=3600
+
+# (所在目录, 目录名, 版本, 厂商)：带 release 文件的 JDK
+RELEASE_HOMES=[
+    ("jvm","java-8-openjdk-amd64","1.8.0_392","Debian"),
+    ("jvm","java-11-openjdk-amd64","11.0.21","Debian"),
+    ("jvm","java-17-openjdk-amd64","17.0.9","Debian"),
+    ("jvm","java-21-openjdk-amd64","21.0.1","Debian"),
+    ("sdkman","17.0.10-tem","17.0.10","Eclipse Adoptium"),
+    ("sdkman","21.0.2-graal","21.0.2","GraalVM Community"),
+]
+
+FAKE_JAVA="""#!/bin/sh
+sleep %s
+cat >&2 <<'EOF'
+Property settings:
+    java.home = %s
+    java.vendor = Fake Vendor
+    java.version = %s
+    os.arch = amd64
+
+openjdk version "%s"
+EOF
+"""
+
+def make_home(home,version,vendor,release):
+    os.makedirs(os.path.join(home,"bin"))
+    java=os.path.join(home,"bin","java")
+    with open(java,"w") as f:
+        f.write(FAKE_JAVA%(PROBE_DELAY,home,version,version))
+    os.chmod(java,os.stat(java).st_mode|stat.S_IXUSR|stat.S_IXGRP|stat.S_IXOTH)
+    if release:
+        with open(os.path.join(home,"release"),"w") as f:
+            f.write('IMPLEMENTOR="%s"\nJAVA_VERSION="%s"\nOS_ARCH="amd64"\nOS_NAME="Linux"\n'%(vendor,version))
+    return java
+
+def backdate(root):
+    old=time.time()-BACKDATE
+    for dirpath,dirnames,filenames in os.walk(root):
+        for name in filenames:
+            os.utime(os.path.join(dirpath,name),(old,old),follow_symlinks=False)
+
+def main():
+    parser=argparse.ArgumentParser(description="Java 发现基准")
+    parser.add_argument("--probed",type=int,default=3,help="没有 release 文件、需要启动探测的 JDK 数")
+    parser.add_argument("--budget",type=float,default=50,help="热查找预算（毫秒）")
+    parser.add_argument("--dir",default=None,help="临时目录所在位置")
+    args=parser.parse_args()
+
+    failures=[]
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        jvm_dir=os.path.join(tmp,"jvm")
+        sdkman_dir=os.path.join(tmp,"sdkman")
+        sdkman_java=os.path.join(sdkman_dir,"candidates","java")
+        os.makedirs(jvm_dir)
+        os.makedirs(sdkman_java)
+        for where,name,version,vendor in RELEASE_HOMES:
+            make_home(os.path.join(jvm_dir if where=="jvm" else sdkman_java,name),version,vendor,True)
+        for i in range(args.probed):
+            make_home(os.path.join(tmp,"opt","jdk-16.0.%d"%i),"16.0.%d"%i,"",False)
+        # 别名与重复：default-java 链接、SDKMAN 的 current、PATH 中的 java 链接、JAVA_HOME
+        os.symlink(os.path.join(jvm_dir,"java-17-openjdk-amd64"),os.path.join(jvm_dir,"default-java"))
+        os.symlink(os.path.join(sdkman_java,"21.0.2-graal"),os.path.join(sdkman_java,"current"))
+        bin_dir=os.path.join(tmp,"bin")
+        os.makedirs(bin_dir)
+        os.symlink(os.path.join(jvm_dir,"java-21-openjdk-amd64","bin","java"),os.path.join(bin_dir,"java"))
+        backdate(tmp)
+        env={
+            "JAVA_HOME":os.path.join(tmp,"opt","jdk-16.0.0"),
+            "PATH":os.pathsep.join([bin_dir]+[os.path.join(tmp,"opt","jdk-16.0.%d"%i,"bin") for i in range(1,args.probed)]),
+            "SDKMAN_DIR":sdkman_dir,
+            "HOME":tmp,
+        }
+        expected=len(RELEASE_HOMES)+args.probed
+        cache_path=os.path.join(tmp,"java.json")
+
+        finder=JavaFinder(cache_path,env,jvm_dirs=(jvm_dir,))
+        started=time.perf_counter()
+        runtimes=finder.discover()
+        cold_ms=(time.perf_counter()-started)*1000
+        print("%-14s %9.1f ms  (%d 个 Java，读取 release %d 次，探测 %d 次，逐个探测约 %.0f ms)"%(
+            "冷查找",cold_ms,len(runtimes),finder.release_reads,finder.probes,args.probed*PROBE_DELAY*1000))
+        if len(runtimes)!=expected:
+            failures.append("找到 %d 个 Java，应为 %d 个"%(len(runtimes),expected))
+        if finder.probes!=args.probed:
+            failures.append("探测了 %d 次，应为 %d 次"%(finder.probes,args.probed))
+        if args.probed>1 and cold_ms>=args.probed*PROBE_DELAY*1000*0.9:
+            failures.append("探测没有并行")
+        errors=[runtime for runtime in runtimes if runtime.error]
+        if errors:
+            failures.append("无法识别: %s"%errors[0].error)
+        graal=[runtime for runtime in runtimes if runtime.version=="21.0.2"]
+        if not graal or graal[0].sources!=("SDKMAN",):
+            failures.append("SDKMAN 的 current 链接没有去重")
+        java21=[runtime for runtime in runtimes if runtime.version=="21.0.1"]
+        if not java21 or set(java21[0].sources)!={"PATH","system"}:
+            failures.append("PATH 中的链接没有合并到同一个 Java")
+
+        # 热查找：新的查找器只读取缓存
+        finder=JavaFinder(cache_path,env,jvm_dirs=(jvm_dir,))
+        timings=[]
+        for _ in range(5):
+            started=time.perf_counter()
+            warm=finder.discover()
+            timings.append((time.perf_counter()-started)*1000)
+        warm_ms=min(timings)
+        print("%-14s %9.2f ms  (读取 release %d 次，探测 %d 次)"%("热查找",warm_ms,finder.release_reads,finder.probes))
+        if warm!=runtimes:
+            failures.append("热查找结果与冷查找不一致")
+        if finder.release_reads or finder.probes:
+            failures.append("热查找仍在读取 release 或启动进程")
+        if warm_ms>args.budget:
+            failures.append("热查找超出预算 %.0f ms"%args.budget)
+
+        started=time.perf_counter()
+        cached=finder.cached()
+        print("%-14s %9.2f ms"%("读取缓存",(time.perf_counter()-started)*1000))
+        if cached!=runtimes:
+            failures.append("cached() 与上次查找不一致")
+
+        # 修改一个带 release 的 JDK 与一个需要探测的 JDK
+        changed=time.time()-BACKDATE+60
+        os.utime(os.path.join(jvm_dir,"java-11-openjdk-amd64","bin","java"),(changed,changed))
+        if args.probed:
+            os.utime(os.path.join(tmp,"opt","jdk-16.0.0","bin","java"),(changed,changed))
+        finder.discover()
+        print("%-14s 读取 release %d 次，探测 %d 次"%("修改两个之后",finder.release_reads,finder.probes))
+        if finder.release_reads!=1 or finder.probes!=min(args.probed,1):
+            failures.append("修改后重新识别的 Java 数不对")
+
+    for major,version in ((8,"1.8.0_392"),(16,"16.0.%d"%(args.probed-1) if args.probed else "17.0.10"),
+                          (17,"17.0.10"),(21,"21.0.2")):
+        chosen=select_runtime(runtimes,major)
+        if chosen is None or chosen.version!=version:
+            failures.append("Java %d 应选择 %s，实际为 %s"%(major,version,chosen and chosen.version))
+    if select_runtime(runtimes,25) is not None:
+        failures.append("没有 Java 25 时不应选出运行时")
+
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""JVM 参数方案基准
+
+用合成的 /proc/meminfo 与 /proc 检查堆大小的计算，然后测量生成参数的开销：
+- 系统内存越大 -Xmx 越大、运行中的游戏越多 -Xmx 越小，-Xmx 不超过可分配的内存，-Xms 不超过可用内存
+- ZGC 在 Java 15 以下改用 G1，分代 ZGC 只在 Java 21、22 上手动开启
+- CDS：Java 8 不使用，Java 17 先生成再映射，Java 21 自动生成
+- 设置写入 instance.json 后能原样读回；合成 /proc 中的游戏进程被正确计数
+- 读取 /proc/meminfo、扫描 /proc 与生成一次参数的耗时（预算 20 ms）
+
+用法：
+    python benchmarks/bench_jvm.py
+    python benchmarks/bench_jvm.py --budget 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from MLCore import paths
+from MLCore.instances import InstanceManager
+from MLCore.jvm import (PROFILES, JvmSettings, MemInfo, NATIVE_OVERHEAD, MIN_HEAP_MB, plan_jvm, read_meminfo,
+                        running_games, load_settings, save_settings, archive_path)
+
+TOTALS_GB=(4,8,16,32)
+MOD_COUNTS=(0,100,300)
+
+def check_heap(failures):
+    """按系统内存、模组数与运行中的游戏数打印 -Xmx，并检查单调性与上下限"""
+    print("%-8s %-6s %s"%("方案","模组","-Xmx（MB）：系统内存 %s GB × 运行中 0/1/2 个"%"/".join(map(str,TOTALS_GB))))
+    for name in PROFILES:
+        for mods in MOD_COUNTS:
+            row=[]
+            previous=None
+            for total_gb in TOTALS_GB:
+                memory=MemInfo(total_gb*1024,total_gb*1024*3//4)
+                sizes=[]
+                for running in (0,1,2):
+                    plan=plan_jvm(JvmSettings(name,False,0),21,mods,running,memory=memory)
+                    sizes.append(plan.xmx_mb)
+                    if plan.xms_mb>plan.xmx_mb or plan.xms_mb>memory.available_mb/NATIVE_OVERHEAD:
+                        failures.append("%s：-Xms %d 超出范围"%(name,plan.xms_mb))
+                    if plan.xmx_mb>max(plan.budget_mb,MIN_HEAP_MB):
+                        failures.append("%s：-Xmx %d 超出可分配的 %d"%(name,plan.xmx_mb,plan.budget_mb))
+                if sizes!=sorted(sizes,reverse=True):
+                    failures.append("%s：运行中的游戏增多时 -Xmx 变大"%name)
+                if previous is not None and sizes[0]<previous:
+                    failures.append("%s：系统内存增大时 -Xmx 变小"%name)
+                previous=sizes[0]
+                row.append("/".join(str(size) for size in sizes))
+            print("%-8s %-6d %s"%(name,mods,"  ".join(row)))
+    plan=plan_jvm(JvmSettings("g1",False,3000),21,300,0,memory=MemInfo(16384,12000))
+    if plan.xmx_mb!=2816:
+        failures.append("手动指定的内存上限没有生效（%d）"%plan.xmx_mb)
+
+def check_profiles(failures):
+    memory=MemInfo(16384,12000)
+    cases=[
+        ("zgc",11,"g1",None),("zgc",17,"zgc","-XX:+ZGenerational"),("zgc",21,"zgc","-XX:+ZGenerational"),
+        ("zgc",23,"zgc","-XX:+ZGenerational"),("low_ram",8,"low_ram",None),("missing",17,"g1",None),
+    ]
+    for name,major,expected,flag in cases:
+        plan=plan_jvm(JvmSettings(name,False,0),major,memory=memory)
+        if plan.profile!=expected:
+            failures.append("%s 在 Java %d 上应为 %s，实际为 %s"%(name,major,expected,plan.profile))
+        if flag and (flag in plan.arguments)!=(major in (21,22)):
+            failures.append("Java %d 的分代 ZGC 参数不对"%major)
+    print("%-20s %d 个用例"%("方案与 Java 版本",len(cases)))
+
+def check_cds(failures):
+    memory=MemInfo(16384,12000)
+    settings=JvmSettings("g1",True,0)
+    plan=plan_jvm(settings,8,instance_id="cds-test",key="k8",memory=memory)
+    if plan.cds_archive is not None or "cds_unsupported" not in plan.notes:
+        failures.append("Java 8 不应使用 CDS")
+    plan=plan_jvm(settings,17,instance_id="cds-test",key="k17",memory=memory)
+    if "-XX:ArchiveClassesAtExit="+plan.cds_archive not in plan.arguments:
+        failures.append("Java 17 第一次启动应生成归档")
+    open(archive_path("cds-test","k17"),"wb").close()
+    plan=plan_jvm(settings,17,instance_id="cds-test",key="k17",memory=memory)
+    if "-XX:SharedArchiveFile="+plan.cds_archive not in plan.arguments:
+        failures.append("Java 17 已有归档时应直接映射")
+    plan=plan_jvm(settings,21,instance_id="cds-test",key="k21",memory=memory)
+    if "-XX:+AutoCreateSharedArchive" not in plan.arguments:
+        failures.append("Java 21 应自动生成归档")
+    print("%-20s Java 8/17/21"%"CDS")
+
+def check_settings(failures,tmp):
+    manager=InstanceManager(os.path.join(tmp,"instances"))
+    instance_id=manager.create("JVM","1.20.1","fabric","0.15.3")
+    if load_settings(manager.read(instance_id).config)!=JvmSettings("g1",True,0):
+        failures.append("新实例的默认设置不对")
+    settings=JvmSettings("low_ram",False,3072)
+    save_settings(manager,instance_id,settings)
+    if load_settings(manager.read(instance_id).config)!=settings:
+        failures.append("保存的设置没有原样读回")
+    print("%-20s 写入并读回 instance.json"%"实例设置")
+
+def check_proc(failures,tmp):
+    proc=os.path.join(tmp,"proc")
+    commands={
+        "101":b"/usr/bin/java\0-Xmx4g\0net.minecraft.client.main.Main\0--version\0" + b"1.20.1\0",
+        "102":b"java\0-cp\0x.jar\0net.fabricmc.loader.impl.launch.knot.KnotClient\0",
+        "103":b"/usr/bin/python3\0net.minecraft.client.main.Main\0",
+        "104":b"java\0-jar\0server.jar\0",
+    }
+    for pid,cmdline in commands.items():
+        os.makedirs(os.path.join(proc,pid))
+        with open(os.path.join(proc,pid,"cmdline"),"wb") as f:
+            f.write(cmdline)
+    os.makedirs(os.path.join(proc,"self"))
+    with open(os.path.join(tmp,"meminfo"),"w") as f:
+        f.write("MemTotal:       16318496 kB\nMemFree:         1234567 kB\nMemAvailable:    9876543 kB\n")
+    if running_games(proc)!=2:
+        failures.append("合成 /proc 中应有 2 个游戏进程，实际为 %d"%running_games(proc))
+    if read_meminfo(os.path.join(tmp,"meminfo"))!=MemInfo(15936,9645):
+        failures.append("合成 meminfo 读取错误: %r"%(read_meminfo(os.path.join(tmp,"meminfo")),))
+
+def measure(failures,budget):
+    def best(func,repeat=20):
+        timings=[]
+        for _ in range(repeat):
+            started=time.perf_counter()
+            func()
+            timings.append((time.perf_counter()-started)*1000)
+        return min(timings)
+    meminfo_ms=best(read_meminfo)
+    proc_ms=best(running_games,5)
+    memory=read_meminfo()
+    plan_ms=best(lambda:plan_jvm(JvmSettings("g1",True,0),21,150,0,"bench","key",memory))
+    total=meminfo_ms+proc_ms+plan_ms
+    print("%-20s %8.3f ms  (%d MB，可用 %d MB)"%("读取 /proc/meminfo",meminfo_ms,memory.total_mb,memory.available_mb))
+    print("%-20s %8.3f ms  (%d 个游戏进程)"%("扫描 /proc",proc_ms,running_games()))
+    print("%-20s %8.3f ms"%("生成参数",plan_ms))
+    if total>budget:
+        failures.append("生成一次参数共 %.1f ms，超出预算 %.0f ms"%(total,budget))
+
+def main():
+    parser=argparse.ArgumentParser(description="JVM 参数方案基准")
+    parser.add_argument("--budget",type=float,default=20,help="读取内存、扫描进程与生成参数的预算（毫秒）")
+    args=parser.parse_args()
+
+    failures=[]
+    with tempfile.TemporaryDirectory() as tmp:
+        # CDS 归档与实例都放在临时目录中
+        os.environ[paths.ENV_HOME]=tmp
+        check_heap(failures)
+        check_profiles(failures)
+        check_cds(failures)
+        check_settings(failures,tmp)
+        check_proc(failures,tmp)
+        measure(failures,args.budget)
+
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
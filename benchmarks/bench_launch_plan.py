@@ -0,0 +1,106 @@
+"""启动计划基准
+
+在临时游戏目录中放入一个原版版本（60 个库）和一个继承它的加载器版本（默认 200 个库，
+其中几个与原版重复），比较：
+- 编译启动计划（规则筛选、去重、占位符替换、类路径）
+- 使用缓存的计划：同一进程内与新进程（从磁盘读取）
+- 每次启动填入会话字段
+
+并检查版本 JSON 或设置变化后计划会重新编译。
+
+用法：
+    python benchmarks/bench_launch_plan.py
+    python benchmarks/bench_launch_plan.py --libraries 300
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from MLCore.launch import PlanCache, compile_resolved, current_platform
+from MLCore.versions import VersionRepository, HttpCache
+from benchmarks.synthetic_versions import make_vanilla_version, make_loader_version
+
+REPEAT=200
+
+def per_call(func,repeat=REPEAT):
+    started=time.perf_counter()
+    for _ in range(repeat):
+        result=func()
+    return (time.perf_counter()-started)*1000/repeat,result
+
+def write_version(repo,data):
+    path=repo.version_path(data["id"])
+    os.makedirs(os.path.dirname(path),exist_ok=True)
+    with open(path,"w",encoding="utf-8") as f:
+        json.dump(data,f)
+
+def main():
+    parser=argparse.ArgumentParser(description="启动计划基准")
+    parser.add_argument("--libraries",type=int,default=200,help="加载器版本的库数量")
+    args=parser.parse_args()
+
+    failures=[]
+    with tempfile.TemporaryDirectory() as tmp:
+        def repository():
+            return VersionRepository(
+                game_dir=os.path.join(tmp,"game"),
+                http_cache=HttpCache(os.path.join(tmp,"http")),
+                parsed_dir=os.path.join(tmp,"parsed")
+            )
+        repo=repository()
+        write_version(repo,make_vanilla_version("1.20.1"))
+        write_version(repo,make_loader_version("loader-1.20.1","1.20.1",library_count=args.libraries))
+        settings={"game_dir":os.path.join(tmp,"game"),"jvm_args":["-Xmx4G"],"resolution":[1280,720]}
+        plat=current_platform()
+
+        resolved=repo.resolve("loader-1.20.1")
+        compile_ms,plan=per_call(lambda:compile_resolved(resolved,"1.20.1",settings,"",plat))
+        print("%-18s %8.3f ms  （类路径 %d 项，合并前 %d 个库）"%(
+            "编译",compile_ms,len(plan.classpath),len(resolved.libraries)))
+        # 没有计划缓存时，新进程每次点击启动都要读取版本、合并继承链再编译
+        cold_ms,_=per_call(lambda:compile_resolved(repository().resolve("loader-1.20.1"),"1.20.1",settings,"",plat),
+                           repeat=50)
+        print("%-18s %8.3f ms"%("新进程读取并编译",cold_ms))
+
+        cache=PlanCache(repo,os.path.join(tmp,"plans"))
+        cache.get("demo","loader-1.20.1",settings,plat)
+        cached_ms,_=per_call(lambda:cache.get("demo","loader-1.20.1",settings,plat))
+        print("%-18s %8.3f ms"%("缓存的计划",cached_ms))
+
+        disk_ms,_=per_call(lambda:PlanCache(repository(),os.path.join(tmp,"plans")).get(
+            "demo","loader-1.20.1",settings,plat),repeat=50)
+        print("%-18s %8.3f ms"%("新进程读取计划",disk_ms))
+
+        session={"auth_player_name":"Steve","auth_uuid":"0"*32,"auth_access_token":"token","user_type":"msa"}
+        patch_ms,command=per_call(lambda:plan.command("java",session))
+        print("%-18s %8.3f ms  （命令 %d 个参数）"%("填入会话字段",patch_ms,len(command)))
+        if "Steve" not in command or any("${auth" in arg for arg in command):
+            failures.append("会话字段没有全部填入")
+        if cached_ms>=compile_ms or disk_ms>=cold_ms:
+            failures.append("缓存的计划没有比编译快")
+
+        # 加载器版本变化、设置变化后重新编译
+        key=cache.get("demo","loader-1.20.1",settings,plat).key
+        loader=make_loader_version("loader-1.20.1","1.20.1",library_count=args.libraries+1)
+        write_version(repo,loader)
+        if cache.get("demo","loader-1.20.1",settings,plat).key==key:
+            failures.append("版本 JSON 变化后计划没有失效")
+        key=cache.get("demo","loader-1.20.1",settings,plat).key
+        if cache.get("demo","loader-1.20.1",dict(settings,jvm_args=["-Xmx8G"]),plat).key==key:
+            failures.append("设置变化后计划没有失效")
+
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""ui.locales.t() 单次查询耗时的微基准
+
+用法：
+    python benchmarks/bench_locales.py
+"""
+import json
+import os
+import sys
+import timeit
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+import ui.locales as locales
+
+def legacy_t(key,lang_code="zh-CN"):
+    """改造前的实现：每次调用都读取并解析整个语言文件"""
+    with open(os.path.join("ui","locales",lang_code+".json"),encoding="utf-8") as f:
+        langs=json.load(f)
+    value=langs
+    for i in key.split("."):
+        value=value[i]
+    return value
+
+def legacy_get_lang_list():
+    with open("ui/locales/langs.json",encoding="utf-8") as f:
+        langs=json.load(f)
+    return [{"lang_code":i,"lang_name":langs[i]} for i in langs["lang_list"]]
+
+def measure(func,number):
+    best=min(timeit.repeat(func,number=number,repeat=5))
+    return best/number*1e6
+
+def main():
+    key="sidebar.home"
+    locales.t(key)  # 预热，首次加载词条表
+    rows=[
+        ("t() 改造前",measure(lambda: legacy_t(key),2000)),
+        ("t() 改造后",measure(lambda: locales.t(key),200000)),
+        ("get_lang_list() 改造前",measure(legacy_get_lang_list,2000)),
+        ("get_lang_list() 改造后",measure(locales.get_lang_list,200000)),
+    ]
+    locales.reload()
+    rows.append(("冷加载词条表（含磁盘缓存）",measure(lambda: (locales.reload(),locales.t(key)),500)))
+    print("%-28s %12s"%("项目","单次耗时(us)"))
+    for name,cost in rows:
+        print("%-28s %12.3f"%(name,cost))
+
+if __name__=="__main__":
+    main()
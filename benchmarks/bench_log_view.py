@@ -0,0 +1,145 @@
+"""日志页面基准
+
+生成一个合成的 latest.log（默认 500 MB，普通文本布局，含 WARN/ERROR 与堆栈行），测量：
+- 打开文件到首屏绘制完成的耗时（预算 200 ms）
+- 后台建立完整行索引的耗时
+- 级别过滤与正则搜索扫描全文件的耗时
+- 滚动到文件中部并重绘的耗时
+
+用法：
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_log_view.py
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_log_view.py --size 100 --dir /dev/shm
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+FIRST_SCREEN_BUDGET_MS=200
+
+def make_block(first_group):
+    """约 1 MB 的日志：每组 20 行，其中 1 行 WARN、1 行 ERROR 带 3 行堆栈"""
+    lines=[]
+    group=first_group
+    size=0
+    while size<1024*1024:
+        for j in range(15):
+            lines.append("[12:%02d:%02d] [Render thread/INFO]: Loaded %d textures for group %d from atlas minecraft:blocks\n"
+                         %(group//60%60,group%60,j*7,group))
+        lines.append("[12:%02d:%02d] [Worker-Main-%d/WARN]: Missing model for variant group%d#inventory\n"
+                     %(group//60%60,group%60,group%8,group))
+        lines.append("[12:%02d:%02d] [Server thread/ERROR]: Failed to handle packet for player%d\n"
+                     %(group//60%60,group%60,group))
+        lines.append("java.lang.IllegalStateException: Unexpected state %d\n"%group)
+        lines.append("\tat net.minecraft.server.network.Handler.handle(Handler.java:%d)\n"%(group%500))
+        lines.append("\tat net.minecraft.util.thread.BlockableEventLoop.run(BlockableEventLoop.java:157)\n")
+        size+=sum(len(line) for line in lines[-20:])
+        group+=1
+    return "".join(lines).encode("utf-8"),group
+
+def write_log(path,megabytes):
+    group=0
+    lines=0
+    with open(path,"wb") as f:
+        for _ in range(megabytes):
+            block,group=make_block(group)
+            lines+=block.count(b"\n")
+            f.write(block)
+    return lines
+
+def wait_for(condition,app,timeout=300):
+    started=time.perf_counter()
+    while not condition():
+        app.processEvents()
+        time.sleep(0.005)
+        if time.perf_counter()-started>timeout:
+            raise TimeoutError
+    return (time.perf_counter()-started)*1000
+
+def main():
+    parser=argparse.ArgumentParser(description="日志页面基准")
+    parser.add_argument("--size",type=int,default=500,help="日志大小（MB）")
+    parser.add_argument("--dir",default=None,help="生成日志的目录，默认为系统临时目录")
+    args=parser.parse_args()
+
+    from PyQt5.QtWidgets import QApplication
+    from ui import theme
+    from ui.pages.log_page import LogPage
+
+    tmp=tempfile.mkdtemp(dir=args.dir)
+    failures=[]
+    try:
+        path=os.path.join(tmp,"latest.log")
+        started=time.perf_counter()
+        total_lines=write_log(path,args.size)
+        print("%-16s %10.2f s  (%d MB, %d 行)"%("生成日志",time.perf_counter()-started,args.size,total_lines))
+
+        app=QApplication(sys.argv)
+        theme.apply_theme(app)
+        page=LogPage()
+        page.resize(1000,700)
+        page.show()
+        app.processEvents()
+
+        started=time.perf_counter()
+        page.open_log(path)
+        page.view.viewport().repaint()
+        first_screen=(time.perf_counter()-started)*1000
+        print("%-16s %10.2f ms"%("首屏",first_screen))
+        if first_screen>FIRST_SCREEN_BUDGET_MS:
+            failures.append("首屏 %.0f ms 超出预算 %d ms"%(first_screen,FIRST_SCREEN_BUDGET_MS))
+        if page.view.row_count()==0:
+            failures.append("首屏没有内容")
+
+        elapsed=wait_for(lambda:page.index.complete,app)+first_screen
+        print("%-16s %10.2f ms"%("完整索引",elapsed))
+        if page.index.line_count()!=total_lines:
+            failures.append("索引行数 %d 与实际 %d 不一致"%(page.index.line_count(),total_lines))
+
+        page.level_box.setCurrentIndex(2)
+        elapsed=wait_for(page.filter_scan.caught_up,app)
+        expected=total_lines//20*4
+        print("%-16s %10.2f ms  (%d 行)"%("错误级别过滤",elapsed,len(page.filter_scan.lines)))
+        if len(page.filter_scan.lines)!=expected:
+            failures.append("过滤结果 %d 行，应为 %d 行"%(len(page.filter_scan.lines),expected))
+        page.level_box.setCurrentIndex(0)
+
+        page.search_input.setText(r"player\d+7\b")
+        page.start_search()
+        elapsed=wait_for(page.search_scan.caught_up,app)
+        print("%-16s %10.2f ms  (%d 行)"%("正则搜索",elapsed,len(page.search_scan.lines)))
+        if not page.search_scan.lines:
+            failures.append("搜索没有结果")
+
+        bar=page.view.verticalScrollBar()
+        durations=[]
+        for step in range(50):
+            bar.setValue(bar.maximum()*step//50)
+            started=time.perf_counter()
+            page.view.viewport().repaint()
+            durations.append((time.perf_counter()-started)*1000)
+        durations.sort()
+        print("%-16s %10.2f ms  (最慢 %.2f ms)"%("跳转并重绘",durations[len(durations)//2],durations[-1]))
+
+        started=time.perf_counter()
+        page.next_match()
+        page.view.viewport().repaint()
+        print("%-16s %10.2f ms"%("定位下一个匹配",(time.perf_counter()-started)*1000))
+        page.close_log()
+    finally:
+        shutil.rmtree(tmp,ignore_errors=True)
+
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""模组索引基准
+
+在临时目录中生成一个 400 个模组的合成 mods 目录（Fabric、Forge/NeoForge 的 mods.toml、旧版 mcmod.info
+混合，另有无元数据的库 jar、禁用的模组与一个损坏的 jar；每个 jar 带几十到几千个 class 条目），测量：
+- 只读中央目录与所需条目的读取器与 zipfile 全量解析目录的耗时对比，两者结果一致
+- 冷索引：缓存为空，全部解析（CPU 多于一个时使用进程池）
+- 热索引：文件都没有变化，只做 stat 与读取缓存（预算 50 ms）
+- 修改一个 jar 后的索引：只重新解析该 jar；禁用/启用模组（改名）后沿用缓存
+- 同时带有 fabric.mod.json 与 mods.toml 的 jar：两组元数据都被索引，按实例的加载器选取
+- 模组管理页热打开 400 个模组的耗时（预算 100 ms）
+
+用法：
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_mods.py
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_mods.py --mods 400 --budget 50
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from MLCore.mods import ModIndex, read_entries, read_mod_file, select_mods, METADATA_ENTRIES, RACY_WINDOW_NS
+
+FABRIC_TEMPLATE={
+    "schemaVersion":1,
+    "environment":"*",
+    "entrypoints":{"main":["com.example.Mod"]},
+}
+
+def fabric_json(mod_id,version,rng,ids):
+    meta=dict(FABRIC_TEMPLATE,id=mod_id,version=version,name=mod_id.title(),
+              description="合成模组 %s"%mod_id,authors=["someone",{"name":"other"}])
+    meta["depends"]={"fabricloader":">=0.14.0","minecraft":["~1.20","1.19.4"]}
+    for dep in rng.sample(ids,min(len(ids),rng.randint(0,3))):
+        meta["depends"][dep]=">=%d.0.0"%rng.randint(0,2)
+    if rng.random()<0.2:
+        meta["breaks"]={rng.choice(ids) if ids else "optifabric":"<1.0.0"}
+    # 与真实的 fabric.mod.json 一样，描述中可能含有未转义的换行
+    return json.dumps(meta,ensure_ascii=False,indent=2).replace("合成模组","合成\n模组").encode("utf-8")
+
+def mods_toml(mod_id,version,rng,ids,neoforge):
+    lines=['modLoader="javafml"','loaderVersion="[47,)"','license="MIT"','',
+           '[[mods]]','modId="%s"'%mod_id,'version="%s"'%version,'displayName="%s"'%mod_id.title(),
+           'authors="someone, other"',"description='''\n多行描述\n'''",'']
+    deps=[("minecraft","[1.20.1,1.21)"),("neoforge" if neoforge else "forge","[47,)")]
+    deps+=[(dep,"[1.0,)") for dep in rng.sample(ids,min(len(ids),rng.randint(0,3)))]
+    for dep,version_range in deps:
+        lines+=['[[dependencies.%s]]'%mod_id,'modId="%s"'%dep]
+        lines+=['type="required"'] if neoforge else ['mandatory=true']
+        lines+=['versionRange="%s"'%version_range,'ordering="NONE"','side="BOTH"','']
+    return "\n".join(lines).encode("utf-8")
+
+def mcmod_info(mod_id,version,ids):
+    return json.dumps({"modListVersion":2,"modList":[{
+        "modid":mod_id,"name":mod_id.title(),"version":version,"mcversion":"1.12.2",
+        "authorList":["someone"],"requiredMods":["forge@[14.23,)"]+["%s@[1.0,)"%dep for dep in ids[:1]],
+        "dependencies":["forge"]+ids[:2],
+    }]}).encode("utf-8")
+
+def write_jar(path,metadata,rng):
+    """写入一个 jar：元数据条目夹在大量 class 条目之间"""
+    classes=int(rng.lognormvariate(6,1.1))+20
+    with zipfile.ZipFile(path,"w",zipfile.ZIP_DEFLATED,compresslevel=1) as jar:
+        jar.writestr("META-INF/MANIFEST.MF","Manifest-Version: 1.0\r\nImplementation-Version: 3.1.4\r\n")
+        names=sorted(metadata)
+        for i in range(classes):
+            if names and i==classes//2:
+                for name in names:
+                    jar.writestr(name,metadata[name])
+            body=rng.randbytes(rng.randint(64,1500))
+            jar.writestr("com/example/%s/C%05d.class"%(os.path.basename(path)[:8],i),body)
+
+def make_mods_dir(mods_dir,count,rng):
+    """生成合成 mods 目录
+
+    Returns:
+        {文件名: 期望的模组 ID 列表}
+    """
+    os.makedirs(mods_dir)
+    expected={}
+    ids=[]
+    for i in range(count):
+        mod_id="mod%03d"%i
+        version="%d.%d.%d"%(rng.randint(0,3),rng.randint(0,20),rng.randint(0,9))
+        kind=rng.random()
+        if kind<0.55:
+            metadata={"fabric.mod.json":fabric_json(mod_id,version,rng,ids[-50:])}
+        elif kind<0.85:
+            neoforge=kind<0.65
+            name="META-INF/neoforge.mods.toml" if neoforge else "META-INF/mods.toml"
+            metadata={name:mods_toml(mod_id,"${file.jarVersion}" if rng.random()<0.3 else version,rng,ids[-50:],neoforge)}
+        elif kind<0.95:
+            metadata={"mcmod.info":mcmod_info(mod_id,version,ids[-2:])}
+        else:
+            metadata={}
+            mod_id=None
+        name="%s-%s.jar"%(mod_id or "library%03d"%i,version)
+        if i%40==7:
+            name+=".disabled"
+        write_jar(os.path.join(mods_dir,name),metadata,rng)
+        expected[name]=[mod_id] if mod_id else []
+        if mod_id:
+            ids.append(mod_id)
+    # 一个损坏的 jar：应记录错误而不是中断索引
+    with open(os.path.join(mods_dir,"broken.jar"),"wb") as f:
+        f.write(rng.randbytes(4096))
+    expected["broken.jar"]=None
+    past=time.time_ns()-RACY_WINDOW_NS*2
+    for name in os.listdir(mods_dir):
+        os.utime(os.path.join(mods_dir,name),ns=(past,past))
+    return expected
+
+def check_multi_loader(tmp,rng):
+    """多加载器 jar 的两组元数据都应被索引，并按加载器选取，返回失败原因列表"""
+    failures=[]
+    path=os.path.join(tmp,"multi-1.0.0.jar")
+    write_jar(path,{"fabric.mod.json":fabric_json("multi","1.0.0",rng,[]),
+                    "META-INF/mods.toml":mods_toml("multi","1.0.0",rng,[],False)},rng)
+    mods,error=read_mod_file(path)
+    if error is not None or sorted(mod.loader for mod in mods)!=["fabric","forge"]:
+        failures.append("多加载器 jar 没有索引全部元数据: %r"%([mod.loader for mod in mods],error))
+        return failures
+    for loader,want in (("forge","forge"),("fabric","fabric"),("quilt","fabric"),(None,"fabric"),("neoforge","fabric")):
+        loaders=[mod.loader for mod in select_mods(mods,loader)]
+        if loaders!=[want]:
+            failures.append("加载器 %s 选取了 %r"%(loader,loaders))
+    return failures
+
+def zipfile_read(path):
+    with zipfile.ZipFile(path) as jar:
+        present=set(jar.namelist())
+        return {name:jar.read(name) for name in METADATA_ENTRIES if name in present}
+
+def measure(title,func):
+    started=time.perf_counter()
+    result=func()
+    elapsed=(time.perf_counter()-started)*1000
+    print("%-14s %9.1f ms"%(title,elapsed))
+    return elapsed,result
+
+def open_page(app,db_path,mods_dir):
+    """创建模组管理页并热打开 mods 目录，返回 (耗时毫秒, 页面)"""
+    from ui.pages.mods_page import ModsPage
+    page=ModsPage()
+    page.mod_index=ModIndex(db_path)
+    page.resize(900,700)
+    page.show()
+    started=time.perf_counter()
+    page.open_dir(mods_dir)
+    app.processEvents()
+    return (time.perf_counter()-started)*1000,page
+
+def main():
+    parser=argparse.ArgumentParser(description="模组索引基准")
+    parser.add_argument("--mods",type=int,default=400,help="合成模组数量")
+    parser.add_argument("--budget",type=float,default=50,help="热索引预算（毫秒）")
+    parser.add_argument("--page-budget",type=float,default=100,help="模组管理页热打开预算（毫秒）")
+    parser.add_argument("--dir",default=None,help="临时目录所在位置（如 /dev/shm）")
+    args=parser.parse_args()
+
+    rng=random.Random(1)
+    failures=[]
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        mods_dir=os.path.join(tmp,"mods")
+        expected=make_mods_dir(mods_dir,args.mods,rng)
+        jar_paths=[os.path.join(mods_dir,name) for name in sorted(expected) if expected[name] is not None]
+        total=sum(os.path.getsize(path) for path in jar_paths)
+        entries=0
+        for path in jar_paths:
+            with zipfile.ZipFile(path) as jar:
+                entries+=len(jar.infolist())
+        print("合成 mods 目录: %d 个 jar，%d 个条目，%.1f MB"%(len(expected),entries,total/1024/1024))
+
+        # 读取器对比：只读中央目录 vs zipfile 解析整个目录
+        slow,slow_result=measure("zipfile 读取",lambda:[zipfile_read(path) for path in jar_paths])
+        fast,fast_result=measure("中央目录读取",lambda:[read_entries(path,METADATA_ENTRIES) for path in jar_paths])
+        if fast_result!=slow_result:
+            failures.append("只读中央目录的读取结果与 zipfile 不一致")
+
+        db_path=os.path.join(tmp,"mods.db")
+        _,cold_files=measure("冷索引",lambda:ModIndex(db_path).scan(mods_dir))
+        warm,warm_files=measure("热索引",lambda:ModIndex(db_path).scan(mods_dir,parse=False))
+        if warm>args.budget:
+            failures.append("热索引超出预算 %.0f ms"%args.budget)
+        if any(item.mods is None for item in warm_files):
+            failures.append("热索引有 %d 个 jar 没有命中缓存"%sum(item.mods is None for item in warm_files))
+        if warm_files!=cold_files:
+            failures.append("热索引结果与冷索引不一致")
+
+        # 结果检查：模组 ID、禁用状态、损坏的 jar
+        for item in cold_files:
+            want=expected[item.name]
+            if want is None:
+                if not item.error:
+                    failures.append("损坏的 jar 没有记录错误")
+            elif [mod.mod_id for mod in item.mods]!=want:
+                failures.append("%s 的模组 ID 不符: %r"%(item.name,[mod.mod_id for mod in item.mods]))
+            if item.enabled==item.name.endswith(".disabled"):
+                failures.append("%s 的启用状态不符"%item.name)
+        versions=[mod.version for item in cold_files for mod in item.mods or ()]
+        if any("${" in version for version in versions):
+            failures.append("${file.jarVersion} 没有替换")
+        print("%-14s %9d 个（依赖声明 %d 个）"%("解析出的模组",len(versions),
+              sum(len(mod.dependencies) for item in cold_files for mod in item.mods or ())))
+
+        # 改动一个 jar：只应重新解析它
+        changed=jar_paths[len(jar_paths)//2]
+        with open(changed,"ab") as f:
+            f.write(b"\0")
+        past=time.time_ns()-RACY_WINDOW_NS*2
+        os.utime(changed,ns=(past,past))
+        _,files=measure("改动一个",lambda:ModIndex(db_path).scan(mods_dir,parse=False))
+        stale=[item.path for item in files if item.mods is None]
+        if stale!=[changed]:
+            failures.append("没有只重新解析被改动的 jar: %d 个"%len(stale))
+        if read_mod_file(changed)[1] is not None:
+            failures.append("末尾追加数据后无法读取")
+        files=ModIndex(db_path).scan(mods_dir)
+        failures.extend(check_multi_loader(tmp,rng))
+
+        # 禁用再启用一个模组：改名后沿用缓存，不需要重新解析
+        index=ModIndex(db_path)
+        item=next(item for item in files if item.enabled and item.mods)
+        disabled=index.set_enabled(item,False)
+        if any(entry.mods is None for entry in index.scan(mods_dir,parse=False)):
+            failures.append("禁用模组后需要重新解析")
+        if index.set_enabled(disabled,True).path!=item.path:
+            failures.append("重新启用后路径不符")
+
+        from PyQt5.QtWidgets import QApplication
+        app=QApplication(sys.argv)
+        page_ms,page=open_page(app,db_path,mods_dir)
+        print("%-14s %9.1f ms  (%d 行，后台解析 %d 个)"%("页面热打开",page_ms,page.model.rowCount(),page.pending))
+        if page.pending:
+            failures.append("页面热打开时仍有 jar 需要解析")
+        if page_ms>args.page_budget:
+            failures.append("页面热打开超出预算 %.0f ms"%args.page_budget)
+        page.close()
+
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
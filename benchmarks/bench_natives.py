@@ -0,0 +1,87 @@
+"""natives 解压基准
+
+生成若干个合成的 natives jar（每个包含几个数 MB 的本地库与 META-INF），测量：
+- 冷解压：natives 目录为空
+- 热启动：没有任何变化，应当零写入
+- 替换一个 jar 后：只重新写入有变化的文件
+
+用法：
+    python benchmarks/bench_natives.py
+    python benchmarks/bench_natives.py --jars 8 --workers 4
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from MLCore.natives import extract_natives
+
+def make_jar(path,index,rng,files_per_jar):
+    with zipfile.ZipFile(path,"w",zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("META-INF/MANIFEST.MF","Manifest-Version: 1.0\n")
+        for i in range(files_per_jar):
+            # 半随机的内容，压缩率接近真实的本地库
+            block=rng.randbytes(64*1024)
+            zf.writestr("liblwjgl%d_%d.so"%(index,i),(block+bytes(64*1024))*rng.randint(8,32))
+
+def snapshot(natives_dir):
+    result={}
+    for name in os.listdir(natives_dir):
+        result[name]=os.stat(os.path.join(natives_dir,name)).st_mtime_ns
+    return result
+
+def measure(title,jars,natives_dir,workers):
+    started=time.perf_counter()
+    stats=extract_natives(jars,natives_dir,workers)
+    elapsed=(time.perf_counter()-started)*1000
+    print("%-12s %9.2f ms  写入 %3d  跳过 %3d  删除 %d"%(title,elapsed,stats.extracted,stats.skipped,stats.removed))
+    return stats
+
+def main():
+    parser=argparse.ArgumentParser(description="natives 解压基准")
+    parser.add_argument("--jars",type=int,default=8)
+    parser.add_argument("--files",type=int,default=3,help="每个 jar 中的本地库数量")
+    parser.add_argument("--workers",type=int,default=4)
+    args=parser.parse_args()
+
+    rng=random.Random(1)
+    failures=[]
+    with tempfile.TemporaryDirectory() as tmp:
+        jars=[]
+        for i in range(args.jars):
+            path=os.path.join(tmp,"natives%d.jar"%i)
+            make_jar(path,i,rng,args.files)
+            jars.append({"path":path,"exclude":["META-INF/"]})
+        total=sum(os.path.getsize(jar["path"]) for jar in jars)
+        print("合成 jar: %d 个，共 %.1f MB（压缩后）"%(len(jars),total/1024/1024))
+        natives_dir=os.path.join(tmp,"natives")
+
+        measure("冷解压",jars,natives_dir,args.workers)
+        if any(name.startswith("META-INF") for name in os.listdir(natives_dir)):
+            failures.append("没有遵守 extract.exclude")
+        before=snapshot(natives_dir)
+        stats=measure("热启动",jars,natives_dir,args.workers)
+        if stats.extracted or snapshot(natives_dir)!=before:
+            failures.append("热启动有写入")
+
+        # 替换第一个 jar：其中的文件内容改变，其余 jar 的文件应跳过
+        make_jar(jars[0]["path"],0,random.Random(2),args.files)
+        stats=measure("替换一个 jar",jars,natives_dir,args.workers)
+        if stats.extracted!=args.files:
+            failures.append("只应重新写入被替换的 jar 中的文件")
+
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""对象库基准
+
+在临时目录中放入一个合成版本（默认 5000 个资源和 150 个库），
+分别测量第一个与第二个实例的生成耗时与新增占用，再测试回收。
+
+新增占用按目标目录中只有一个链接（st_nlink == 1）的文件大小统计；
+reflink 生成的文件同样只有一个链接，但数据块是共享的，这种情况下统计值偏大。
+
+用法：
+    python benchmarks/bench_objects.py
+    python benchmarks/bench_objects.py --assets 5000 --libraries 150
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from MLCore.objects import ObjectStore
+
+def extra_bytes(root):
+    total=0
+    for dirpath,_,filenames in os.walk(root):
+        for name in filenames:
+            stat=os.stat(os.path.join(dirpath,name))
+            if stat.st_nlink==1:
+                total+=stat.st_size
+    return total
+
+def main():
+    parser=argparse.ArgumentParser(description="对象库基准")
+    parser.add_argument("--assets",type=int,default=5000)
+    parser.add_argument("--libraries",type=int,default=150)
+    args=parser.parse_args()
+
+    rng=random.Random(1)
+    failures=[]
+    with tempfile.TemporaryDirectory() as tmp:
+        store=ObjectStore(os.path.join(tmp,"store"))
+        files={}
+        started=time.perf_counter()
+        for i in range(args.assets):
+            sha1=store.add_bytes(rng.randbytes(int(rng.lognormvariate(8.5,1.2))+1))
+            files["resources/%s/%05d.ogg"%(sha1[:2],i)]=sha1
+        for i in range(args.libraries):
+            sha1=store.add_bytes(rng.randbytes(rng.randint(20000,2000000)))
+            files["libraries/lib%03d/lib%03d.jar"%(i,i)]=sha1
+        print("%-12s %8.1f ms"%("填充对象库",(time.perf_counter()-started)*1000))
+
+        for name in ("instance1","instance2"):
+            dest=os.path.join(tmp,name)
+            started=time.perf_counter()
+            counts=store.materialize(files,dest,owner=name)
+            elapsed=(time.perf_counter()-started)*1000
+            print("%-12s %8.1f ms  新增 %8.2f MB  %s"%(name,elapsed,extra_bytes(dest)/1024/1024,counts))
+
+        # 再次生成应全部跳过
+        counts=store.materialize(files,os.path.join(tmp,"instance2"),owner="instance2")
+        if counts["skipped"]!=len(files) and counts["reflink"]==0:
+            failures.append("重复生成没有跳过")
+
+        store.remove_refs("instance1")
+        store.remove_refs("instance2")
+        count,freed=store.gc()
+        print("%-12s %8d 个  （实例目录仍有硬链接的对象保留）"%("回收",count))
+        for name in ("instance1","instance2"):
+            for dirpath,_,filenames in os.walk(os.path.join(tmp,name)):
+                for filename in filenames:
+                    os.remove(os.path.join(dirpath,filename))
+        count,freed=store.gc()
+        print("%-12s %8d 个 %8.2f MB"%("删除实例后回收",count,freed/1024/1024))
+        if count!=len(set(files.values())):
+            failures.append("删除实例后没有回收全部对象")
+
+    for failure in failures:
+        print("失败: "+failure)
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""游戏进程日志基准
+
+不需要 Java：用一个 Python 子进程冒充游戏，以固定速率（默认 50k 行/秒）输出
+普通文本布局与 log4j XML 布局混合的日志（含堆栈行），GUI 线程通过 ProcessBridge 接收。
+测量：
+- 事件循环的最大停顿（5 ms 心跳定时器的最大间隔）
+- 解析出的日志条数是否与子进程输出的一致，界面收到与跳过的条数
+- 退出码与崩溃检测（子进程最后输出崩溃报告行并以非零退出码退出）
+
+用法：
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_process.py
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_process.py --rate 100000 --seconds 5
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+CRASH_REPORT="/tmp/crash-reports/crash-2024-01-01_00.00.00-client.txt"
+HEARTBEAT_MS=5
+
+def flood(rate,seconds):
+    """冒充游戏的子进程：按 rate 行/秒输出日志，最后输出崩溃报告行并以 255 退出
+
+    每 10 条为一组：7 条普通布局、1 个 XML 事件（3 行）、2 行堆栈；
+    子进程在结束时把实际输出的日志条数写到 stderr 的最后一行。
+    """
+    out=sys.stdout
+    written=0
+    groups=0
+    started=time.perf_counter()
+    total=int(rate*seconds)
+    while written<total:
+        # 按节奏输出，每 10 ms 补齐到应输出的行数
+        due=min(total,int((time.perf_counter()-started)*rate)+rate//100)
+        parts=[]
+        while written<due:
+            g=groups
+            for j in range(7):
+                parts.append("[12:34:56] [Render thread/INFO]: group %d line %d loading resources\n"%(g,j))
+            parts.append('<log4j:Event logger="net.minecraft.client.Minecraft" timestamp="1700000000000" '
+                         'level="WARN" thread="Worker-Main-%d">\n'
+                         '\t<log4j:Message><![CDATA[Missing texture for group %d]]></log4j:Message>\n'
+                         '</log4j:Event>\n'%(g%8,g))
+            parts.append("java.lang.IllegalStateException: group %d\n"%g)
+            parts.append("\tat net.minecraft.client.Main.run(Main.java:%d)\n"%g)
+            groups+=1
+            written+=10
+        out.write("".join(parts))
+        out.flush()
+        time.sleep(0.01)
+    out.write("[12:35:00] [Render thread/FATAL]: #@!@# Game crashed! Crash report saved to: #@!@# %s\n"%CRASH_REPORT)
+    out.flush()
+    sys.stderr.write("[12:35:00] [main/INFO]: records %d\n"%(groups*10+1))
+    sys.stderr.flush()
+    sys.exit(255)
+
+def main():
+    parser=argparse.ArgumentParser(description="游戏进程日志基准")
+    parser.add_argument("--rate",type=int,default=50000,help="每秒输出的日志行数")
+    parser.add_argument("--seconds",type=float,default=3.0)
+    parser.add_argument("--flood",action="store_true",help=argparse.SUPPRESS)
+    args=parser.parse_args()
+    if args.flood:
+        flood(args.rate,args.seconds)
+        return 0
+
+    from PyQt5.QtCore import QElapsedTimer, QTimer
+    from PyQt5.QtWidgets import QApplication
+    from MLCore.process import GameProcess
+    from ui.process_bridge import ProcessBridge
+
+    app=QApplication(sys.argv)
+    process=GameProcess(buffer_capacity=100000)
+    command=[sys.executable,os.path.abspath(__file__),"--flood","--rate",str(args.rate),"--seconds",str(args.seconds)]
+
+    spawn_started=time.perf_counter()
+    process.start(command)
+    spawn_ms=(time.perf_counter()-spawn_started)*1000
+    bridge=ProcessBridge(process)
+
+    state={"batches":0,"max_batch":0,"levels":{},"max_gap":0.0,"result":None}
+    def on_records(records):
+        state["batches"]+=1
+        state["max_batch"]=max(state["max_batch"],len(records))
+        levels=state["levels"]
+        for record in records:
+            levels[record.level]=levels.get(record.level,0)+1
+    def on_exited(code,crashed):
+        state["result"]=(code,crashed)
+        app.quit()
+    bridge.records_ready.connect(on_records)
+    bridge.exited.connect(on_exited)
+
+    clock=QElapsedTimer()
+    clock.start()
+    last=[clock.elapsed()]
+    def heartbeat():
+        now=clock.elapsed()
+        state["max_gap"]=max(state["max_gap"],now-last[0])
+        last[0]=now
+    heart=QTimer()
+    heart.setInterval(HEARTBEAT_MS)
+    heart.timeout.connect(heartbeat)
+    heart.start()
+    QTimer.singleShot(int((args.seconds+30)*1000),app.quit)
+
+    started=time.perf_counter()
+    app.exec_()
+    elapsed=time.perf_counter()-started
+    heart.stop()
+
+    expected=None
+    for record in process.buffer.snapshot()[-5:]:
+        if record.stream=="stderr" and record.message.startswith("records "):
+            expected=int(record.message.split()[1])
+    parsed=process.buffer.total-1
+
+    print("%-18s %10.2f ms"%("启动子进程",spawn_ms))
+    print("%-18s %10.2f s"%("运行时间",elapsed))
+    print("%-18s %10d"%("解析出的日志",parsed))
+    print("%-18s %10.0f 条/秒"%("吞吐",parsed/elapsed))
+    print("%-18s %10d"%("界面收到",bridge.delivered))
+    print("%-18s %10d"%("因积压跳过",bridge.dropped))
+    print("%-18s %10d"%("批次",state["batches"]))
+    print("%-18s %10d"%("最大批",state["max_batch"]))
+    print("%-18s %10d ms"%("事件循环最大停顿",state["max_gap"]))
+    print("级别统计: "+", ".join("%s=%d"%item for item in sorted(state["levels"].items())))
+
+    failures=[]
+    if state["result"] is None:
+        failures.append("没有收到进程退出信号")
+    elif state["result"]!=(255,True):
+        failures.append("退出码或崩溃标记错误: %r"%(state["result"],))
+    if process.crash_report!=CRASH_REPORT:
+        failures.append("没有识别出崩溃报告路径: %r"%process.crash_report)
+    if expected is None or parsed!=expected:
+        failures.append("解析出的日志条数 %d 与输出的 %r 不一致"%(parsed,expected))
+    if bridge.delivered+bridge.dropped!=process.buffer.total:
+        failures.append("界面收到与跳过的条数之和与日志总数不一致")
+    if state["max_gap"]>100:
+        failures.append("事件循环停顿 %d ms"%state["max_gap"])
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
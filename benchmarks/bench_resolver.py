@@ -0,0 +1,196 @@
+"""模组依赖检查基准
+
+检查版本比较与范围解析（Maven、SemVer、Forge 写法）的一组已知结果，然后在 1000 个模组的合成依赖图上测量：
+- 完整检查的耗时（版本与范围缓存为空，预算 250 ms）
+- 逐个启用/禁用模组时增量检查的耗时，并定期与从头完整检查的结果比对
+- 预置的缺失依赖、版本不符、不兼容与重复模组都被报告为错误
+- 多加载器 jar 只按实例加载器的元数据检查
+
+用法：
+    python benchmarks/bench_resolver.py
+    python benchmarks/bench_resolver.py --mods 1000 --budget 250
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from MLCore.mods import Dependency, ModFile, ModInfo
+from MLCore.ranges import compare_versions, parse_range, version_key, RangeError
+from MLCore.resolver import ModResolver
+
+ENVIRONMENT={"minecraft":"1.20.1","fabricloader":"0.15.3","forge":"47.2.0","java":"17.0.9"}
+
+# (a, b, 期望的比较结果)
+VERSION_CASES=[
+    ("1.0","1.0.0",0),("1.0-alpha","1.0",-1),("1.0-rc1","1.0-beta2",1),("1.0-sp","1.0",1),
+    ("1.0.0-beta.11","1.0.0-beta.2",1),("0.5.1+1.20.1","0.5.1",0),("1.0-SNAPSHOT","1.0",-1),
+    ("1.10","1.9",1),("v2.0","1.9",1),("47.2.0","47.1.99",1),
+]
+# (范围, 语法, 版本, 期望是否包含)
+RANGE_CASES=[
+    ("[1.0,2.0)","maven","1.5",True),("[1.0,2.0)","maven","2.0",False),("(,1.0]","maven","1.0",True),
+    ("[1.2]","maven","1.2.0",True),("[1.0,1.2),[1.5,)","maven","1.3",False),("[1.0,1.2),[1.5,)","maven","9",True),
+    ("47.1","maven","1.0",True),("[47,)","maven","47.2.0",True),("[1.20.1,1.21)","maven","1.21-pre1",True),
+    (">=1.2 <2","semver","1.9",True),(">=1.2 <2","semver","2.0",False),("^1.2.3","semver","1.9.9",True),
+    ("^1.2.3","semver","2.0",False),("^0.2.3","semver","0.3",False),("~1.2","semver","1.2.9",True),
+    ("~1.2","semver","1.3",False),("1.20.x","semver","1.20.4",True),("1.20.x","semver","1.21",False),
+    ("*","semver","9",True),("1.0","semver","1.0.1",False),("<1 || >=3","semver","2",False),
+    ("<1 || >=3","semver","3.1",True),(">= 0.14","semver","0.15.3",True),
+]
+
+def check_multi_loader(failures):
+    """同时带有 Fabric 与 Forge 元数据的 jar：只检查实例加载器的那一组"""
+    mods=(
+        ModInfo("multi","Multi","1.0.0","fabric","",(),(Dependency("fabric-api","required",()),),()),
+        ModInfo("multi","Multi","1.0.0","forge","",(),(Dependency("forge","required",("[47,)",)),),()),
+    )
+    files=[ModFile("/mods/multi.jar","multi.jar",True,0,0,mods,None)]
+    forge=[(p.kind,p.target) for p in ModResolver(files,ENVIRONMENT,"forge").problems()]
+    fabric=[(p.kind,p.target) for p in ModResolver(files,ENVIRONMENT,"fabric").problems()]
+    if forge:
+        failures.append("Forge 实例检查了 Fabric 元数据: %r"%forge)
+    if fabric!=[("missing","fabric-api")]:
+        failures.append("Fabric 实例的检查结果不符: %r"%fabric)
+
+def check_algebra(failures):
+    for a,b,expected in VERSION_CASES:
+        if compare_versions(a,b)!=expected:
+            failures.append("版本比较 %s ? %s 应为 %d"%(a,b,expected))
+    for text,syntax,version,expected in RANGE_CASES:
+        if parse_range(text,syntax).contains(version)!=expected:
+            failures.append("范围 %s（%s）对 %s 应为 %s"%(text,syntax,version,expected))
+    both=parse_range("[1,3)","maven").intersect(parse_range(">=2","semver"))
+    if both.contains("1.5") or not both.contains("2.5") or both.contains("3"):
+        failures.append("交集 [1,3) ∩ >=2 错误")
+    if not parse_range("<1","semver").intersect(parse_range(">2","semver")).is_empty():
+        failures.append("不相交范围的交集不为空")
+    for text,syntax in (("[1.0","maven"),(">=1 what<","semver")):
+        try:
+            parse_range(text,syntax)
+            failures.append("无效范围 %s 没有报错"%text)
+        except RangeError:
+            pass
+    print("%-20s %d 个版本比较、%d 个范围用例"%("版本代数",len(VERSION_CASES),len(RANGE_CASES)))
+
+def semver_range(version,rng):
+    """生成一个包含 version 的 SemVer 风格范围"""
+    major,minor,patch=(int(part) for part in version.split("."))
+    return rng.choice([
+        ">=%d.%d.0"%(major,minor),"^%s"%version,"~%d.%d"%(major,minor),"%d.x"%major,
+        ">=%d.0 <%d"%(major,major+1),"*",
+    ])
+
+def maven_range(version,rng):
+    major,minor,_=(int(part) for part in version.split("."))
+    return rng.choice([
+        "[%d.%d,)"%(major,minor),"[%d,%d)"%(major,major+1),"(,%d]"%(major+1),"[%s]"%version,version,
+    ])
+
+def make_graph(count,rng):
+    """生成合成模组图：依赖只指向编号更小的模组，另预置几处错误
+
+    Returns:
+        (ModFile 列表, 预置错误的 (类型, jar 文件名) 集合)
+    """
+    mods=[]
+    for i in range(count):
+        loader="fabric" if i%3 else "forge"
+        version="%d.%d.%d"%(rng.randint(0,5),rng.randint(0,20),rng.randint(0,9))
+        mods.append([i,loader,version])
+    files=[]
+    for i,loader,version in mods:
+        mod_id="mod%04d"%i
+        make=semver_range if loader=="fabric" else maven_range
+        deps=[Dependency("minecraft","required",(">=1.20" if loader=="fabric" else "[1.20,1.21)",))]
+        deps.append(Dependency("fabricloader" if loader=="fabric" else "forge","required",()))
+        for target in rng.sample(mods[:i],min(i,rng.randint(0,6))):
+            kind=rng.choice(("required","required","required","optional","recommended"))
+            deps.append(Dependency("mod%04d"%target[0],kind,(make(target[2],rng),)))
+        if i>10 and rng.random()<0.05:
+            # 只与不存在的版本不兼容
+            deps.append(Dependency("mod%04d"%rng.randrange(i),"incompatible",("<0.0.1",) if loader=="fabric" else ("(,0.0.1)",)))
+        info=ModInfo(mod_id,mod_id.title(),version,loader,"",(),tuple(deps),())
+        name="%s-%s.jar"%(mod_id,version)
+        files.append(ModFile(os.path.join("/mods",name),name,True,1000,0,(info,),None))
+
+    expected=set()
+    def inject(position,dependency,kind):
+        item=files[position]
+        info=item.mods[0]
+        files[position]=item._replace(mods=(info._replace(dependencies=info.dependencies+(dependency,)),))
+        expected.add((kind,item.name))
+    inject(count-1,Dependency("not-installed","required",()),"missing")
+    target=files[5].mods[0]
+    inject(count-2,Dependency(target.mod_id,"required",(">%s"%target.version,)),"version")
+    inject(count-3,Dependency(files[6].mods[0].mod_id,"incompatible",()),"incompatible")
+    duplicate=files[7]._replace(path="/mods/copy.jar",name="copy.jar")
+    files.append(duplicate)
+    expected.add(("duplicate",min(files[7].name,"copy.jar")))
+    return files,expected
+
+def error_set(resolver):
+    return {(problem.kind,problem.file) for problem in resolver.errors()}
+
+def main():
+    parser=argparse.ArgumentParser(description="模组依赖检查基准")
+    parser.add_argument("--mods",type=int,default=1000,help="合成模组数量")
+    parser.add_argument("--budget",type=float,default=250,help="完整检查预算（毫秒）")
+    parser.add_argument("--toggles",type=int,default=500,help="增量切换次数")
+    args=parser.parse_args()
+
+    failures=[]
+    check_algebra(failures)
+    check_multi_loader(failures)
+
+    rng=random.Random(1)
+    files,expected=make_graph(args.mods,rng)
+    edges=sum(len(item.mods[0].dependencies) for item in files)
+    version_key.cache_clear()
+    parse_range.cache_clear()
+    started=time.perf_counter()
+    resolver=ModResolver(files,ENVIRONMENT)
+    full_ms=(time.perf_counter()-started)*1000
+    print("%-20s %9.1f ms  (%d 个模组，%d 条依赖)"%("完整检查",full_ms,len(files),edges))
+    print("%-20s %9d 个错误，%d 个警告"%("检查结果",len(resolver.errors()),len(resolver.problems())-len(resolver.errors())))
+    if full_ms>args.budget:
+        failures.append("完整检查超出预算 %.0f ms"%args.budget)
+    if error_set(resolver)!=expected:
+        failures.append("错误与预置不符: 多出 %r，缺少 %r"%(error_set(resolver)-expected,expected-error_set(resolver)))
+
+    # 增量切换：随机启用/禁用，定期与完整检查比对
+    current={item.path:item for item in files}
+    timings=[]
+    mismatches=0
+    for step in range(args.toggles):
+        item=current.pop(rng.choice(sorted(current)))
+        enabled=not item.enabled
+        path=item.path[:-len(".disabled")] if enabled else item.path+".disabled"
+        updated=item._replace(path=path,name=os.path.basename(path),enabled=enabled)
+        current[path]=updated
+        started=time.perf_counter()
+        resolver.update(item.path,updated)
+        timings.append((time.perf_counter()-started)*1000)
+        if step%25==0 or step==args.toggles-1:
+            fresh=ModResolver(list(current.values()),ENVIRONMENT)
+            if sorted(resolver.problems())!=sorted(fresh.problems()):
+                mismatches+=1
+    timings.sort()
+    print("%-20s %9.3f ms  (p99 %.3f ms，最大 %.3f ms，%d 次)"%(
+        "增量切换 平均",sum(timings)/len(timings),timings[int(len(timings)*0.99)],timings[-1],len(timings)))
+    if mismatches:
+        failures.append("%d 次增量结果与完整检查不一致"%mismatches)
+
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""窗口阴影绘制耗时基准
+
+对比改造前整窗 QGraphicsDropShadowEffect 与改造后缓存九宫格阴影，
+分别测量整窗重绘与子部件（列表）重绘的耗时。
+
+用法：
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_shadow.py
+"""
+import os
+import sys
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from PyQt5.QtWidgets import QApplication, QMainWindow, QGraphicsDropShadowEffect, QListWidget
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+from ui import theme
+import ui.UIMain as UIMain
+
+REPEAT=200
+
+def fill(window):
+    """放入一个有内容的列表，模拟真实页面"""
+    list_widget=QListWidget()
+    list_widget.addItems(["账号 %d"%i for i in range(200)])
+    window.setCentralWidget(list_widget)
+    window.resize(820,620)
+    window.show()
+    return list_widget
+
+def create_legacy_window():
+    """改造前的实现：整窗阴影特效"""
+    window=QMainWindow()
+    window.setWindowFlags(Qt.FramelessWindowHint)
+    shadow=QGraphicsDropShadowEffect()
+    shadow.setBlurRadius(10)
+    shadow.setColor(QColor(0,0,0,100))
+    shadow.setOffset(0,0)
+    window.setGraphicsEffect(shadow)
+    return window,fill(window)
+
+def create_window():
+    window=UIMain.ResizableMainWindow()
+    return window,fill(window)
+
+def measure(app,widget):
+    app.processEvents()
+    start=time.perf_counter()
+    for _ in range(REPEAT):
+        widget.update()
+        widget.repaint()
+    return (time.perf_counter()-start)/REPEAT*1000
+
+def main():
+    app=QApplication(sys.argv)
+    theme.apply_theme(app)
+    rows=[]
+    for name,factory in (("QGraphicsDropShadowEffect",create_legacy_window),("缓存九宫格阴影",create_window)):
+        window,list_widget=factory()
+        rows.append((name,measure(app,window),measure(app,list_widget.viewport())))
+        window.close()
+    print("每种情况重复 %d 次"%REPEAT)
+    print("%-28s %14s %14s"%("阴影实现","整窗重绘(ms)","列表重绘(ms)"))
+    for name,window_ms,child_ms in rows:
+        print("%-28s %14.3f %14.3f"%(name,window_ms,child_ms))
+
+if __name__=="__main__":
+    main()
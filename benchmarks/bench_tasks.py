@@ -0,0 +1,180 @@
+"""后台任务运行时基准
+
+在 GUI 事件循环运行的同时提交一批混合优先级的阻塞任务与协程任务，检查并测量：
+- 同时执行的任务数不超过并发上限，排队中的高优先级任务先于低优先级任务开始
+- 排队中与执行中的任务都能取消，进度信号在 GUI 线程收到
+- 取消不响应检查点的阻塞函数时，任务在函数返回前保持 cancelling 并占用并发名额
+- GUI 线程中的协程可以顺序 await 多个任务
+- 空任务的调度开销（提交到开始的等待时间）与 GUI 线程每帧被阻塞的时间
+
+用法：
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_tasks.py
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from PyQt5.QtCore import QThread
+from PyQt5.QtWidgets import QApplication
+from ui.tasks import TaskRuntime, TaskCancelled, current_task, PRIORITY_HIGH, PRIORITY_LOW, CANCELLED, CANCELLING, DONE
+
+MAX_CONCURRENT=4
+BATCH=200
+NOOP_TASKS=2000
+
+class Probe:
+    """记录同时执行的任务数与开始顺序"""
+    def __init__(self):
+        self.lock=threading.Lock()
+        self.active=0
+        self.peak=0
+        self.order=[]
+
+    def work(self,label,seconds):
+        with self.lock:
+            self.active+=1
+            self.peak=max(self.peak,self.active)
+            self.order.append(label)
+        task=current_task()
+        try:
+            steps=10
+            for i in range(steps):
+                task.check()
+                time.sleep(seconds/steps)
+                task.report((i+1)/steps,label)
+        finally:
+            with self.lock:
+                self.active-=1
+        return label
+
+def check_stubborn_cancel(app):
+    """取消一个不检查取消的阻塞函数：函数返回前不能释放并发名额，返回失败原因列表"""
+    failures=[]
+    runtime=TaskRuntime(max_concurrent=1)
+    release=threading.Event()
+    stubborn=runtime.submit(release.wait,5)
+    wait_until(app,lambda:stubborn.state!="pending")
+    stubborn.cancel()
+    follower=runtime.submit(int,"1")
+    wait_until(app,lambda:follower.state!="pending",timeout=0.2)
+    if stubborn.state!=CANCELLING:
+        failures.append("执行中的阻塞函数取消后状态为 %s"%stubborn.state)
+    if follower.state!="pending" or runtime.stats()["running"]!=1:
+        failures.append("被取消的阻塞函数返回前释放了并发名额")
+    release.set()
+    if not wait_until(app,lambda:follower.done()):
+        failures.append("阻塞函数返回后排队的任务没有开始")
+    if stubborn.state!=CANCELLED or follower.state!=DONE:
+        failures.append("取消后的状态错误: %s, %s"%(stubborn.state,follower.state))
+    runtime.shutdown()
+    return failures
+
+async def async_work(value):
+    await asyncio.sleep(0.005)
+    return value*2
+
+def wait_until(app,condition,timeout=30):
+    deadline=time.perf_counter()+timeout
+    while not condition() and time.perf_counter()<deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    return condition()
+
+def main():
+    app=QApplication(sys.argv)
+    runtime=TaskRuntime(max_concurrent=MAX_CONCURRENT)
+    runtime.frames.start()
+    failures=[]
+    probe=Probe()
+    gui_thread=QThread.currentThread()
+    progress={"count":0,"wrong_thread":0}
+    def on_progress(value,text):
+        progress["count"]+=1
+        if QThread.currentThread()!=gui_thread:
+            progress["wrong_thread"]+=1
+    depths=[]
+    runtime.queue_changed.connect(lambda pending,running:depths.append((pending,running)))
+
+    # 混合优先级的阻塞任务：先提交低优先级，再提交高优先级
+    started=time.perf_counter()
+    tasks=[]
+    for i in range(BATCH):
+        priority=PRIORITY_LOW if i<BATCH//2 else PRIORITY_HIGH
+        task=runtime.submit(probe.work,"low" if priority==PRIORITY_LOW else "high",0.01,priority=priority)
+        task.progress.connect(on_progress)
+        tasks.append(task)
+    # 取消一个排队中的任务与一个执行中的任务
+    tasks[-1].cancel()
+    wait_until(app,lambda:tasks[0].state!="pending")
+    tasks[0].cancel()
+
+    # GUI 线程中的协程顺序 await 多个任务
+    results=[]
+    async def page_flow():
+        first=await runtime.submit(async_work,1)
+        second=await runtime.submit(sum,[first,10])
+        try:
+            await runtime.submit(int,"not a number")
+        except ValueError:
+            results.append("error")
+        results.extend([first,second])
+    runtime.start_ui(page_flow())
+
+    if not wait_until(app,lambda:all(task.done() for task in tasks) and len(results)==3):
+        failures.append("任务没有全部结束")
+    elapsed=time.perf_counter()-started
+
+    # 空任务的调度开销
+    noop_started=time.perf_counter()
+    noops=[runtime.submit(int,"1") for _ in range(NOOP_TASKS)]
+    wait_until(app,lambda:all(task.done() for task in noops))
+    noop_elapsed=time.perf_counter()-noop_started
+    stats=runtime.stats()
+    runtime.shutdown()
+    failures.extend(check_stubborn_cancel(app))
+
+    last_high=len(probe.order)-1-probe.order[::-1].index("high") if "high" in probe.order else 0
+    low_before_high=probe.order[:last_high].count("low")
+    frames=stats["frames"]
+    print("%-22s %10.2f s   (%d 个任务，每个 10 ms，并发上限 %d)"%("阻塞任务批次",elapsed,BATCH,MAX_CONCURRENT))
+    print("%-22s %10d"%("同时执行的峰值",probe.peak))
+    print("%-22s %10d"%("进度信号",progress["count"]))
+    print("%-22s %10d"%("最大排队深度",max(pending for pending,_ in depths)))
+    print("%-22s %10.1f µs/个"%("空任务吞吐",noop_elapsed/NOOP_TASKS*1e6))
+    print("%-22s %10.2f ms  (p99 %.2f ms)"%("排队等待 p50",stats["wait_p50"],stats["wait_p99"]))
+    print("%-22s %10.2f ms"%("GUI 线程回调合计",stats["callback_ms"]))
+    print("%-22s %10.2f ms  (p99 %.2f ms，最大 %.2f ms，%d 帧)"%(
+        "每帧阻塞 平均",frames["mean"],frames["p99"],frames["max"],frames["frames"]))
+
+    if probe.peak>MAX_CONCURRENT:
+        failures.append("同时执行 %d 个任务，超过上限 %d"%(probe.peak,MAX_CONCURRENT))
+    # 除了高优先级任务提交前已经开始的，低优先级任务都应排在全部高优先级任务之后
+    if low_before_high>MAX_CONCURRENT:
+        failures.append("%d 个低优先级任务先于高优先级任务开始"%low_before_high)
+    if tasks[-1].state!=CANCELLED or tasks[0].state!=CANCELLED:
+        failures.append("取消失败: %s, %s"%(tasks[0].state,tasks[-1].state))
+    try:
+        tasks[0].result()
+        failures.append("取消的任务没有抛出 TaskCancelled")
+    except TaskCancelled:
+        pass
+    if sum(task.state==DONE for task in tasks)!=BATCH-2:
+        failures.append("完成的任务数不符")
+    if progress["wrong_thread"] or not progress["count"]:
+        failures.append("进度信号没有在 GUI 线程收到")
+    if results!=["error",2,12]:
+        failures.append("协程结果错误: %r"%results)
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""侧边栏导航耗时基准：50 个菜单项下逐个切换选中页面
+
+对比改造前“每次导航给所有按钮重新 setStyleSheet”与改造后
+“只翻转两个按钮的 selected 属性”两种方式。
+
+用法：
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_theme.py
+"""
+import os
+import sys
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from PyQt5.QtWidgets import QApplication
+from ui import theme
+from ui.layout import AppSidebar
+
+MENU_COUNT=50
+ROUNDS=5
+
+LEGACY_STYLE="""
+QPushButton {
+    background-color: %s;
+    color: #212529;
+    border: none;
+    text-align: left;
+    padding: 0px;
+}
+QPushButton:hover {
+    background-color: #e9ecef;
+}
+QPushButton:hover QLabel {
+    color: #212529;
+}
+QPushButton QLabel {
+    color: #212529;
+    background-color: transparent;
+}
+"""
+
+def legacy_update_menu_styles(sidebar):
+    """改造前的实现：每次导航都给所有菜单按钮重新设置样式表"""
+    for id, button in sidebar.menu_buttons.items():
+        color="#e9ecef" if id==sidebar.current_page else "transparent"
+        button.setStyleSheet(LEGACY_STYLE%color)
+
+def create_sidebar():
+    sidebar=AppSidebar()
+    for i in range(1,MENU_COUNT):
+        sidebar.add_menu_item("page%d"%i,"sidebar.home","■")
+    sidebar.resize(220,MENU_COUNT*48+200)
+    sidebar.show()
+    return sidebar
+
+def measure(app,sidebar,navigate):
+    ids=list(sidebar.menu_buttons)
+    navigate(ids[0])
+    app.processEvents()
+    costs=[]
+    for _ in range(ROUNDS):
+        for id in ids:
+            start=time.perf_counter()
+            navigate(id)
+            # 计入样式重新匹配与重绘
+            sidebar.repaint()
+            app.processEvents()
+            costs.append(time.perf_counter()-start)
+    costs.sort()
+    return sum(costs)/len(costs)*1000,costs[int(len(costs)*0.99)-1]*1000
+
+def main():
+    app=QApplication(sys.argv)
+    theme.apply_theme(app)
+
+    legacy=create_sidebar()
+    def legacy_navigate(id):
+        legacy.current_page=id
+        legacy_update_menu_styles(legacy)
+    legacy_result=measure(app,legacy,legacy_navigate)
+    legacy.close()
+
+    sidebar=create_sidebar()
+    result=measure(app,sidebar,sidebar.set_current_page)
+    sidebar.close()
+
+    print("菜单项数量: %d，每种方式导航 %d 次"%(MENU_COUNT,MENU_COUNT*ROUNDS))
+    print("%-24s %10s %10s"%("方式","平均(ms)","p99(ms)"))
+    print("%-24s %10.3f %10.3f"%("逐个 setStyleSheet",*legacy_result))
+    print("%-24s %10.3f %10.3f"%("动态属性 + 单部件 polish",*result))
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,97 @@
+"""增量校验基准
+
+在临时目录中生成一个与 1.20 完整安装规模相当的合成游戏目录
+（约 3400 个资源、60 个库与一个客户端 jar，共 300 MB 以上），测量：
+- 冷校验：索引为空，全部计算哈希
+- 热校验：文件都没有变化，只做 stat（预算 100 ms）
+- 修改一个文件后的校验：只重新计算该文件
+
+用法：
+    python benchmarks/bench_verify.py
+    python benchmarks/bench_verify.py --budget 100
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from MLCore.verify import VerifyIndex, RACY_WINDOW_NS
+
+ASSET_COUNT=3400
+LIBRARY_COUNT=60
+
+def write_file(root,rel_path,data,entries):
+    path=os.path.join(root,rel_path)
+    os.makedirs(os.path.dirname(path),exist_ok=True)
+    with open(path,"wb") as f:
+        f.write(data)
+    entries.append((rel_path,len(data),hashlib.sha1(data).hexdigest()))
+
+def make_install(root,rng):
+    entries=[]
+    for i in range(ASSET_COUNT):
+        data=rng.randbytes(int(rng.lognormvariate(9.9,1.3))+1)
+        sha1=hashlib.sha1(data).hexdigest()
+        write_file(root,"assets/objects/%s/%s"%(sha1[:2],sha1),data,entries)
+    for i in range(LIBRARY_COUNT):
+        write_file(root,"libraries/lib%02d/lib%02d.jar"%(i,i),rng.randbytes(rng.randint(100000,5000000)),entries)
+    write_file(root,"versions/1.20/1.20.jar",rng.randbytes(22*1024*1024),entries)
+    return entries
+
+def measure(title,index,root,entries):
+    started=time.perf_counter()
+    result=index.verify(root,entries)
+    elapsed=(time.perf_counter()-started)*1000
+    print("%-10s %9.1f ms  重新计算 %5d / %d  缺失 %d  不符 %d"%(
+        title,elapsed,result.hashed,result.checked,len(result.missing),len(result.mismatched)))
+    return elapsed,result
+
+def main():
+    parser=argparse.ArgumentParser(description="增量校验基准")
+    parser.add_argument("--budget",type=float,default=100,help="热校验预算（毫秒）")
+    args=parser.parse_args()
+
+    rng=random.Random(1)
+    failures=[]
+    with tempfile.TemporaryDirectory() as tmp:
+        root=os.path.join(tmp,"game")
+        entries=make_install(root,rng)
+        total=sum(entry[1] for entry in entries)
+        print("合成安装: %d 个文件 %.1f MB"%(len(entries),total/1024/1024))
+        # 让所有文件的 mtime 落在索引的“过新”窗口之外
+        past=time.time_ns()-RACY_WINDOW_NS*2
+        for rel_path,_,_ in entries:
+            os.utime(os.path.join(root,rel_path),ns=(past,past))
+
+        index=VerifyIndex(os.path.join(tmp,"verify.db"))
+        measure("冷校验",index,root,entries)
+        index=VerifyIndex(os.path.join(tmp,"verify.db"))
+        warm,result=measure("热校验",index,root,entries)
+        if warm>args.budget:
+            failures.append("热校验超出预算 %.0f ms"%args.budget)
+        if result.hashed:
+            failures.append("热校验重新计算了哈希")
+
+        # 破坏一个文件（大小不变），应只重新计算它并报告不符
+        rel_path=entries[-1][0]
+        with open(os.path.join(root,rel_path),"r+b") as f:
+            f.write(b"\0"*16)
+        _,result=measure("改动一个",index,root,entries)
+        if result.hashed!=1 or result.mismatched!=[rel_path]:
+            failures.append("没有只重新计算被改动的文件")
+
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
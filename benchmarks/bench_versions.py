@@ -0,0 +1,115 @@
+"""版本清单缓存基准
+
+用本地替身服务器提供合成的版本清单（默认 800 个版本）与版本 JSON，测量：
+- 首次获取清单（网络 + 解析）
+- 新进程打开版本列表：只读本地缓存（不访问网络，读取 pickle 而不是解析 JSON）
+- 条件刷新：服务器返回 304
+- 获取版本 JSON 并解析带 inheritsFrom 的加载器版本，再次解析时命中合并缓存
+
+用法：
+    python benchmarks/bench_versions.py
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from MLCore.versions import VersionRepository, HttpCache
+from benchmarks.standin_server import StandinServer
+from benchmarks.synthetic_versions import make_manifest, make_loader_version
+
+def timed(title,func,server):
+    before=server.stats["requests"]
+    started=time.perf_counter()
+    result=func()
+    elapsed=(time.perf_counter()-started)*1000
+    print("%-20s %9.2f ms  请求 %d"%(title,elapsed,server.stats["requests"]-before))
+    return result,server.stats["requests"]-before
+
+def main():
+    parser=argparse.ArgumentParser(description="版本清单缓存基准")
+    parser.add_argument("--versions",type=int,default=800)
+    args=parser.parse_args()
+
+    server=StandinServer().start()
+    manifest,bodies=make_manifest(args.versions,server.url())
+    server.objects["/mc/game/version_manifest_v2.json"]=json.dumps(manifest).encode("utf-8")
+    server.objects.update(bodies)
+    failures=[]
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            def repository():
+                return VersionRepository(
+                    game_dir=os.path.join(tmp,"game"),
+                    http_cache=HttpCache(os.path.join(tmp,"http")),
+                    parsed_dir=os.path.join(tmp,"parsed"),
+                    manifest_url=server.url("/mc/game/version_manifest_v2.json")
+                )
+
+            repo=repository()
+            timed("首次获取清单",repo.refresh_manifest,server)
+
+            # 模拟新进程：新的仓库对象，内存缓存为空
+            repo=repository()
+            result,requests=timed("打开版本列表",repo.manifest,server)
+            if result is None or requests:
+                failures.append("打开版本列表时访问了网络")
+            if len(result.versions)!=args.versions:
+                failures.append("清单版本数不符")
+
+            (_,changed),requests=timed("条件刷新(304)",repo.refresh_manifest,server)
+            if changed or server.stats["not_modified"]!=1:
+                failures.append("条件刷新没有得到 304")
+
+            parent_id=manifest["latest"]["release"]
+            loader_id="loader-0.15-"+parent_id
+            loader_path=repo.version_path(loader_id)
+            os.makedirs(os.path.dirname(loader_path))
+            with open(loader_path,"w",encoding="utf-8") as f:
+                json.dump(make_loader_version(loader_id,parent_id),f)
+
+            merged,_=timed("首次解析加载器版本",lambda:repo.resolve(loader_id),server)
+            repo=repository()
+            timed("新进程解析",lambda:repo.resolve(loader_id),server)
+            again,requests=timed("再次解析(合并缓存)",lambda:repo.resolve(loader_id),server)
+            if again is not repo.resolve(loader_id) or requests:
+                failures.append("合并结果没有被缓存")
+            if merged.main_class!="net.loader.impl.launch.knot.KnotClient" or merged.inherits_from is not None:
+                failures.append("继承链合并结果错误")
+            print("合并后的库数量: %d"%len(merged.libraries))
+
+            # 被截断的版本 JSON 与清单中的 sha1 不一致，重新下载
+            parent_path=repo.version_path(parent_id)
+            with open(parent_path,"r+b") as f:
+                f.truncate(100)
+            repo=repository()
+            _,requests=timed("截断后重新获取",lambda:repo.version(parent_id),server)
+            if requests!=1:
+                failures.append("版本 JSON 被截断后没有重新下载")
+
+            # 其他版本写入的 pickle（引用了不存在的模块）退回到重新解析
+            for name in os.listdir(os.path.join(tmp,"parsed")):
+                with open(os.path.join(tmp,"parsed",name),"wb") as f:
+                    f.write(b"cno_such_module\nThing\n.")
+            repo=repository()
+            try:
+                repo.resolve(loader_id)
+            except Exception as e:
+                failures.append("损坏的解析缓存导致异常: %r"%e)
+    finally:
+        server.stop()
+
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""事件循环看门狗基准
+
+以 --watchdog=100 启动主窗口，点击侧边栏菜单时执行一个人为阻塞 300 ms 的处理函数，检查：
+- 看门狗记录到这次停顿，抓到的 GUI 线程堆栈中包含阻塞的函数
+- 标题栏的延迟浮层已显示并进入危险色
+- 空闲时看门狗自身的 CPU 开销
+
+用法：
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_watchdog.py
+"""
+import io
+import os
+import sys
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT)
+os.chdir(ROOT)
+
+from PyQt5.QtCore import QTimer
+import ui.UIMain as UIMain
+from ui.layout.AppHeader import AppHeader
+from ui.layout.AppSidebar import AppSidebar
+
+THRESHOLD_MS=100
+BLOCK_SECONDS=0.3
+IDLE_SECONDS=2.0
+
+def blocking_menu_handler(menu_id):
+    """模拟一个在 GUI 线程做重活的菜单处理函数"""
+    time.sleep(BLOCK_SECONDS)
+
+def main():
+    sys.argv.append("--watchdog=%d"%THRESHOLD_MS)
+    app=UIMain.create_app()
+    window=UIMain.create_main_window()
+    from ui import watchdog
+    dog=window.findChild(watchdog.Watchdog)
+    header=window.findChild(AppHeader)
+    failures=[]
+    if dog is None:
+        print("失败: 看门狗没有开启")
+        return 1
+    log=io.StringIO()
+    dog.output=log
+
+    sidebar=window.findChild(AppSidebar)
+    sidebar.menu_clicked.connect(blocking_menu_handler)
+    result={}
+
+    def measure_idle():
+        result["cpu_start"]=time.process_time()
+        result["wall_start"]=time.perf_counter()
+        QTimer.singleShot(int(IDLE_SECONDS*1000),finish_idle)
+    def finish_idle():
+        result["cpu"]=time.process_time()-result["cpu_start"]
+        result["wall"]=time.perf_counter()-result["wall_start"]
+        sidebar.menu_buttons["logs"].click()
+        QTimer.singleShot(800,app.quit)
+    QTimer.singleShot(500,measure_idle)
+    app.exec_()
+    dog.stop()
+
+    stalls=dog.stalls
+    print("%-16s %10d"%("心跳次数",dog.histogram.total))
+    print("%-16s %10d"%("停顿次数",len(stalls)))
+    if stalls:
+        print("%-16s %10.0f ms"%("最长停顿",max(ms for ms,_ in stalls)))
+    print("%-16s %10.2f %%"%("空闲 CPU 占用",result["cpu"]/result["wall"]*100))
+    print("%-16s %s"%("浮层",header.latency_label.text()))
+    print(dog.histogram.format())
+
+    # 心跳测量的是迟到的时间：阻塞开始时距上次心跳已经过去 0~INTERVAL_MS，记录的停顿最短为阻塞时长减去一个心跳间隔
+    shortest=BLOCK_SECONDS*1000-watchdog.Watchdog.INTERVAL_MS
+    if not any(ms>=shortest and "blocking_menu_handler" in stack for ms,stack in stalls):
+        failures.append("没有记录到带堆栈的停顿")
+    if "blocking_menu_handler" not in log.getvalue():
+        failures.append("停顿报告中没有阻塞函数的堆栈")
+    if header.latency_label.property("level")!="bad":
+        failures.append("浮层没有显示停顿")
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""启动耗时回归检查
+
+在子进程中以 ``python -X importtime`` 运行 main.py 的启动流程（开启启动追踪，
+事件循环空闲后自动退出），检查：
+
+- 导入 ui.UIMain（不含 PyQt5 本身）的累计耗时
+- 从进程开始到首帧绘制的耗时
+- 启动期间没有导入应当按需加载的重模块（如 MLCore 的子模块）
+
+任一项超出预算时以非零状态退出，可直接用于 CI。
+
+用法：
+    QT_QPA_PLATFORM=offscreen python benchmarks/check_startup_budget.py
+    QT_QPA_PLATFORM=offscreen python benchmarks/check_startup_budget.py --import-budget 100 --paint-budget 500
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 启动阶段不应导入的模块前缀
+LAZY_MODULES=(
+    "MLCore.",
+    # 后台任务运行时与 asyncio 在第一次提交任务时才导入
+    "ui.tasks",
+    "asyncio",
+)
+# 例外：首页需要在启动时读取账号头信息
+STARTUP_ALLOWED=(
+    "MLCore.accounts",
+    "MLCore.paths",
+)
+
+CHILD_SCRIPT="""
+import runpy
+import sys
+sys.argv=["main.py","--trace-startup="+sys.argv[1]]
+from ui import startup_trace
+from PyQt5.QtCore import QCoreApplication
+original_finish=startup_trace.finish
+def finish():
+    original_finish()
+    QCoreApplication.quit()
+startup_trace.finish=finish
+runpy.run_path("main.py",run_name="__main__")
+"""
+
+def parse_importtime(stderr):
+    """解析 -X importtime 输出，返回 {模块名: 累计耗时(us)}"""
+    result={}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _,_,cumulative,name=[part.strip() for part in line.replace("import time:","|",1).split("|")]
+        result[name]=int(cumulative)
+    return result
+
+def main():
+    parser=argparse.ArgumentParser(description="启动耗时回归检查")
+    parser.add_argument("--import-budget",type=float,default=150,help="导入 ui.UIMain 的预算（毫秒）")
+    parser.add_argument("--paint-budget",type=float,default=1000,help="首帧绘制的预算（毫秒）")
+    args=parser.parse_args()
+
+    env=dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM","offscreen")
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_path=os.path.join(tmp,"trace.json")
+        proc=subprocess.run(
+            [sys.executable,"-X","importtime","-c",CHILD_SCRIPT,trace_path],
+            cwd=ROOT,env=env,capture_output=True,text=True,timeout=60
+        )
+        if proc.returncode!=0 or not os.path.exists(trace_path):
+            print(proc.stdout)
+            print(proc.stderr)
+            print("启动流程运行失败")
+            return 1
+        with open(trace_path,encoding="utf-8") as f:
+            trace=json.load(f)["traceEvents"]
+
+    imports=parse_importtime(proc.stderr)
+    ui_import_ms=imports.get("ui.UIMain",0)/1000
+    paint_ms=next((e["ts"]/1000 for e in trace if e["name"]=="first paint"),None)
+    eager=sorted(name for name in imports if name.startswith(LAZY_MODULES) and name not in STARTUP_ALLOWED)
+
+    failures=[]
+    print("%-28s %10s %10s"%("检查项","实测(ms)","预算(ms)"))
+    print("%-28s %10.2f %10.2f"%("导入 ui.UIMain",ui_import_ms,args.import_budget))
+    if ui_import_ms>args.import_budget:
+        failures.append("导入 ui.UIMain 超出预算")
+    if paint_ms is None:
+        failures.append("没有记录到首帧绘制")
+    else:
+        print("%-28s %10.2f %10.2f"%("首帧绘制",paint_ms,args.paint_budget))
+        if paint_ms>args.paint_budget:
+            failures.append("首帧绘制超出预算")
+    if eager:
+        failures.append("启动时导入了应按需加载的模块: "+", ".join(eager))
+
+    for failure in failures:
+        print("失败: "+failure)
+    if not failures:
+        print("通过")
+    return 1 if failures else 0
+
+if __name__=="__main__":
+    sys.exit(main())
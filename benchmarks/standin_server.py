@@ -0,0 +1,121 @@
+"""本地 HTTP 替身服务器
+
+在后台线程中运行，替代资源服务器与版本清单服务器，供基准脚本和手动测试使用：
+- HTTP/1.1 keep-alive
+- 单段 Range 请求（206）
+- 带 ETag 的条件请求（304）
+- 统计请求数、返回的字节数与建立的连接数
+
+用法：
+    server=StandinServer({"/a/b": b"..."})
+    server.start()
+    url=server.url("/a/b")
+    ...
+    server.stop()
+"""
+import hashlib
+import re
+import socket
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RANGE_PATTERN=re.compile(r"bytes=(\d+)-(\d*)$")
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version="HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # 响应头与响应体分两次写出，不关闭 Nagle 时会和客户端的延迟确认叠加出 40ms 停顿
+        self.connection.setsockopt(socket.IPPROTO_TCP,socket.TCP_NODELAY,1)
+        self.server.owner.count("connections")
+
+    def log_message(self,format,*args):
+        pass
+
+    def do_GET(self):
+        owner=self.server.owner
+        owner.count("requests")
+        body=owner.objects.get(self.path.split("?",1)[0])
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length","0")
+            self.end_headers()
+            return
+
+        etag=owner.etag(self.path.split("?",1)[0],body)
+        if self.headers.get("If-None-Match")==etag:
+            owner.count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag",etag)
+            self.send_header("Content-Length","0")
+            self.end_headers()
+            return
+
+        start,end=0,len(body)-1
+        match=RANGE_PATTERN.match(self.headers.get("Range","")) if owner.support_range else None
+        if match:
+            start=int(match.group(1))
+            end=min(int(match.group(2)) if match.group(2) else end,end)
+            self.send_response(206)
+            self.send_header("Content-Range","bytes %d-%d/%d"%(start,end,len(body)))
+        else:
+            self.send_response(200)
+        self.send_header("ETag",etag)
+        self.send_header("Content-Length",str(end-start+1))
+        self.end_headers()
+        self.wfile.write(body[start:end+1])
+        owner.count("bytes",end-start+1)
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads=True
+
+    def handle_error(self,request,client_address):
+        # 客户端提前断开（如取消下载）是正常情况，不打印堆栈
+        if isinstance(sys.exc_info()[1],ConnectionError):
+            return
+        super().handle_error(request,client_address)
+
+class StandinServer:
+    """后台运行的替身服务器"""
+
+    def __init__(self,objects=None,support_range=True):
+        """初始化
+
+        Args:
+            objects: {路径: 内容(bytes)}，启动后仍可修改
+            support_range: 为 False 时忽略 Range 头，总是返回完整内容
+        """
+        self.objects=dict(objects or {})
+        self.support_range=support_range
+        self.etags={}
+        self.stats={"requests":0,"connections":0,"bytes":0,"not_modified":0}
+        self.lock=threading.Lock()
+        self.httpd=_Server(("127.0.0.1",0),_Handler)
+        self.httpd.owner=self
+        self.thread=None
+
+    def etag(self,path,body):
+        """内容的 ETag，按 (路径, 内容) 缓存，内容被替换后自动更新"""
+        cached=self.etags.get(path)
+        if cached is None or cached[0] is not body:
+            cached=self.etags[path]=(body,'"%s"'%hashlib.sha1(body).hexdigest())
+        return cached[1]
+
+    def count(self,name,amount=1):
+        with self.lock:
+            self.stats[name]+=amount
+
+    def url(self,path=""):
+        host,port=self.httpd.server_address
+        return "http://%s:%d%s"%(host,port,path)
+
+    def start(self):
+        self.thread=threading.Thread(target=self.httpd.serve_forever,daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
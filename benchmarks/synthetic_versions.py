@@ -0,0 +1,112 @@
+"""合成的版本清单与版本 JSON
+
+结构与官方 version_manifest_v2.json、1.13+ 版本 JSON 以及 Fabric 的继承版本 JSON 一致，
+内容（库名、哈希）是随机生成的，供基准脚本使用。
+"""
+import hashlib
+import json
+
+OS_NAMES=("linux","windows","osx")
+
+def _sha1(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def make_library(group,artifact,version,base_url="https://libraries.minecraft.net/",os_name=None):
+    name="%s:%s:%s"%(group,artifact,version)
+    path="%s/%s/%s/%s-%s.jar"%(group.replace(".","/"),artifact,version,artifact,version)
+    library={
+        "name":name,
+        "downloads":{"artifact":{"path":path,"url":base_url+path,"sha1":_sha1(name),"size":100000+len(name)}}
+    }
+    if os_name:
+        library["name"]+=":natives-"+os_name
+        library["rules"]=[{"action":"allow","os":{"name":os_name}}]
+    return library
+
+def make_vanilla_version(version_id,library_count=60):
+    """生成一个 1.13+ 格式的原版版本 JSON（字典）"""
+    libraries=[]
+    for i in range(library_count):
+        # 约三分之一的库带平台规则（类似 LWJGL 的各平台 natives）
+        os_name=OS_NAMES[(i//3)%3] if i%3==0 else None
+        libraries.append(make_library("org.example.lib%02d"%(i//3),"artifact%d"%i,"1.%d.0"%(i%7),os_name=os_name))
+    return {
+        "id":version_id,
+        "type":"release",
+        "mainClass":"net.minecraft.client.main.Main",
+        "assets":"5",
+        "assetIndex":{"id":"5","url":"https://piston-meta.mojang.com/v1/packages/x/5.json","sha1":_sha1("5"),
+                      "size":400000,"totalSize":600000000},
+        "downloads":{"client":{"url":"https://piston-data.mojang.com/v1/objects/x/client.jar",
+                               "sha1":_sha1(version_id),"size":22000000}},
+        "javaVersion":{"component":"java-runtime-gamma","majorVersion":17},
+        "libraries":libraries,
+        "arguments":{
+            "game":[
+                "--username","${auth_player_name}","--version","${version_name}","--gameDir","${game_directory}",
+                "--assetsDir","${assets_root}","--assetIndex","${assets_index_name}","--uuid","${auth_uuid}",
+                "--accessToken","${auth_access_token}","--userType","${user_type}","--versionType","${version_type}",
+                {"rules":[{"action":"allow","features":{"is_demo_user":True}}],"value":"--demo"},
+                {"rules":[{"action":"allow","features":{"has_custom_resolution":True}}],
+                 "value":["--width","${resolution_width}","--height","${resolution_height}"]}
+            ],
+            "jvm":[
+                {"rules":[{"action":"allow","os":{"name":"osx"}}],"value":["-XstartOnFirstThread"]},
+                {"rules":[{"action":"allow","os":{"name":"windows"}}],
+                 "value":"-XX:HeapDumpPath=MojangTricksIntelDriversForPerformance_javaw.exe_minecraft.exe.heapdump"},
+                {"rules":[{"action":"allow","os":{"arch":"x86"}}],"value":"-Xss1M"},
+                "-Djava.library.path=${natives_directory}","-Dminecraft.launcher.brand=${launcher_name}",
+                "-Dminecraft.launcher.version=${launcher_version}","-cp","${classpath}"
+            ]
+        },
+        "logging":{"client":{"argument":"-Dlog4j.configurationFile=${path}",
+                             "file":{"id":"client-1.12.xml","sha1":_sha1("log"),"size":888,
+                                     "url":"https://piston-data.mojang.com/v1/objects/x/client-1.12.xml"},
+                             "type":"log4j2-xml"}}
+    }
+
+def make_loader_version(version_id,parent_id,library_count=20,duplicate_count=5):
+    """生成一个继承 parent_id 的加载器版本 JSON（字典），类似 Fabric/Forge
+
+    前 duplicate_count 个库与原版的库 group:artifact 相同、版本更新，用于测试去重。
+    """
+    libraries=[]
+    for i in range(library_count):
+        if i<duplicate_count:
+            group,artifact="org.example.lib%02d"%(i*3//3),"artifact%d"%(i*3+1)
+        else:
+            group,artifact="net.loader.dep%03d"%i,"dep%d"%i
+        libraries.append({"name":"%s:%s:9.%d.0"%(group,artifact,i),"url":"https://maven.example.net/"})
+    return {
+        "id":version_id,
+        "inheritsFrom":parent_id,
+        "type":"release",
+        "mainClass":"net.loader.impl.launch.knot.KnotClient",
+        "arguments":{"game":[],"jvm":["-DFabricMcEmu= net.minecraft.client.main.Main "]},
+        "libraries":libraries
+    }
+
+def make_manifest(count,base_url):
+    """生成版本清单（字典）与 {URL 路径: 版本 JSON 字节} 映射
+
+    只有最新的 5 个版本在服务器上有版本 JSON，其余版本只出现在清单中。
+    """
+    versions=[]
+    bodies={}
+    for i in range(count):
+        version_id="1.%d.%d"%(count-i,i%3)
+        path="/v1/packages/%s/%s.json"%(_sha1(version_id),version_id)
+        body=json.dumps(make_vanilla_version(version_id)).encode("utf-8")
+        if i<5:
+            bodies[path]=body
+        versions.append({
+            "id":version_id,
+            "type":"release" if i%4 else "snapshot",
+            "url":base_url+path,
+            "time":"2024-01-01T00:00:00+00:00",
+            "releaseTime":"2024-01-01T00:00:00+00:00",
+            "sha1":hashlib.sha1(body).hexdigest(),
+            "complianceLevel":1
+        })
+    manifest={"latest":{"release":versions[1]["id"],"snapshot":versions[0]["id"]},"versions":versions}
+    return manifest,bodies
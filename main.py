@@ -1,4 +1,16 @@
-import ui.UIMain as UIMain
-app=UIMain.create_app()
-main_window=UIMain.create_main_window()
-app.exec_()
+import sys
+from ui import startup_trace
+startup_trace.init(sys.argv)
+
+with startup_trace.span("import PyQt5"):
+    import PyQt5.QtWidgets
+    import PyQt5.QtCore
+    import PyQt5.QtGui
+with startup_trace.span("import ui.UIMain"):
+    import ui.UIMain as UIMain
+with startup_trace.span("create_app"):
+    app=UIMain.create_app()
+startup_trace.watch_first_paint(app)
+with startup_trace.span("create_main_window"):
+    main_window=UIMain.create_main_window()
+app.exec_()
\ No newline at end of file
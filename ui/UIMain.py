@@ -2,62 +2,154 @@ import PyQt5.QtWidgets as qtw
 import PyQt5.QtCore as qtc
 import PyQt5.QtGui as qtg
 from .layout import AppHeader, AppSidebar
-from .pages import HomePage
+from .layout.edges import hit_test, EDGE_CURSORS
+from .layout.shadow import paint_shadow
+from .pages import PageRegistry
+from . import theme
+from . import startup_trace
+
+# 已创建页面的估算内存预算（MB），超出时回收可回收的页面
+PAGE_MEMORY_BUDGET_MB=32
+# 首帧绘制后等待多久再预创建页面（毫秒）
+PREWARM_DELAY_MS=1000
 
 class ResizableMainWindow(qtw.QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("MineLancher")
-        self.setGeometry(100,100,800,600)
         self.setWindowIcon(qtg.QIcon("assets/logo/logo32.png"))
         # 隐藏系统标题栏，使用自定义标题栏
         self.setWindowFlags(qtc.Qt.FramelessWindowHint)
         
-        # 添加窗口阴影
-        shadow = qtw.QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setColor(qtg.QColor(0, 0, 0, 100))
-        shadow.setOffset(0, 0)
-        self.setGraphicsEffect(shadow)
+        # 添加窗口阴影：窗口四周留出透明边距，用缓存的九宫格贴图绘制阴影，
+        # 子部件重绘时不会触发整窗模糊
+        with startup_trace.span("window shadow"):
+            self.setAttribute(qtc.Qt.WA_TranslucentBackground)
+            self.shadow_size = 10
+            self.shadow_color = qtg.QColor(0, 0, 0, 100)
+            self.shadow_enabled = True
+            self.update_shadow_margins()
+        # 内容区域为 800x600，外面再加上阴影边距
+        m = self.shadow_size
+        self.setGeometry(100 - m, 100 - m, 800 + 2 * m, 600 + 2 * m)
         
         # 边缘拖动相关
         self.edge_size = 8  # 增加边缘大小，减少敏感度
         self.is_resizing = False
         self.resize_direction = None
         
+        # 几何更新合并：鼠标事件只记录最新的目标位置/大小，
+        # 由定时器每帧最多真正应用一次
+        self.pending_geometry = None
+        self.pending_pos = None
+        self.geometry_timer = qtc.QTimer(self)
+        self.geometry_timer.setSingleShot(True)
+        self.geometry_timer.setInterval(16)
+        self.geometry_timer.timeout.connect(self.flush_geometry)
+    
+    def shadow_margin(self):
+        """当前的阴影边距，最大化或全屏时没有阴影"""
+        if self.isMaximized() or self.isFullScreen():
+            return 0
+        return self.shadow_size
+    
+    def content_rect(self):
+        """窗口中除去阴影边距的内容区域"""
+        m = self.shadow_margin()
+        return self.rect().adjusted(m, m, -m, -m)
+    
+    def update_shadow_margins(self):
+        """根据窗口状态更新内容区域的边距"""
+        m = self.shadow_margin()
+        self.setContentsMargins(m, m, m, m)
+    
+    def changeEvent(self, event):
+        if event.type() == qtc.QEvent.WindowStateChange:
+            self.update_shadow_margins()
+        super().changeEvent(event)
+    
+    def paintEvent(self, event):
+        """在透明边距中绘制阴影，缩放期间只画一圈细线作为占位"""
+        m = self.shadow_margin()
+        if not m:
+            return
+        painter = qtg.QPainter(self)
+        content = self.content_rect()
+        if self.shadow_enabled:
+            paint_shadow(painter, content, m, self.shadow_color, event.region())
+        else:
+            painter.setPen(self.shadow_color)
+            painter.drawRect(content.adjusted(-1, -1, 0, 0))
+    
+    def edge_hit_test(self, pos):
+        """判断窗口坐标落在哪条可缩放边缘上，阴影边距也算作边缘"""
+        return hit_test(pos, self.rect(), self.edge_size + self.shadow_margin())
+    
+    def edge_at(self, global_pos):
+        """判断全局坐标落在窗口的哪条边缘上，供标题栏复用
+        
+        Args:
+            global_pos: 全局坐标
+        
+        Returns:
+            方向字符串，不在边缘上时返回 None
+        """
+        return self.edge_hit_test(self.mapFromGlobal(global_pos))
+    
+    def request_geometry(self, rect):
+        """请求设置窗口几何信息，同一帧内的多次请求只应用最后一次
+        
+        Args:
+            rect: 目标几何信息
+        """
+        self.pending_geometry = rect
+        self.pending_pos = None
+        if not self.geometry_timer.isActive():
+            self.geometry_timer.start()
+    
+    def request_move(self, pos):
+        """请求移动窗口，同一帧内的多次请求只应用最后一次
+        
+        Args:
+            pos: 目标左上角位置
+        """
+        self.pending_pos = pos
+        self.pending_geometry = None
+        if not self.geometry_timer.isActive():
+            self.geometry_timer.start()
+    
+    def flush_geometry(self):
+        """立即应用尚未生效的几何更新"""
+        self.geometry_timer.stop()
+        if self.pending_geometry is not None:
+            self.setGeometry(self.pending_geometry)
+        elif self.pending_pos is not None:
+            self.move(self.pending_pos)
+        self.pending_geometry = None
+        self.pending_pos = None
+    
+    def set_shadow_enabled(self, enabled):
+        """开关窗口阴影，实时缩放期间用细线占位代替
+        
+        Args:
+            enabled: 是否开启
+        """
+        if enabled != self.shadow_enabled:
+            self.shadow_enabled = enabled
+            self.update()
+        
     def mousePressEvent(self, event):
         if event.button() == qtc.Qt.LeftButton:
-            # 检查鼠标是否在窗口边缘
-            pos = event.pos()
-            rect = self.rect()
-            
-            # 确定拖动方向
-            if pos.x() <= self.edge_size:
-                if pos.y() <= self.edge_size:
-                    self.resize_direction = "topleft"
-                elif pos.y() >= rect.height() - self.edge_size:
-                    self.resize_direction = "bottomleft"
-                else:
-                    self.resize_direction = "left"
-            elif pos.x() >= rect.width() - self.edge_size:
-                if pos.y() <= self.edge_size:
-                    self.resize_direction = "topright"
-                elif pos.y() >= rect.height() - self.edge_size:
-                    self.resize_direction = "bottomright"
-                else:
-                    self.resize_direction = "right"
-            elif pos.y() <= self.edge_size:
-                self.resize_direction = "top"
-            elif pos.y() >= rect.height() - self.edge_size:
-                self.resize_direction = "bottom"
-            else:
-                self.resize_direction = None
+            # 检查鼠标是否在窗口边缘，确定拖动方向
+            self.resize_direction = self.edge_hit_test(event.pos())
             
             if self.resize_direction:
                 self.is_resizing = True
                 self.resize_start_pos = event.globalPos()
                 # 保存起始状态
                 self.resize_start_geometry = self.geometry()
+                # 缩放期间用无阴影的窗口代替，松开鼠标后恢复
+                self.set_shadow_enabled(False)
         
         super().mousePressEvent(event)
     
@@ -180,8 +272,8 @@ class ResizableMainWindow(qtw.QMainWindow):
                 if new_height < min_height:
                     new_height = min_height
             
-            # 更新窗口几何信息
-            self.setGeometry(new_x, new_y, new_width, new_height)
+            # 更新窗口几何信息，合并到下一帧再应用
+            self.request_geometry(qtc.QRect(new_x, new_y, new_width, new_height))
             
             # 注意：这里不再更新起始位置和几何信息，避免累积误差
             # 这样可以确保每次计算都基于原始的起始状态
@@ -193,27 +285,9 @@ class ResizableMainWindow(qtw.QMainWindow):
     
     def update_cursor(self, pos):
         """根据鼠标位置更新光标样式"""
-        rect = self.rect()
-        
-        # 检查鼠标是否在窗口边缘
-        if pos.x() <= self.edge_size:
-            if pos.y() <= self.edge_size:
-                self.setCursor(qtc.Qt.SizeFDiagCursor)  # 左上
-            elif pos.y() >= rect.height() - self.edge_size:
-                self.setCursor(qtc.Qt.SizeBDiagCursor)  # 左下
-            else:
-                self.setCursor(qtc.Qt.SizeHorCursor)  # 左
-        elif pos.x() >= rect.width() - self.edge_size:
-            if pos.y() <= self.edge_size:
-                self.setCursor(qtc.Qt.SizeBDiagCursor)  # 右上
-            elif pos.y() >= rect.height() - self.edge_size:
-                self.setCursor(qtc.Qt.SizeFDiagCursor)  # 右下
-            else:
-                self.setCursor(qtc.Qt.SizeHorCursor)  # 右
-        elif pos.y() <= self.edge_size:
-            self.setCursor(qtc.Qt.SizeVerCursor)  # 上
-        elif pos.y() >= rect.height() - self.edge_size:
-            self.setCursor(qtc.Qt.SizeVerCursor)  # 下
+        direction = self.edge_hit_test(pos)
+        if direction:
+            self.setCursor(EDGE_CURSORS[direction])
         else:
             self.unsetCursor()  # 恢复默认光标
     
@@ -228,6 +302,10 @@ class ResizableMainWindow(qtw.QMainWindow):
         super().leaveEvent(event)
     
     def mouseReleaseEvent(self, event):
+        # 松开时立即应用最后一次几何更新，并恢复阴影
+        self.flush_geometry()
+        if self.is_resizing:
+            self.set_shadow_enabled(True)
         self.is_resizing = False
         self.resize_direction = None
         self.unsetCursor()  # 恢复默认光标
@@ -235,6 +313,8 @@ class ResizableMainWindow(qtw.QMainWindow):
 
 def create_app():
     app=qtw.QApplication([])
+    # 整个应用共用一份预先生成的主题样式表
+    theme.apply_theme(app)
     return app
 def create_main_window():
     # 使用自定义的可调整大小的主窗口
@@ -242,6 +322,7 @@ def create_main_window():
     
     # 创建中央部件
     central_widget=qtw.QWidget()
+    central_widget.setObjectName("centralWidget")
     main_layout=qtw.QVBoxLayout(central_widget)
     main_layout.setContentsMargins(0,0,0,0)
     main_layout.setSpacing(0)
@@ -253,64 +334,61 @@ def create_main_window():
     content_layout.setSpacing(0)
     
     # 创建侧边栏
-    sidebar=AppSidebar(main_window)
+    with startup_trace.span("AppSidebar"):
+        sidebar=AppSidebar(main_window)
     content_layout.addWidget(sidebar)
     
     # 创建右侧区域（包含标题栏和主内容）
     right_widget=qtw.QWidget()
-    right_widget.setStyleSheet("background-color: #ffffff;")
+    right_widget.setObjectName("rightPanel")
     right_layout=qtw.QVBoxLayout(right_widget)
     right_layout.setContentsMargins(0,0,0,0)
     right_layout.setSpacing(0)
     
     # 创建标题栏
-    header=AppHeader(main_window=main_window, title="首页")
+    with startup_trace.span("AppHeader"):
+        header=AppHeader(main_window=main_window)
+        header.set_title_key("sidebar.home")
     right_layout.addWidget(header)
     
-    # 创建主内容区域（页面容器）
-    main_content=qtw.QWidget()
-    main_content.setStyleSheet("background-color: #f8f9fa;")
-    content_layout_inside=qtw.QVBoxLayout(main_content)
-    content_layout_inside.setContentsMargins(0,0,0,0)
-    content_layout_inside.setSpacing(0)
+    # 开发者选项：事件循环看门狗（MINELANCHER_WATCHDOG=1 或 --watchdog），标题栏显示延迟
+    from ui import watchdog
+    event_watchdog=watchdog.start(parent=main_window)
+    if event_watchdog is not None:
+        header.show_latency_overlay(event_watchdog)
     
-    # 创建页面实例
-    home_page=HomePage()
+    # 创建主内容区域（页面容器），页面在第一次导航时才创建；
+    # 已创建页面的估算内存超出预算时回收最久未用的重页面（模组、日志），下次导航时重建
+    pages=PageRegistry(memory_budget=PAGE_MEMORY_BUDGET_MB,parent=main_window)
+    main_content=pages.stack
+    main_content.setObjectName("pageStack")
     
-    # 添加页面到容器
-    content_layout_inside.addWidget(home_page)
-    
-    # 保存页面引用
-    pages={
-        "home": home_page
-    }
+    # 登记页面，页面模块在第一次显示时才导入
+    # cost 为估算内存（MB）；实例页是首页之后最常去的页面，空闲时预先创建（创建时不扫描实例）
+    pages.register("home", "ui.pages.home_page:HomePage", title_key="sidebar.home", cost=2)
+    pages.register("instances", "ui.pages.instances_page:InstancesPage", title_key="sidebar.instances",
+                   cost=4, prewarm=True)
+    pages.register("mods", "ui.pages.mods_page:ModsPage", title_key="sidebar.mods", cost=16, evictable=True)
+    pages.register("logs", "ui.pages.log_page:LogPage", title_key="sidebar.logs", cost=16, evictable=True)
     
     # 当前显示的页面
     current_page="home"
+    pages.show(current_page)
     
     # 设置默认选中首页
     sidebar.set_current_page(current_page)
     
     # 连接侧边栏信号
     def on_menu_clicked(menu_id):
-        nonlocal current_page
         if menu_id in pages:
-            # 隐藏当前页面
-            if current_page in pages:
-                pages[current_page].hide()
-                pages[current_page].on_hide()
-            
-            # 显示新页面
-            pages[menu_id].show()
-            pages[menu_id].on_show()
-            current_page=menu_id
+            pages.show(menu_id)
             
             # 更新侧边栏选中状态
-            sidebar.set_current_page(current_page)
+            sidebar.set_current_page(menu_id)
             
             # 更新标题栏标题
-            if menu_id == "home":
-                header.set_title("首页")
+            if pages.title_key(menu_id):
+                header.set_title_key(pages.title_key(menu_id))
     
     sidebar.menu_clicked.connect(on_menu_clicked)
     
@@ -322,5 +400,9 @@ def create_main_window():
     
     # 设置中央部件
     main_window.setCentralWidget(central_widget)
-    main_window.show()
+    with startup_trace.span("main_window.show"):
+        main_window.show()
+    
+    # 首帧绘制后在空闲时间预创建页面
+    pages.schedule_prewarm(delay=PREWARM_DELAY_MS)
     return main_window
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""实例目录监视
+
+用 QFileSystemWatcher（Linux 上基于 inotify）监视实例根目录与每个实例的目录、instance.json、
+mods 与 screenshots 目录。变化先记入待处理集合，停止变化 DEBOUNCE_MS 后（持续变化时最多等待 MAX_WAIT_MS）
+交给 InstanceManager.apply() 只重新读取受影响的实例，结果以增量差异发出，界面不需要定时全量扫描。
+"""
+import os
+import time
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+class InstanceWatcher(QObject):
+    """实例目录监视器
+
+    Signals:
+        diff_ready(object): MLCore.instances.InstanceDiff，只在有变化时发出
+    """
+
+    diff_ready = pyqtSignal(object)
+
+    # 最后一次变化之后等待的时间（毫秒）
+    DEBOUNCE_MS = 200
+    # 持续变化时，距第一次变化最多等待的时间（毫秒）
+    MAX_WAIT_MS = 1000
+
+    def __init__(self, manager, debounce_ms=DEBOUNCE_MS, parent=None):
+        """初始化监视器（需在 GUI 线程中创建）
+
+        Args:
+            manager: MLCore.instances.InstanceManager，已完成 scan()
+            debounce_ms: 去抖间隔（毫秒）
+        """
+        super().__init__(parent)
+        self.manager = manager
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_changed)
+        self.watcher.fileChanged.connect(self.on_changed)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce_ms)
+        self.timer.timeout.connect(self.flush)
+        # 实例 ID -> 正在监视的路径
+        self.watched = {}
+        self.dirty = set()
+        self.root_dirty = False
+        self.first_dirty = None
+        # 统计：收到的变化通知数与实际处理的批次数
+        self.events = 0
+        self.batches = 0
+
+    def start(self):
+        """开始监视，并补上扫描与开始监视之间发生的变化"""
+        self.watcher.addPath(self.manager.root)
+        for instance_id in list(self.manager.instances):
+            self.watch(instance_id)
+        self.dirty.update(self.manager.instances)
+        self.root_dirty = True
+        self.flush()
+
+    def stop(self):
+        self.timer.stop()
+        paths = self.watcher.files() + self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
+        self.watched.clear()
+
+    def watch(self, instance_id):
+        """（重新）监视一个实例的路径；原子替换的 instance.json 与新建的子目录需要重新加入"""
+        self.unwatch(instance_id)
+        paths = [path for path in self.manager.watch_paths(instance_id) if os.path.exists(path)]
+        if paths:
+            self.watcher.addPaths(paths)
+        self.watched[instance_id] = paths
+
+    def unwatch(self, instance_id):
+        paths = self.watched.pop(instance_id, None)
+        if paths:
+            self.watcher.removePaths(paths)
+
+    def watch_new_dirs(self):
+        """监视根目录中还不是实例的子目录：之后在其中写入 instance.json 时才能收到通知"""
+        try:
+            with os.scandir(self.manager.root) as entries:
+                names = {entry.name for entry in entries if not entry.name.startswith(".") and entry.is_dir()}
+        except OSError:
+            return
+        for name in names - set(self.watched):
+            path = self.manager.instance_path(name)
+            self.watcher.addPath(path)
+            self.watched[name] = [path]
+        for name in set(self.watched) - names:
+            self.unwatch(name)
+
+    def on_changed(self, path):
+        """记录一次变化并（重新）开始去抖计时"""
+        self.events += 1
+        if path == self.manager.root:
+            self.root_dirty = True
+        else:
+            relative = os.path.relpath(path, self.manager.root)
+            self.dirty.add(relative.split(os.sep, 1)[0])
+        now = time.monotonic()
+        if self.first_dirty is None:
+            self.first_dirty = now
+        if not self.timer.isActive() or (now - self.first_dirty) * 1000 < self.MAX_WAIT_MS:
+            self.timer.start()
+
+    def flush(self):
+        """处理积累的变化，发出增量差异"""
+        self.timer.stop()
+        dirty, self.dirty = self.dirty, set()
+        root_dirty, self.root_dirty = self.root_dirty, False
+        self.first_dirty = None
+        if not dirty and not root_dirty:
+            return
+        self.batches += 1
+        diff = self.manager.apply(dirty, root_dirty)
+        for instance_id in diff.removed:
+            self.unwatch(instance_id)
+        # 有变化的实例与被通知的实例都重新加入监视（被替换的文件与新目录需要重新登记）
+        for instance_id in dirty | {instance.id for instance in diff.added}:
+            if instance_id in self.manager.instances:
+                self.watch(instance_id)
+        if root_dirty:
+            self.watch_new_dirs()
+        if diff.added or diff.removed or diff.changed:
+            self.diff_ready.emit(diff)
@@ -1,7 +1,10 @@
 from PyQt5.QtWidgets import QWidget, QLabel, QPushButton, QHBoxLayout, QMenu, QAction, QWidgetAction
 from PyQt5.QtCore import Qt, QPoint
 from PyQt5.QtGui import QPalette, QColor
-from ui.locales import t, get_lang_list, set_lang_code, lang_code
+from ui.locales import t, get_lang_list, get_lang_code
+from ui.locales.retranslator import retranslator
+from ui import theme
+from .edges import hit_test
 
 class AppHeader(QWidget):
     """现代风格的标题栏组件"""
@@ -16,6 +19,7 @@ class AppHeader(QWidget):
             text_color: 标题栏文本色
         """
         super().__init__()
+        self.setObjectName("AppHeader")
         
         # 保存主窗口引用
         self.main_window = main_window
@@ -28,6 +32,7 @@ class AppHeader(QWidget):
         
         # 拖动相关
         self.drag_pos = QPoint()
+        self.dragging = False
         
         # 创建布局
         self.layout = QHBoxLayout(self)
@@ -50,8 +55,18 @@ class AppHeader(QWidget):
             title: 新的标题
         """
         self.title = title
+        retranslator.unbind(self.app_name)
         self.app_name.setText(title)
     
+    def set_title_key(self, key):
+        """按词条键设置标题，切换语言时自动更新
+        
+        Args:
+            key: 词条键，如 "sidebar.home"
+        """
+        retranslator.bind(self.app_name, key)
+        self.title = self.app_name.text()
+    
     def create_app_info(self):
         """创建应用名称（不含图标）"""
         # 应用信息部件
@@ -62,8 +77,8 @@ class AppHeader(QWidget):
         
         # 应用名称
         self.app_name = QLabel(self.title)
+        self.app_name.setObjectName("headerTitle")
         self.app_name.setAlignment(Qt.AlignCenter)
-        self.app_name.setStyleSheet(f"color: {self.text_color}; font-weight: bold; font-size: 14px; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;")
         self.app_info_layout.addWidget(self.app_name)
         
         self.layout.addWidget(self.app_info)
@@ -80,76 +95,20 @@ class AppHeader(QWidget):
         # 语言切换按钮
         self.lang_btn = QPushButton("🌐")
         self.lang_btn.setFixedSize(40, 40)
-        # 去掉小三角形并调整图标显示
-        self.lang_btn.setStyleSheet("""
-        QPushButton {
-            background-color: transparent;
-            border: none;
-            padding: 0px;
-            text-align: center;
-        }
-        QPushButton::menu-indicator {
-            image: none;
-        }
-        """)
+        # 去掉小三角形的样式见主题中的 #langButton
+        self.lang_btn.setObjectName("langButton")
         self.controls_layout.addWidget(self.lang_btn)
         
         # 创建语言菜单
         self.lang_menu = QMenu()
-        # 设置菜单样式
-        self.lang_menu.setStyleSheet("""
-        QMenu {
-            background-color: rgba(255, 255, 255, 0.95);
-            border: 1px solid #e9ecef;
-            border-radius: 4px;
-            padding: 5px 0;
-        }
-        QMenu::item {
-            padding: 8px 20px;
-            font-family: 黑体;
-            font-size: 14px;
-            color: #212529;
-        }
-        QMenu::item:hover {
-            background-color: #e9ecef;
-            color: #007bff;
-        }
-        QMenu::item:selected {
-            background-color: #e9ecef;
-            color: #007bff;
-        }
-        """)
+        self.lang_menu.setObjectName("langMenu")
         self.lang_actions = {}
+        self.lang_items = {}
         
         # 添加语言选项
+        current_code = get_lang_code()
         for lang in get_lang_list():
-            # 创建自定义菜单项
-            widget = QWidget()
-            layout = QHBoxLayout(widget)
-            layout.setContentsMargins(20, 8, 20, 8)
-            layout.setSpacing(0)
-            
-            label = QLabel(lang["lang_name"])
-            label.setStyleSheet("font-family: 黑体; font-size: 14px;")
-            
-            # 检查是否是当前语言
-            if lang["lang_code"] == lang_code:
-                # 为当前语言设置与悬停效果一样的样式
-                widget.setStyleSheet("background-color: #e9ecef;")
-                label.setStyleSheet("font-family: 黑体; font-size: 14px; color: #007bff;")
-            
-            layout.addWidget(label)
-            widget.setLayout(layout)
-            
-            # 创建QWidgetAction
-            action = QWidgetAction(self)
-            action.setDefaultWidget(widget)
-            action.triggered.connect(lambda checked, code=lang["lang_code"]: self.on_lang_change(code))
-            # 存储语言代码到action的data中
-            action.setData(lang["lang_code"])
-            
-            self.lang_actions[lang["lang_code"]] = action
-            self.lang_menu.addAction(action)
+            self.create_lang_item(lang, lang["lang_code"] == current_code)
         
         self.lang_btn.setMenu(self.lang_menu)
         
@@ -174,78 +133,95 @@ class AppHeader(QWidget):
         
         self.layout.addWidget(self.controls)
     
+    def show_latency_overlay(self, watchdog):
+        """显示事件循环延迟的开发者浮层（当前值与 p99）
+        
+        Args:
+            watchdog: ui.watchdog.Watchdog
+        """
+        self.latency_threshold = watchdog.threshold_ms
+        self.latency_label = QLabel()
+        self.latency_label.setObjectName("devOverlay")
+        self.latency_label.setProperty("level", "ok")
+        self.layout.insertWidget(self.layout.indexOf(self.controls), self.latency_label)
+        self.update_latency_overlay(0.0, 0.0)
+        watchdog.latency_updated.connect(self.update_latency_overlay)
+    
+    def update_latency_overlay(self, current, p99):
+        """刷新延迟浮层，p99 超过一帧显示警告色、超过停顿阈值显示危险色"""
+        self.latency_label.setText(t("dev.latency").format(current=current, p99=p99))
+        level = "bad" if p99 >= self.latency_threshold else "warn" if p99 >= 16 else "ok"
+        theme.set_state(self.latency_label, "level", level)
+    
+    def create_lang_item(self, lang, selected):
+        """创建一个语言菜单项
+        
+        Args:
+            lang: get_lang_list() 返回的语言信息
+            selected: 是否为当前语言
+        """
+        # 创建自定义菜单项
+        widget = QWidget()
+        widget.setObjectName("langItem")
+        layout = QHBoxLayout(widget)
+        layout.setContentsMargins(20, 8, 20, 8)
+        layout.setSpacing(0)
+        
+        label = QLabel(lang["lang_name"])
+        layout.addWidget(label)
+        widget.setLayout(layout)
+        
+        self.lang_items[lang["lang_code"]] = (widget, label)
+        self.set_lang_item_selected(lang["lang_code"], selected)
+        
+        # 创建QWidgetAction
+        action = QWidgetAction(self)
+        action.setDefaultWidget(widget)
+        action.triggered.connect(lambda checked, code=lang["lang_code"]: self.on_lang_change(code))
+        # 存储语言代码到action的data中
+        action.setData(lang["lang_code"])
+        
+        self.lang_actions[lang["lang_code"]] = action
+        self.lang_menu.addAction(action)
+    
+    def set_lang_item_selected(self, code, selected):
+        """设置语言菜单项的选中样式
+        
+        Args:
+            code: 语言代码
+            selected: 是否选中
+        """
+        widget = self.lang_items[code][0]
+        # 当前语言使用与悬停效果一样的样式
+        theme.set_state(widget, "selected", selected)
+    
     def on_lang_change(self, lang_code):
         """语言切换事件"""
-        set_lang_code(lang_code)
-        
-        # 清空并重新添加语言选项，确保当前语言有特殊样式
-        self.lang_menu.clear()
-        self.lang_actions = {}
+        old_code = get_lang_code()
+        if lang_code == old_code:
+            return
         
-        for lang in get_lang_list():
-            # 创建自定义菜单项
-            widget = QWidget()
-            layout = QHBoxLayout(widget)
-            layout.setContentsMargins(20, 8, 20, 8)
-            layout.setSpacing(0)
-            
-            label = QLabel(lang["lang_name"])
-            label.setStyleSheet("font-family: 黑体; font-size: 14px;")
-            
-            # 检查是否是当前语言
-            if lang["lang_code"] == lang_code:
-                # 为当前语言设置与悬停效果一样的样式
-                widget.setStyleSheet("background-color: #e9ecef;")
-                label.setStyleSheet("font-family: 黑体; font-size: 14px; color: #007bff;")
-            
-            layout.addWidget(label)
-            widget.setLayout(layout)
-            
-            # 创建QWidgetAction
-            action = QWidgetAction(self)
-            action.setDefaultWidget(widget)
-            action.triggered.connect(lambda checked, code=lang["lang_code"]: self.on_lang_change(code))
-            # 存储语言代码到action的data中
-            action.setData(lang["lang_code"])
-            
-            self.lang_actions[lang["lang_code"]] = action
-            self.lang_menu.addAction(action)
+        # 只更新新旧两个菜单项的选中样式，不重建菜单
+        self.set_lang_item_selected(old_code, False)
+        self.set_lang_item_selected(lang_code, True)
         
-        # 这里可以添加更新界面语言的逻辑
+        # 统一刷新所有已绑定的界面文本
+        retranslator.switch_language(lang_code)
         print(f"语言切换为: {lang_code}")
     
     def set_style(self):
-        """设置样式"""
-        # 标题栏样式
-        style = """
-        QWidget {
-            background-color: %s;
-            border-bottom: 1px solid #e9ecef;
-        }
-        QLabel {
-            color: %s;
-            font-weight: bold;
-            font-size: 14px;
-            font-family: 黑体;
-        }
-        QPushButton {
-            background-color: transparent;
-            color: %s;
-            font-size: 14px;
-            font-family: 黑体;
-            border: none;
-            padding: 10px;
-            margin: 0;
-        }
-        QPushButton:hover {
-            background-color: #e9ecef;
-        }
-        QPushButton#closeButton:hover {
-            background-color: #dc3545 !important;
-            color: white !important;
-        }
+        """设置样式
+        
+        样式由应用级主题样式表统一提供，这里只在传入了与主题不同的颜色时
+        为本部件单独生成一份覆盖色板的样式表。
         """
-        self.setStyleSheet(style % (self.primary_color, self.text_color, self.text_color))
+        overrides = {}
+        if self.primary_color != theme.PALETTE["surface"]:
+            overrides["surface"] = self.primary_color
+        if self.text_color != theme.PALETTE["text"]:
+            overrides["text"] = self.text_color
+        if overrides:
+            self.setStyleSheet(theme.build_stylesheet(overrides))
     
     def on_minimize(self):
         """最小化窗口"""
@@ -267,52 +243,42 @@ class AppHeader(QWidget):
         if self.main_window:
             self.main_window.close()
     
+    def is_at_window_edge(self, global_pos):
+        """检查全局坐标是否在主窗口的缩放边缘上"""
+        if hasattr(self.main_window, "edge_at"):
+            return self.main_window.edge_at(global_pos) is not None
+        # 普通 QMainWindow（如测试代码）使用默认的 8 像素边缘
+        local_pos = self.main_window.mapFromGlobal(global_pos)
+        return hit_test(local_pos, self.main_window.rect(), 8) is not None
+    
     def mousePressEvent(self, event):
         """鼠标按下事件，开始拖动"""
         if event.button() == Qt.LeftButton:
             if self.main_window:
                 # 检查鼠标是否在窗口边缘，如果是则不执行拖动
-                # 将局部坐标转换为全局坐标，再转换为主窗口的局部坐标
+                # 边缘判断只在按下时做一次，拖动过程中不再重复计算
                 global_pos = event.globalPos()
-                main_window_local_pos = self.main_window.mapFromGlobal(global_pos)
-                
-                # 检查是否在窗口边缘（边缘大小8像素）
-                edge_size = 8
-                rect = self.main_window.rect()
-                is_at_edge = (
-                    main_window_local_pos.x() <= edge_size or
-                    main_window_local_pos.x() >= rect.width() - edge_size or
-                    main_window_local_pos.y() <= edge_size or
-                    main_window_local_pos.y() >= rect.height() - edge_size
-                )
-                
-                if not is_at_edge:
+                if not self.is_at_window_edge(global_pos):
                     self.drag_pos = global_pos - self.main_window.frameGeometry().topLeft()
+                    self.dragging = True
                     event.accept()
     
     def mouseMoveEvent(self, event):
         """鼠标移动事件，拖动窗口"""
-        if event.buttons() == Qt.LeftButton and self.drag_pos:
-            if self.main_window:
-                # 检查鼠标是否在窗口边缘，如果是则不执行拖动
-                global_pos = event.globalPos()
-                main_window_local_pos = self.main_window.mapFromGlobal(global_pos)
-                
-                edge_size = 8
-                rect = self.main_window.rect()
-                is_at_edge = (
-                    main_window_local_pos.x() <= edge_size or
-                    main_window_local_pos.x() >= rect.width() - edge_size or
-                    main_window_local_pos.y() <= edge_size or
-                    main_window_local_pos.y() >= rect.height() - edge_size
-                )
-                
-                if not is_at_edge:
-                    self.main_window.move(global_pos - self.drag_pos)
-                    event.accept()
+        if self.dragging and event.buttons() == Qt.LeftButton:
+            target = event.globalPos() - self.drag_pos
+            if hasattr(self.main_window, "request_move"):
+                # 合并到下一帧再移动
+                self.main_window.request_move(target)
+            else:
+                self.main_window.move(target)
+            event.accept()
     
     def mouseReleaseEvent(self, event):
         """鼠标释放事件，结束拖动"""
+        if self.dragging and hasattr(self.main_window, "flush_geometry"):
+            self.main_window.flush_geometry()
+        self.dragging = False
         self.drag_pos = QPoint()
 
 # 测试代码
@@ -321,6 +287,7 @@ if __name__ == "__main__":
     import sys
     
     app = QApplication(sys.argv)
+    theme.apply_theme(app)
     
     # 创建主窗口
     window = QMainWindow()
@@ -3,6 +3,8 @@ from PyQt5.QtCore import Qt, pyqtSignal, QPropertyAnimation
 from PyQt5.QtGui import QIcon, QPixmap
 import PyQt5.QtGui as qtg
 from ui.locales import t, get_lang_list, set_lang_code
+from ui.locales.retranslator import retranslator
+from ui import theme
 
 class AppSidebar(QWidget):
     """现代风格的侧边栏组件"""
@@ -22,6 +24,7 @@ class AppSidebar(QWidget):
             collapsed_width: 侧边栏折叠宽度
         """
         super().__init__(parent)
+        self.setObjectName("AppSidebar")
         
         # 配置
         self.secondary_color = secondary_color
@@ -64,12 +67,14 @@ class AppSidebar(QWidget):
         
         # 品牌图标
         self.brand_icon = QLabel()
+        self.brand_icon.setObjectName("brandIcon")
         self.brand_icon.setPixmap(qtg.QPixmap("assets/logo/logo32.png"))
         self.brand_icon.setFixedSize(32, 32)
         self.brand_icon.setAlignment(Qt.AlignCenter)
         
         # 品牌名称
         self.brand_name = QLabel("Minelancher")
+        self.brand_name.setObjectName("brandName")
         self.brand_name.setAlignment(Qt.AlignCenter)
         
         self.brand_layout.addWidget(self.brand_icon)
@@ -86,43 +91,59 @@ class AppSidebar(QWidget):
         self.menu_layout.setContentsMargins(0, 20, 0, 0)  # 顶部留出空间
         self.menu_layout.setSpacing(0)
         
-        # 菜单项 - 只保留首页按钮
-        self.menu_items = {
-            "home": {"text": t("sidebar.home"), "icon": "■"}
-        }
-        
-        # 创建菜单项按钮
-        self.menu_buttons = {}
-        for id, info in self.menu_items.items():
-            button = QPushButton()
-            button.setFixedHeight(48)
-            button_layout = QHBoxLayout(button)
-            button_layout.setContentsMargins(20, 0, 20, 0)
-            
-            # 图标
-            icon_label = QLabel(info["icon"])
-            icon_label.setFixedSize(24, 24)
-            icon_label.setAlignment(Qt.AlignCenter)
-            
-            # 文本
-            text_label = QLabel(info["text"])
-            text_label.setAlignment(Qt.AlignCenter)
-            
-            button_layout.addWidget(icon_label)
-            button_layout.addWidget(text_label)
-            button_layout.addStretch()
-            
-            # 连接信号
-            button.clicked.connect(lambda checked, id=id: self.on_menu_clicked(id))
-            
-            self.menu_buttons[id] = button
-            self.menu_layout.addWidget(button)
-        
         # 在菜单下方添加伸缩空间，使按钮集中在顶部
         self.menu_layout.addStretch()
         
+        # 菜单项
+        self.menu_items = {}
+        self.menu_buttons = {}
+        self.add_menu_item("home", "sidebar.home", "■")
+        self.add_menu_item("instances", "sidebar.instances", "▤")
+        self.add_menu_item("mods", "sidebar.mods", "◆")
+        self.add_menu_item("logs", "sidebar.logs", "≡")
+        
         self.layout.addWidget(self.menu, 1)
     
+    def add_menu_item(self, id, key, icon):
+        """添加一个菜单项
+        
+        Args:
+            id: 菜单ID，与页面ID一致
+            key: 菜单文本的词条键
+            icon: 菜单图标文本
+        """
+        self.menu_items[id] = {"text": t(key), "key": key, "icon": icon}
+        
+        button = QPushButton()
+        button.setObjectName("menuButton")
+        button.setProperty("selected", False)
+        button.setFixedHeight(48)
+        button_layout = QHBoxLayout(button)
+        button_layout.setContentsMargins(20, 0, 20, 0)
+        
+        # 图标
+        icon_label = QLabel(icon)
+        icon_label.setFixedSize(24, 24)
+        icon_label.setAlignment(Qt.AlignCenter)
+        
+        # 文本
+        text_label = QLabel(self.menu_items[id]["text"])
+        text_label.setAlignment(Qt.AlignCenter)
+        retranslator.bind(text_label, key)
+        
+        button_layout.addWidget(icon_label)
+        button_layout.addWidget(text_label)
+        button_layout.addStretch()
+        if self.is_collapsed:
+            text_label.setVisible(False)
+        
+        # 连接信号
+        button.clicked.connect(lambda checked, id=id: self.on_menu_clicked(id))
+        
+        self.menu_buttons[id] = button
+        # 插入到末尾的伸缩空间之前
+        self.menu_layout.insertWidget(self.menu_layout.count() - 1, button)
+    
     def create_toggle_button(self):
         """创建折叠按钮"""
         # 折叠按钮部件
@@ -133,84 +154,27 @@ class AppSidebar(QWidget):
         
         # 按钮
         self.toggle_button = QPushButton("«")
+        self.toggle_button.setObjectName("sidebarToggle")
         self.toggle_button.setFixedSize(self.width, 48)
         self.toggle_button.clicked.connect(self.toggle_sidebar)
+        retranslator.bind(self.toggle_button, "sidebar.hide", "toolTip")
         
         self.toggle_layout.addWidget(self.toggle_button)
         self.layout.addWidget(self.toggle)
     
     def set_style(self):
-        """设置样式"""
-        # 侧边栏样式
-        style = """
-        QWidget {
-            background-color: %s;
-            border-right: 1px solid #e9ecef;
-        }
-        QLabel {
-            color: %s;
-            font-size: 14px;
-            font-family: 黑体;
-            background-color: transparent;
-        }
-        QPushButton {
-            background-color: transparent;
-            color: %s;
-            font-size: 14px;
-            font-family: 黑体;
-            border: none;
-            text-align: left;
-            padding: 0px;
-        }
-        QPushButton:hover {
-            background-color: #e9ecef;
-        }
-        QPushButton:hover QLabel {
-            color: #007bff;
-        }
-        QPushButton:pressed {
-            background-color: #dee2e6;
-        }
-        """
-        self.setStyleSheet(style % (self.secondary_color, self.text_color, self.text_color))
-        
-        # 品牌图标样式
-        brand_icon_style = """
-        QLabel {
-            background-color: #ffffff;
-            color: #007bff;
-            border-radius: 6px;
-            font-weight: bold;
-            font-size: 16px;
-        }
-        """
-        self.brand_icon.setStyleSheet(brand_icon_style)
-        
-        # 品牌名称样式
-        brand_name_style = """
-        QLabel {
-            color: %s;
-            font-weight: bold;
-            font-size: 16px;
-            margin-left: 10px;
-        }
-        """
-        self.brand_name.setStyleSheet(brand_name_style % self.text_color)
-        
-        # 折叠按钮样式
-        toggle_button_style = """
-        QPushButton {
-            background-color: transparent;
-            color: %s;
-            font-size: 16px;
-            border: none;
-            text-align: center;
-        }
-        QPushButton:hover {
-            background-color: #e9ecef;
-        }
+        """设置样式
+        
+        样式由应用级主题样式表统一提供，这里只在传入了与主题不同的颜色时
+        为本部件单独生成一份覆盖色板的样式表。
         """
-        self.toggle_button.setStyleSheet(toggle_button_style % self.text_color)
+        overrides = {}
+        if self.secondary_color != theme.PALETTE["background"]:
+            overrides["background"] = self.secondary_color
+        if self.text_color != theme.PALETTE["text"]:
+            overrides["text"] = self.text_color
+        if overrides:
+            self.setStyleSheet(theme.build_stylesheet(overrides))
     
     def toggle_sidebar(self):
         """折叠/展开侧边栏"""
@@ -226,6 +190,7 @@ class AppSidebar(QWidget):
                 if layout.count() > 1:
                     layout.itemAt(1).widget().setVisible(False)
             self.toggle_button.setText("»")
+            retranslator.bind(self.toggle_button, "sidebar.show", "toolTip")
         else:
             # 展开
             target_width = self.width
@@ -236,6 +201,7 @@ class AppSidebar(QWidget):
                 if layout.count() > 1:
                     layout.itemAt(1).widget().setVisible(True)
             self.toggle_button.setText("«")
+            retranslator.bind(self.toggle_button, "sidebar.hide", "toolTip")
         
         # 先设置目标宽度，避免崩溃
         self.setFixedWidth(target_width)
@@ -270,50 +236,12 @@ class AppSidebar(QWidget):
         self.update_menu_styles()
     
     def update_menu_styles(self):
-        """更新菜单项样式，根据当前选中的页面"""
+        """更新菜单项样式，根据当前选中的页面
+        
+        只修改 selected 属性，状态未变化的按钮不会重新 polish。
+        """
         for id, button in self.menu_buttons.items():
-            if id == self.current_page:
-                # 选中状态
-                button.setStyleSheet("""
-                QPushButton {
-                    background-color: #e9ecef;
-                    color: %s;
-                    border: none;
-                    text-align: left;
-                    padding: 0px;
-                }
-                QPushButton:hover {
-                    background-color: #e9ecef;
-                }
-                QPushButton:hover QLabel {
-                    color: %s;
-                }
-                QPushButton QLabel {
-                    color: %s;
-                    background-color: transparent;
-                }
-                """ % (self.text_color, self.text_color, self.text_color))
-            else:
-                # 未选中状态，重置为默认样式
-                button.setStyleSheet("""
-                QPushButton {
-                    background-color: transparent;
-                    color: %s;
-                    border: none;
-                    text-align: left;
-                    padding: 0px;
-                }
-                QPushButton:hover {
-                    background-color: #e9ecef;
-                }
-                QPushButton:hover QLabel {
-                    color: %s;
-                }
-                QPushButton QLabel {
-                    color: %s;
-                    background-color: transparent;
-                }
-                """ % (self.text_color, self.text_color, self.text_color))
+            theme.set_state(button, "selected", id == self.current_page)
 
 # 测试代码
 if __name__ == "__main__":
@@ -321,6 +249,7 @@ if __name__ == "__main__":
     import sys
     
     app = QApplication(sys.argv)
+    theme.apply_theme(app)
     
     # 创建主窗口
     window = QMainWindow()
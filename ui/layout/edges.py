@@ -0,0 +1,47 @@
+from PyQt5.QtCore import Qt
+
+# 边缘方向 -> 光标样式
+EDGE_CURSORS = {
+    "topleft": Qt.SizeFDiagCursor,
+    "bottomright": Qt.SizeFDiagCursor,
+    "topright": Qt.SizeBDiagCursor,
+    "bottomleft": Qt.SizeBDiagCursor,
+    "left": Qt.SizeHorCursor,
+    "right": Qt.SizeHorCursor,
+    "top": Qt.SizeVerCursor,
+    "bottom": Qt.SizeVerCursor,
+}
+
+def hit_test(pos, rect, edge_size):
+    """判断位置落在窗口的哪条边缘上
+
+    主窗口的缩放与标题栏的拖动共用这一份判断。
+
+    Args:
+        pos: 窗口坐标系中的位置
+        rect: 可拖动缩放的区域
+        edge_size: 边缘的判定宽度
+
+    Returns:
+        "left"、"topright" 等方向字符串，不在边缘上时返回 None
+    """
+    x = pos.x() - rect.x()
+    y = pos.y() - rect.y()
+    width = rect.width()
+    height = rect.height()
+    
+    if x <= edge_size:
+        horizontal = "left"
+    elif x >= width - edge_size:
+        horizontal = "right"
+    else:
+        horizontal = ""
+    
+    if y <= edge_size:
+        vertical = "top"
+    elif y >= height - edge_size:
+        vertical = "bottom"
+    else:
+        vertical = ""
+    
+    return (vertical + horizontal) or None
\ No newline at end of file
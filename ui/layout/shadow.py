@@ -0,0 +1,83 @@
+import math
+from PyQt5.QtCore import QRect
+from PyQt5.QtGui import QImage, QPixmap, QColor
+
+# (阴影宽度, 颜色) -> 九宫格贴图
+_tile_cache = {}
+
+def _falloff(distance, sigma):
+    """锐利边缘经高斯模糊后，距边缘 distance 处的覆盖率"""
+    return 0.5 * math.erfc(distance / (sigma * math.sqrt(2)))
+
+def _render(width, height, color, coverage):
+    image = QImage(width, height, QImage.Format_ARGB32)
+    for y in range(height):
+        for x in range(width):
+            pixel = QColor(color)
+            pixel.setAlphaF(color.alphaF() * coverage(x, y))
+            image.setPixelColor(x, y, pixel)
+    return QPixmap.fromImage(image)
+
+def shadow_tiles(margin, color):
+    """生成（或取出缓存的）阴影九宫格贴图
+
+    矩形经高斯模糊后的阴影在水平和垂直方向上可分离，
+    因此边上的覆盖率只和到边缘的距离有关，角上是两个方向的乘积。
+    每种 (宽度, 颜色) 只计算一次，之后绘制只是贴图。
+
+    Args:
+        margin: 阴影宽度（像素）
+        color: 阴影颜色（QColor），紧贴内容边缘处的透明度约为其一半
+
+    Returns:
+        {"top": ..., "topleft": ..., ...} 八张贴图，边的贴图只有 1 像素宽/高，绘制时拉伸
+    """
+    key = (margin, color.rgba())
+    tiles = _tile_cache.get(key)
+    if tiles is not None:
+        return tiles
+
+    sigma = margin / 3
+    # 第 i 个像素到内容边缘的距离（取像素中心）
+    outward = [_falloff(margin - i - 0.5, sigma) for i in range(margin)]
+    inward = outward[::-1]
+
+    tiles = {
+        "top": _render(1, margin, color, lambda x, y: outward[y]),
+        "bottom": _render(1, margin, color, lambda x, y: inward[y]),
+        "left": _render(margin, 1, color, lambda x, y: outward[x]),
+        "right": _render(margin, 1, color, lambda x, y: inward[x]),
+        "topleft": _render(margin, margin, color, lambda x, y: outward[x] * outward[y]),
+        "topright": _render(margin, margin, color, lambda x, y: inward[x] * outward[y]),
+        "bottomleft": _render(margin, margin, color, lambda x, y: outward[x] * inward[y]),
+        "bottomright": _render(margin, margin, color, lambda x, y: inward[x] * inward[y]),
+    }
+    _tile_cache[key] = tiles
+    return tiles
+
+def paint_shadow(painter, rect, margin, color, clip=None):
+    """在内容区域外围绘制阴影
+
+    Args:
+        painter: QPainter
+        rect: 内容区域，阴影画在它外面 margin 像素内
+        margin: 阴影宽度
+        color: 阴影颜色
+        clip: 需要重绘的区域（QRegion），只绘制与之相交的贴图
+    """
+    tiles = shadow_tiles(margin, color)
+    left, top, right, bottom = rect.left(), rect.top(), rect.right() + 1, rect.bottom() + 1
+    width, height = rect.width(), rect.height()
+    targets = (
+        ("topleft", QRect(left - margin, top - margin, margin, margin)),
+        ("top", QRect(left, top - margin, width, margin)),
+        ("topright", QRect(right, top - margin, margin, margin)),
+        ("left", QRect(left - margin, top, margin, height)),
+        ("right", QRect(right, top, margin, height)),
+        ("bottomleft", QRect(left - margin, bottom, margin, margin)),
+        ("bottom", QRect(left, bottom, width, margin)),
+        ("bottomright", QRect(right, bottom, margin, margin)),
+    )
+    for name, target in targets:
+        if clip is None or clip.intersects(target):
+            painter.drawPixmap(target, tiles[name])
@@ -1,25 +1,141 @@
+import hashlib
 import json
 import os
+import threading
+from ui import startup_trace
+
+# 语言文件所在目录，不再依赖当前工作目录
+LOCALES_DIR=os.path.dirname(os.path.abspath(__file__))
+# 预编译缓存目录，可通过环境变量 MINELANCHER_LOCALE_CACHE=0 关闭
+CACHE_DIR=os.path.join(LOCALES_DIR,".cache")
+CACHE_VERSION=1
+use_disk_cache=os.environ.get("MINELANCHER_LOCALE_CACHE","1")!="0"
+
 lang_code="zh-CN"
+# 当前生效的 (语言代码, 扁平化词条表)，整体替换以保证切换是原子的
+_active=None
+# 已加载的词条表：{lang_code: {"sidebar.home": "首页", ...}}
+_catalogs={}
+_lang_list=None
+_lock=threading.Lock()
+
+def flatten(tree,prefix=""):
+    """把嵌套的语言字典展开为 {"a.b.c": value} 形式"""
+    flat={}
+    for key,value in tree.items():
+        full_key=prefix+key
+        if isinstance(value,dict):
+            flat.update(flatten(value,full_key+"."))
+        else:
+            flat[full_key]=value
+    return flat
+
+def _cache_path(code):
+    return os.path.join(CACHE_DIR,code+".json")
+
+def _read_cache(code):
+    try:
+        with open(_cache_path(code),encoding="utf-8") as f:
+            cached=json.load(f)
+    except (OSError,ValueError):
+        return None
+    if not isinstance(cached,dict) or cached.get("version")!=CACHE_VERSION:
+        return None
+    return cached
+
+def _write_cache(code,stat,digest,catalog):
+    """写入预编译缓存，失败（如目录只读）时静默忽略"""
+    data={
+        "version":CACHE_VERSION,
+        "mtime_ns":stat.st_mtime_ns,
+        "size":stat.st_size,
+        "sha1":digest,
+        "catalog":catalog
+    }
+    tmp_path=_cache_path(code)+".tmp"
+    try:
+        os.makedirs(CACHE_DIR,exist_ok=True)
+        with open(tmp_path,"w",encoding="utf-8") as f:
+            json.dump(data,f,ensure_ascii=False,separators=(",",":"))
+        os.replace(tmp_path,_cache_path(code))
+    except OSError:
+        pass
+
+def _compile_catalog(code):
+    """读取语言文件并生成扁平化词条表
+
+    文件的 mtime 与大小没有变化时直接使用磁盘缓存；
+    mtime 变了但内容哈希一致时也复用缓存，只刷新缓存里的 mtime。
+    """
+    path=os.path.join(LOCALES_DIR,code+".json")
+    stat=os.stat(path)
+    cached=_read_cache(code) if use_disk_cache else None
+    if cached and cached["mtime_ns"]==stat.st_mtime_ns and cached["size"]==stat.st_size:
+        return cached["catalog"]
+    with open(path,"rb") as f:
+        raw=f.read()
+    digest=hashlib.sha1(raw).hexdigest()
+    if cached and cached["sha1"]==digest:
+        catalog=cached["catalog"]
+    else:
+        catalog=flatten(json.loads(raw.decode("utf-8")))
+    if use_disk_cache:
+        _write_cache(code,stat,digest,catalog)
+    return catalog
+
+def load_catalog(code):
+    """获取指定语言的词条表，每种语言只加载一次"""
+    catalog=_catalogs.get(code)
+    if catalog is None:
+        with _lock:
+            catalog=_catalogs.get(code)
+            if catalog is None:
+                with startup_trace.span("locale:"+code):
+                    catalog=_compile_catalog(code)
+                _catalogs[code]=catalog
+    return catalog
+
+def _activate(code):
+    global _active
+    # 先完整加载新词条表，再一次性替换，t() 不会读到半切换的状态
+    _active=(code,load_catalog(code))
+    return _active
+
 def set_lang_code(code):
     global lang_code
+    _activate(code)
     lang_code=code
+
+def get_lang_code():
+    """获取当前语言代码"""
+    return (_active or _activate(lang_code))[0]
+
+def get_catalog():
+    """获取当前语言的扁平化词条表（只读）"""
+    return (_active or _activate(lang_code))[1]
+
 def t(key):
-    with open(os.path.join("ui","locales",lang_code+".json"),encoding="utf-8") as f:
-        langs=json.load(f)
-    key_list=key.split(".")
-    value=langs
-    for i in key_list:
-        value=value[i]
-    return value
+    active=_active
+    if active is None:
+        active=_activate(lang_code)
+    return active[1][key]
+
 def get_lang_list():
-    with open("ui/locales/langs.json",encoding="utf-8") as f:
-        langs=json.load(f)
-    lang_list=langs["lang_list"]
-    export=[]
-    for i in lang_list:
-        export.append({
-            "lang_code":i,
-            "lang_name":langs[i]
-        })
-    return export
\ No newline at end of file
+    global _lang_list
+    if _lang_list is None:
+        with open(os.path.join(LOCALES_DIR,"langs.json"),encoding="utf-8") as f:
+            langs=json.load(f)
+        _lang_list=tuple(
+            {"lang_code":i,"lang_name":langs[i]}
+            for i in langs["lang_list"]
+        )
+    # 返回副本，避免调用方修改缓存
+    return [dict(i) for i in _lang_list]
+
+def reload():
+    """清空内存中的词条表与语言列表，下次使用时重新加载"""
+    global _active,_lang_list
+    with _lock:
+        _catalogs.clear()
+        _lang_list=None
+        _active=None
@@ -0,0 +1,118 @@
+import functools
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5 import sip
+from . import get_catalog, get_lang_code, set_lang_code
+
+class Retranslator(QObject):
+    """界面文本的翻译绑定注册表
+
+    各部件通过 bind() 登记 (部件, 属性, 词条键)，切换语言时只重新设置
+    译文发生变化的绑定，不重建任何部件。部件销毁时（destroyed 信号）自动移除它的全部绑定，
+    被回收后重建的页面不会留下旧绑定与其中的闭包。
+    """
+
+    # 语言切换信号，参数为新的语言代码
+    lang_changed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # 词条键 -> [(部件, 属性), ...]
+        self._bindings = {}
+        # (id(部件), 属性) -> 词条键，用于同一属性重新绑定时替换旧绑定
+        self._index = {}
+        # id(部件) -> {属性, ...}，部件销毁时据此移除它的全部绑定
+        self._widgets = {}
+
+    def bind(self, widget, key, prop="text"):
+        """注册翻译绑定并立即应用当前语言的译文
+
+        Args:
+            widget: 目标部件，同时决定绑定的生命周期
+            key: 词条键，如 "sidebar.home"
+            prop: Qt属性名（如 "text"、"toolTip"），或接收译文的可调用对象
+        """
+        self.unbind(widget, prop)
+        widget_id = id(widget)
+        self._index[(widget_id, prop)] = key
+        self._bindings.setdefault(key, []).append((widget, prop))
+        props = self._widgets.get(widget_id)
+        if props is None:
+            props = self._widgets[widget_id] = set()
+            widget.destroyed.connect(functools.partial(self._forget_widget, widget_id))
+        props.add(prop)
+        self._apply_one(widget, prop, get_catalog().get(key, key))
+
+    def unbind(self, widget, prop="text"):
+        """移除部件某个属性上的翻译绑定
+
+        Args:
+            widget: 目标部件
+            prop: Qt属性名，或绑定时传入的同一个可调用对象
+        """
+        self._remove(id(widget), prop)
+
+    def _remove(self, widget_id, prop):
+        key = self._index.pop((widget_id, prop), None)
+        if key is None:
+            return
+        self._widgets.get(widget_id, set()).discard(prop)
+        bindings = [(w, p) for w, p in self._bindings[key] if not (id(w) == widget_id and p == prop)]
+        if bindings:
+            self._bindings[key] = bindings
+        else:
+            del self._bindings[key]
+
+    def _forget_widget(self, widget_id, *_):
+        """部件已销毁：移除它的全部绑定"""
+        for prop in list(self._widgets.pop(widget_id, ())):
+            self._remove(widget_id, prop)
+
+    def switch_language(self, code):
+        """切换语言并在一次批量刷新中更新所有变化的译文
+
+        Args:
+            code: 语言代码
+        """
+        old_catalog = get_catalog()
+        set_lang_code(code)
+        new_catalog = get_catalog()
+
+        targets = []
+        dead = set()
+        for key, bindings in self._bindings.items():
+            value = new_catalog.get(key, key)
+            if value == old_catalog.get(key, key):
+                continue
+            for widget, prop in bindings:
+                if sip.isdeleted(widget):
+                    dead.add(id(widget))
+                else:
+                    targets.append((widget, prop, value))
+        # 正常情况下 destroyed 信号已经移除了这些绑定，这里只兜底
+        for widget_id in dead:
+            self._forget_widget(widget_id)
+
+        # 刷新期间关闭所在窗口的界面更新，所有文本设置完后统一重绘一次
+        windows = {}
+        for widget, _, _ in targets:
+            window = widget.window()
+            windows[id(window)] = window
+        for window in windows.values():
+            window.setUpdatesEnabled(False)
+        try:
+            for widget, prop, value in targets:
+                self._apply_one(widget, prop, value)
+        finally:
+            for window in windows.values():
+                window.setUpdatesEnabled(True)
+
+        self.lang_changed.emit(get_lang_code())
+
+    def _apply_one(self, widget, prop, value):
+        if callable(prop):
+            prop(value)
+        else:
+            widget.setProperty(prop, value)
+
+# 全局唯一的翻译注册表
+retranslator = Retranslator()
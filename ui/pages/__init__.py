@@ -1,4 +1,23 @@
-from .base_page import BasePage
-from .home_page import HomePage
+import importlib
 
-__all__ = ['BasePage', 'HomePage']
\ No newline at end of file
+# 名称 -> 所在子模块，首次访问时才导入（PEP 562）
+_LAZY_ATTRS = {
+    'BasePage': '.base_page',
+    'HomePage': '.home_page',
+    'InstancesPage': '.instances_page',
+    'LogPage': '.log_page',
+    'ModsPage': '.mods_page',
+    'PageRegistry': '.registry',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -26,3 +26,7 @@ class BasePage(QWidget):
     def on_hide(self):
         """页面隐藏时调用"""
         pass
+    
+    def on_evict(self):
+        """页面被 PageRegistry 回收（销毁）前调用，取消仍在进行的后台操作"""
+        pass
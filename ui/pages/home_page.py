@@ -1,10 +1,18 @@
-from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton, QTabWidget, QListWidget, QListWidgetItem, QLineEdit, QFormLayout
-from PyQt5.QtCore import Qt
+import uuid
+from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton, QTabWidget, QListView, QLineEdit, QFormLayout, QInputDialog, QMessageBox, QApplication
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from ui.locales import t
+from ui.locales.retranslator import retranslator
+from ui import startup_trace
+from ui.widgets.account_list import AccountListModel, AccountDelegate
 from .base_page import BasePage
 
 class HomePage(BasePage):
     """首页页面"""
     
+    # 账号写入失败（由账号存储的后台线程发出，在 GUI 线程提示）
+    account_write_failed = pyqtSignal(str)
+    
     def setup_ui(self):
         """设置UI"""
         super().setup_ui()
@@ -12,28 +20,12 @@ class HomePage(BasePage):
         # 添加伸缩空间
         self.layout.addStretch(1)
         
+        # 每个标签页各有一个启动按钮，检查依赖期间全部禁用
+        self.launch_buttons = []
+        self.launching = False
+        
         # 创建模式切换标签页
         self.tab_widget = QTabWidget()
-        self.tab_widget.setStyleSheet("""
-        QTabWidget {
-            font-family: 黑体;
-        }
-        QTabBar {
-            font-size: 14px;
-        }
-        QTabBar::tab {
-            padding: 10px 24px;
-            margin: 0 2px;
-            background-color: #e9ecef;
-            border: 1px solid #dee2e6;
-            border-top-left-radius: 8px;
-            border-top-right-radius: 8px;
-        }
-        QTabBar::tab:selected {
-            background-color: white;
-            border-bottom: 1px solid white;
-        }
-        """)
         
         # 创建正版模式页面
         self.official_page = QWidget()
@@ -44,13 +36,20 @@ class HomePage(BasePage):
         self.create_offline_page()
         
         # 添加标签页
-        self.tab_widget.addTab(self.official_page, "正版")
-        self.tab_widget.addTab(self.offline_page, "离线")
+        self.tab_widget.addTab(self.official_page, "")
+        self.tab_widget.addTab(self.offline_page, "")
+        retranslator.bind(self.tab_widget, "home.official", lambda text: self.tab_widget.setTabText(0, text))
+        retranslator.bind(self.tab_widget, "home.offline", lambda text: self.tab_widget.setTabText(1, text))
         
         self.layout.addWidget(self.tab_widget)
         
         # 添加伸缩空间
         self.layout.addStretch(1)
+        
+        # 账号存储在首帧绘制之后再打开，不拖慢启动
+        self.account_store = None
+        self.settings_dialog = None
+        QTimer.singleShot(0, self.load_accounts)
     
     def create_official_page(self):
         """创建正版模式页面"""
@@ -59,54 +58,28 @@ class HomePage(BasePage):
         layout.setSpacing(20)
         
         # 创建账号列表标题
-        account_title = QLabel("账号列表")
-        account_title.setStyleSheet("font-size: 18px; font-weight: bold; color: #212529; font-family: 黑体;")
+        account_title = QLabel()
+        account_title.setObjectName("sectionTitle")
+        retranslator.bind(account_title, "home.account_list")
         layout.addWidget(account_title)
         
-        # 创建账号列表
-        self.account_list = QListWidget()
-        self.account_list.setStyleSheet("""
-        QListWidget {
-            font-family: 黑体;
-            font-size: 14px;
-            border: 1px solid #dee2e6;
-            border-radius: 8px;
-        }
-        QListWidget::item {
-            padding: 12px;
-            border-bottom: 1px solid #e9ecef;
-        }
-        QListWidget::item:last-child {
-            border-bottom: none;
-        }
-        QListWidget::item:selected {
-            background-color: #e9ecef;
-        }
-        """)
-        
-
-        
+        # 创建账号列表，由模型提供数据、委托直接绘制每一行
+        self.account_model = AccountListModel(self)
+        self.account_list = QListView()
+        self.account_list.setObjectName("accountList")
+        self.account_list.setModel(self.account_model)
+        self.account_list.setItemDelegate(AccountDelegate(parent=self.account_list))
+        # 所有行等高，滚动时只计算和绘制可见的行
+        self.account_list.setUniformItemSizes(True)
+        self.account_list.setMouseTracking(True)
+        # 委托绘制的文本不经过翻译绑定，切换语言时重绘一次
+        retranslator.lang_changed.connect(self.account_list.viewport().update)
         layout.addWidget(self.account_list)
         
         # 创建添加新账号按钮
-        add_account_btn = QPushButton("添加新账号")
-        add_account_btn.setStyleSheet("""
-        QPushButton {
-            padding: 10px 20px;
-            font-size: 14px;
-            font-family: 黑体;
-            background-color: #6c757d;
-            color: white;
-            border: none;
-            border-radius: 6px;
-        }
-        QPushButton:hover {
-            background-color: #5a6268;
-        }
-        QPushButton:pressed {
-            background-color: #495057;
-        }
-        """)
+        add_account_btn = QPushButton()
+        add_account_btn.setProperty("variant", "secondary")
+        retranslator.bind(add_account_btn, "home.add_account")
         add_account_btn.clicked.connect(self.add_new_account)
         layout.addWidget(add_account_btn)
         
@@ -114,55 +87,7 @@ class HomePage(BasePage):
         layout.addStretch()
         
         # 创建底部按钮区域
-        bottom_layout = QHBoxLayout()
-        bottom_layout.setSpacing(20)
-        
-        # 创建启动按钮
-        launch_btn = QPushButton("启动")
-        launch_btn.setStyleSheet("""
-        QPushButton {
-            padding: 14px 32px;
-            font-size: 18px;
-            font-family: 黑体;
-            background-color: #007bff;
-            color: white;
-            border: none;
-            border-radius: 8px;
-        }
-        QPushButton:hover {
-            background-color: #0069d9;
-        }
-        QPushButton:pressed {
-            background-color: #005cbf;
-        }
-        """)
-        
-        # 创建设置按钮
-        settings_btn = QPushButton("设置")
-        settings_btn.setStyleSheet("""
-        QPushButton {
-            padding: 10px 20px;
-            font-size: 14px;
-            font-family: 黑体;
-            background-color: #f8f9fa;
-            color: #495057;
-            border: 1px solid #dee2e6;
-            border-radius: 8px;
-        }
-        QPushButton:hover {
-            background-color: #e9ecef;
-            border-color: #ced4da;
-        }
-        QPushButton:pressed {
-            background-color: #dee2e6;
-            border-color: #adb5bd;
-        }
-        """)
-        
-        bottom_layout.addWidget(launch_btn, 1)
-        bottom_layout.addWidget(settings_btn)
-        
-        layout.addLayout(bottom_layout)
+        self.create_bottom_buttons(layout)
     
     def create_offline_page(self):
         """创建离线模式页面"""
@@ -176,81 +101,142 @@ class HomePage(BasePage):
         
         # 创建用户名输入框
         self.username_input = QLineEdit()
-        self.username_input.setPlaceholderText("请输入用户名")
-        self.username_input.setStyleSheet("""
-        QLineEdit {
-            padding: 10px;
-            font-size: 14px;
-            font-family: 黑体;
-            border: 1px solid #dee2e6;
-            border-radius: 6px;
-        }
-        QLineEdit:focus {
-            border-color: #007bff;
-        }
-        """)
+        retranslator.bind(self.username_input, "home.username_placeholder", "placeholderText")
+        self.username_input.editingFinished.connect(self.save_offline_username)
         
-        form_layout.addRow("用户名:", self.username_input)
+        username_label = QLabel()
+        retranslator.bind(username_label, "home.username")
+        form_layout.addRow(username_label, self.username_input)
         layout.addLayout(form_layout)
         
         # 添加伸缩空间
         layout.addStretch()
         
         # 创建底部按钮区域
+        self.create_bottom_buttons(layout)
+    
+    def create_bottom_buttons(self, layout):
+        """创建底部的启动与设置按钮
+        
+        Args:
+            layout: 按钮区域要加入的布局
+        """
         bottom_layout = QHBoxLayout()
         bottom_layout.setSpacing(20)
         
         # 创建启动按钮
-        launch_btn = QPushButton("启动")
-        launch_btn.setStyleSheet("""
-        QPushButton {
-            padding: 14px 32px;
-            font-size: 18px;
-            font-family: 黑体;
-            background-color: #007bff;
-            color: white;
-            border: none;
-            border-radius: 8px;
-        }
-        QPushButton:hover {
-            background-color: #0069d9;
-        }
-        QPushButton:pressed {
-            background-color: #005cbf;
-        }
-        """)
+        launch_btn = QPushButton()
+        launch_btn.setProperty("variant", "primary")
+        retranslator.bind(launch_btn, "home.launch")
+        launch_btn.clicked.connect(self.launch)
+        self.launch_buttons.append(launch_btn)
         
         # 创建设置按钮
-        settings_btn = QPushButton("设置")
-        settings_btn.setStyleSheet("""
-        QPushButton {
-            padding: 10px 20px;
-            font-size: 14px;
-            font-family: 黑体;
-            background-color: #f8f9fa;
-            color: #495057;
-            border: 1px solid #dee2e6;
-            border-radius: 8px;
-        }
-        QPushButton:hover {
-            background-color: #e9ecef;
-            border-color: #ced4da;
-        }
-        QPushButton:pressed {
-            background-color: #dee2e6;
-            border-color: #adb5bd;
-        }
-        """)
+        settings_btn = QPushButton()
+        settings_btn.setProperty("variant", "outline")
+        retranslator.bind(settings_btn, "home.settings")
+        settings_btn.clicked.connect(self.show_settings)
         
         bottom_layout.addWidget(launch_btn, 1)
         bottom_layout.addWidget(settings_btn)
         
         layout.addLayout(bottom_layout)
     
+    def show_settings(self):
+        """显示设置对话框（第一次用到时才创建）"""
+        if self.settings_dialog is None:
+            from ui.widgets.settings_dialog import SettingsDialog
+            self.settings_dialog = SettingsDialog(self.window())
+        self.settings_dialog.show()
+        self.settings_dialog.raise_()
+    
+    def get_account_store(self):
+        """账号存储，第一次用到时才导入并打开"""
+        if self.account_store is None:
+            from MLCore.accounts import default_store
+            self.account_store = default_store()
+            self.account_store.on_error = lambda error: self.account_write_failed.emit(str(error))
+            self.account_write_failed.connect(self.show_account_error)
+            QApplication.instance().aboutToQuit.connect(self.close_account_store)
+        return self.account_store
+    
+    def show_account_error(self, message):
+        QMessageBox.warning(self, t("home.account_save_failed"), message)
+    
+    def close_account_store(self):
+        """退出前写完排队中的账号修改，失败时直接提示（事件循环已经停止，信号不会再送达）"""
+        import sqlite3
+        store = self.account_store
+        store.on_error = None
+        try:
+            store.close()
+        except sqlite3.Error as e:
+            self.show_account_error(str(e))
+    
+    def load_accounts(self):
+        """从账号存储读取账号列表（只读头信息）与上次使用的离线用户名"""
+        with startup_trace.span("accounts"):
+            store = self.get_account_store()
+            headers = store.list_headers()
+        self.account_model.set_accounts([header for header in headers if header.account_type != "offline"])
+        if not self.username_input.text():
+            self.username_input.setText(store.get_meta("last_offline_username", ""))
+    
     def add_new_account(self):
         """添加新账号"""
-        # 暂时只打印日志，不实现具体功能
-        print("添加新账号")
+        # 微软登录流程尚未接入，先记录用户名，令牌在登录完成后写入
+        username, ok = QInputDialog.getText(self, t("home.add_account_title"), t("home.add_account_prompt"))
+        username = username.strip()
+        if not ok or not username:
+            return
+        from MLCore.accounts import AccountHeader
+        header = AccountHeader(uuid.uuid4().hex, username, "msa", None, None)
+        # 先更新列表，写入在后台线程完成
+        self.account_model.add_account(header)
+        self.get_account_store().save_account(header)
+    
+    def save_offline_username(self):
+        """保存离线模式的用户名，并记为离线账号"""
+        username = self.username_input.text().strip()
+        if not username:
+            return
+        from MLCore.accounts import AccountHeader, offline_uuid
+        store = self.get_account_store()
+        if store.get_meta("last_offline_username") == username:
+            return
+        store.save_account(AccountHeader(offline_uuid(username), username, "offline", None, None))
+        store.set_meta("last_offline_username", username)
+    
+    def launch(self):
+        """启动游戏：先在后台检查当前实例的模组依赖，有错误时显示报告并阻止启动"""
+        from ui.tasks import runtime
+        if self.launching:
+            return
+        # 协程在第一个 await 之前出错时 finally 会同步执行，标志要在 start_ui() 之前设置
+        self.launching = True
+        self.set_launch_enabled(False)
+        runtime().start_ui(self.check_and_launch())
+    
+    def set_launch_enabled(self, enabled):
+        for button in self.launch_buttons:
+            button.setEnabled(enabled)
+    
+    async def check_and_launch(self):
+        from MLCore.resolver import check_mods_dir
+        from ui.tasks import runtime, PRIORITY_HIGH
+        from ui.pages.mods_page import show_problem_report
+        from ui.pages.instances_page import current_target
+        try:
+            mods_dir, environment, loader = current_target()
+            resolver = await runtime().submit(check_mods_dir, mods_dir, environment, loader=loader,
+                                              priority=PRIORITY_HIGH, name="launch.check_mods")
+        finally:
+            self.launching = False
+            self.set_launch_enabled(True)
+        if resolver.errors():
+            show_problem_report(self, resolver.problems(), t("home.launch_blocked"), "")
+            return
+        # 游戏启动流程尚未接入，依赖检查通过后在这里继续
     
     def on_show(self):
         """页面显示时调用"""
@@ -0,0 +1,181 @@
+import time
+from PyQt5.QtWidgets import QHBoxLayout, QPushButton, QLineEdit, QLabel, QListView, QInputDialog, QMessageBox
+from PyQt5.QtCore import Qt, QSortFilterProxyModel, QUrl
+from PyQt5.QtGui import QDesktopServices
+from ui.locales import t
+from ui.locales.retranslator import retranslator
+from ui.widgets.instance_list import InstanceListModel, InstanceDelegate, format_playtime
+from .base_page import BasePage
+
+# 新建实例时默认填写的游戏版本
+DEFAULT_VERSION = "1.20.1"
+
+class InstancesPage(BasePage):
+    """实例列表页面
+
+    第一次显示时在后台完整扫描一次实例根目录，之后由 ui.instance_watcher.InstanceWatcher
+    监视文件系统，只把变化的实例以增量差异应用到列表模型，不做定时全量扫描。
+    双击实例将其设为当前实例，模组页与启动前的依赖检查都使用当前实例的 mods 目录。
+    """
+
+    def setup_ui(self):
+        """设置UI"""
+        super().setup_ui()
+        self.manager = None
+        self.watcher = None
+        self.scan_flow = None
+        self.scan_ms = 0.0
+
+        # 工具栏：新建、设为当前、打开目录、过滤
+        toolbar = QHBoxLayout()
+        toolbar.setSpacing(10)
+        new_btn = QPushButton()
+        new_btn.setProperty("variant", "outline")
+        retranslator.bind(new_btn, "instances.new")
+        new_btn.clicked.connect(self.new_instance)
+        toolbar.addWidget(new_btn)
+
+        select_btn = QPushButton()
+        select_btn.setProperty("variant", "outline")
+        retranslator.bind(select_btn, "instances.select")
+        select_btn.clicked.connect(self.select_current)
+        toolbar.addWidget(select_btn)
+
+        folder_btn = QPushButton()
+        folder_btn.setProperty("variant", "outline")
+        retranslator.bind(folder_btn, "instances.open_folder")
+        folder_btn.clicked.connect(self.open_folder)
+        toolbar.addWidget(folder_btn)
+
+        self.filter_input = QLineEdit()
+        retranslator.bind(self.filter_input, "instances.filter_placeholder", "placeholderText")
+        toolbar.addWidget(self.filter_input, 1)
+        self.layout.addLayout(toolbar)
+
+        # 模型保存全部实例，过滤由代理模型完成
+        self.model = InstanceListModel(self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterRole(InstanceListModel.SearchRole)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.filter_input.textChanged.connect(self.proxy.setFilterFixedString)
+
+        self.instance_list = QListView()
+        self.instance_list.setObjectName("instanceList")
+        self.instance_list.setModel(self.proxy)
+        self.instance_list.setItemDelegate(InstanceDelegate(parent=self.instance_list))
+        # 所有行等高，滚动时只计算和绘制可见的行
+        self.instance_list.setUniformItemSizes(True)
+        self.instance_list.setMouseTracking(True)
+        # 委托绘制的文本不经过翻译绑定，切换语言时重绘一次
+        retranslator.lang_changed.connect(self.instance_list.viewport().update)
+        self.instance_list.doubleClicked.connect(self.select_instance)
+        self.layout.addWidget(self.instance_list, 1)
+
+        self.status_label = QLabel()
+        self.status_label.setObjectName("instanceStatus")
+        self.layout.addWidget(self.status_label)
+        retranslator.lang_changed.connect(self.update_status)
+        self.model.rowsInserted.connect(self.update_status)
+        self.model.rowsRemoved.connect(self.update_status)
+        self.model.dataChanged.connect(self.update_status)
+        self.update_status()
+
+    def on_show(self):
+        """页面显示时调用：第一次显示时扫描并开始监视，之后列表一直保持最新"""
+        if self.manager is None:
+            from MLCore.instances import default_manager
+            from ui.tasks import runtime
+            self.manager = default_manager()
+            self.scan_flow = runtime().start_ui(self.load())
+
+    async def load(self):
+        """在后台完整扫描一次，然后开始监视"""
+        from ui.tasks import runtime, PRIORITY_HIGH
+        from ui.instance_watcher import InstanceWatcher
+        started = time.perf_counter()
+        instances = await runtime().submit(self.manager.scan, priority=PRIORITY_HIGH, name="instances.scan")
+        self.scan_ms = (time.perf_counter() - started) * 1000
+        self.scan_flow = None
+        self.model.set_instances(instances.values())
+        self.model.set_current(self.manager.selected())
+        self.watcher = InstanceWatcher(self.manager, parent=self)
+        self.watcher.diff_ready.connect(self.model.apply_diff)
+        self.watcher.start()
+        self.update_status()
+
+    def new_instance(self):
+        """新建实例；列表由文件监视器更新"""
+        from MLCore.instances import LOADERS, default_manager
+        name, ok = QInputDialog.getText(self, t("instances.new_title"), t("instances.new_name"))
+        if not ok or not name.strip():
+            return
+        version, ok = QInputDialog.getText(self, t("instances.new_title"), t("instances.new_version"),
+                                           text=DEFAULT_VERSION)
+        if not ok or not version.strip():
+            return
+        loader, ok = QInputDialog.getItem(self, t("instances.new_title"), t("instances.new_loader"),
+                                          LOADERS, 0, False)
+        if not ok:
+            return
+        manager = self.manager or default_manager()
+        try:
+            manager.create(name.strip(), version.strip(), loader)
+        except OSError as e:
+            QMessageBox.warning(self, t("instances.new_failed"), str(e))
+
+    def select_current(self):
+        """把当前选中的行设为当前实例"""
+        self.select_instance(self.instance_list.currentIndex())
+
+    def select_instance(self, index):
+        """设为当前实例
+
+        Args:
+            index: 列表（过滤代理模型）中的索引
+        """
+        if not index.isValid() or self.manager is None:
+            return
+        instance_id = self.proxy.data(index, InstanceListModel.IdRole)
+        try:
+            self.manager.select(instance_id)
+        except OSError as e:
+            QMessageBox.warning(self, t("instances.select_failed"), str(e))
+            return
+        self.model.set_current(instance_id)
+
+    def open_folder(self):
+        """在文件管理器中打开实例根目录"""
+        from MLCore.instances import default_manager
+        manager = self.manager or default_manager()
+        QDesktopServices.openUrl(QUrl.fromLocalFile(manager.root))
+
+    def update_status(self):
+        """更新状态栏：实例数、总游戏时长与首次扫描用时"""
+        if self.manager is None or self.scan_flow is not None:
+            text = t("instances.loading")
+        else:
+            instances = self.model.instances
+            parts = [t("instances.count").format(count=len(instances))]
+            playtime = sum(instance.playtime for instance in instances)
+            if playtime:
+                parts.append(t("instances.total_playtime").format(time=format_playtime(playtime)))
+            parts.append(t("instances.scan_time").format(ms=self.scan_ms))
+            text = " · ".join(parts)
+        if text != self.status_label.text():
+            self.status_label.setText(text)
+
+def current_target():
+    """当前实例的 mods 目录、依赖检查环境与加载器
+
+    Returns:
+        (mods 目录, 环境字典, 加载器)；没有当前实例时为 (DEFAULT_MODS_DIR, {}, None)
+    """
+    from MLCore.instances import default_manager, mod_environment, MODS_DIR
+    from ui.pages.mods_page import DEFAULT_MODS_DIR
+    manager = default_manager()
+    instance_id = manager.selected()
+    instance = manager.read(instance_id) if instance_id else None
+    if instance is None:
+        return DEFAULT_MODS_DIR, {}, None
+    return manager.instance_path(instance_id, MODS_DIR), mod_environment(instance), instance.loader
@@ -0,0 +1,289 @@
+import os
+import re
+from bisect import bisect_left, bisect_right
+from PyQt5.QtWidgets import QHBoxLayout, QPushButton, QLineEdit, QComboBox, QLabel, QFileDialog
+from PyQt5.QtCore import QTimer
+from ui.locales import t
+from ui.locales.retranslator import retranslator
+from ui.widgets.log_view import LogView
+from .base_page import BasePage
+
+# 游戏目录中的最新日志
+LATEST_LOG = os.path.join("logs", "latest.log")
+
+# 级别过滤选项：(词条键, 显示的级别)，None 表示不过滤
+LEVEL_FILTERS = (
+    ("logs.level_all", None),
+    ("logs.level_warn", ("WARN", "ERROR", "FATAL")),
+    ("logs.level_error", ("ERROR", "FATAL")),
+)
+
+def default_log():
+    """当前实例（即游戏目录）的 logs/latest.log；没有当前实例时为数据目录下默认游戏目录中的"""
+    from MLCore import paths
+    from MLCore.instances import default_manager
+    manager = default_manager()
+    instance_id = manager.selected()
+    if instance_id and manager.read(instance_id) is not None:
+        return manager.instance_path(instance_id, LATEST_LOG)
+    return os.path.join(paths.data_dir("minecraft"), LATEST_LOG)
+
+class LogPage(BasePage):
+    """日志页面
+
+    日志文件由 MLCore.logs.LogIndex 映射并在后台建立行索引，LogView 只绘制可见行；
+    级别过滤与搜索由 LineScan 在后台扫描，界面定时取用已有的结果。
+    显示页面时跟随当前实例打开它的 latest.log（手动打开了其他文件时不切换）；
+    页面隐藏时停止轮询并暂停扫描。
+    """
+
+    # 轮询索引与扫描进度的间隔（毫秒）
+    POLL_INTERVAL = 100
+    # 文件增长检查的间隔（以轮询次数计）
+    REFRESH_EVERY = 10
+    # 搜索框停止输入后多久开始搜索（毫秒）
+    SEARCH_DELAY = 250
+
+    def setup_ui(self):
+        """设置UI"""
+        super().setup_ui()
+        self.index = None
+        self.filter_scan = None
+        self.search_scan = None
+        self.search_error = False
+        self.polls = 0
+        # 最近一次跟随的当前实例日志
+        self.followed_log = None
+
+        # 工具栏：打开、搜索、上一个/下一个、级别过滤
+        toolbar = QHBoxLayout()
+        toolbar.setSpacing(10)
+        open_btn = QPushButton()
+        open_btn.setProperty("variant", "outline")
+        retranslator.bind(open_btn, "logs.open")
+        open_btn.clicked.connect(self.choose_file)
+        toolbar.addWidget(open_btn)
+
+        self.search_input = QLineEdit()
+        retranslator.bind(self.search_input, "logs.search_placeholder", "placeholderText")
+        self.search_input.textChanged.connect(self.on_search_changed)
+        self.search_input.returnPressed.connect(self.next_match)
+        toolbar.addWidget(self.search_input, 1)
+
+        prev_btn = QPushButton()
+        prev_btn.setProperty("variant", "outline")
+        retranslator.bind(prev_btn, "logs.prev")
+        prev_btn.clicked.connect(self.previous_match)
+        toolbar.addWidget(prev_btn)
+        next_btn = QPushButton()
+        next_btn.setProperty("variant", "outline")
+        retranslator.bind(next_btn, "logs.next")
+        next_btn.clicked.connect(self.next_match)
+        toolbar.addWidget(next_btn)
+
+        self.level_box = QComboBox()
+        for i, (key, _) in enumerate(LEVEL_FILTERS):
+            self.level_box.addItem("")
+            retranslator.bind(self.level_box, key, lambda text, i=i: self.level_box.setItemText(i, text))
+        self.level_box.currentIndexChanged.connect(self.apply_filter)
+        toolbar.addWidget(self.level_box)
+        self.layout.addLayout(toolbar)
+
+        self.view = LogView()
+        self.layout.addWidget(self.view, 1)
+
+        self.status_label = QLabel()
+        self.status_label.setObjectName("logStatus")
+        self.layout.addWidget(self.status_label)
+        retranslator.lang_changed.connect(self.update_status)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY)
+        self.search_timer.timeout.connect(self.start_search)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(self.POLL_INTERVAL)
+        self.poll_timer.timeout.connect(self.poll)
+        self.update_status()
+
+    def on_show(self):
+        """页面显示时调用：当前实例改变后打开它的日志，恢复轮询与扫描"""
+        log_path = default_log()
+        if log_path != self.followed_log:
+            following = self.index is None or self.index.path == self.followed_log
+            self.followed_log = log_path
+            if following:
+                if os.path.isfile(log_path):
+                    self.open_log(log_path)
+                else:
+                    self.close_log()
+                    self.update_status()
+        for scan in (self.filter_scan, self.search_scan):
+            if scan is not None:
+                scan.resume()
+        if self.index is not None:
+            self.poll_timer.start()
+
+    def on_hide(self):
+        """页面隐藏时调用：停止轮询并暂停后台扫描"""
+        self.poll_timer.stop()
+        for scan in (self.filter_scan, self.search_scan):
+            if scan is not None:
+                scan.pause()
+
+    def on_evict(self):
+        """页面被回收前关闭日志，停止后台索引与扫描"""
+        self.close_log()
+
+    def choose_file(self):
+        """选择并打开日志文件"""
+        start_dir = os.path.dirname(self.index.path if self.index else self.followed_log or default_log())
+        path, _ = QFileDialog.getOpenFileName(self, t("logs.open_title"), start_dir, "*.log *.txt;;*")
+        if path:
+            self.open_log(path)
+
+    def open_log(self, path):
+        """打开日志文件：同步索引开头一块后立即显示，其余在后台继续
+
+        Args:
+            path: 日志文件路径
+        """
+        from MLCore.logs import LogIndex
+        self.close_log()
+        try:
+            self.index = LogIndex(path)
+        except OSError:
+            self.index = None
+            self.status_label.setText(t("logs.open_failed"))
+            return
+        self.view.set_index(self.index)
+        self.apply_filter()
+        self.start_search()
+        self.poll_timer.start()
+
+    def close_log(self):
+        """关闭当前日志，停止所有后台扫描"""
+        for scan in (self.filter_scan, self.search_scan):
+            if scan is not None:
+                scan.cancel()
+        self.filter_scan = self.search_scan = None
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+        self.view.set_index(None)
+
+    def apply_filter(self):
+        """按级别过滤选项重新扫描"""
+        from MLCore.logs import LineScan, level_pattern
+        if self.filter_scan is not None:
+            self.filter_scan.cancel()
+            self.filter_scan = None
+        if self.index is None:
+            return
+        levels = LEVEL_FILTERS[self.level_box.currentIndex()][1]
+        if levels is not None:
+            self.filter_scan = LineScan(self.index, level_pattern(levels), continuation=True)
+        self.view.set_rows(self.filter_scan.lines if self.filter_scan else None)
+        self.update_status()
+
+    def on_search_changed(self, text):
+        self.search_timer.start()
+
+    def start_search(self):
+        """按搜索框中的正则重新扫描（忽略大小写），空白时清除搜索"""
+        from MLCore.logs import LineScan
+        self.search_timer.stop()
+        if self.search_scan is not None:
+            self.search_scan.cancel()
+            self.search_scan = None
+        self.search_error = False
+        text = self.search_input.text()
+        if not text or self.index is None:
+            self.view.set_highlight(None)
+            self.update_status()
+            return
+        try:
+            highlight = re.compile(text, re.I)
+            pattern = re.compile(text.encode("utf-8"), re.I | re.M)
+        except re.error:
+            self.search_error = True
+            self.view.set_highlight(None)
+            self.update_status()
+            return
+        self.search_scan = LineScan(self.index, pattern)
+        self.view.set_highlight(highlight)
+        self.update_status()
+
+    def visible(self, line):
+        """日志行是否在当前过滤结果中"""
+        rows = self.view.rows
+        if rows is None:
+            return True
+        row = self.view.row_of(line)
+        return row < len(rows) and rows[row] == line
+
+    def find_match(self, forward):
+        """从当前行开始查找下一个（或上一个）未被过滤掉的匹配行"""
+        if self.search_scan is None:
+            return None
+        matches = self.search_scan.lines
+        current = self.view.current_line
+        if current is None:
+            current = self.view.line_at(self.view.verticalScrollBar().value())
+            current = -1 if current is None else current - 1 if forward else current
+        if forward:
+            candidates = range(bisect_right(matches, current), len(matches))
+        else:
+            candidates = range(bisect_left(matches, current) - 1, -1, -1)
+        for position in candidates:
+            if self.visible(matches[position]):
+                return matches[position]
+        return None
+
+    def next_match(self):
+        line = self.find_match(True)
+        if line is not None:
+            self.view.scroll_to_line(line)
+
+    def previous_match(self):
+        line = self.find_match(False)
+        if line is not None:
+            self.view.scroll_to_line(line)
+
+    def poll(self):
+        """取用索引与扫描的最新进度；文件增长时继续索引，视图在底部时跟随新行"""
+        if self.index is None:
+            self.poll_timer.stop()
+            return
+        self.polls += 1
+        # 只在首次索引完成、且用户停在末尾时跟随，打开文件时不会被索引进度带着往下跳
+        following = (self.index.complete and self.view.at_bottom()
+                     and self.view.row_count() > self.view.page_rows())
+        if self.polls % self.REFRESH_EVERY == 0 and self.index.refresh() == "truncated":
+            self.open_log(self.index.path)
+            return
+        self.view.refresh()
+        if following:
+            self.view.verticalScrollBar().setValue(self.view.verticalScrollBar().maximum())
+        self.update_status()
+
+    def update_status(self):
+        """更新状态栏：行数、索引进度与搜索结果"""
+        if self.index is None:
+            text = t("logs.empty")
+        else:
+            parts = [t("logs.lines").format(lines=self.index.line_count())]
+            if not self.index.complete:
+                parts.append(t("logs.indexing").format(percent=int(self.index.progress() * 100)))
+            if self.filter_scan is not None:
+                parts.append(t("logs.filtered").format(lines=len(self.filter_scan.lines)))
+            if self.search_error:
+                parts.append(t("logs.invalid_pattern"))
+            elif self.search_scan is not None:
+                parts.append(t("logs.matches").format(count=len(self.search_scan.lines)))
+                if not self.search_scan.caught_up():
+                    parts.append(t("logs.searching"))
+            text = " · ".join(parts)
+        if text != self.status_label.text():
+            self.status_label.setText(text)
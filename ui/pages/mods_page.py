@@ -0,0 +1,260 @@
+import os
+import time
+from PyQt5.QtWidgets import QHBoxLayout, QPushButton, QLineEdit, QLabel, QListView, QFileDialog, QMessageBox
+from PyQt5.QtCore import Qt, QSortFilterProxyModel
+from ui.locales import t
+from ui.locales.retranslator import retranslator
+from ui.widgets.mod_list import ModListModel, ModDelegate, describe_problem
+from .base_page import BasePage
+
+# 没有当前实例时打开的 mods 目录
+DEFAULT_MODS_DIR = os.path.join(".minecraft", "mods")
+# 依赖检查报告中直接显示的条数，其余放在详细信息中
+REPORT_LINES = 10
+
+class ModsPage(BasePage):
+    """模组管理页面
+
+    打开目录时先用 MLCore.mods.ModIndex 的缓存同步列出全部 jar（文件没有变化时只需要 stat），
+    缓存中没有的 jar 先显示文件名，再交给后台任务解析，完成后只重绘这些行。
+    全部解析后用 MLCore.resolver.ModResolver 检查依赖；启用/禁用单个模组时只增量重新检查。
+    显示页面时跟随当前实例：当前实例改变后打开它的 mods 目录，并以它的游戏与加载器版本检查依赖；
+    同时带有多个加载器元数据的 jar 按当前实例的加载器显示与检查。
+    """
+
+    def setup_ui(self):
+        """设置UI"""
+        super().setup_ui()
+        self.mod_index = None
+        self.mods_dir = None
+        self.resolver = None
+        self.parse_flow = None
+        self.pending = 0
+        # 最近一次后台解析失败的原因，没有失败时为 None
+        self.parse_error = None
+        self.scan_ms = 0.0
+        # 最近一次跟随的当前实例 mods 目录，以及检查依赖时使用的环境与加载器
+        self.followed_dir = None
+        self.environment = {}
+        self.loader = None
+
+        # 工具栏：打开目录、刷新、过滤
+        toolbar = QHBoxLayout()
+        toolbar.setSpacing(10)
+        open_btn = QPushButton()
+        open_btn.setProperty("variant", "outline")
+        retranslator.bind(open_btn, "mods.open")
+        open_btn.clicked.connect(self.choose_dir)
+        toolbar.addWidget(open_btn)
+
+        refresh_btn = QPushButton()
+        refresh_btn.setProperty("variant", "outline")
+        retranslator.bind(refresh_btn, "mods.refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        toolbar.addWidget(refresh_btn)
+
+        toggle_btn = QPushButton()
+        toggle_btn.setProperty("variant", "outline")
+        retranslator.bind(toggle_btn, "mods.toggle")
+        toggle_btn.clicked.connect(self.toggle_current)
+        toolbar.addWidget(toggle_btn)
+
+        check_btn = QPushButton()
+        check_btn.setProperty("variant", "outline")
+        retranslator.bind(check_btn, "mods.check")
+        check_btn.clicked.connect(self.show_report)
+        toolbar.addWidget(check_btn)
+
+        self.filter_input = QLineEdit()
+        retranslator.bind(self.filter_input, "mods.filter_placeholder", "placeholderText")
+        toolbar.addWidget(self.filter_input, 1)
+        self.layout.addLayout(toolbar)
+
+        # 模型保存全部 jar，过滤由代理模型完成
+        self.model = ModListModel(self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterRole(ModListModel.SearchRole)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.filter_input.textChanged.connect(self.proxy.setFilterFixedString)
+
+        self.mod_list = QListView()
+        self.mod_list.setObjectName("modList")
+        self.mod_list.setModel(self.proxy)
+        self.mod_list.setItemDelegate(ModDelegate(parent=self.mod_list))
+        # 所有行等高，滚动时只计算和绘制可见的行
+        self.mod_list.setUniformItemSizes(True)
+        self.mod_list.setMouseTracking(True)
+        # 委托绘制的文本不经过翻译绑定，切换语言时重绘一次
+        retranslator.lang_changed.connect(self.mod_list.viewport().update)
+        self.mod_list.doubleClicked.connect(self.toggle_mod)
+        self.layout.addWidget(self.mod_list, 1)
+
+        self.status_label = QLabel()
+        self.status_label.setObjectName("modStatus")
+        self.layout.addWidget(self.status_label)
+        retranslator.lang_changed.connect(self.update_status)
+        self.update_status()
+
+    def on_show(self):
+        """页面显示时调用"""
+        from ui.pages.instances_page import current_target
+        mods_dir, environment, loader = current_target()
+        if mods_dir != self.followed_dir:
+            self.followed_dir = mods_dir
+            self.environment = environment
+            self.loader = loader
+            if os.path.isdir(mods_dir):
+                self.open_dir(mods_dir)
+
+    def on_evict(self):
+        """页面被回收前取消后台解析"""
+        if self.parse_flow is not None:
+            self.parse_flow.cancel()
+            self.parse_flow = None
+
+    def choose_dir(self):
+        """选择并打开 mods 目录"""
+        start_dir = self.mods_dir or DEFAULT_MODS_DIR
+        path = QFileDialog.getExistingDirectory(self, t("mods.open_title"), start_dir)
+        if path:
+            self.open_dir(path)
+
+    def refresh(self):
+        """重新扫描当前目录"""
+        if self.mods_dir is not None:
+            self.open_dir(self.mods_dir)
+
+    def open_dir(self, mods_dir):
+        """打开 mods 目录：同步列出全部 jar，缓存中没有的在后台解析
+
+        Args:
+            mods_dir: mods 目录
+        """
+        from MLCore.mods import ModIndex
+        if self.parse_flow is not None:
+            self.parse_flow.cancel()
+            self.parse_flow = None
+        if self.mod_index is None:
+            self.mod_index = ModIndex()
+        self.mods_dir = mods_dir
+        self.resolver = None
+        self.parse_error = None
+        self.model.loader = self.loader if mods_dir == self.followed_dir else None
+        started = time.perf_counter()
+        files = self.mod_index.scan(mods_dir, parse=False)
+        self.scan_ms = (time.perf_counter() - started) * 1000
+        self.model.set_files(files)
+        stale = [item for item in files if item.mods is None]
+        self.pending = len(stale)
+        if stale:
+            from ui.tasks import runtime
+            self.parse_flow = runtime().start_ui(self.parse_stale(stale))
+        else:
+            self.resolve()
+        self.update_status()
+
+    async def parse_stale(self, stale):
+        """在后台解析缓存中没有的 jar，完成后更新对应的行
+
+        解析失败时在状态栏显示原因（不检查依赖），被取消时（打开了其他目录）只清理状态。
+        """
+        from ui.tasks import runtime, PRIORITY_HIGH
+        parsed = None
+        try:
+            parsed = await runtime().submit(self.mod_index.parse, stale, priority=PRIORITY_HIGH, name="mods.parse")
+        except Exception as e:
+            self.parse_error = f"{type(e).__name__}: {e}"
+        finally:
+            self.pending = 0
+            self.parse_flow = None
+        if parsed is not None:
+            self.model.update_files(parsed)
+            self.resolve()
+        self.update_status()
+
+    def resolve(self):
+        """完整检查一次依赖"""
+        from MLCore.resolver import ModResolver
+        if self.mods_dir == self.followed_dir:
+            self.resolver = ModResolver(self.model.files, self.environment, self.loader)
+        else:
+            self.resolver = ModResolver(self.model.files)
+        self.model.set_problems(self.resolver.problem_files())
+
+    def toggle_current(self):
+        """启用或禁用当前选中的模组"""
+        self.toggle_mod(self.mod_list.currentIndex())
+
+    def toggle_mod(self, index):
+        """启用或禁用一个模组：文件改名后增量重新检查依赖
+
+        Args:
+            index: 列表（过滤代理模型）中的索引
+        """
+        if not index.isValid() or self.pending:
+            return
+        item = self.proxy.data(index, ModListModel.FileRole)
+        try:
+            updated = self.mod_index.set_enabled(item, not item.enabled)
+        except OSError as e:
+            QMessageBox.warning(self, t("mods.toggle_failed"), str(e))
+            return
+        self.model.replace_file(item.path, updated)
+        if self.resolver is not None:
+            self.resolver.update(item.path, updated)
+            self.model.set_problems(self.resolver.problem_files())
+        self.update_status()
+
+    def show_report(self):
+        """显示依赖检查报告"""
+        if self.resolver is None:
+            return
+        show_problem_report(self, self.resolver.problems(), t("mods.report_title"), t("mods.report_ok"))
+
+    def update_status(self):
+        """更新状态栏：jar 数、禁用数、后台解析进度与依赖检查结果"""
+        if self.mods_dir is None:
+            text = t("mods.empty")
+        else:
+            files = self.model.files
+            disabled = sum(not item.enabled for item in files)
+            parts = [t("mods.count").format(count=len(files))]
+            if disabled:
+                parts.append(t("mods.disabled").format(count=disabled))
+            if self.pending:
+                parts.append(t("mods.reading").format(count=self.pending))
+            elif self.parse_error is not None:
+                parts.append(t("mods.read_failed").format(error=self.parse_error))
+            elif self.resolver is not None:
+                problems = self.resolver.problems()
+                errors = sum(problem.severity == "error" for problem in problems)
+                if errors:
+                    parts.append(t("mods.errors").format(count=errors))
+                if len(problems) > errors:
+                    parts.append(t("mods.warnings").format(count=len(problems) - errors))
+            parts.append(t("mods.scan_time").format(ms=self.scan_ms))
+            text = " · ".join(parts)
+        if text != self.status_label.text():
+            self.status_label.setText(text)
+
+def show_problem_report(parent, problems, title, ok_text):
+    """以对话框显示依赖检查结果：摘要与前几条说明，完整列表在详细信息中
+
+    Args:
+        parent: 父窗口
+        problems: MLCore.resolver.Problem 列表（错误在前）
+        title: 对话框标题
+        ok_text: 没有问题时显示的文本
+    """
+    if not problems:
+        QMessageBox.information(parent, title, ok_text)
+        return
+    errors = sum(problem.severity == "error" for problem in problems)
+    lines = [describe_problem(problem) for problem in problems]
+    box = QMessageBox(QMessageBox.Critical if errors else QMessageBox.Warning, title,
+                      t("mods.report_summary").format(errors=errors, warnings=len(problems) - errors), parent=parent)
+    box.setInformativeText("\n".join(lines[:REPORT_LINES]))
+    if len(lines) > REPORT_LINES:
+        box.setDetailedText("\n".join(lines))
+    box.exec_()
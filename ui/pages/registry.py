@@ -0,0 +1,177 @@
+import importlib
+from collections import OrderedDict
+from PyQt5.QtWidgets import QStackedWidget
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from ui import startup_trace
+
+class PageRegistry(QObject):
+    """页面注册表
+
+    页面按 ID 和工厂函数登记，第一次导航到时才创建并放入 QStackedWidget；
+    可在首帧绘制后的空闲时间预热，也可在超出内存预算时回收不常用的重页面。
+    """
+
+    # 信号
+    page_created = pyqtSignal(str)  # 页面实例创建
+    page_changed = pyqtSignal(str)  # 当前页面切换
+    page_evicted = pyqtSignal(str)  # 页面被回收
+
+    def __init__(self, stack=None, memory_budget=None, parent=None):
+        """初始化页面注册表
+
+        Args:
+            stack: 页面容器，默认新建一个 QStackedWidget
+            memory_budget: 已创建页面的估算内存上限（MB），None 表示不限制
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.stack = stack if stack is not None else QStackedWidget()
+        self.memory_budget = memory_budget
+        self.current_page = None
+        # 页面 ID -> 登记信息
+        self.specs = {}
+        # 已创建的页面，按最近使用顺序排列（最旧的在前）
+        self.pages = OrderedDict()
+        self.prewarm_queue = []
+        self.prewarm_interval = 50
+
+    def register(self, page_id, factory, title_key=None, cost=1, evictable=False, prewarm=False):
+        """登记页面
+
+        Args:
+            page_id: 页面ID，与侧边栏菜单ID一致
+            factory: 无参可调用对象，返回 BasePage 实例；也可以是 "模块:类名" 字符串，
+                第一次创建页面时才导入对应模块
+            title_key: 标题栏使用的词条键
+            cost: 页面的估算内存（MB），用于内存预算
+            evictable: 是否允许在超出预算时回收
+            prewarm: 是否在空闲时间预先创建
+        """
+        self.specs[page_id] = {
+            "factory": factory,
+            "title_key": title_key,
+            "cost": cost,
+            "evictable": evictable,
+            "prewarm": prewarm
+        }
+
+    def __contains__(self, page_id):
+        return page_id in self.specs
+
+    def title_key(self, page_id):
+        """获取页面标题的词条键"""
+        return self.specs[page_id]["title_key"]
+
+    def is_created(self, page_id):
+        """页面是否已经创建"""
+        return page_id in self.pages
+
+    def page(self, page_id):
+        """获取页面实例，未创建时立即创建"""
+        page = self.pages.get(page_id)
+        if page is None:
+            with startup_trace.span("page:" + page_id):
+                page = self.resolve_factory(page_id)()
+            self.pages[page_id] = page
+            self.stack.addWidget(page)
+            self.page_created.emit(page_id)
+        return page
+
+    def resolve_factory(self, page_id):
+        """获取页面工厂，字符串形式的工厂在这里导入并缓存"""
+        spec = self.specs[page_id]
+        factory = spec["factory"]
+        if isinstance(factory, str):
+            module_name, attr = factory.split(":")
+            factory = getattr(importlib.import_module(module_name), attr)
+            spec["factory"] = factory
+        return factory
+
+    def show(self, page_id):
+        """切换到指定页面
+
+        Args:
+            page_id: 页面ID
+
+        Returns:
+            页面实例
+        """
+        page = self.page(page_id)
+        if page_id == self.current_page:
+            return page
+
+        # 隐藏当前页面
+        old_page = self.pages.get(self.current_page)
+        if old_page is not None:
+            old_page.on_hide()
+
+        # 显示新页面
+        self.stack.setCurrentWidget(page)
+        page.on_show()
+        self.current_page = page_id
+        self.pages.move_to_end(page_id)
+
+        self.enforce_budget()
+        self.page_changed.emit(page_id)
+        return page
+
+    def schedule_prewarm(self, interval=50, delay=0):
+        """在事件循环空闲时逐个预创建标记了 prewarm 的页面
+
+        应在主窗口 show() 之后调用，每个定时器回调只创建一个页面，
+        避免长时间占用事件循环。
+
+        Args:
+            interval: 两个页面之间的间隔（毫秒）
+            delay: 开始预创建前的等待（毫秒），让首帧绘制与启动时的其他工作先完成
+        """
+        self.prewarm_queue = [
+            page_id for page_id, spec in self.specs.items()
+            if spec["prewarm"] and page_id not in self.pages
+        ]
+        self.prewarm_interval = interval
+        if self.prewarm_queue:
+            QTimer.singleShot(delay, self.prewarm_next)
+
+    def prewarm_next(self):
+        """预创建队列中的下一个页面"""
+        while self.prewarm_queue:
+            page_id = self.prewarm_queue.pop(0)
+            if page_id not in self.pages and page_id in self.specs:
+                self.page(page_id)
+                break
+        if self.prewarm_queue:
+            QTimer.singleShot(self.prewarm_interval, self.prewarm_next)
+
+    def used_memory(self):
+        """已创建页面的估算内存（MB）"""
+        return sum(self.specs[page_id]["cost"] for page_id in self.pages)
+
+    def enforce_budget(self):
+        """超出内存预算时，从最久未使用的可回收页面开始回收"""
+        if self.memory_budget is None:
+            return
+        used = self.used_memory()
+        for page_id in list(self.pages):
+            if used <= self.memory_budget:
+                break
+            if page_id == self.current_page or not self.specs[page_id]["evictable"]:
+                continue
+            used -= self.specs[page_id]["cost"]
+            self.evict(page_id)
+
+    def evict(self, page_id):
+        """回收页面实例，下次导航时重新创建
+
+        Args:
+            page_id: 页面ID，不能是当前页面
+        """
+        if page_id == self.current_page:
+            return
+        page = self.pages.pop(page_id, None)
+        if page is None:
+            return
+        page.on_evict()
+        self.stack.removeWidget(page)
+        page.deleteLater()
+        self.page_evicted.emit(page_id)
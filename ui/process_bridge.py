@@ -0,0 +1,59 @@
+"""游戏进程与界面之间的桥
+
+MLCore.process.GameProcess 在后台线程中读取游戏输出，写入环形缓冲区；
+本模块在 GUI 线程用定时器按固定间隔批量取出新日志，通过信号交给界面。
+无论游戏输出多快，界面每秒最多收到 1000 / interval 批、每批最多 max_batch 条，
+积压超过 max_batch 时跳过较旧的日志（完整日志仍在游戏的 latest.log 中）。
+"""
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+class ProcessBridge(QObject):
+    """把 GameProcess 的日志与退出事件转成 Qt 信号
+
+    Signals:
+        records_ready(list): 一批新的 LogRecord
+        records_dropped(int): 因积压被跳过的日志条数
+        exited(int, bool): 进程退出，参数为退出码与是否崩溃
+    """
+
+    records_ready = pyqtSignal(list)
+    records_dropped = pyqtSignal(int)
+    exited = pyqtSignal(int, bool)
+
+    def __init__(self, process, interval=50, max_batch=2000, parent=None):
+        """初始化并开始轮询
+
+        Args:
+            process: 已启动的 MLCore.process.GameProcess
+            interval: 轮询间隔（毫秒）
+            max_batch: 每批最多交给界面的日志条数
+        """
+        super().__init__(parent)
+        self.process = process
+        self.max_batch = max_batch
+        self.cursor = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.poll)
+        self.timer.start()
+
+    def poll(self):
+        """取出新日志并发出信号；进程结束且日志取完后发出 exited 并停止轮询"""
+        # 先看是否结束：finished 之后缓冲区已包含全部输出，这一轮取完即可收尾
+        finished = self.process.finished.is_set()
+        records, self.cursor, dropped = self.process.buffer.read_since(self.cursor, self.max_batch)
+        if dropped:
+            self.dropped += dropped
+            self.records_dropped.emit(dropped)
+        if records:
+            self.delivered += len(records)
+            self.records_ready.emit(records)
+        if finished and self.cursor == self.process.buffer.total:
+            self.timer.stop()
+            self.exited.emit(self.process.returncode, self.process.crashed)
+
+    def stop(self):
+        """停止轮询（不影响进程本身）"""
+        self.timer.stop()
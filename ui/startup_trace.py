@@ -0,0 +1,149 @@
+"""启动耗时追踪
+
+通过环境变量 MINELANCHER_TRACE 或命令行参数 --trace-startup 开启，
+记录导入、QApplication 创建、各部件构造、首帧绘制与事件循环空闲的时间点，
+结束后输出 Chrome trace 格式的 JSON（可在 chrome://tracing 或 Perfetto 中打开）
+并在终端打印汇总表。未开启时所有接口都是空操作。
+
+本模块不能依赖 PyQt5，以便在导入 PyQt5 之前就开始计时。
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+ENV_VAR="MINELANCHER_TRACE"
+CLI_FLAG="--trace-startup"
+DEFAULT_OUTPUT="startup-trace.json"
+
+enabled=False
+output_path=DEFAULT_OUTPUT
+# 以本模块导入的时刻作为时间零点
+origin_ns=time.perf_counter_ns()
+# 记录的事件：(名称, 分类, 开始ns, 结束ns)，瞬时事件的结束时间为 None
+events=[]
+finished=False
+_lock=threading.Lock()
+
+def init(argv=None):
+    """根据命令行参数与环境变量决定是否开启追踪
+
+    Args:
+        argv: 命令行参数，支持 --trace-startup 与 --trace-startup=输出路径
+    """
+    global enabled,output_path
+    value=os.environ.get(ENV_VAR,"")
+    for arg in argv or []:
+        if arg==CLI_FLAG:
+            value=value or "1"
+        elif arg.startswith(CLI_FLAG+"="):
+            value=arg.split("=",1)[1]
+    if not value or value=="0":
+        return
+    enabled=True
+    if value!="1":
+        output_path=value
+    atexit.register(finish)
+
+def _now():
+    return time.perf_counter_ns()
+
+@contextmanager
+def span(name,category="startup"):
+    """记录一段代码的耗时
+
+    Args:
+        name: 事件名称
+        category: 事件分类
+    """
+    if not enabled:
+        yield
+        return
+    start=_now()
+    try:
+        yield
+    finally:
+        end=_now()
+        with _lock:
+            events.append((name,category,start,end))
+
+def mark(name,category="startup"):
+    """记录一个瞬时时间点
+
+    Args:
+        name: 事件名称
+        category: 事件分类
+    """
+    if not enabled:
+        return
+    with _lock:
+        events.append((name,category,_now(),None))
+
+def watch_first_paint(app):
+    """监听首帧绘制，随后在事件循环第一次空闲时结束追踪
+
+    Args:
+        app: QApplication 实例
+    """
+    if not enabled:
+        return
+    from PyQt5.QtCore import QObject, QEvent, QTimer
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type()==QEvent.Paint:
+                mark("first paint")
+                app.removeEventFilter(self)
+                # 零延时定时器会在当前这批事件处理完后触发，即事件循环空闲
+                QTimer.singleShot(0,on_idle)
+            return False
+
+    def on_idle():
+        mark("event loop idle")
+        finish()
+
+    paint_filter=FirstPaintFilter(app)
+    app.installEventFilter(paint_filter)
+
+def to_chrome_trace():
+    """把已记录的事件转换为 Chrome trace 格式"""
+    pid=os.getpid()
+    tid=threading.get_ident()
+    trace_events=[]
+    for name,category,start,end in events:
+        event={
+            "name":name,
+            "cat":category,
+            "ts":(start-origin_ns)/1000,
+            "pid":pid,
+            "tid":tid
+        }
+        if end is None:
+            event["ph"]="i"
+            event["s"]="g"
+        else:
+            event["ph"]="X"
+            event["dur"]=(end-start)/1000
+        trace_events.append(event)
+    return {"traceEvents":trace_events,"displayTimeUnit":"ms"}
+
+def summary():
+    """生成汇总表文本，按开始时间排序"""
+    lines=["%-40s %12s %12s"%("事件","开始(ms)","耗时(ms)")]
+    for name,_,start,end in sorted(events,key=lambda e:e[2]):
+        duration="-" if end is None else "%.2f"%((end-start)/1e6)
+        lines.append("%-40s %12.2f %12s"%(name,(start-origin_ns)/1e6,duration))
+    return "\n".join(lines)
+
+def finish():
+    """写出追踪文件并打印汇总表，只执行一次"""
+    global finished
+    if not enabled or finished:
+        return
+    finished=True
+    with open(output_path,"w",encoding="utf-8") as f:
+        json.dump(to_chrome_trace(),f,ensure_ascii=False)
+    print(summary())
+    print(f"启动追踪已写入: {os.path.abspath(output_path)}")
@@ -0,0 +1,429 @@
+"""后台任务运行时
+
+GUI 线程之外运行一个专用线程，其中是 asyncio 事件循环；任务通过信号把进度与结果送回 GUI 线程。
+- submit() 提交协程函数或普通（阻塞）函数，阻塞函数在线程池中执行，MLCore 的同步接口可以直接提交
+- 按优先级排队（数值小的先执行），全局并发数有上限
+- 任务可取消：排队中的直接移除；协程在下一个 await 处收到取消；
+  阻塞函数通过 current_task().check() / is_cancelled() 在检查点响应，
+  在它真正返回之前任务处于 CANCELLING 状态并继续占用并发名额
+- 任务函数内可用 current_task().report(进度, 文本) 报告进度（任意线程，自动节流）
+- start_ui() 在 GUI 线程驱动一个协程，其中可以 ``await`` 任务，页面代码可以顺序地写后台操作
+- 统计排队深度、排队等待时间，以及 GUI 线程每帧被阻塞的时间（FrameMonitor，
+  与看门狗一起由 MINELANCHER_WATCHDOG 或 --watchdog 开启，未开启时不运行采样定时器）
+
+asyncio 导入较慢，本模块在第一次需要后台任务时才导入，不在启动路径上。
+"""
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, QElapsedTimer, QCoreApplication, QThread, pyqtSignal
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+# 任务状态
+PENDING = "pending"
+RUNNING = "running"
+# 已请求取消、线程池中的函数尚未返回
+CANCELLING = "cancelling"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_current = contextvars.ContextVar("minelancher_task", default=None)
+
+def current_task():
+    """在任务函数内部获取当前的 Task，不在任务中时返回 None"""
+    return _current.get()
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+class TaskCancelled(Exception):
+    """任务已被取消"""
+
+class Task(QObject):
+    """一个后台任务
+
+    信号在工作线程发出，连接到 GUI 线程的槽时自动排队执行。
+
+    Signals:
+        progress(float, str): 进度（0~1）与说明文本
+        finished(): 任务结束（完成、失败或取消）
+    """
+
+    progress = pyqtSignal(float, str)
+    finished = pyqtSignal()
+
+    # 进度信号的最小间隔（秒）
+    PROGRESS_INTERVAL = 0.05
+
+    def __init__(self, runtime, func, args, kwargs, priority, name):
+        super().__init__()
+        self.runtime = runtime
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.name = name or getattr(func, "__name__", "task")
+        self.state = PENDING
+        self.value = None
+        self.error = None
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+        self.future = None
+        self.last_report = 0.0
+        self.callbacks = []
+        self.finished.connect(self._run_callbacks)
+
+    def report(self, value, text=""):
+        """报告进度，可在任意线程调用；间隔过短的更新被丢弃，完成（>= 1）时总是发出"""
+        now = time.monotonic()
+        if value < 1 and now - self.last_report < self.PROGRESS_INTERVAL:
+            return
+        self.last_report = now
+        self.progress.emit(float(value), text)
+
+    def is_cancelled(self):
+        return self.cancel_requested
+
+    def check(self):
+        """取消检查点：任务已被取消时抛出 TaskCancelled"""
+        if self.cancel_requested:
+            raise TaskCancelled(self.name)
+
+    def cancel(self):
+        """请求取消任务"""
+        self.runtime.cancel(self)
+
+    def done(self):
+        return self.state in (DONE, FAILED, CANCELLED)
+
+    def result(self):
+        """任务的返回值；失败时重新抛出异常，取消时抛出 TaskCancelled"""
+        if self.state == FAILED:
+            raise self.error
+        if self.state == CANCELLED:
+            raise TaskCancelled(self.name)
+        return self.value
+
+    def add_done_callback(self, callback):
+        """任务结束后在 GUI 线程调用 callback(task)；已结束时立即调用"""
+        if self.done():
+            callback(self)
+        else:
+            self.callbacks.append(callback)
+
+    def _run_callbacks(self):
+        started = time.perf_counter()
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback(self)
+        self.runtime.callback_seconds += time.perf_counter() - started
+
+    def __await__(self):
+        # 由 start_ui() 的驱动器接收，任务结束后恢复协程
+        if not self.done():
+            yield self
+        return self.result()
+
+class UiCoroutine:
+    """在 GUI 线程驱动一个协程；协程每次 await 一个 Task，任务结束后在 GUI 线程继续执行"""
+
+    def __init__(self, coro, owner):
+        self.coro = coro
+        self.owner = owner
+        self.waiting = None
+        self.owner.add(self)
+        self._step(None, None)
+
+    def _step(self, value, error):
+        self.waiting = None
+        try:
+            awaited = self.coro.throw(error) if error is not None else self.coro.send(value)
+        except StopIteration:
+            self.owner.discard(self)
+            return
+        except (TaskCancelled, GeneratorExit):
+            self.owner.discard(self)
+            return
+        except Exception:
+            self.owner.discard(self)
+            sys.excepthook(*sys.exc_info())
+            return
+        if not isinstance(awaited, Task):
+            self._step(None, TypeError(f"start_ui() 中只能 await Task，得到 {awaited!r}"))
+            return
+        self.waiting = awaited
+        awaited.add_done_callback(self._resume)
+
+    def _resume(self, task):
+        if self.waiting is not task:
+            return
+        try:
+            value = task.result()
+        except BaseException as e:
+            self._step(None, e)
+        else:
+            self._step(value, None)
+
+    def cancel(self):
+        """结束协程，并取消它正在等待的任务"""
+        if self.waiting is not None:
+            self.waiting.cancel()
+            self.waiting = None
+        self.coro.close()
+        self.owner.discard(self)
+
+class FrameMonitor(QObject):
+    """测量 GUI 线程每帧被阻塞的时间
+
+    以一帧（16 ms）为间隔的定时器采样，实际间隔超出一帧的部分记为这一帧被阻塞的时间。
+    采样定时器每秒唤醒 GUI 线程 60 次，只在开启看门狗时由 runtime() 启动（见 ui.watchdog.threshold_from）。
+    """
+
+    FRAME_MS = 16
+
+    def __init__(self, history=600, parent=None):
+        super().__init__(parent)
+        self.samples = deque(maxlen=history)
+        self.clock = QElapsedTimer()
+        self.last_ns = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.FRAME_MS)
+        self.timer.timeout.connect(self._tick)
+
+    def start(self):
+        self.clock.start()
+        self.last_ns = 0
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def running(self):
+        return self.timer.isActive()
+
+    def _tick(self):
+        now = self.clock.nsecsElapsed()
+        self.samples.append(max(0.0, (now - self.last_ns) / 1e6 - self.FRAME_MS))
+        self.last_ns = now
+
+    def stats(self):
+        """最近若干帧的阻塞时间（毫秒）：{"frames", "mean", "p99", "max"}"""
+        samples = sorted(self.samples)
+        return {
+            "frames": len(samples),
+            "mean": sum(samples) / len(samples) if samples else 0.0,
+            "p99": _percentile(samples, 0.99),
+            "max": samples[-1] if samples else 0.0,
+        }
+
+class TaskRuntime(QObject):
+    """任务运行时：一个运行 asyncio 事件循环的线程与一个执行阻塞函数的线程池
+
+    Signals:
+        queue_changed(int, int): 排队中与执行中的任务数
+    """
+
+    queue_changed = pyqtSignal(int, int)
+
+    def __init__(self, max_concurrent=4, parent=None):
+        """启动事件循环线程
+
+        Args:
+            max_concurrent: 同时执行的任务数上限（协程与阻塞函数合计）
+        """
+        super().__init__(parent)
+        self.max_concurrent = max_concurrent
+        self.executor = ThreadPoolExecutor(max_concurrent, thread_name_prefix="Task")
+        self.loop = asyncio.new_event_loop()
+        self.lock = threading.Lock()
+        # 排队中的任务：(优先级, 序号, Task)，取消的任务留在堆中，出队时跳过
+        self.queue = []
+        self.sequence = itertools.count()
+        self.pending = 0
+        self.running = set()
+        self.completed = 0
+        self.last_depth = None
+        # 最近任务的排队等待时间（秒）
+        self.waits = deque(maxlen=1000)
+        # GUI 线程执行任务回调累计花费的时间（秒）
+        self.callback_seconds = 0.0
+        self.ui_coroutines = set()
+        self.frames = FrameMonitor(parent=self)
+        self.thread = threading.Thread(target=self._run_loop, daemon=True, name="TaskRuntime")
+        self.thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, func, *args, priority=PRIORITY_NORMAL, name=None, **kwargs):
+        """提交任务
+
+        Args:
+            func: 协程函数，或普通函数（在线程池中执行）
+            args, kwargs: 调用参数
+            priority: 优先级，数值小的先执行
+            name: 任务名，默认为函数名
+
+        Returns:
+            Task，可在 start_ui() 的协程中 await
+        """
+        task = Task(self, func, args, kwargs, priority, name)
+        # 信号要在 GUI 线程处理，任务对象归属主线程
+        app = QCoreApplication.instance()
+        if app is not None and QThread.currentThread() != app.thread():
+            task.moveToThread(app.thread())
+        with self.lock:
+            heapq.heappush(self.queue, (priority, next(self.sequence), task))
+            self.pending += 1
+        self.loop.call_soon_threadsafe(self._dispatch)
+        return task
+
+    def start_ui(self, coro):
+        """在 GUI 线程执行协程，其中可以 await submit() 返回的任务
+
+        Returns:
+            UiCoroutine，可用 cancel() 提前结束
+        """
+        return UiCoroutine(coro, self.ui_coroutines)
+
+    def cancel(self, task):
+        """取消任务：排队中的立即结束，执行中的请求取消并在真正结束前处于 CANCELLING"""
+        with self.lock:
+            if task.done():
+                return
+            task.cancel_requested = True
+            dequeued = task.state == PENDING
+            if dequeued:
+                task.state = CANCELLED
+                task.finished_at = time.monotonic()
+                self.pending -= 1
+            else:
+                task.state = CANCELLING
+        if dequeued:
+            task.finished.emit()
+            self._emit_depth()
+        elif task.future is not None:
+            self.loop.call_soon_threadsafe(task.future.cancel)
+
+    def _dispatch(self):
+        """在事件循环线程中按优先级启动排队的任务，直到达到并发上限"""
+        while True:
+            with self.lock:
+                if len(self.running) >= self.max_concurrent or not self.queue:
+                    break
+                task = heapq.heappop(self.queue)[2]
+                if task.state != PENDING:
+                    continue
+                task.state = RUNNING
+                task.started_at = time.monotonic()
+                self.pending -= 1
+                self.running.add(task)
+            self.waits.append(task.started_at - task.submitted_at)
+            task.future = self.loop.create_task(self._execute(task))
+        self._emit_depth()
+
+    async def _execute(self, task):
+        _current.set(task)
+        state = DONE
+        work = None
+        try:
+            task.check()
+            if asyncio.iscoroutinefunction(task.func):
+                task.value = await task.func(*task.args, **task.kwargs)
+            else:
+                # 复制上下文，线程池中的函数也能通过 current_task() 拿到任务
+                call = functools.partial(contextvars.copy_context().run, task.func, *task.args, **task.kwargs)
+                work = self.executor.submit(call)
+                task.value = await asyncio.wrap_future(work, loop=self.loop)
+            if task.cancel_requested:
+                state = CANCELLED
+        except (asyncio.CancelledError, TaskCancelled):
+            state = CANCELLED
+        except Exception as e:
+            state = FAILED
+            task.error = e
+        if work is not None and not work.done():
+            # 取消时函数仍在线程池中执行：保留并发名额，等它返回后再结束任务
+            work.add_done_callback(lambda _: self.loop.call_soon_threadsafe(self._finish, task, state))
+            return
+        self._finish(task, state)
+
+    def _finish(self, task, state):
+        """在事件循环线程中结束任务，释放并发名额并启动排队的任务"""
+        with self.lock:
+            task.finished_at = time.monotonic()
+            task.state = state
+            self.running.discard(task)
+            self.completed += 1
+        task.finished.emit()
+        self._dispatch()
+
+    def _emit_depth(self):
+        depth = (self.pending, len(self.running))
+        if depth != self.last_depth:
+            self.last_depth = depth
+            self.queue_changed.emit(*depth)
+
+    def stats(self):
+        """运行时统计：排队深度、等待时间（毫秒）、GUI 线程回调耗时与每帧阻塞时间"""
+        with self.lock:
+            pending, running, completed = self.pending, len(self.running), self.completed
+        waits = sorted(self.waits)
+        return {
+            "pending": pending,
+            "running": running,
+            "completed": completed,
+            "max_concurrent": self.max_concurrent,
+            "wait_p50": _percentile(waits, 0.5) * 1000,
+            "wait_p99": _percentile(waits, 0.99) * 1000,
+            "callback_ms": self.callback_seconds * 1000,
+            "frames": self.frames.stats(),
+        }
+
+    def shutdown(self):
+        """取消所有任务并停止事件循环线程"""
+        for coroutine in list(self.ui_coroutines):
+            coroutine.cancel()
+        with self.lock:
+            tasks = [entry[2] for entry in self.queue] + list(self.running)
+        for task in tasks:
+            self.cancel(task)
+        self.frames.stop()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(1)
+        self.executor.shutdown(wait=False)
+
+_runtime = None
+
+def runtime():
+    """应用共用的任务运行时，第一次调用时创建，应用退出时关闭
+
+    开启了看门狗（MINELANCHER_WATCHDOG 或 --watchdog）时同时开始测量每帧阻塞时间，
+    stats()["frames"] 才有数据。
+    """
+    global _runtime
+    if _runtime is None:
+        _runtime = TaskRuntime()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(_runtime.shutdown)
+            from ui import watchdog
+            if watchdog.threshold_from(sys.argv) is not None:
+                _runtime.frames.start()
+    return _runtime
@@ -0,0 +1,409 @@
+from functools import lru_cache
+from string import Template
+from PyQt5.QtWidgets import QWidget
+
+# 默认主题色板，样式表中的 $名称 会被替换为对应的值
+PALETTE = {
+    # 颜色
+    "primary": "#007bff",
+    "primary_hover": "#0069d9",
+    "primary_pressed": "#005cbf",
+    "secondary": "#6c757d",
+    "secondary_hover": "#5a6268",
+    "secondary_pressed": "#495057",
+    "danger": "#dc3545",
+    "warning": "#b07d00",
+    "highlight": "#fff3bf",
+    "text": "#212529",
+    "text_muted": "#495057",
+    "surface": "#ffffff",
+    "background": "#f8f9fa",
+    "hover": "#e9ecef",
+    "pressed": "#dee2e6",
+    "border_light": "#e9ecef",
+    "border": "#dee2e6",
+    "border_hover": "#ced4da",
+    "border_pressed": "#adb5bd",
+    # 字体
+    "font_family": "黑体",
+    "title_font_family": "'Segoe UI', Tahoma, Geneva, Verdana, sans-serif",
+    "font_size": "14px",
+    "font_size_medium": "16px",
+    "font_size_large": "18px",
+    # 圆角
+    "radius_small": "4px",
+    "radius": "6px",
+    "radius_large": "8px",
+}
+
+# 应用级样式表模板
+# 部件通过 objectName 与动态属性（如 selected、variant）匹配样式，
+# 状态变化时只需修改属性并重新 polish 单个部件。
+STYLESHEET_TEMPLATE = Template("""
+/* 主窗口 */
+#centralWidget {
+    background-color: $surface;
+}
+#rightPanel {
+    background-color: $surface;
+}
+#pageStack, #pageStack QWidget {
+    background-color: $background;
+}
+
+/* 侧边栏 */
+#AppSidebar, #AppSidebar QWidget {
+    background-color: $background;
+    border-right: 1px solid $border_light;
+}
+#AppSidebar QLabel {
+    color: $text;
+    font-size: $font_size;
+    font-family: $font_family;
+    background-color: transparent;
+}
+#AppSidebar QPushButton {
+    background-color: transparent;
+    color: $text;
+    font-size: $font_size;
+    font-family: $font_family;
+    border: none;
+    text-align: left;
+    padding: 0px;
+}
+#AppSidebar QPushButton:hover {
+    background-color: $hover;
+}
+#AppSidebar QPushButton:pressed {
+    background-color: $pressed;
+}
+#AppSidebar QLabel#brandIcon {
+    background-color: $surface;
+    color: $primary;
+    border-radius: $radius;
+    font-weight: bold;
+    font-size: $font_size_medium;
+}
+#AppSidebar QLabel#brandName {
+    color: $text;
+    font-weight: bold;
+    font-size: $font_size_medium;
+    margin-left: 10px;
+}
+#AppSidebar QPushButton#menuButton[selected="true"] {
+    background-color: $hover;
+}
+#AppSidebar QPushButton#menuButton QLabel {
+    color: $text;
+    background-color: transparent;
+}
+#AppSidebar QPushButton#sidebarToggle {
+    font-size: $font_size_medium;
+    text-align: center;
+}
+
+/* 标题栏 */
+#AppHeader, #AppHeader QWidget {
+    background-color: $surface;
+    border-bottom: 1px solid $border_light;
+}
+#AppHeader QLabel {
+    color: $text;
+    font-weight: bold;
+    font-size: $font_size;
+    font-family: $font_family;
+}
+#AppHeader QLabel#headerTitle {
+    font-family: $title_font_family;
+}
+#AppHeader QPushButton {
+    background-color: transparent;
+    color: $text;
+    font-size: $font_size;
+    font-family: $font_family;
+    border: none;
+    padding: 10px;
+    margin: 0;
+}
+#AppHeader QPushButton:hover {
+    background-color: $hover;
+}
+#AppHeader QPushButton#closeButton:hover {
+    background-color: $danger;
+    color: white;
+}
+#AppHeader QPushButton#langButton {
+    padding: 0px;
+    text-align: center;
+}
+#AppHeader QPushButton#langButton::menu-indicator {
+    image: none;
+}
+#AppHeader QLabel#devOverlay {
+    color: $text_muted;
+    font-weight: normal;
+    padding: 0 12px;
+}
+#AppHeader QLabel#devOverlay[level="warn"] {
+    color: $warning;
+}
+#AppHeader QLabel#devOverlay[level="bad"] {
+    color: $danger;
+}
+
+/* 语言菜单 */
+QMenu#langMenu {
+    background-color: rgba(255, 255, 255, 0.95);
+    border: 1px solid $border_light;
+    border-radius: $radius_small;
+    padding: 5px 0;
+}
+QMenu#langMenu::item {
+    padding: 8px 20px;
+    font-family: $font_family;
+    font-size: $font_size;
+    color: $text;
+}
+QMenu#langMenu::item:hover, QMenu#langMenu::item:selected {
+    background-color: $hover;
+    color: $primary;
+}
+QWidget#langItem[selected="true"] {
+    background-color: $hover;
+}
+QWidget#langItem QLabel {
+    font-family: $font_family;
+    font-size: $font_size;
+}
+QWidget#langItem[selected="true"] QLabel {
+    color: $primary;
+}
+
+/* 页面通用 */
+#pageStack QLabel#sectionTitle {
+    font-size: $font_size_large;
+    font-weight: bold;
+    color: $text;
+    font-family: $font_family;
+}
+#pageStack QLineEdit {
+    padding: 10px;
+    font-size: $font_size;
+    font-family: $font_family;
+    border: 1px solid $border;
+    border-radius: $radius;
+}
+#pageStack QLineEdit:focus {
+    border-color: $primary;
+}
+#pageStack QPushButton[variant="primary"] {
+    padding: 14px 32px;
+    font-size: $font_size_large;
+    font-family: $font_family;
+    background-color: $primary;
+    color: white;
+    border: none;
+    border-radius: $radius_large;
+}
+#pageStack QPushButton[variant="primary"]:hover {
+    background-color: $primary_hover;
+}
+#pageStack QPushButton[variant="primary"]:pressed {
+    background-color: $primary_pressed;
+}
+#pageStack QPushButton[variant="secondary"] {
+    padding: 10px 20px;
+    font-size: $font_size;
+    font-family: $font_family;
+    background-color: $secondary;
+    color: white;
+    border: none;
+    border-radius: $radius;
+}
+#pageStack QPushButton[variant="secondary"]:hover {
+    background-color: $secondary_hover;
+}
+#pageStack QPushButton[variant="secondary"]:pressed {
+    background-color: $secondary_pressed;
+}
+#pageStack QPushButton[variant="outline"] {
+    padding: 10px 20px;
+    font-size: $font_size;
+    font-family: $font_family;
+    background-color: $background;
+    color: $text_muted;
+    border: 1px solid $border;
+    border-radius: $radius_large;
+}
+#pageStack QPushButton[variant="outline"]:hover {
+    background-color: $hover;
+    border-color: $border_hover;
+}
+#pageStack QPushButton[variant="outline"]:pressed {
+    background-color: $pressed;
+    border-color: $border_pressed;
+}
+
+/* 设置对话框 */
+#SettingsDialog {
+    background-color: $background;
+    font-family: $font_family;
+}
+#SettingsDialog QTabBar {
+    font-size: $font_size;
+}
+#SettingsDialog QTreeWidget#javaList {
+    border: 1px solid $border;
+    border-radius: $radius;
+    background-color: $surface;
+    font-size: $font_size;
+}
+#SettingsDialog QLabel#jvmInstance {
+    font-size: $font_size_large;
+    font-weight: bold;
+    color: $text;
+}
+#SettingsDialog QLabel#jvmSummary {
+    color: $text_muted;
+    font-size: $font_size;
+}
+#SettingsDialog QPlainTextEdit#jvmArguments {
+    border: 1px solid $border;
+    border-radius: $radius;
+    background-color: $surface;
+    font-family: monospace;
+}
+#SettingsDialog QLabel#javaStatus {
+    color: $text_muted;
+    font-size: $font_size;
+}
+#SettingsDialog QPushButton[variant="outline"] {
+    padding: 8px 20px;
+    font-size: $font_size;
+    background-color: $background;
+    color: $text_muted;
+    border: 1px solid $border;
+    border-radius: $radius_large;
+}
+#SettingsDialog QPushButton[variant="outline"]:hover {
+    background-color: $hover;
+    border-color: $border_hover;
+}
+
+/* 首页 */
+#HomePage QTabWidget {
+    font-family: $font_family;
+}
+#HomePage QTabBar {
+    font-size: $font_size;
+}
+#HomePage QTabBar::tab {
+    padding: 10px 24px;
+    margin: 0 2px;
+    background-color: $hover;
+    border: 1px solid $border;
+    border-top-left-radius: $radius_large;
+    border-top-right-radius: $radius_large;
+}
+#HomePage QTabBar::tab:selected {
+    background-color: white;
+    border-bottom: 1px solid white;
+}
+#HomePage QListView#accountList {
+    border: 1px solid $border;
+    border-radius: $radius_large;
+    background-color: $surface;
+}
+
+/* 实例页 */
+#InstancesPage QListView#instanceList {
+    border: 1px solid $border;
+    border-radius: $radius_large;
+    background-color: $surface;
+}
+#InstancesPage QLabel#instanceStatus {
+    color: $text_muted;
+    font-size: $font_size;
+    font-family: $font_family;
+}
+
+/* 模组页 */
+#ModsPage QListView#modList {
+    border: 1px solid $border;
+    border-radius: $radius_large;
+    background-color: $surface;
+}
+#ModsPage QLabel#modStatus {
+    color: $text_muted;
+    font-size: $font_size;
+    font-family: $font_family;
+}
+
+/* 日志页 */
+#LogPage QComboBox {
+    padding: 8px 12px;
+    font-size: $font_size;
+    font-family: $font_family;
+    border: 1px solid $border;
+    border-radius: $radius;
+}
+#LogPage QAbstractScrollArea#logView {
+    border: 1px solid $border;
+    border-radius: $radius;
+}
+#LogPage QLabel#logStatus {
+    color: $text_muted;
+    font-size: $font_size;
+    font-family: $font_family;
+}
+""")
+
+@lru_cache(maxsize=8)
+def _build(items):
+    return STYLESHEET_TEMPLATE.substitute(dict(items))
+
+def build_stylesheet(overrides=None):
+    """根据色板生成应用级样式表，相同色板只生成一次
+
+    Args:
+        overrides: 覆盖默认色板的部分值，如 {"primary": "#ff0000"}
+
+    Returns:
+        样式表字符串
+    """
+    palette = dict(PALETTE)
+    if overrides:
+        palette.update(overrides)
+    return _build(tuple(sorted(palette.items())))
+
+def apply_theme(app, overrides=None):
+    """把主题样式表设置到整个应用上
+
+    Args:
+        app: QApplication 实例
+        overrides: 覆盖默认色板的部分值
+    """
+    app.setStyleSheet(build_stylesheet(overrides))
+
+def repolish(widget):
+    """让部件及其子部件按当前动态属性重新匹配样式"""
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    for child in widget.findChildren(QWidget):
+        style.unpolish(child)
+        style.polish(child)
+    widget.update()
+
+def set_state(widget, name, value):
+    """修改部件的动态属性并只重新 polish 该部件
+
+    Args:
+        widget: 目标部件
+        name: 属性名，如 "selected"
+        value: 属性值
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    repolish(widget)
@@ -0,0 +1,204 @@
+"""事件循环看门狗（开发者选项）
+
+通过环境变量 MINELANCHER_WATCHDOG 或命令行参数 --watchdog 开启，值为停顿阈值（毫秒），
+"1" 表示使用默认阈值。未开启时不创建任何定时器或线程。
+- GUI 线程上的心跳定时器测量事件循环延迟（实际间隔超出预期间隔的部分），计入直方图
+- 监视线程发现心跳超过阈值没有到来时，抓取 GUI 线程此刻的 Python 堆栈，即阻塞事件循环的代码
+- 停顿结束后在终端输出停顿时长、堆栈与延迟直方图，退出时输出汇总
+- 标题栏显示当前延迟与 p99（AppHeader.show_latency_overlay）
+"""
+import atexit
+import os
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import deque
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+ENV_VAR = "MINELANCHER_WATCHDOG"
+CLI_FLAG = "--watchdog"
+DEFAULT_THRESHOLD_MS = 200
+
+# 直方图各桶的上限（毫秒），最后一个桶收纳更长的停顿
+BUCKETS_MS = (5, 16, 33, 50, 100, 200, 500, 1000, 2000)
+
+def threshold_from(argv=None, environ=None):
+    """根据命令行参数与环境变量决定是否开启看门狗
+
+    Args:
+        argv: 命令行参数，支持 --watchdog 与 --watchdog=阈值毫秒
+        environ: 环境变量，默认为 os.environ
+
+    Returns:
+        停顿阈值（毫秒），未开启时为 None
+    """
+    value = (os.environ if environ is None else environ).get(ENV_VAR, "")
+    for arg in argv or []:
+        if arg == CLI_FLAG:
+            value = value or "1"
+        elif arg.startswith(CLI_FLAG + "="):
+            value = arg.split("=", 1)[1]
+    if not value or value == "0":
+        return None
+    if value == "1":
+        return DEFAULT_THRESHOLD_MS
+    try:
+        return max(1, int(value))
+    except ValueError:
+        return DEFAULT_THRESHOLD_MS
+
+class LatencyHistogram:
+    """事件循环延迟的直方图，另保留最近的样本用于计算分位数"""
+
+    def __init__(self, buckets=BUCKETS_MS, recent=2000):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.recent = deque(maxlen=recent)
+        self.total = 0
+
+    def add(self, ms):
+        self.counts[bisect_left(self.buckets, ms)] += 1
+        self.recent.append(ms)
+        self.total += 1
+
+    def percentile(self, fraction):
+        """最近样本的分位数（毫秒）"""
+        if not self.recent:
+            return 0.0
+        samples = sorted(self.recent)
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+    def format(self, width=40):
+        """文本形式的直方图"""
+        peak = max(self.counts) or 1
+        lines = []
+        for i, count in enumerate(self.counts):
+            label = f"<= {self.buckets[i]} ms" if i < len(self.buckets) else f"> {self.buckets[-1]} ms"
+            bar = "█" * max(1 if count else 0, count * width // peak)
+            lines.append(f"  {label:>11} {count:8d} {bar}")
+        return "\n".join(lines)
+
+class Watchdog(QObject):
+    """事件循环看门狗
+
+    Signals:
+        latency_updated(float, float): 当前延迟与最近样本的 p99（毫秒），每 0.5 秒最多一次
+    """
+
+    latency_updated = pyqtSignal(float, float)
+
+    # 心跳间隔（毫秒）
+    INTERVAL_MS = 50
+    # 浮层刷新间隔（秒）
+    OVERLAY_INTERVAL = 0.5
+
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, output=None, parent=None):
+        """初始化（需在 GUI 线程中创建）
+
+        Args:
+            threshold_ms: 停顿阈值（毫秒），超过时抓取堆栈并输出
+            output: 输出停顿报告的文件对象，默认为 stderr
+        """
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.output = output
+        self.gui_ident = threading.get_ident()
+        self.histogram = LatencyHistogram()
+        # 超过阈值的停顿：[(时长毫秒, 堆栈文本), ...]
+        self.stalls = []
+        self.current = 0.0
+        self.lock = threading.Lock()
+        self.last_beat = time.monotonic()
+        self.beat_seq = 0
+        # 监视线程为当前这次停顿抓到的 (心跳序号, 堆栈)
+        self.captured = None
+        self.last_overlay = 0.0
+        self.stopped = threading.Event()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(self.INTERVAL_MS)
+        self.timer.timeout.connect(self._beat)
+        self.monitor = threading.Thread(target=self._monitor, daemon=True, name="Watchdog")
+
+    def start(self):
+        """开始心跳与监视，退出时输出汇总"""
+        self.last_beat = time.monotonic()
+        self.timer.start()
+        self.monitor.start()
+        atexit.register(self.report)
+        return self
+
+    def stop(self):
+        self.timer.stop()
+        self.stopped.set()
+
+    def p99(self):
+        return self.histogram.percentile(0.99)
+
+    def _beat(self):
+        now = time.monotonic()
+        with self.lock:
+            latency = max(0.0, (now - self.last_beat) * 1000 - self.INTERVAL_MS)
+            captured = self.captured
+            if captured is not None and captured[0] != self.beat_seq:
+                captured = None
+            self.captured = None
+            self.beat_seq += 1
+            self.last_beat = now
+        self.current = latency
+        self.histogram.add(latency)
+        if latency >= self.threshold_ms:
+            stack = captured[1] if captured else ""
+            self.stalls.append((latency, stack))
+            self._log_stall(latency, stack)
+        if now - self.last_overlay >= self.OVERLAY_INTERVAL:
+            self.last_overlay = now
+            self.latency_updated.emit(latency, self.p99())
+
+    def _monitor(self):
+        poll = max(0.005, self.threshold_ms / 4000)
+        while not self.stopped.wait(poll):
+            with self.lock:
+                waited_ms = (time.monotonic() - self.last_beat) * 1000 - self.INTERVAL_MS
+                if waited_ms < self.threshold_ms or (self.captured and self.captured[0] == self.beat_seq):
+                    continue
+                seq = self.beat_seq
+            # 抓取堆栈不持有锁，避免 GUI 线程恢复时等待
+            frame = sys._current_frames().get(self.gui_ident)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            with self.lock:
+                if self.beat_seq == seq:
+                    self.captured = (seq, stack)
+
+    def _write(self, text):
+        print(text, file=self.output or sys.stderr, flush=True)
+
+    def _log_stall(self, latency, stack):
+        lines = [f"[watchdog] 事件循环停顿 {latency:.0f} ms（阈值 {self.threshold_ms} ms）"]
+        if stack:
+            lines.append("GUI 线程堆栈：")
+            lines.append(stack.rstrip())
+        lines.append(self.histogram.format())
+        self._write("\n".join(lines))
+
+    def report(self):
+        """输出汇总：心跳次数、停顿次数、p99 与直方图"""
+        if not self.histogram.total:
+            return
+        self._write(
+            f"[watchdog] 心跳 {self.histogram.total} 次，停顿 {len(self.stalls)} 次，"
+            f"p99 {self.p99():.1f} ms\n" + self.histogram.format()
+        )
+
+def start(parent=None, argv=None):
+    """按命令行参数与环境变量开启看门狗
+
+    Returns:
+        已开始的 Watchdog，未开启时为 None
+    """
+    threshold = threshold_from(sys.argv if argv is None else argv)
+    if threshold is None:
+        return None
+    return Watchdog(threshold, parent=parent).start()
@@ -0,0 +1,26 @@
+import importlib
+
+# 名称 -> 所在子模块，首次访问时才导入（PEP 562）
+_LAZY_ATTRS = {
+    'AccountListModel': '.account_list',
+    'AccountDelegate': '.account_list',
+    'AvatarCache': '.account_list',
+    'InstanceListModel': '.instance_list',
+    'InstanceDelegate': '.instance_list',
+    'LogView': '.log_view',
+    'ModListModel': '.mod_list',
+    'ModDelegate': '.mod_list',
+    'SettingsDialog': '.settings_dialog',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -0,0 +1,246 @@
+import time
+import zlib
+from collections import OrderedDict, namedtuple
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt5.QtGui import QPixmap, QPainter, QColor, QFont, QPen
+from ui.locales import t
+from ui import theme
+
+# 账号列表中的一行
+# expires_at 为令牌过期时间（Unix 时间戳），离线账号或未知时为 None
+AccountEntry = namedtuple("AccountEntry", "uuid username account_type expires_at skin_path")
+
+class AvatarCache:
+    """头像贴图的 LRU 缓存
+
+    头像从皮肤文件的脸部区域裁剪并缩放，没有皮肤时生成带首字母的色块。
+    """
+
+    def __init__(self, capacity=256):
+        """初始化缓存
+
+        Args:
+            capacity: 最多缓存的头像数量
+        """
+        self.capacity = capacity
+        self.pixmaps = OrderedDict()
+
+    def get(self, account, size):
+        """获取账号头像
+
+        Args:
+            account: AccountEntry
+            size: 头像边长（像素）
+
+        Returns:
+            QPixmap
+        """
+        key = (account.uuid, account.skin_path, size)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+            return pixmap
+
+        pixmap = self.load_skin_face(account.skin_path, size) if account.skin_path else None
+        if pixmap is None:
+            pixmap = self.create_placeholder(account, size)
+
+        self.pixmaps[key] = pixmap
+        if len(self.pixmaps) > self.capacity:
+            self.pixmaps.popitem(last=False)
+        return pixmap
+
+    def invalidate(self, uuid):
+        """移除某个账号的所有缓存头像（如皮肤更新后）"""
+        for key in [key for key in self.pixmaps if key[0] == uuid]:
+            del self.pixmaps[key]
+
+    def load_skin_face(self, skin_path, size):
+        """从皮肤文件中裁剪脸部（64x64 皮肤的 (8, 8, 8, 8) 区域）"""
+        skin = QPixmap(skin_path)
+        if skin.isNull() or skin.width() < 16:
+            return None
+        scale = skin.width() // 64 or 1
+        face = skin.copy(8 * scale, 8 * scale, 8 * scale, 8 * scale)
+        # 像素风头像放大时不做平滑
+        return face.scaled(size, size, Qt.IgnoreAspectRatio, Qt.FastTransformation)
+
+    def create_placeholder(self, account, size):
+        """生成带用户名首字母的占位头像，颜色由 UUID 决定"""
+        pixmap = QPixmap(size, size)
+        pixmap.fill(Qt.transparent)
+        hue = zlib.crc32(account.uuid.encode("utf-8")) % 360
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor.fromHsv(hue, 120, 200))
+        painter.drawRoundedRect(0, 0, size, size, 6, 6)
+        painter.setPen(Qt.white)
+        font = QFont()
+        font.setPixelSize(size // 2)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.drawText(QRect(0, 0, size, size), Qt.AlignCenter, account.username[:1].upper())
+        painter.end()
+        return pixmap
+
+class AccountListModel(QAbstractListModel):
+    """账号列表数据模型"""
+
+    # 自定义数据角色
+    AccountRole = Qt.UserRole + 1
+    UuidRole = Qt.UserRole + 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.accounts = []
+        # uuid -> 行号
+        self.rows = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.accounts)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        account = self.accounts[index.row()]
+        if role == Qt.DisplayRole:
+            return account.username
+        if role == self.AccountRole:
+            return account
+        if role == self.UuidRole:
+            return account.uuid
+        return None
+
+    def set_accounts(self, accounts):
+        """整体替换账号列表
+
+        Args:
+            accounts: AccountEntry 列表
+        """
+        self.beginResetModel()
+        self.accounts = list(accounts)
+        self.rows = {account.uuid: row for row, account in enumerate(self.accounts)}
+        self.endResetModel()
+
+    def add_account(self, account):
+        """添加账号，UUID 已存在时更新该行"""
+        if account.uuid in self.rows:
+            self.update_account(account)
+            return
+        row = len(self.accounts)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.accounts.append(account)
+        self.rows[account.uuid] = row
+        self.endInsertRows()
+
+    def update_account(self, account):
+        """更新已有账号，只通知该行重绘"""
+        row = self.rows[account.uuid]
+        self.accounts[row] = account
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove_account(self, uuid):
+        """按 UUID 删除账号"""
+        row = self.rows.get(uuid)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.accounts[row]
+        self.endRemoveRows()
+        self.rows = {account.uuid: row for row, account in enumerate(self.accounts)}
+
+    def account_at(self, row):
+        """获取指定行的账号"""
+        return self.accounts[row]
+
+class AccountDelegate(QStyledItemDelegate):
+    """直接绘制账号行：头像、用户名、账号类型与令牌过期标记
+
+    所有行高度一致，配合 QListView.setUniformItemSizes(True)，
+    滚动时只会绘制可见的行。
+    """
+
+    ROW_HEIGHT = 56
+    AVATAR_SIZE = 32
+    PADDING = 12
+
+    def __init__(self, avatar_cache=None, parent=None):
+        """初始化委托
+
+        Args:
+            avatar_cache: AvatarCache，默认新建一个
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.avatar_cache = avatar_cache or AvatarCache()
+        self.name_font = QFont(theme.PALETTE["font_family"])
+        self.name_font.setPixelSize(14)
+        self.detail_font = QFont(theme.PALETTE["font_family"])
+        self.detail_font.setPixelSize(12)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def badge(self, account):
+        """计算令牌状态标记的文本与颜色"""
+        if account.expires_at is None:
+            return None, None
+        remaining = account.expires_at - time.time()
+        if remaining <= 0:
+            return t("account.expired"), QColor(theme.PALETTE["danger"])
+        days = int(remaining // 86400)
+        if days < 1:
+            return t("account.expires_soon"), QColor(theme.PALETTE["secondary"])
+        return t("account.expires_in").format(days=days), QColor(theme.PALETTE["secondary"])
+
+    def paint(self, painter, option, index):
+        account = index.data(AccountListModel.AccountRole)
+        rect = option.rect
+        painter.save()
+
+        # 背景与分隔线
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, QColor(theme.PALETTE["hover"]))
+        elif option.state & QStyle.State_MouseOver:
+            painter.fillRect(rect, QColor(theme.PALETTE["background"]))
+        painter.setPen(QPen(QColor(theme.PALETTE["border_light"]), 1))
+        painter.drawLine(rect.left(), rect.bottom(), rect.right(), rect.bottom())
+
+        # 头像
+        avatar_top = rect.top() + (rect.height() - self.AVATAR_SIZE) // 2
+        avatar = self.avatar_cache.get(account, self.AVATAR_SIZE)
+        painter.drawPixmap(rect.left() + self.PADDING, avatar_top, avatar)
+
+        # 右侧的令牌状态标记
+        text_left = rect.left() + self.PADDING * 2 + self.AVATAR_SIZE
+        text_right = rect.right() - self.PADDING
+        badge_text, badge_color = self.badge(account)
+        if badge_text:
+            painter.setFont(self.detail_font)
+            badge_width = painter.fontMetrics().horizontalAdvance(badge_text) + 16
+            badge_rect = QRect(text_right - badge_width, rect.center().y() - 10, badge_width, 20)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(badge_color)
+            painter.drawRoundedRect(badge_rect, 10, 10)
+            painter.setPen(Qt.white)
+            painter.drawText(badge_rect, Qt.AlignCenter, badge_text)
+            text_right = badge_rect.left() - self.PADDING
+
+        # 用户名与账号类型
+        text_width = max(text_right - text_left, 0)
+        painter.setPen(QColor(theme.PALETTE["text"]))
+        painter.setFont(self.name_font)
+        painter.drawText(QRect(text_left, rect.top() + 8, text_width, 22),
+                         Qt.AlignLeft | Qt.AlignVCenter, account.username)
+        painter.setPen(QColor(theme.PALETTE["secondary"]))
+        painter.setFont(self.detail_font)
+        painter.drawText(QRect(text_left, rect.top() + 28, text_width, 20),
+                         Qt.AlignLeft | Qt.AlignVCenter, t("account.type." + account.account_type))
+
+        painter.restore()
@@ -0,0 +1,219 @@
+import time
+from bisect import bisect_left
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt5.QtGui import QPainter, QColor, QFont, QPen
+from ui.locales import t
+from ui import theme
+
+def format_playtime(seconds):
+    """游戏时长的显示文本"""
+    if seconds < 3600:
+        return t("instances.playtime_minutes").format(minutes=int(seconds // 60))
+    return t("instances.playtime_hours").format(hours=seconds / 3600)
+
+def sort_key(instance):
+    return (instance.name.casefold(), instance.id)
+
+class InstanceListModel(QAbstractListModel):
+    """实例列表数据模型，按名称排序
+
+    实例目录的变化以增量差异（MLCore.instances.InstanceDiff）应用，
+    只插入、删除或重绘受影响的行，其余行与选中状态保持不变。
+    """
+
+    # 自定义数据角色
+    InstanceRole = Qt.UserRole + 1
+    IdRole = Qt.UserRole + 2
+    # 供过滤使用的文本：名称、版本与加载器
+    SearchRole = Qt.UserRole + 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.instances = []
+        # 与 instances 对应的排序键，用于二分查找行号
+        self.keys = []
+        # 实例 ID -> 排序键
+        self.key_of = {}
+        # 当前选中（启动时使用）的实例 ID
+        self.current_id = None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.instances)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        instance = self.instances[index.row()]
+        if role == Qt.DisplayRole:
+            return instance.name
+        if role == self.InstanceRole:
+            return instance
+        if role == self.IdRole:
+            return instance.id
+        if role == self.SearchRole:
+            return " ".join((instance.name, instance.version, instance.loader))
+        return None
+
+    def set_instances(self, instances):
+        """整体替换列表
+
+        Args:
+            instances: Instance 列表
+        """
+        self.beginResetModel()
+        self.instances = sorted(instances, key=sort_key)
+        self.keys = [sort_key(instance) for instance in self.instances]
+        self.key_of = {instance.id: key for instance, key in zip(self.instances, self.keys)}
+        self.endResetModel()
+
+    def row_of(self, instance_id):
+        """实例所在的行，不存在时为 None"""
+        key = self.key_of.get(instance_id)
+        if key is None:
+            return None
+        return bisect_left(self.keys, key)
+
+    def apply_diff(self, diff):
+        """应用一批增量变化"""
+        for instance_id in diff.removed:
+            self._remove(instance_id)
+        for instance in diff.changed:
+            row = self.row_of(instance.id)
+            if row is not None and self.keys[row] == sort_key(instance):
+                # 排序位置不变，只重绘这一行
+                self.instances[row] = instance
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+            else:
+                self._remove(instance.id)
+                self._insert(instance)
+        for instance in diff.added:
+            if instance.id in self.key_of:
+                self._remove(instance.id)
+            self._insert(instance)
+
+    def _insert(self, instance):
+        key = sort_key(instance)
+        row = bisect_left(self.keys, key)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.instances.insert(row, instance)
+        self.keys.insert(row, key)
+        self.key_of[instance.id] = key
+        self.endInsertRows()
+
+    def _remove(self, instance_id):
+        row = self.row_of(instance_id)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.instances[row]
+        del self.keys[row]
+        del self.key_of[instance_id]
+        self.endRemoveRows()
+
+    def set_current(self, instance_id):
+        """标记当前实例，只重绘前后两行"""
+        rows = [self.row_of(self.current_id), self.row_of(instance_id)]
+        self.current_id = instance_id
+        for row in rows:
+            if row is not None:
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+    def instance_at(self, row):
+        """获取指定行的实例"""
+        return self.instances[row]
+
+class InstanceDelegate(QStyledItemDelegate):
+    """直接绘制实例行：名称、版本与加载器、模组数、截图数与游戏时长
+
+    所有行高度一致，配合 QListView.setUniformItemSizes(True)，
+    滚动时只会绘制可见的行。
+    """
+
+    ROW_HEIGHT = 60
+    PADDING = 12
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = QFont(theme.PALETTE["font_family"])
+        self.name_font.setPixelSize(15)
+        self.detail_font = QFont(theme.PALETTE["font_family"])
+        self.detail_font.setPixelSize(12)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def details(self, instance):
+        """第二行的说明文本"""
+        parts = [instance.version or "?"]
+        if instance.loader != "vanilla":
+            parts.append(f"{instance.loader} {instance.loader_version}".strip())
+        parts.append(t("instances.mods").format(count=instance.mods))
+        if instance.screenshots:
+            parts.append(t("instances.screenshots").format(count=len(instance.screenshots)))
+        if instance.playtime:
+            parts.append(format_playtime(instance.playtime))
+        if instance.last_played:
+            parts.append(t("instances.last_played").format(
+                date=time.strftime("%Y-%m-%d", time.localtime(instance.last_played))))
+        return " · ".join(parts)
+
+    def paint(self, painter, option, index):
+        instance = index.data(InstanceListModel.InstanceRole)
+        current = index.model().data(index, InstanceListModel.IdRole) == self.current_id(index)
+        rect = option.rect
+        painter.save()
+
+        # 背景与分隔线
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, QColor(theme.PALETTE["hover"]))
+        elif option.state & QStyle.State_MouseOver:
+            painter.fillRect(rect, QColor(theme.PALETTE["background"]))
+        painter.setPen(QPen(QColor(theme.PALETTE["border_light"]), 1))
+        painter.drawLine(rect.left(), rect.bottom(), rect.right(), rect.bottom())
+
+        # 右侧的标记：当前实例或配置错误
+        text_left = rect.left() + self.PADDING
+        text_right = rect.right() - self.PADDING
+        if instance.error:
+            badge_text, badge_color = t("instances.badge_error"), QColor(theme.PALETTE["danger"])
+        elif current:
+            badge_text, badge_color = t("instances.badge_current"), QColor(theme.PALETTE["primary"])
+        else:
+            badge_text = None
+        if badge_text:
+            painter.setFont(self.detail_font)
+            badge_width = painter.fontMetrics().horizontalAdvance(badge_text) + 16
+            badge_rect = QRect(text_right - badge_width, rect.center().y() - 10, badge_width, 20)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(badge_color)
+            painter.drawRoundedRect(badge_rect, 10, 10)
+            painter.setPen(Qt.white)
+            painter.drawText(badge_rect, Qt.AlignCenter, badge_text)
+            text_right = badge_rect.left() - self.PADDING
+
+        text_width = max(text_right - text_left, 0)
+        painter.setPen(QColor(theme.PALETTE["text"]))
+        painter.setFont(self.name_font)
+        metrics = painter.fontMetrics()
+        painter.drawText(QRect(text_left, rect.top() + 8, text_width, 22), Qt.AlignLeft | Qt.AlignVCenter,
+                         metrics.elidedText(instance.name, Qt.ElideRight, text_width))
+        painter.setPen(QColor(theme.PALETTE["secondary"]))
+        painter.setFont(self.detail_font)
+        metrics = painter.fontMetrics()
+        painter.drawText(QRect(text_left, rect.top() + 32, text_width, 20), Qt.AlignLeft | Qt.AlignVCenter,
+                         metrics.elidedText(self.details(instance), Qt.ElideRight, text_width))
+
+        painter.restore()
+
+    def current_id(self, index):
+        """源模型中标记的当前实例（列表可能经过过滤代理模型）"""
+        model = index.model()
+        while hasattr(model, "sourceModel"):
+            model = model.sourceModel()
+        return getattr(model, "current_id", None)
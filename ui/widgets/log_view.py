@@ -0,0 +1,196 @@
+import re
+from bisect import bisect_left
+from PyQt5.QtWidgets import QAbstractScrollArea, QAbstractSlider
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainter, QColor, QFontDatabase
+from ui import theme
+
+# 可见行中识别级别用，只对正在绘制的行执行
+LEVEL_IN_LINE = re.compile(r"^\[[^\]]*\] \[[^\]]*?/(TRACE|DEBUG|INFO|WARN|ERROR|FATAL)\]")
+
+class LogView(QAbstractScrollArea):
+    """日志查看器的视口
+
+    数据来自 MLCore.logs.LogIndex，只读取与绘制可见的行；
+    设置 rows（递增的行号数组，如级别过滤的结果）后只显示这些行。
+    """
+
+    # 单行最多绘制的字符数，超长的行截断
+    MAX_CHARS = 2000
+    TAB_SIZE = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("logView")
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.index = None
+        self.rows = None
+        # 高亮的搜索正则（str），None 表示不高亮
+        self.highlight = None
+        # 当前定位到的行号
+        self.current_line = None
+        # 绘制过的最宽行，用于水平滚动条
+        self.content_width = 0
+        self.shown_rows = 0
+        self.colors = {}
+        self.update_colors()
+        self.verticalScrollBar().setSingleStep(1)
+
+    def update_colors(self):
+        """按主题色板准备绘制用的颜色"""
+        palette = theme.PALETTE
+        self.colors = {
+            "background": QColor(palette["surface"]),
+            "gutter": QColor(palette["background"]),
+            "gutter_text": QColor(palette["secondary"]),
+            "text": QColor(palette["text"]),
+            "muted": QColor(palette["text_muted"]),
+            "current": QColor(palette["hover"]),
+            "highlight": QColor(palette["highlight"]),
+            "WARN": QColor(palette["warning"]),
+            "ERROR": QColor(palette["danger"]),
+            "FATAL": QColor(palette["danger"]),
+            "DEBUG": QColor(palette["secondary"]),
+            "TRACE": QColor(palette["secondary"]),
+        }
+
+    def set_index(self, index):
+        """显示一个 LogIndex（None 表示清空）"""
+        self.index = index
+        self.rows = None
+        self.current_line = None
+        self.content_width = 0
+        self.shown_rows = 0
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        self.refresh()
+
+    def set_rows(self, rows):
+        """只显示 rows 中的行（递增的行号序列），None 表示显示全部"""
+        line = self.line_at(self.verticalScrollBar().value())
+        self.rows = rows
+        self.shown_rows = 0
+        self.refresh()
+        if line is not None:
+            self.verticalScrollBar().setValue(self.row_of(line))
+
+    def set_highlight(self, pattern):
+        """设置高亮的搜索正则（编译好的 str 正则或 None）"""
+        self.highlight = pattern
+        self.viewport().update()
+
+    def row_count(self):
+        if self.index is None:
+            return 0
+        return len(self.rows) if self.rows is not None else self.index.line_count()
+
+    def line_at(self, row):
+        """第 row 个显示行对应的日志行号"""
+        if row >= self.row_count():
+            return None
+        return self.rows[row] if self.rows is not None else row
+
+    def row_of(self, line):
+        """日志行号对应的显示行（被过滤掉时为其后最近的一行）"""
+        return bisect_left(self.rows, line) if self.rows is not None else line
+
+    def line_height(self):
+        return self.fontMetrics().height()
+
+    def page_rows(self):
+        return max(1, self.viewport().height() // self.line_height())
+
+    def at_bottom(self):
+        bar = self.verticalScrollBar()
+        return bar.value() >= bar.maximum()
+
+    def refresh(self):
+        """行数变化后更新滚动条；新行落在可见区域时重绘"""
+        rows = self.row_count()
+        page = self.page_rows()
+        bar = self.verticalScrollBar()
+        bar.setPageStep(page)
+        bar.setRange(0, max(0, rows - page))
+        first = bar.value()
+        if self.shown_rows < first + page + 1 or rows < self.shown_rows:
+            self.viewport().update()
+        self.update_horizontal_range()
+
+    def update_horizontal_range(self):
+        bar = self.horizontalScrollBar()
+        bar.setPageStep(self.viewport().width())
+        bar.setRange(0, max(0, self.content_width - self.viewport().width()))
+
+    def scroll_to_line(self, line):
+        """定位到日志行 line，使其位于视口中部并标记为当前行"""
+        self.current_line = line
+        self.verticalScrollBar().setValue(self.row_of(line) - self.page_rows() // 2)
+        self.viewport().update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.refresh()
+
+    def keyPressEvent(self, event):
+        actions = {
+            Qt.Key_Up: QAbstractSlider.SliderSingleStepSub,
+            Qt.Key_Down: QAbstractSlider.SliderSingleStepAdd,
+            Qt.Key_PageUp: QAbstractSlider.SliderPageStepSub,
+            Qt.Key_PageDown: QAbstractSlider.SliderPageStepAdd,
+            Qt.Key_Home: QAbstractSlider.SliderToMinimum,
+            Qt.Key_End: QAbstractSlider.SliderToMaximum,
+        }
+        action = actions.get(event.key())
+        if action is None:
+            super().keyPressEvent(event)
+            return
+        self.verticalScrollBar().triggerAction(action)
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        rect = self.viewport().rect()
+        colors = self.colors
+        painter.fillRect(rect, colors["background"])
+        if self.index is None:
+            return
+
+        metrics = self.fontMetrics()
+        line_height = metrics.height()
+        ascent = metrics.ascent()
+        rows = self.row_count()
+        first = self.verticalScrollBar().value()
+        last = min(rows, first + rect.height() // line_height + 1)
+        self.shown_rows = rows
+
+        # 行号栏
+        gutter = metrics.horizontalAdvance("9" * len(str(max(1, self.index.line_count())))) + 16
+        painter.fillRect(0, 0, gutter, rect.height(), colors["gutter"])
+        text_x = gutter + 8 - self.horizontalScrollBar().value()
+        widest = 0
+
+        y = 0
+        for row in range(first, last):
+            line = self.rows[row] if self.rows is not None else row
+            text = self.index.line(line)[:self.MAX_CHARS].expandtabs(self.TAB_SIZE)
+            if line == self.current_line:
+                painter.fillRect(gutter, y, rect.width() - gutter, line_height, colors["current"])
+            if self.highlight is not None:
+                for match in self.highlight.finditer(text):
+                    if match.end() > match.start():
+                        left = metrics.horizontalAdvance(text[:match.start()])
+                        width = metrics.horizontalAdvance(match.group())
+                        painter.fillRect(max(gutter, text_x + left), y, width, line_height, colors["highlight"])
+            painter.setClipping(False)
+            painter.setPen(colors["gutter_text"])
+            painter.drawText(0, y, gutter - 8, line_height, Qt.AlignRight | Qt.AlignVCenter, str(line + 1))
+
+            level = LEVEL_IN_LINE.match(text)
+            painter.setPen(colors.get(level.group(1), colors["text"]) if level else colors["muted"])
+            painter.setClipRect(gutter, y, rect.width() - gutter, line_height)
+            painter.drawText(text_x, y + ascent, text)
+            widest = max(widest, metrics.horizontalAdvance(text))
+            y += line_height
+
+        if widest + gutter + 16 > self.content_width:
+            self.content_width = widest + gutter + 16
+            self.update_horizontal_range()
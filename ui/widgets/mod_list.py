@@ -0,0 +1,197 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt5.QtGui import QPainter, QColor, QFont, QPen
+from ui.locales import t
+from ui import theme
+from MLCore.mods import select_mods
+
+def describe_problem(problem):
+    """依赖检查结果（MLCore.resolver.Problem）的说明文本"""
+    ranges = t("mods.problem.or").join(problem.ranges) if problem.ranges else t("mods.problem.any_version")
+    found = ", ".join(problem.found) if problem.kind == "duplicate" else problem.found
+    return t("mods.problem." + problem.kind).format(
+        file=problem.file, mod=problem.mod_id, target=problem.target, ranges=ranges, found=found
+    )
+
+class ModListModel(QAbstractListModel):
+    """模组列表数据模型，每行是 mods 目录中的一个 jar（MLCore.mods.ModFile）"""
+
+    # 自定义数据角色
+    FileRole = Qt.UserRole + 1
+    # 供过滤使用的文本：模组名、ID 与文件名
+    SearchRole = Qt.UserRole + 2
+    # 依赖检查结果的严重程度，没有问题时为 None
+    ProblemRole = Qt.UserRole + 3
+    # 当前加载器下生效的模组（MLCore.mods.select_mods），尚未解析时为 None
+    ModsRole = Qt.UserRole + 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.files = []
+        # 实例的加载器，多加载器 jar 只显示它的模组；None 时按默认顺序选取
+        self.loader = None
+        # 路径 -> 行号
+        self.rows = {}
+        # 文件名 -> 依赖检查结果的严重程度（error / warning）
+        self.problems = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.files)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self.files[index.row()]
+        if role == Qt.DisplayRole:
+            mods = select_mods(item.mods, self.loader)
+            return mods[0].name if mods else item.name
+        if role == self.FileRole:
+            return item
+        if role == self.ModsRole:
+            return select_mods(item.mods, self.loader)
+        if role == self.ProblemRole:
+            return self.problems.get(item.name)
+        if role == self.SearchRole:
+            parts = [item.name]
+            for mod in item.mods or ():
+                parts.extend((mod.name, mod.mod_id))
+            return " ".join(parts)
+        return None
+
+    def set_files(self, files):
+        """整体替换列表
+
+        Args:
+            files: ModFile 列表
+        """
+        self.beginResetModel()
+        self.files = list(files)
+        self.rows = {item.path: row for row, item in enumerate(self.files)}
+        self.endResetModel()
+
+    def update_files(self, files):
+        """更新已有的行（如后台解析完成后），只通知变化的行范围重绘"""
+        changed = []
+        for item in files:
+            row = self.rows.get(item.path)
+            if row is not None:
+                self.files[row] = item
+                changed.append(row)
+        if changed:
+            self.dataChanged.emit(self.index(min(changed)), self.index(max(changed)))
+
+    def replace_file(self, old_path, item):
+        """替换一行（如启用/禁用后文件改名）"""
+        row = self.rows.pop(old_path)
+        self.files[row] = item
+        self.rows[item.path] = row
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def set_problems(self, problems):
+        """更新依赖检查结果，只在有变化时重绘
+
+        Args:
+            problems: {文件名: 严重程度}
+        """
+        if problems == self.problems:
+            return
+        self.problems = problems
+        if self.files:
+            self.dataChanged.emit(self.index(0), self.index(len(self.files) - 1))
+
+    def file_at(self, row):
+        """获取指定行的 jar"""
+        return self.files[row]
+
+class ModDelegate(QStyledItemDelegate):
+    """直接绘制模组行：名称与版本、模组 ID 与文件名、加载器与状态标记
+
+    所有行高度一致，配合 QListView.setUniformItemSizes(True)，
+    几百个模组滚动时也只绘制可见的行。
+    """
+
+    ROW_HEIGHT = 52
+    PADDING = 12
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = QFont(theme.PALETTE["font_family"])
+        self.name_font.setPixelSize(14)
+        self.detail_font = QFont(theme.PALETTE["font_family"])
+        self.detail_font.setPixelSize(12)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def badge(self, item, mods, problem):
+        """计算状态标记的文本与颜色"""
+        if problem == "error":
+            return t("mods.badge_conflict"), QColor(theme.PALETTE["danger"])
+        if item.error:
+            return t("mods.badge_error"), QColor(theme.PALETTE["danger"])
+        if not item.enabled:
+            return t("mods.badge_disabled"), QColor(theme.PALETTE["secondary"])
+        if item.mods is None:
+            return t("mods.badge_reading"), QColor(theme.PALETTE["border_pressed"])
+        if problem == "warning":
+            return t("mods.badge_warning"), QColor(theme.PALETTE["warning"])
+        if mods:
+            return mods[0].loader, QColor(theme.PALETTE["primary"])
+        return None, None
+
+    def paint(self, painter, option, index):
+        item = index.data(ModListModel.FileRole)
+        mods = index.data(ModListModel.ModsRole)
+        problem = index.data(ModListModel.ProblemRole)
+        rect = option.rect
+        painter.save()
+
+        # 背景与分隔线
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, QColor(theme.PALETTE["hover"]))
+        elif option.state & QStyle.State_MouseOver:
+            painter.fillRect(rect, QColor(theme.PALETTE["background"]))
+        painter.setPen(QPen(QColor(theme.PALETTE["border_light"]), 1))
+        painter.drawLine(rect.left(), rect.bottom(), rect.right(), rect.bottom())
+
+        # 右侧的状态标记
+        text_left = rect.left() + self.PADDING
+        text_right = rect.right() - self.PADDING
+        badge_text, badge_color = self.badge(item, mods, problem)
+        if badge_text:
+            painter.setFont(self.detail_font)
+            badge_width = painter.fontMetrics().horizontalAdvance(badge_text) + 16
+            badge_rect = QRect(text_right - badge_width, rect.center().y() - 10, badge_width, 20)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(badge_color)
+            painter.drawRoundedRect(badge_rect, 10, 10)
+            painter.setPen(Qt.white)
+            painter.drawText(badge_rect, Qt.AlignCenter, badge_text)
+            text_right = badge_rect.left() - self.PADDING
+
+        # 名称与版本；下一行是模组 ID 与文件名
+        if mods:
+            title = mods[0].name
+            if mods[0].version:
+                title += "  " + mods[0].version
+            detail = ", ".join(mod.mod_id for mod in mods) + " · " + item.name
+        else:
+            title = item.name
+            detail = item.error or ""
+        text_width = max(text_right - text_left, 0)
+        painter.setPen(QColor(theme.PALETTE["text" if item.enabled else "secondary"]))
+        painter.setFont(self.name_font)
+        metrics = painter.fontMetrics()
+        painter.drawText(QRect(text_left, rect.top() + 6, text_width, 22), Qt.AlignLeft | Qt.AlignVCenter,
+                         metrics.elidedText(title, Qt.ElideRight, text_width))
+        painter.setPen(QColor(theme.PALETTE["secondary"]))
+        painter.setFont(self.detail_font)
+        metrics = painter.fontMetrics()
+        painter.drawText(QRect(text_left, rect.top() + 26, text_width, 20), Qt.AlignLeft | Qt.AlignVCenter,
+                         metrics.elidedText(detail, Qt.ElideMiddle, text_width))
+
+        painter.restore()
@@ -0,0 +1,297 @@
+import time
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QTabWidget, QWidget, QLabel,
+                             QPushButton, QTreeWidget, QTreeWidgetItem, QHeaderView, QComboBox, QCheckBox, QSpinBox,
+                             QPlainTextEdit, QMessageBox)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QColor
+from ui import theme
+from ui.locales import t
+from ui.locales.retranslator import retranslator
+
+# Java 列表的列：(词条键, JavaRuntime -> 文本)
+JAVA_COLUMNS = (
+    ("settings.column_version", lambda runtime: runtime.version or t("settings.java_unknown")),
+    ("settings.column_vendor", lambda runtime: runtime.vendor),
+    ("settings.column_arch", lambda runtime: runtime.arch),
+    ("settings.column_source", lambda runtime: ", ".join(runtime.sources)),
+    ("settings.column_path", lambda runtime: runtime.path),
+)
+
+# 性能页中方案的显示顺序
+PROFILE_ORDER = ("g1", "zgc", "low_ram")
+# 内存上限停止变化多久后保存（毫秒）：输入或连续点按时只刷新预览，不逐次写 instance.json
+SAVE_DELAY_MS = 500
+
+class SettingsDialog(QDialog):
+    """设置对话框
+
+    Java 页先显示上次查找的缓存结果（只读取一个缓存文件），再在后台用
+    MLCore.java.JavaFinder 重新查找：文件没有变化的 Java 不需要读取 release 或启动进程，
+    热启动时列表几乎立即就是最新的。
+
+    性能页编辑当前实例的 JVM 方案、CDS 与内存上限（保存在实例的 instance.json 中），
+    并按 MLCore.jvm.plan_jvm() 预览生成的参数。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("SettingsDialog")
+        self.resize(720, 440)
+        retranslator.bind(self, "settings.title", "windowTitle")
+        self.finder = None
+        self.discover_flow = None
+        self.discover_ms = None
+        self.runtimes = []
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(10)
+        self.tab_widget = QTabWidget()
+        self.java_page = QWidget()
+        self.create_java_page()
+        self.tab_widget.addTab(self.java_page, "")
+        retranslator.bind(self.tab_widget, "settings.java", lambda text: self.tab_widget.setTabText(0, text))
+        self.jvm_page = QWidget()
+        self.create_jvm_page()
+        self.tab_widget.addTab(self.jvm_page, "")
+        retranslator.bind(self.tab_widget, "settings.jvm", lambda text: self.tab_widget.setTabText(1, text))
+        layout.addWidget(self.tab_widget, 1)
+
+        close_layout = QHBoxLayout()
+        close_layout.addStretch(1)
+        close_btn = QPushButton()
+        close_btn.setProperty("variant", "outline")
+        retranslator.bind(close_btn, "settings.close")
+        close_btn.clicked.connect(self.accept)
+        close_layout.addWidget(close_btn)
+        layout.addLayout(close_layout)
+
+    def create_java_page(self):
+        """创建 Java 页：运行时列表、重新查找按钮与状态"""
+        layout = QVBoxLayout(self.java_page)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(10)
+
+        self.java_list = QTreeWidget()
+        self.java_list.setObjectName("javaList")
+        self.java_list.setRootIsDecorated(False)
+        self.java_list.setUniformRowHeights(True)
+        self.java_list.setColumnCount(len(JAVA_COLUMNS))
+        header = self.java_list.header()
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setStretchLastSection(True)
+        retranslator.bind(self.java_list, JAVA_COLUMNS[0][0], lambda _: self.java_list.setHeaderLabels(
+            [t(key) for key, _ in JAVA_COLUMNS]))
+        layout.addWidget(self.java_list, 1)
+
+        bottom_layout = QHBoxLayout()
+        self.java_status = QLabel()
+        self.java_status.setObjectName("javaStatus")
+        bottom_layout.addWidget(self.java_status, 1)
+        self.rescan_btn = QPushButton()
+        self.rescan_btn.setProperty("variant", "outline")
+        retranslator.bind(self.rescan_btn, "settings.java_rescan")
+        self.rescan_btn.clicked.connect(self.refresh_java)
+        bottom_layout.addWidget(self.rescan_btn)
+        layout.addLayout(bottom_layout)
+        retranslator.lang_changed.connect(self.update_java)
+
+    def create_jvm_page(self):
+        """创建性能页：当前实例、方案、CDS、内存上限与参数预览"""
+        self.jvm_instance = None
+        self.jvm_memory = None
+        self.jvm_running = 0
+        self.jvm_java = None
+        self.jvm_major = 8
+        # 最近一次读取或保存的设置，没有变化时不重复写入
+        self.jvm_saved = None
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.save_jvm)
+        layout = QVBoxLayout(self.jvm_page)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(10)
+
+        self.jvm_title = QLabel()
+        self.jvm_title.setObjectName("jvmInstance")
+        layout.addWidget(self.jvm_title)
+
+        form = QFormLayout()
+        form.setSpacing(10)
+        self.profile_combo = QComboBox()
+        for _ in PROFILE_ORDER:
+            self.profile_combo.addItem("")
+        retranslator.bind(self.profile_combo, "settings.profile.g1", lambda _: self.retranslate_profiles())
+        profile_label = QLabel()
+        retranslator.bind(profile_label, "settings.jvm_profile")
+        form.addRow(profile_label, self.profile_combo)
+
+        self.cds_check = QCheckBox()
+        retranslator.bind(self.cds_check, "settings.jvm_cds")
+        form.addRow("", self.cds_check)
+
+        self.memory_spin = QSpinBox()
+        self.memory_spin.setSingleStep(256)
+        self.memory_spin.setSuffix(" MB")
+        retranslator.bind(self.memory_spin, "settings.jvm_memory_auto", "specialValueText")
+        memory_label = QLabel()
+        retranslator.bind(memory_label, "settings.jvm_memory")
+        form.addRow(memory_label, self.memory_spin)
+        layout.addLayout(form)
+
+        self.jvm_summary = QLabel()
+        self.jvm_summary.setObjectName("jvmSummary")
+        self.jvm_summary.setWordWrap(True)
+        layout.addWidget(self.jvm_summary)
+        self.jvm_arguments = QPlainTextEdit()
+        self.jvm_arguments.setObjectName("jvmArguments")
+        self.jvm_arguments.setReadOnly(True)
+        layout.addWidget(self.jvm_arguments, 1)
+
+        self.profile_combo.currentIndexChanged.connect(self.save_jvm)
+        self.cds_check.toggled.connect(self.save_jvm)
+        # 输入内存上限时只刷新预览，输入结束（回车、离开输入框）或停止变化一段时间后才保存
+        self.memory_spin.valueChanged.connect(self.schedule_save)
+        self.memory_spin.editingFinished.connect(self.save_jvm)
+        retranslator.lang_changed.connect(self.update_jvm)
+
+    def retranslate_profiles(self):
+        for index, name in enumerate(PROFILE_ORDER):
+            self.profile_combo.setItemText(index, t(f"settings.profile.{name}"))
+            self.profile_combo.setItemData(index, t(f"settings.profile_tip.{name}"), Qt.ToolTipRole)
+
+    def load_jvm(self):
+        """读取当前实例的 JVM 设置、系统内存与正在运行的游戏数"""
+        from MLCore.instances import default_manager
+        from MLCore.jvm import load_settings, read_meminfo, running_games
+        manager = default_manager()
+        instance_id = manager.selected()
+        self.jvm_instance = manager.read(instance_id) if instance_id else None
+        self.jvm_memory = read_meminfo()
+        self.jvm_running = running_games()
+        self.select_jvm_java()
+
+        settings = load_settings(self.jvm_instance.config if self.jvm_instance else {})
+        self.jvm_saved = settings
+        # 填入控件时不触发保存
+        for widget in (self.profile_combo, self.cds_check, self.memory_spin):
+            widget.blockSignals(True)
+        self.profile_combo.setCurrentIndex(PROFILE_ORDER.index(settings.profile))
+        self.cds_check.setChecked(settings.cds)
+        self.memory_spin.setRange(0, max(self.jvm_memory.total_mb, settings.max_memory_mb))
+        self.memory_spin.setValue(settings.max_memory_mb)
+        for widget in (self.profile_combo, self.cds_check, self.memory_spin):
+            widget.blockSignals(False)
+            widget.setEnabled(self.jvm_instance is not None)
+        self.update_jvm()
+
+    def select_jvm_java(self):
+        """按当前实例的游戏版本选择 Java（预览 CDS 与方案是否可用）"""
+        from MLCore.java import required_major, select_runtime
+        major = required_major(self.jvm_instance.version if self.jvm_instance else "")
+        self.jvm_java = select_runtime(self.runtimes, major)
+        self.jvm_major = self.jvm_java.major if self.jvm_java else major
+
+    def jvm_settings(self):
+        from MLCore.jvm import JvmSettings
+        return JvmSettings(PROFILE_ORDER[self.profile_combo.currentIndex()], self.cds_check.isChecked(),
+                           self.memory_spin.value())
+
+    def schedule_save(self):
+        """刷新预览，停止变化 SAVE_DELAY_MS 后保存"""
+        self.update_jvm()
+        self.save_timer.start()
+
+    def save_jvm(self):
+        """把修改写入当前实例的 instance.json 并刷新预览（设置没有变化时不写入）"""
+        self.save_timer.stop()
+        if self.jvm_instance is None:
+            return
+        from MLCore.instances import default_manager
+        from MLCore.jvm import save_settings
+        settings = self.jvm_settings()
+        if settings != self.jvm_saved:
+            try:
+                save_settings(default_manager(), self.jvm_instance.id, settings)
+                self.jvm_saved = settings
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(self, t("settings.jvm_save_failed"), str(e))
+        self.update_jvm()
+
+    def update_jvm(self):
+        """按当前设置预览生成的 JVM 参数"""
+        if self.jvm_memory is None:
+            return
+        from MLCore.jvm import plan_jvm, archive_key
+        instance = self.jvm_instance
+        if instance is None:
+            self.jvm_title.setText(t("settings.jvm_no_instance"))
+        else:
+            self.jvm_title.setText(t("settings.jvm_instance").format(name=instance.name, version=instance.version))
+        java = self.jvm_java
+        key = archive_key(java.path, java.version) if java else ""
+        plan = plan_jvm(self.jvm_settings(), self.jvm_major, instance.mods if instance else 0, self.jvm_running,
+                        instance.id if instance else None, key, self.jvm_memory)
+        lines = [t("settings.jvm_heap").format(
+            xmx=plan.xmx_mb, xms=plan.xms_mb, total=self.jvm_memory.total_mb / 1024,
+            available=self.jvm_memory.available_mb / 1024, running=self.jvm_running, java=self.jvm_major)]
+        lines += [t(f"settings.note.{note}") for note in plan.notes]
+        self.jvm_summary.setText("\n".join(lines))
+        self.jvm_arguments.setPlainText(" ".join(plan.arguments))
+
+    def showEvent(self, event):
+        """每次显示时先显示 Java 的缓存结果并读取当前实例的 JVM 设置，再在后台重新查找 Java"""
+        super().showEvent(event)
+        if self.finder is None:
+            from MLCore.java import default_finder
+            self.finder = default_finder()
+            self.runtimes = self.finder.cached()
+            self.update_java()
+        self.load_jvm()
+        self.refresh_java()
+
+    def hideEvent(self, event):
+        """关闭时保存还在等待的修改"""
+        if self.save_timer.isActive():
+            self.save_jvm()
+        super().hideEvent(event)
+
+    def refresh_java(self):
+        """在后台重新查找 Java"""
+        from ui.tasks import runtime
+        if self.discover_flow is None:
+            self.discover_flow = runtime().start_ui(self.discover())
+            self.update_java()
+
+    async def discover(self):
+        from ui.tasks import runtime, PRIORITY_HIGH
+        started = time.perf_counter()
+        try:
+            runtimes = await runtime().submit(self.finder.discover, priority=PRIORITY_HIGH, name="java.discover")
+        finally:
+            self.discover_flow = None
+        self.discover_ms = (time.perf_counter() - started) * 1000
+        self.runtimes = runtimes
+        self.update_java()
+        if self.jvm_memory is not None:
+            self.select_jvm_java()
+            self.update_jvm()
+
+    def update_java(self):
+        """重建 Java 列表与状态文本"""
+        self.java_list.clear()
+        for runtime in self.runtimes:
+            item = QTreeWidgetItem([column(runtime) for _, column in JAVA_COLUMNS])
+            if runtime.error:
+                item.setToolTip(0, runtime.error)
+                item.setForeground(0, QColor(theme.PALETTE["danger"]))
+            self.java_list.addTopLevelItem(item)
+        parts = [t("settings.java_found").format(count=len(self.runtimes)) if self.runtimes
+                 else t("settings.java_none")]
+        if self.discover_flow is not None:
+            parts.append(t("settings.java_searching"))
+        elif self.discover_ms is not None:
+            parts.append(t("settings.java_time").format(ms=self.discover_ms))
+        self.java_status.setText(" · ".join(parts))
+        self.rescan_btn.setEnabled(self.discover_flow is None)